@@ -0,0 +1,62 @@
+"""
+Benchmark — HabitDash metric fetching against the local stand-in
+================================================================
+
+Starts ``biosystems.testing.HabitDashStandIn`` with a rate limit and
+measures ``HabitDashClient.fetch_all_metrics`` wall time and achieved
+request rate for several worker counts, versus the ceiling the limit
+allows (``rate_limit / rate_window_s``).
+
+Usage
+-----
+    python3.11 benchmarks/bench_habitdash_sync.py
+    python3.11 benchmarks/bench_habitdash_sync.py --days 365 --rate-limit 30 --window 2 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from biosystems.testing import HabitDashStandIn  # noqa: E402
+from biosystems.wellness.habitdash import HabitDashClient  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--days", type=int, default=180, help="Date range to sync")
+    parser.add_argument("--rate-limit", type=int, default=20, help="Requests per window")
+    parser.add_argument("--window", type=float, default=1.0, help="Rate-limit window (s)")
+    parser.add_argument("--latency", type=float, default=0.03, help="Per-response latency (s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    end = date(2025, 12, 31)
+    start = end - timedelta(days=args.days - 1)
+    ceiling = args.rate_limit / args.window
+    print(f"{args.days} days · limit {args.rate_limit}/{args.window:g}s (ceiling {ceiling:.1f} req/s) "
+          f"· latency {args.latency * 1000:.0f}ms")
+
+    for workers in args.workers:
+        with HabitDashStandIn(
+            first_day=start, last_day=end, rate_limit=args.rate_limit,
+            rate_window_s=args.window, latency_s=args.latency,
+        ) as hd:
+            client = HabitDashClient(api_key="standin", base_url=hd.root_url, max_workers=workers)
+            t0 = time.perf_counter()
+            records = client.fetch_all_metrics(start.isoformat(), end.isoformat())
+            wall = time.perf_counter() - t0
+            stats = hd.stats()
+        rate = stats["requests"] / wall if wall else 0.0
+        statuses = ", ".join(f"{k}:{v}" for k, v in sorted(stats["by_status"].items()))
+        print(f"  workers={workers:<2}  {wall:>6.2f}s  {rate:>6.1f} req/s "
+              f"({rate / ceiling:>4.0%} of ceiling)  {len(records):>6} records  [{statuses}]")
+
+
+if __name__ == "__main__":
+    main()
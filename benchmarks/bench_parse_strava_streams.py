@@ -0,0 +1,62 @@
+"""
+Benchmark — parse_strava_streams
+================================
+
+Times Strava stream → DataFrame conversion on synthetic activities of
+10k–100k points (a 100k-point stream is roughly a 28 h ultra at 1 Hz).
+
+Usage
+-----
+    python3.11 benchmarks/bench_parse_strava_streams.py
+    python3.11 benchmarks/bench_parse_strava_streams.py --sizes 10000 50000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from biosystems.ingestion.strava import parse_strava_streams  # noqa: E402
+
+
+def synthetic_streams(n: int, seed: int = 0) -> dict[str, list]:
+    """Build a Strava-shaped streams dict (plain Python lists, as the API JSON decodes)."""
+    rng = np.random.default_rng(seed)
+    speed = np.clip(rng.normal(3.0, 0.3, n), 0.0, None)
+    speed[rng.random(n) < 0.01] = 0.0  # paused samples
+    lat = 40.0 + np.cumsum(rng.normal(0, 1e-5, n))
+    lon = -74.0 + np.cumsum(rng.normal(0, 1e-5, n))
+    return {
+        "time": list(range(n)),
+        "distance": np.cumsum(speed).tolist(),
+        "latlng": np.column_stack([lat, lon]).tolist(),
+        "altitude": (100 + np.cumsum(rng.normal(0, 0.1, n))).tolist(),
+        "heartrate": rng.integers(120, 175, n).tolist(),
+        "cadence": rng.integers(80, 92, n).tolist(),
+        "velocity_smooth": speed.tolist(),
+        "moving": (speed > 0).tolist(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 25_000, 50_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'points':>8}  {'best ms':>9}  {'median ms':>9}  {'µs/point':>9}")
+    for n in args.sizes:
+        streams = synthetic_streams(n)
+        timer = timeit.Timer(lambda: parse_strava_streams(streams, "2025-06-01T07:00:00Z"))
+        runs = np.array(timer.repeat(repeat=args.repeat, number=1)) * 1000
+        print(f"{n:>8}  {runs.min():>9.2f}  {np.median(runs):>9.2f}  {runs.min() * 1000 / n:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
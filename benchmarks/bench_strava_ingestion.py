@@ -0,0 +1,156 @@
+"""
+Benchmark — Strava ingestion against the local API stand-in
+===========================================================
+
+Starts ``biosystems.testing.StravaStandIn`` (and an ``OpenMeteoStandIn`` for
+weather context) on localhost, points the clients at them via
+``STRAVA_API_ROOT`` / ``OPEN_METEO_API_ROOT`` and measures end-to-end throughput and
+per-activity latency of the ingestion paths:
+
+  list      fetch_runs_since (paginated /athlete/activities)
+  streams   fetch_activity_streams per activity (detail + streams + parse)
+  efforts   fetch_activity_efforts per activity
+  backfill-streams / backfill-efforts / sync
+            the CLI commands, in-process, against a throwaway BIOSYSTEMS_HOME
+
+No real credentials or quota are used; results are reproducible offline.
+
+Usage
+-----
+    python3.11 benchmarks/bench_strava_ingestion.py
+    python3.11 benchmarks/bench_strava_ingestion.py --activities 50 --points 7200 --latency 0.05
+    python3.11 benchmarks/bench_strava_ingestion.py --fail-every 7 --rate-limit 60
+    python3.11 benchmarks/bench_strava_ingestion.py --recording data/strava_recording/
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import biosystems.ingestion.strava as strava_mod  # noqa: E402
+from biosystems.testing import OpenMeteoStandIn, StravaStandIn  # noqa: E402
+
+
+def _report(label: str, latencies_s: list[float], wall_s: float, n: int, stats: dict) -> None:
+    if latencies_s:
+        lat = np.array(latencies_s) * 1000
+        lat_str = f"p50 {np.percentile(lat, 50):>7.1f}ms  p95 {np.percentile(lat, 95):>7.1f}ms"
+    else:
+        lat_str = f"{'per-item latency n/a':<28}"
+    statuses = ", ".join(f"{k}:{v}" for k, v in sorted(stats["by_status"].items()))
+    rate = n / wall_s if wall_s else 0.0
+    print(
+        f"{label:<18} {n:>5} items  {wall_s:>7.2f}s  {rate:>7.1f}/s  {lat_str}  "
+        f"reqs {stats['requests']:>4} ({statuses})"
+    )
+
+
+def _timed_each(fn, ids: list[int]) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    t0 = time.perf_counter()
+    for aid in ids:
+        t = time.perf_counter()
+        fn(aid)
+        latencies.append(time.perf_counter() - t)
+    return latencies, time.perf_counter() - t0
+
+
+def _run_cli(api: StravaStandIn, args: list[str]) -> tuple[float, int]:
+    from typer.testing import CliRunner
+
+    from biosystems.cli import app
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["BIOSYSTEMS_HOME"] = home
+        t0 = time.perf_counter()
+        result = CliRunner().invoke(app, args)
+        wall = time.perf_counter() - t0
+    if result.exit_code != 0:
+        print(f"  ! {' '.join(args)} exited {result.exit_code}: {result.output.strip()[-200:]}")
+    return wall, result.exit_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--activities", type=int, default=20)
+    parser.add_argument("--points", type=int, default=3600, help="Stream samples per activity")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in latency per response (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per window (0 = unlimited)")
+    parser.add_argument("--rate-window", type=float, default=10.0)
+    parser.add_argument("--recording", type=Path, help="Serve recorded payloads instead of synthetic ones")
+    parser.add_argument("--skip-cli", action="store_true", help="Only benchmark the client functions")
+    args = parser.parse_args()
+
+    fault_kwargs = dict(
+        latency_s=args.latency,
+        error_rate=args.error_rate,
+        fail_every=args.fail_every,
+        rate_limit=args.rate_limit,
+        rate_window_s=args.rate_window,
+        retry_after_s=1,
+    )
+    if args.recording:
+        api = StravaStandIn.from_recording(args.recording, **fault_kwargs)
+    else:
+        api = StravaStandIn(
+            n_activities=args.activities,
+            n_points=args.points,
+            start=datetime.now(timezone.utc) - timedelta(days=args.activities),
+            **fault_kwargs,
+        )
+
+    weather_api = OpenMeteoStandIn()
+    os.environ.update({
+        "OPEN_METEO_API_ROOT": weather_api.root_url,
+        "STRAVA_API_ROOT": api.root_url,
+        "STRAVA_CLIENT_ID": "standin",
+        "STRAVA_CLIENT_SECRET": "standin",
+        "STRAVA_REFRESH_TOKEN": "standin",
+    })
+
+    with api, weather_api:
+        ids = api.activity_ids
+        after = (datetime.now(timezone.utc) - timedelta(days=len(ids) + 1)).strftime("%Y-%m-%d")
+        token = strava_mod._refresh_access_token()
+        print(f"Stand-in at {api.root_url}: {len(ids)} activities × {args.points} points\n")
+
+        api.reset_stats()
+        t0 = time.perf_counter()
+        runs = strava_mod.fetch_runs_since(after, access_token=token)
+        _report("list", [time.perf_counter() - t0], time.perf_counter() - t0, len(runs), api.stats())
+
+        api.reset_stats()
+        lat, wall = _timed_each(lambda aid: strava_mod.fetch_activity_streams(aid, access_token=token), ids)
+        _report("streams", lat, wall, len(ids), api.stats())
+
+        api.reset_stats()
+        lat, wall = _timed_each(lambda aid: strava_mod.fetch_activity_efforts(aid, access_token=token), ids)
+        _report("efforts", lat, wall, len(ids), api.stats())
+
+        if not args.skip_cli:
+            for label, cli_args in (
+                ("backfill-streams", ["backfill-streams", "--after", after, "--delay", "0"]),
+                ("backfill-efforts", ["backfill-efforts", str(len(ids))]),
+                ("sync", ["sync", "--after", after, "--delay", "0", "--json"]),
+            ):
+                api.reset_stats()
+                weather_before = len(weather_api.requests)
+                wall, _ = _run_cli(api, cli_args)
+                _report(label, [], wall, len(ids), api.stats())
+                print(f"{'':<18} weather requests: {len(weather_api.requests) - weather_before}")
+
+
+if __name__ == "__main__":
+    main()
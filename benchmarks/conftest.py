@@ -0,0 +1,152 @@
+"""
+Benchmark Suite (pytest-benchmark)
+==================================
+
+Times the ingestion parsers, the physics pipeline, history and PMC
+analytics and wellness context on synthetic inputs from
+``biosystems.testing.synthetic``. Inputs are generated once per session into
+a temporary ``BIOSYSTEMS_HOME``; nothing touches ~/.biosystems.
+
+``--bench-scale quick`` (default) covers 1 h and 4 h activities, 100 and
+5,000-run histories and 3 years of wellness; ``--bench-scale full`` adds
+12 h and 48 h ultras (172,800 samples), 10 to 50,000 runs and 10 years.
+
+Baselines live in ``benchmarks/baselines`` (one directory per machine and
+Python, as pytest-benchmark lays them out). They are not committed: timings
+only compare on the machine that recorded them, so record one locally
+before comparing, and again after any intended performance change.
+
+Usage
+-----
+    # compare against the latest saved baseline, failing on a >25% mean regression
+    python3.11 -m pytest benchmarks -o addopts="" --benchmark-storage=benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+
+    # record a new baseline
+    python3.11 -m pytest benchmarks -o addopts="" --benchmark-storage=benchmarks/baselines \\
+        --benchmark-save=baseline
+
+    python3.11 -m pytest benchmarks -o addopts="" --bench-scale full -k "fit or gpx"
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+if importlib.util.find_spec("pytest_benchmark") is None:
+    # Without the plugin there is no ``benchmark`` fixture; skip collection
+    # rather than erroring (pip install -e ".[dev]" brings it in).
+    collect_ignore_glob = ["test_*.py"]
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ZONES_PATH = REPO_ROOT / "data" / "zones_personal.yml"
+
+SCALES: dict[str, dict[str, list]] = {
+    "quick": {"hours": [1, 4], "n_runs": [100, 5_000], "wellness_years": [3]},
+    "full": {"hours": [1, 4, 12, 48], "n_runs": [10, 1_000, 10_000, 50_000], "wellness_years": [3, 10]},
+}
+_IDS = {"hours": "{}h", "n_runs": "{}runs", "wellness_years": "{}y"}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--bench-scale", choices=sorted(SCALES), default="quick",
+        help="Input sizes for the benchmark suite (default: quick)",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    sizes = SCALES[metafunc.config.getoption("--bench-scale")]
+    for name, values in sizes.items():
+        if name in metafunc.fixturenames:
+            metafunc.parametrize(name, values, ids=[_IDS[name].format(v) for v in values])
+
+
+@pytest.fixture(scope="session", autouse=True)
+def bench_home(tmp_path_factory: pytest.TempPathFactory):
+    """A throwaway BIOSYSTEMS_HOME for the whole session."""
+    home = tmp_path_factory.mktemp("biosystems_home")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("BIOSYSTEMS_HOME", str(home))
+        yield home
+
+
+@pytest.fixture(scope="session")
+def activity_files(tmp_path_factory: pytest.TempPathFactory) -> Callable[[float], dict[str, Any]]:
+    """``hours -> {"gpx": path, "fit": path, "streams": dict, "start": iso}``, generated once per size."""
+    from biosystems.testing.synthetic import (
+        DEFAULT_START,
+        synthetic_fit,
+        synthetic_gpx,
+        synthetic_streams,
+    )
+
+    root = tmp_path_factory.mktemp("activities")
+    made: dict[float, dict[str, Any]] = {}
+
+    def get(hours: float) -> dict[str, Any]:
+        if hours not in made:
+            duration_s = int(hours * 3600)
+            gpx, fit = root / f"run_{hours:g}h.gpx", root / f"run_{hours:g}h.fit"
+            gpx.write_text(synthetic_gpx(duration_s))
+            fit.write_bytes(synthetic_fit(duration_s))
+            made[hours] = {
+                "gpx": gpx,
+                "fit": fit,
+                "streams": synthetic_streams(duration_s),
+                "start": DEFAULT_START.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        return made[hours]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def zone_config():
+    from biosystems._pipeline import load_zone_config
+
+    return load_zone_config(ZONES_PATH)
+
+
+@pytest.fixture(scope="session")
+def history_entries() -> Callable[[int], list[dict[str, Any]]]:
+    """``n_runs -> entries`` (generated once per size; treat as read-only)."""
+    from biosystems.testing.synthetic import synthetic_history
+
+    made: dict[int, list[dict[str, Any]]] = {}
+
+    def get(n_runs: int) -> list[dict[str, Any]]:
+        if n_runs not in made:
+            made[n_runs] = synthetic_history(n_runs)
+        return made[n_runs]
+
+    return get
+
+
+@pytest.fixture
+def publish_history() -> Callable[[list[dict[str, Any]]], None]:
+    """Write entries as the current history.jsonl directly (not timed, no append_runs dedup pass)."""
+    from biosystems.analytics import history as hist_mod
+
+    def publish(entries: list[dict[str, Any]]) -> None:
+        lines = [json.dumps(e, separators=(",", ":")) for e in entries]
+        hist_mod.history_path().write_text("\n".join(lines) + "\n")
+        hist_mod._snapshot_cache = None
+
+    return publish
+
+
+@pytest.fixture
+def slow_benchmark(benchmark) -> Callable[..., Any]:
+    """``benchmark`` with a fixed 3 rounds, for calls that take seconds at the larger sizes."""
+
+    def run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=3, iterations=1, warmup_rounds=0)
+
+    return run
@@ -0,0 +1,65 @@
+"""
+Benchmarks — run history and PMC
+
+load_history (first read in a process and cached re-read), append_run into
+an existing history, compute_pmc, and the analytics API read per entry and
+as frames (the ``FRAME_MIN_BYTES`` switch), at each history size (``n_runs``).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import biosystems.analytics.history as hist_mod
+from biosystems import api
+from biosystems.analytics.trending import compute_pmc
+from biosystems.testing.synthetic import synthetic_history
+
+
+def test_load_history_cold(benchmark, history_entries, publish_history, n_runs):
+    publish_history(history_entries(n_runs))
+
+    def drop_cache():
+        hist_mod._snapshot_cache = None
+
+    entries = benchmark.pedantic(hist_mod.load_history, setup=drop_cache, rounds=10, warmup_rounds=1)
+    assert len(entries) == n_runs
+
+
+def test_load_history_cached(benchmark, history_entries, publish_history, n_runs):
+    publish_history(history_entries(n_runs))
+    entries = benchmark(hist_mod.load_history)
+    assert len(entries) == n_runs
+
+
+def test_append_run(benchmark, history_entries, publish_history, n_runs):
+    publish_history(history_entries(n_runs))
+    new_run = synthetic_history(1, seed=99)[0]
+    efforts = new_run.pop("strava_efforts")
+    benchmark.pedantic(hist_mod.append_run, args=(new_run, efforts), rounds=10, warmup_rounds=1)
+    assert len(hist_mod.load_history()) == n_runs + 1
+
+
+def test_compute_pmc(benchmark, history_entries, n_runs):
+    pmc = benchmark(compute_pmc, history_entries(n_runs))
+    assert pmc[-1]["date"] == history_entries(n_runs)[-1]["date"]
+
+
+@pytest.mark.parametrize("frames", [False, True], ids=["entries", "frames"])
+def test_analytics_api(benchmark, history_entries, publish_history, n_runs, frames, monkeypatch):
+    entries = history_entries(n_runs)
+    publish_history(entries)
+    monkeypatch.setattr(hist_mod, "FRAME_MIN_BYTES", 0 if frames else 1 << 62)
+    mid_period = entries[len(entries) // 2]["date"]  # finer than the rollup cells
+
+    def drop_caches():
+        hist_mod._snapshot_cache = None
+        hist_mod._frame_cache = None
+
+    def analytics():
+        return api.trend(), api.top(), api.efforts(), api.summary(since=mid_period)
+
+    drop_caches()
+    analytics()  # write the Parquet mirrors and rollups once, untimed
+    result = benchmark.pedantic(analytics, setup=drop_caches, rounds=5, warmup_rounds=0)
+    assert result[0]["summary"]["history_runs"] > 0
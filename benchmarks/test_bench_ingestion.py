@@ -0,0 +1,30 @@
+"""
+Benchmarks — ingestion parsers
+
+parse_gpx, parse_fit and parse_strava_streams on the same synthetic run at
+each activity duration (``hours``).
+"""
+
+from __future__ import annotations
+
+from biosystems.ingestion.fit import parse_fit
+from biosystems.ingestion.gpx import parse_gpx
+from biosystems.ingestion.strava import parse_strava_streams
+
+
+def test_parse_gpx(slow_benchmark, activity_files, hours):
+    files = activity_files(hours)
+    df = slow_benchmark(parse_gpx, files["gpx"])
+    assert len(df) == int(hours * 3600)
+
+
+def test_parse_fit(slow_benchmark, activity_files, hours):
+    files = activity_files(hours)
+    df = slow_benchmark(parse_fit, files["fit"])
+    assert len(df) == int(hours * 3600)
+
+
+def test_parse_strava_streams(benchmark, activity_files, hours):
+    files = activity_files(hours)
+    df = benchmark(parse_strava_streams, files["streams"], files["start"], 1)
+    assert len(df) == int(hours * 3600)
@@ -0,0 +1,32 @@
+"""
+Benchmarks — physics pipeline
+
+run_metrics and build_run_report on the Strava pipeline frame (parsed
+streams with walks flagged, as ``biosystems strava`` builds it).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from biosystems._pipeline import flag_walks
+from biosystems.ingestion.strava import parse_strava_streams
+from biosystems.physics.metrics import run_metrics
+from biosystems.physics.report import build_run_report
+
+
+@pytest.fixture
+def run_frame(activity_files, hours):
+    files = activity_files(hours)
+    return flag_walks(parse_strava_streams(files["streams"], files["start"], 1))
+
+
+def test_run_metrics(benchmark, run_frame, zone_config):
+    run_only = run_frame[~run_frame["is_walk"]]
+    metrics = benchmark(run_metrics, run_only, zone_config)
+    assert metrics.efficiency_factor > 0
+
+
+def test_build_run_report(slow_benchmark, run_frame, zone_config):
+    report = slow_benchmark(build_run_report, run_frame, zone_config, activity_name="Synthetic Run")
+    assert report.run_only.distance_km > 0
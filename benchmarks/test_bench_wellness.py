@@ -0,0 +1,37 @@
+"""
+Benchmarks — wellness context
+
+compute_wellness_context for the last day of the store, both in a
+long-lived process (store frame cached) and as a fresh CLI process sees it
+(frame cache dropped, persisted feature table available), at each store
+size (``wellness_years``).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import biosystems.wellness.cache as cache
+from biosystems.testing.synthetic import DEFAULT_END, synthetic_wellness
+
+TARGET = DEFAULT_END.isoformat()
+
+
+@pytest.fixture
+def wellness_store(wellness_years):
+    cache._save_df(synthetic_wellness(wellness_years * 365))
+    assert cache.compute_wellness_context(TARGET)  # builds and persists the feature table
+
+
+def test_compute_wellness_context_in_process(benchmark, wellness_store):
+    context = benchmark(cache.compute_wellness_context, TARGET)
+    assert context["gar"]
+
+
+def test_compute_wellness_context_fresh_process(benchmark, wellness_store):
+    def drop_frame_cache():
+        with cache._frame_guard:
+            cache._frame_cache.clear()
+
+    context = benchmark.pedantic(cache.compute_wellness_context, args=(TARGET,), setup=drop_frame_cache, rounds=20)
+    assert context["gar"]
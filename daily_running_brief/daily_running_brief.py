@@ -5,7 +5,7 @@ Daily Running Brief
 cron: after each run (or nightly at 20:00)
 
 Pipeline:
-  Collect   (biosystems strava --list + per-run fetch)
+  Collect   (biosystems.api list_runs + per-run run_report, in-process)
   → Stats   (pre-compute all baselines in Python — Claude never does arithmetic)
   → Cards   (build structured run card per activity — replaces raw JSON dumps)
   → Preamble (Claude writes plain-English fitness state — one call, no metrics)
@@ -13,6 +13,10 @@ Pipeline:
   → Synthesize (Claude identifies cross-run structural pattern if ≥2 runs)
   → Write   memory/intelligence/YYYY-MM-DD_running_brief.md
 
+Report fetches and per-run analyses run on a bounded thread pool (--workers),
+each with its own timeout; the preamble starts once every report is in, while
+the analyses are still running. Results are assembled in run order.
+
 Place this file at:  ~/.openclaw/workspace/scripts/daily_running_brief.py
 Output writes to:    ~/.openclaw/workspace/memory/intelligence/
 Seen-runs ledger:    ~/.openclaw/workspace/memory/intelligence/seen_runs.json
@@ -25,19 +29,26 @@ Claude only interprets pre-computed structured cards.
 Requires:
   ANTHROPIC_API_KEY  (or OPENAI_API_KEY — OpenAI is primary, Anthropic is fallback)
   STRAVA_CLIENT_ID, STRAVA_CLIENT_SECRET, STRAVA_REFRESH_TOKEN  (for biosystems strava)
-  biosystems CLI installed and on PATH  (pip install -e /path/to/bio-systems-engineering)
+  biosystems importable (pip install -e /path/to/bio-systems-engineering); the
+  data is read through biosystems.api in this process (the CLI on PATH is
+  the fallback for reading it), and history baselines always come from
+  biosystems.analytics.stats_index.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import math
 import os
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from pathlib import Path
-from statistics import mean, stdev
 from typing import Any
 
 # ─── Paths — mirror nightly_synthesis_engine.py exactly ──────────────────────
@@ -45,6 +56,7 @@ from typing import Any
 WORKSPACE   = Path(__file__).parent.parent          # ~/.openclaw/workspace
 OUTPUT_DIR  = WORKSPACE / "memory" / "intelligence"
 SEEN_LEDGER = OUTPUT_DIR / "seen_runs.json"
+LLM_CACHE_DIR = OUTPUT_DIR / ".llm_cache"            # one JSON file per prompt hash
 
 _CONTEXT_FILES = [
     ("USER.md",   "OPERATOR PROFILE"),
@@ -56,6 +68,16 @@ _CONTEXT_FILES = [
 _OPENAI_MODEL    = "gpt-5-mini"
 _ANTHROPIC_MODEL = "claude-sonnet-4-6"
 
+_LLM_CACHE_ENABLED   = True                # --no-llm-cache turns it off
+_LLM_CACHE_TTL_S     = 7 * 24 * 3600       # responses older than a week are refetched
+_LLM_CACHE_MAX_BYTES = 20 * 1024 * 1024    # least recently used entries evicted beyond this
+
+# ─── Concurrency ──────────────────────────────────────────────────────────────
+
+_DEFAULT_WORKERS = 4      # concurrent report fetches / LLM calls
+_FETCH_TIMEOUT_S = 180    # per run report (Strava streams + weather + analysis)
+_LLM_TIMEOUT_S   = 300    # per LLM call, also passed to the provider clients
+
 # ─── Types ────────────────────────────────────────────────────────────────────
 
 RunEntry    = dict[str, Any]
@@ -63,7 +85,23 @@ RunReport   = dict[str, Any]
 HistStats   = dict[str, Any]
 
 
-# ─── biosystems CLI helper ────────────────────────────────────────────────────
+# ─── biosystems API / CLI helpers ─────────────────────────────────────────────
+
+
+def _biosystems_api():
+    """
+    Return the biosystems.api module, or None when biosystems is not importable
+    from this interpreter (callers then fall back to the CLI via _run_cli).
+    """
+    try:
+        from biosystems import api
+    except ImportError:
+        return None
+    # The CLI loads .env on import; the API does not, so read the Strava
+    # credentials here the same way.
+    import dotenv
+    dotenv.load_dotenv()
+    return api
 
 
 def _run_cli(*args: str, timeout: int = 60) -> str | None:
@@ -105,9 +143,16 @@ def _run_cli(*args: str, timeout: int = 60) -> str | None:
 
 def _load_all_history() -> list[dict]:
     """
-    Fetch all history entries via biosystems top (sorted by EF, all distances).
-    Using count=500 captures full history for an athlete with years of data.
+    Fetch every history entry with an EF (runs of 1 km or more).
+    In-process this is the whole history; the CLI fallback is capped at 500 runs.
     """
+    api = _biosystems_api()
+    if api is not None:
+        try:
+            return [e for e in api.history(min_dist=1.0) if e.get("ef") is not None]
+        except Exception as exc:
+            print(f"[api] history: {exc}", file=sys.stderr)
+            return []
     raw = _run_cli("top", "--by", "ef", "--count", "500", "--min-dist", "1.0", "--json", timeout=45)
     if not raw:
         return []
@@ -134,53 +179,41 @@ def _compute_history_stats(entries: list[dict]) -> HistStats:
     if not entries:
         return {}
 
-    efs  = sorted([e["ef"] for e in entries if e.get("ef")])
-    decs = [e["decoupling_pct"] for e in entries if e.get("decoupling_pct") is not None]
-    tss  = [e["hrTSS"] for e in entries if e.get("hrTSS")]
-
-    # 30-day window
     cutoff_30d = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-    recent = [e for e in entries if e.get("date", "") >= cutoff_30d]
-    recent_efs  = [e["ef"]          for e in recent if e.get("ef")]
-    recent_tss  = [e["hrTSS"]       for e in recent if e.get("hrTSS")]
-    recent_decs = [e["decoupling_pct"] for e in recent if e.get("decoupling_pct") is not None]
-
-    def _pct_rank(value: float, sorted_list: list[float]) -> int:
-        """Percentile rank of value in a sorted list (0-100)."""
-        if not sorted_list:
-            return 50
-        below = sum(1 for x in sorted_list if x < value)
-        return round(below / len(sorted_list) * 100)
-
-    ef_mean     = mean(efs)         if efs else None
-    ef_std      = stdev(efs)        if len(efs) > 1 else None
-    ef_best     = max(efs)          if efs else None
-    ef_30d_mean = mean(recent_efs)  if recent_efs else ef_mean
+
+    from biosystems.analytics.stats_index import HistoryStatsIndex
+
+    # Sorted arrays + prefix sums: O(log n) percentile ranks and window means
+    index = HistoryStatsIndex(entries)
+    ef_mean      = index.mean("ef")
+    ef_std       = index.std("ef")
+    ef_best      = index.best("ef")
+    recent_ef    = index.window_mean("ef", since=cutoff_30d)
+    ef_30d_n     = index.window_count("ef", since=cutoff_30d)
+    dec_mean     = index.mean("decoupling_pct")
+    dec_30d_mean = index.window_mean("decoupling_pct", since=cutoff_30d)
+    tss_30d_mean = index.window_mean("hrTSS", since=cutoff_30d)
+
+    ef_30d_mean = recent_ef if recent_ef is not None else ef_mean
 
     return {
         "ef_mean":       round(ef_mean, 5)      if ef_mean     else None,
         "ef_std":        round(ef_std, 5)        if ef_std      else None,
         "ef_best":       round(ef_best, 5)       if ef_best     else None,
         "ef_30d_mean":   round(ef_30d_mean, 5)   if ef_30d_mean else None,
-        "ef_30d_n":      len(recent_efs),
-        "dec_mean":      round(mean(decs), 2)    if decs        else None,
-        "dec_30d_mean":  round(mean(recent_decs), 2) if recent_decs else None,
-        "tss_30d_mean":  round(mean(recent_tss), 1)  if recent_tss  else None,
+        "ef_30d_n":      ef_30d_n,
+        "dec_mean":      round(dec_mean, 2)      if dec_mean is not None else None,
+        "dec_30d_mean":  round(dec_30d_mean, 2)  if dec_30d_mean is not None else None,
+        "tss_30d_mean":  round(tss_30d_mean, 1)  if tss_30d_mean is not None else None,
         "total_runs":    len(entries),
-        # Percentile function (closure over sorted efs)
-        "_efs_sorted":   efs,
+        # Percentile function: EF value → 0-100 rank within history
+        "_ef_rank":      lambda ef: index.percentile_rank("ef", ef),
     }
 
 
 def _ef_percentile(ef: float, stats: HistStats) -> int:
-    return _pct_rank_inner(ef, stats.get("_efs_sorted", []))
-
-
-def _pct_rank_inner(value: float, sorted_list: list[float]) -> int:
-    if not sorted_list:
-        return 50
-    below = sum(1 for x in sorted_list if x < value)
-    return round(below / len(sorted_list) * 100)
+    rank = stats.get("_ef_rank")
+    return rank(ef) if rank else 50
 
 
 # ─── Run card builders (all numeric classification done here, not in LLM) ─────
@@ -302,11 +335,31 @@ def _classify_heat(temp_c: float | None) -> tuple[str, str]:
         return "COOL", f"{temp_c:.1f}°C — optimal conditions; metrics represent true capacity."
 
 
+_WELLNESS_CONTEXTS: dict[str, dict] = {}
+
+
+def _prefetch_wellness_contexts(dates: list[str]) -> None:
+    """
+    Resolve wellness contexts for all brief dates in one batch call so the
+    per-run lookups below are dictionary hits. Silently no-ops on failure.
+    """
+    try:
+        import importlib.util
+        if importlib.util.find_spec("biosystems") is None:
+            return
+        from biosystems.wellness.cache import compute_wellness_context_batch
+        _WELLNESS_CONTEXTS.update(compute_wellness_context_batch(d for d in dates if d))
+    except Exception:
+        pass
+
+
 def _load_wellness_context(date_str: str) -> dict:
     """
     Load full wellness context for a run date from the biosystems wellness cache.
     Returns {} if cache absent or date not found — always degrades gracefully.
     """
+    if date_str in _WELLNESS_CONTEXTS:
+        return _WELLNESS_CONTEXTS[date_str] or {}
     try:
         # biosystems may not be on the path depending on how the brief is invoked
         import sys
@@ -417,6 +470,13 @@ def _format_wellness_block(wellness_ctx: dict) -> str:
     return "\n".join(parts)
 
 
+# Columns the 7-day wellness table shows (sleep columns come from analytics).
+_WINDOW_COLUMNS = (
+    "resting_hr_whoop", "resting_hr_garmin", "body_battery", "avg_stress",
+    "sleep_score", "recovery_score", "hrv_rmssd",
+)
+
+
 def _build_wellness_section(date_str: str) -> str:
     """
     Build a printed ## Wellness Readiness section for the brief.
@@ -429,7 +489,7 @@ def _build_wellness_section(date_str: str) -> str:
         if importlib.util.find_spec("biosystems") is None:
             return ""
         from biosystems.wellness.cache import compute_wellness_context, get_wellness_window
-        from biosystems.wellness.analytics import calibrate_thresholds
+        from biosystems.wellness.analytics import SLEEP_COLUMNS, calibrate_thresholds
         from biosystems.wellness.cache import load_wellness_df
     except Exception:
         return ""
@@ -463,7 +523,7 @@ def _build_wellness_section(date_str: str) -> str:
         lines.append(f"\n⚠ Data is {stale_d}d old — sync when API key is available.")
 
     # 7-day trend table
-    window = get_wellness_window(date_str, days=8)
+    window = get_wellness_window(date_str, days=8, columns=_WINDOW_COLUMNS + SLEEP_COLUMNS)
     if not window.empty:
         import pandas as pd
         end_ts = pd.Timestamp(date_str).normalize()
@@ -485,7 +545,7 @@ def _build_wellness_section(date_str: str) -> str:
         has_stress   = "avg_stress"       in rows.columns and rows["avg_stress"].notna().any()
         has_sleep_h  = any(
             c in rows.columns and rows[c].notna().any()
-            for c in ["sleep_duration_s", "sleep_duration_s_garmin"]
+            for c in SLEEP_COLUMNS
         )
 
         cols = ["Date", "RHR"]
@@ -1027,19 +1087,35 @@ def _save_seen_runs(existing: set[str], new_ids: list[str]) -> None:
 
 
 def collect_recent_runs(days: int = 7) -> list[RunEntry]:
-    raw = _run_cli("strava", "--list", "--json", "--count", "30", timeout=90)
-    if not raw:
-        return []
-    try:
-        all_runs: list[RunEntry] = json.loads(raw)
-    except json.JSONDecodeError as exc:
-        print(f"[collect] JSON parse error: {exc}", file=sys.stderr)
-        return []
+    all_runs: list[RunEntry]
+    api = _biosystems_api()
+    if api is not None:
+        try:
+            all_runs = api.list_runs(30)
+        except Exception as exc:
+            print(f"[collect] {exc}", file=sys.stderr)
+            return []
+    else:
+        raw = _run_cli("strava", "--list", "--json", "--count", "30", timeout=90)
+        if not raw:
+            return []
+        try:
+            all_runs = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            print(f"[collect] JSON parse error: {exc}", file=sys.stderr)
+            return []
     cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     return [r for r in all_runs if r.get("date", "") >= cutoff]
 
 
 def fetch_run_report(strava_id: int | str) -> RunReport | None:
+    api = _biosystems_api()
+    if api is not None:
+        try:
+            return api.run_report(int(strava_id))
+        except Exception as exc:
+            print(f"[fetch:{strava_id}] {exc}", file=sys.stderr)
+            return None
     raw = _run_cli("strava", str(strava_id), "--json", timeout=120)
     if not raw:
         return None
@@ -1053,13 +1129,86 @@ def fetch_run_report(strava_id: int | str) -> RunReport | None:
 # ─── LLM provider — OpenAI primary, Anthropic fallback ───────────────────────
 
 _TOKEN_LOG: list[dict] = []
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+def _llm_cache_key(provider: str, model: str, system: str, messages: list[dict]) -> str:
+    payload = json.dumps(
+        {"provider": provider, "model": model, "system": system, "messages": messages},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _llm_cache_get(key: str, label: str) -> str | None:
+    """
+    Return the cached response for a prompt hash, or None (disabled, missing,
+    expired or unreadable). A hit is logged to _TOKEN_LOG at zero cost, with
+    the tokens and cost it saved.
+    """
+    if not _LLM_CACHE_ENABLED:
+        return None
+    path = LLM_CACHE_DIR / f"{key}.json"
+    try:
+        entry = json.loads(path.read_text())
+        if time.time() - entry["created"] > _LLM_CACHE_TTL_S:
+            return None
+        os.utime(path)  # mtime = last use, for LRU eviction
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    usage = entry.get("usage") or {}
+    _TOKEN_LOG.append({
+        "label":  label,
+        "model":  entry.get("model", "?"),
+        "input":  0,
+        "output": 0,
+        "total":  0,
+        "cost":   0.0,
+        "cached": True,
+        "saved_tokens": usage.get("total", 0),
+        "saved_cost":   usage.get("cost", 0.0),
+    })
+    return entry["response"]
+
+
+def _llm_cache_put(key: str, response: str, usage: dict) -> None:
+    """Store a response atomically, then evict least recently used entries over the size bound."""
+    if not _LLM_CACHE_ENABLED:
+        return
+    try:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = LLM_CACHE_DIR / f"{key}.json"
+        tmp  = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({
+            "model":    usage.get("model"),
+            "created":  time.time(),
+            "usage":    {k: usage[k] for k in ("input", "output", "total", "cost")},
+            "response": response,
+        }))
+        os.replace(tmp, path)
+        with _LLM_CACHE_LOCK:
+            files = []
+            for f in LLM_CACHE_DIR.glob("*.json"):
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue  # evicted by a concurrent brief
+                files.append((st.st_mtime, st.st_size, f))
+            total = sum(size for _, size, _ in files)
+            for _, size, f in sorted(files):
+                if total <= _LLM_CACHE_MAX_BYTES:
+                    break
+                f.unlink(missing_ok=True)
+                total -= size
+    except OSError as exc:
+        print(f"[llm-cache] write failed: {exc}", file=sys.stderr)
 
 
 def _chat(messages: list[dict], system: str, label: str = "call") -> str:
     """
     Send the provided chat messages to an LLM provider, preferring OpenRouter, then OpenAI, then Anthropic, and return the model's textual response.
     
-    The function attempts providers in that order and falls through to the next on failure. When using OpenRouter or OpenAI it injects the given `system` prompt as a system message, may force `temperature=0` for non-reasoning models, and records input/output token counts and an estimated cost to the module-level `_TOKEN_LOG`. For Anthropic it calls the provider with the provided system and messages and likewise logs token usage and estimated cost.
+    The function attempts providers in that order and falls through to the next on failure. Responses are cached on disk under LLM_CACHE_DIR, keyed by a hash of (provider, model, system, messages): an identical prompt within _LLM_CACHE_TTL_S returns the stored text without a provider call (disable with --no-llm-cache). When using OpenRouter or OpenAI it injects the given `system` prompt as a system message, may force `temperature=0` for non-reasoning models, and records input/output token counts and an estimated cost to the module-level `_TOKEN_LOG`. For Anthropic it calls the provider with the provided system and messages and likewise logs token usage and estimated cost.
     
     Parameters:
         messages (list[dict]): Chat message list (each item is a mapping with at least `role` and `content`) to send to the model.
@@ -1077,11 +1226,16 @@ def _chat(messages: list[dict], system: str, label: str = "call") -> str:
     anthropic_key  = os.environ.get("ANTHROPIC_API_KEY")
 
     if openrouter_key:
+        key = _llm_cache_key("openrouter", _OPENAI_MODEL, system, messages)
+        cached = _llm_cache_get(key, label)
+        if cached is not None:
+            return cached
         try:
             from openai import OpenAI
             client = OpenAI(
                 api_key=openrouter_key,
                 base_url="https://openrouter.ai/api/v1",
+                timeout=_LLM_TIMEOUT_S,
             )
             _REASONING_PREFIXES = ("o1", "o3", "o4", "gpt-5")
             is_reasoning = any(_OPENAI_MODEL.startswith(p) for p in _REASONING_PREFIXES)
@@ -1093,15 +1247,18 @@ def _chat(messages: list[dict], system: str, label: str = "call") -> str:
                 kwargs["temperature"] = 0
             resp = client.chat.completions.create(**kwargs)
             u = resp.usage
-            _TOKEN_LOG.append({
+            usage = {
                 "label":  label,
                 "model":  _OPENAI_MODEL,
                 "input":  u.prompt_tokens,
                 "output": u.completion_tokens,
                 "total":  u.total_tokens,
                 "cost":   round(u.prompt_tokens * 0.00000015 + u.completion_tokens * 0.00000060, 6),
-            })
-            return resp.choices[0].message.content or ""
+            }
+            _TOKEN_LOG.append(usage)
+            text = resp.choices[0].message.content or ""
+            _llm_cache_put(key, text, usage)
+            return text
         except Exception:
             pass  # fall through to next provider
 
@@ -1111,8 +1268,12 @@ def _chat(messages: list[dict], system: str, label: str = "call") -> str:
         except ImportError:
             openai_key = None
     if openai_key:
+        key = _llm_cache_key("openai", _OPENAI_MODEL, system, messages)
+        cached = _llm_cache_get(key, label)
+        if cached is not None:
+            return cached
         from openai import OpenAI
-        client = OpenAI(api_key=openai_key)
+        client = OpenAI(api_key=openai_key, timeout=_LLM_TIMEOUT_S)
         _REASONING_PREFIXES = ("o1", "o3", "o4", "gpt-5")
         is_reasoning = any(_OPENAI_MODEL.startswith(p) for p in _REASONING_PREFIXES)
         kwargs: dict = dict(
@@ -1124,19 +1285,26 @@ def _chat(messages: list[dict], system: str, label: str = "call") -> str:
         resp = client.chat.completions.create(**kwargs)
         u = resp.usage
         # gpt-5-mini pricing: $0.30/1M input, $1.20/1M output (mirrors SIF engine)
-        _TOKEN_LOG.append({
+        usage = {
             "label":  label,
             "model":  _OPENAI_MODEL,
             "input":  u.prompt_tokens,
             "output": u.completion_tokens,
             "total":  u.total_tokens,
             "cost":   round(u.prompt_tokens * 0.00000030 + u.completion_tokens * 0.00000120, 6),
-        })
-        return resp.choices[0].message.content or ""
+        }
+        _TOKEN_LOG.append(usage)
+        text = resp.choices[0].message.content or ""
+        _llm_cache_put(key, text, usage)
+        return text
 
     if anthropic_key:
+        key = _llm_cache_key("anthropic", _ANTHROPIC_MODEL, system, messages)
+        cached = _llm_cache_get(key, label)
+        if cached is not None:
+            return cached
         from anthropic import Anthropic
-        client = Anthropic(api_key=anthropic_key)
+        client = Anthropic(api_key=anthropic_key, timeout=_LLM_TIMEOUT_S)
         resp = client.messages.create(
             model=_ANTHROPIC_MODEL,
             max_tokens=4096,
@@ -1144,15 +1312,18 @@ def _chat(messages: list[dict], system: str, label: str = "call") -> str:
             messages=messages,
         )
         u = resp.usage
-        _TOKEN_LOG.append({
+        usage = {
             "label":  label,
             "model":  _ANTHROPIC_MODEL,
             "input":  u.input_tokens,
             "output": u.output_tokens,
             "total":  u.input_tokens + u.output_tokens,
             "cost":   round(u.input_tokens * 0.000003 + u.output_tokens * 0.000015, 6),
-        })
-        return resp.content[0].text
+        }
+        _TOKEN_LOG.append(usage)
+        text = resp.content[0].text
+        _llm_cache_put(key, text, usage)
+        return text
 
     raise RuntimeError(
         "No API key found. Set OPENAI_API_KEY (preferred, cheaper) or ANTHROPIC_API_KEY."
@@ -1449,6 +1620,15 @@ def analyze_run(
         label=f"analyze-{str(entry.get('id', ''))[:12]}",
     )
 
+    return {
+        **_run_metrics(entry, report),
+        "analysis":    analysis,
+        "run_card":    run_card,
+    }
+
+
+def _run_metrics(entry: RunEntry, report: RunReport) -> dict:
+    """Headline numbers for one run — all the preamble needs, available before its analysis."""
     run_only = report.get("run_only") or {}
     return {
         "id":          entry.get("id", ""),
@@ -1461,8 +1641,6 @@ def analyze_run(
         "hr_tss":      run_only.get("hr_tss"),
         "avg_hr":      run_only.get("avg_hr"),
         "duration_min": run_only.get("duration_min"),
-        "analysis":    analysis,
-        "run_card":    run_card,
     }
 
 
@@ -1631,9 +1809,12 @@ def generate_fitness_preamble(
         try:
             import importlib.util as _ilu2
             if _ilu2.find_spec("biosystems") is not None:
-                from biosystems.wellness.analytics import compute_longitudinal_fitness
+                from biosystems.wellness.analytics import (
+                    FITNESS_COLUMNS,
+                    compute_longitudinal_fitness,
+                )
                 from biosystems.wellness.cache import load_wellness_df as _lwdf
-                _ft = compute_longitudinal_fitness(_lwdf())
+                _ft = compute_longitudinal_fitness(_lwdf(columns=FITNESS_COLUMNS))
                 _era = _ft.get("era_summary", "")
                 if _era and "Insufficient" not in _era:
                     fitness_arc_line = f"  Fitness arc (longitudinal): {_era}\n"
@@ -1800,12 +1981,98 @@ def _print_token_report() -> None:
     print(f"  {'Call':<35} {'Input':>7} {'Output':>7} {'Total':>7}  {'Cost':>9}")
     print(f"  {'-'*35} {'-'*7} {'-'*7} {'-'*7}  {'-'*9}")
     for e in _TOKEN_LOG:
+        label = f"{e['label']} (cached)" if e.get("cached") else e["label"]
         print(
-            f"  {e['label']:<35} {e['input']:>7,} {e['output']:>7,} "
+            f"  {label:<35} {e['input']:>7,} {e['output']:>7,} "
             f"{e['total']:>7,}  ${e['cost']:>8.6f}"
         )
     print(f"  {'─'*35} {'─'*7} {'─'*7} {'─'*7}  {'─'*9}")
     print(f"  {'TOTAL':<35} {total_in:>7,} {total_out:>7,} {total_tok:>7,}  ${total_usd:>8.6f}")
+    hits = [e for e in _TOKEN_LOG if e.get("cached")]
+    if _LLM_CACHE_ENABLED:
+        print(
+            f"  LLM cache: {len(hits)}/{len(_TOKEN_LOG)} hits ({len(hits) / len(_TOKEN_LOG):.0%})"
+            f" · saved {sum(e['saved_tokens'] for e in hits):,} tokens"
+            f" / ${sum(e['saved_cost'] for e in hits):.6f}"
+        )
+    else:
+        print("  LLM cache: disabled (--no-llm-cache)")
+
+
+# ─── Bounded task pool ────────────────────────────────────────────────────────
+
+
+class _Task:
+    """Handle for one pool task; ``result()`` enforces its timeout."""
+
+    def __init__(self, label: str, timeout: float) -> None:
+        self.label      = label
+        self.timeout    = timeout
+        self.started_at = 0.0     # time.monotonic() when a worker picked the task up
+        self._started   = threading.Event()
+        self._future: Future | None = None
+
+    def _run(self, fn, args: tuple) -> Any:
+        self.started_at = time.monotonic()
+        self._started.set()
+        return fn(*args)
+
+    def result(self) -> Any:
+        """
+        Return the task's result, or None if it failed or ran past its timeout.
+        The timeout counts from when the task starts; waiting for a free worker
+        may take at most one more timeout before the task is given up on.
+        """
+        if not self._started.wait(self.timeout):
+            self._future.cancel()
+            print(f"[pool] {self.label}: not started after {self.timeout:.0f}s", file=sys.stderr)
+            return None
+        remaining = self.started_at + self.timeout - time.monotonic()
+        try:
+            return self._future.result(timeout=max(remaining, 0.0))
+        except FutureTimeoutError:
+            # The thread cannot be interrupted; its result is simply never used.
+            print(f"[pool] {self.label}: timed out after {self.timeout:.0f}s", file=sys.stderr)
+        except Exception as exc:
+            print(f"[pool] {self.label}: {exc}", file=sys.stderr)
+        return None
+
+
+class _BoundedPool:
+    """Thread pool with at most ``workers`` tasks in flight and a timeout per task."""
+
+    def __init__(self, workers: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="brief")
+
+    def submit(self, label: str, timeout: float, fn, *args) -> _Task:
+        task = _Task(label, timeout)
+        task._future = self._executor.submit(task._run, fn, args)
+        return task
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fetch_and_analyze(
+    pool: _BoundedPool,
+    entry: RunEntry,
+    stats: HistStats,
+    operator_context: str,
+) -> tuple[RunReport, _Task] | None:
+    """
+    Pool task: fetch one run report and build its card, then queue the LLM
+    analysis on the same pool. Returns (report, analysis task), None if the
+    fetch failed.
+    """
+    report = fetch_run_report(entry.get("id", ""))
+    if report is None:
+        return None
+    run_card = _build_run_card(entry, report, stats)
+    analysis = pool.submit(
+        f"analyze {entry.get('id', '')}", _LLM_TIMEOUT_S,
+        analyze_run, entry, report, run_card, operator_context,
+    )
+    return report, analysis
 
 
 # ─── Main ─────────────────────────────────────────────────────────────────────
@@ -1817,11 +2084,11 @@ def main() -> None:
     
     Performs the following high-level actions:
     - Validates that an API key for OpenRouter (preferred), OpenAI, or Anthropic is present and exits the process with an error message if none are found.
-    - Parses command-line arguments: --days (lookback window), --force (re-analyze already-briefed runs), and --dry-run (collect without calling LLMs).
+    - Parses command-line arguments: --days (lookback window), --force (re-analyze already-briefed runs), --dry-run (collect without calling LLMs), --workers (concurrency) and --no-llm-cache (bypass the response cache).
     - Loads historical stats and PMC/trend data to build operator context.
     - Collects recent runs and filters out runs already recorded in the seen-runs ledger (unless --force).
-    - For each new run: fetches a detailed report, builds a numeric run card, and requests an LLM analysis.
-    - Generates a fitness preamble and a weekly synthesis (when enough runs exist).
+    - For each new run, on a bounded thread pool: fetches a detailed report, builds a numeric run card, and requests an LLM analysis.
+    - Generates a fitness preamble (started once all reports are in, alongside the analyses) and a weekly synthesis (when enough runs exist).
     - Assembles the final Markdown brief and writes it to OUTPUT_DIR with a YYYY-MM-DD filename.
     - Updates the seen-runs ledger and prints a token-usage report.
     
@@ -1845,8 +2112,19 @@ def main() -> None:
     parser.add_argument("--days",  type=int, default=7, help="Look back N days (default: 7)")
     parser.add_argument("--force", action="store_true", help="Re-analyze already-briefed runs")
     parser.add_argument("--dry-run", action="store_true", help="Collect runs without calling Claude")
+    parser.add_argument(
+        "--workers", type=int, default=_DEFAULT_WORKERS,
+        help=f"Concurrent report fetches / LLM calls (default: {_DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--no-llm-cache", action="store_true",
+        help="Always call the LLM provider; neither read nor write the response cache",
+    )
     args = parser.parse_args()
 
+    global _LLM_CACHE_ENABLED
+    _LLM_CACHE_ENABLED = not args.no_llm_cache
+
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     today       = datetime.now().strftime("%Y-%m-%d")
     output_path = OUTPUT_DIR / f"{today}_running_brief.md"
@@ -1863,14 +2141,23 @@ def main() -> None:
     print("  → Loading PMC / trend data...", end=" ", flush=True)
     trend_summary: dict = {}
     rolling: list[dict] = []
-    raw = _run_cli("trend", "--json", "--no-pmc", timeout=45)
-    if raw:
+    api = _biosystems_api()
+    if api is not None:
         try:
-            td = json.loads(raw)
-            trend_summary = td.get("summary", {})
-            rolling       = td.get("rolling", [])
-        except json.JSONDecodeError:
-            pass
+            td = api.trend(pmc=False)
+            trend_summary = td["summary"]
+            rolling       = td["rolling"]
+        except Exception as exc:
+            print(f"[api] trend: {exc}", file=sys.stderr, end=" ")
+    else:
+        raw = _run_cli("trend", "--json", "--no-pmc", timeout=45)
+        if raw:
+            try:
+                td = json.loads(raw)
+                trend_summary = td.get("summary", {})
+                rolling       = td.get("rolling", [])
+            except json.JSONDecodeError:
+                pass
     print(f"CTL={trend_summary.get('ctl', '?')} ATL={trend_summary.get('atl', '?')} TSB={trend_summary.get('tsb', '?')}")
 
     # ── Build operator context (compact bullets, not JSON dumps) ──────────────
@@ -1909,40 +2196,58 @@ def main() -> None:
             print(f"  {r['date']}  {r['name']:<35}  {r['distance_km']}km  id={r['id']}")
         return
 
-    # ── Fetch reports, build run cards, analyze ───────────────────────────────
-    analyzed: list[dict] = []
-    for entry in new_runs:
-        run_id   = entry.get("id", "")
-        run_date = entry.get("date", "?")
-        run_name = entry.get("name", "?")
-        run_km   = entry.get("distance_km", 0)
-
-        print(f"  → {run_date} '{run_name}' ({run_km}km)...", end=" ", flush=True)
-        report = fetch_run_report(run_id)
-        if report is None:
-            print("fetch failed — skipping")
-            continue
-
-        run_card = _build_run_card(entry, report, stats)
-        result   = analyze_run(entry, report, run_card, operator_context)
-        analyzed.append(result)
-        print("done")
-
-    if not analyzed:
-        print("[running-brief] All fetches failed. Check Strava credentials.")
-        return
-
-    # ── Fitness preamble (one Claude call, plain English) ─────────────────────
-    print("  → Generating fitness preamble...", end=" ", flush=True)
-    fitness_preamble = generate_fitness_preamble(trend_summary, stats, analyzed, operator_context, rolling)
-    print("done")
-
-    # ── Synthesize (≥2 runs) ──────────────────────────────────────────────────
-    synthesis = ""
-    if len(analyzed) >= 2:
-        print(f"  → Synthesizing {len(analyzed)}-run pattern...", end=" ", flush=True)
-        synthesis = synthesize_brief(analyzed, operator_context, today)
-        print("done")
+    # ── Fetch reports, build run cards, analyze (bounded pool) ───────────────
+    _prefetch_wellness_contexts([r.get("date", "") for r in new_runs] + [today])
+    started_at = time.monotonic()
+    pool = _BoundedPool(args.workers)
+    try:
+        print(f"  → Fetching {len(new_runs)} run reports ({args.workers} workers)...")
+        fetches = [
+            pool.submit(f"fetch {r.get('id', '')}", _FETCH_TIMEOUT_S, _fetch_and_analyze, pool, r, stats, operator_context)
+            for r in new_runs
+        ]
+        fetched: list[tuple[RunEntry, RunReport, _Task]] = []
+        for entry, task in zip(new_runs, fetches):
+            label = f"{entry.get('date', '?')} '{entry.get('name', '?')}' ({entry.get('distance_km', 0)}km)"
+            result = task.result()
+            if result is None:
+                print(f"    {label}: fetch failed — skipping")
+                continue
+            fetched.append((entry, *result))
+            print(f"    {label}: report ready")
+
+        if not fetched:
+            print("[running-brief] All fetches failed. Check Strava credentials.")
+            return
+
+        # ── Fitness preamble (one Claude call, plain English) ─────────────────
+        # Needs only the report metrics, so it runs alongside the per-run analyses.
+        print("  → Generating fitness preamble and run analyses...", end=" ", flush=True)
+        preamble_task = pool.submit(
+            "preamble", _LLM_TIMEOUT_S, generate_fitness_preamble,
+            trend_summary, stats, [_run_metrics(e, rep) for e, rep, _ in fetched], operator_context, rolling,
+        )
+        analyzed: list[dict] = []
+        for entry, _report, analysis_task in fetched:
+            result = analysis_task.result()
+            if result is not None:
+                analyzed.append(result)
+        fitness_preamble = preamble_task.result() or ""
+        print(f"{len(analyzed)}/{len(fetched)} analyzed")
+
+        if not analyzed:
+            print("[running-brief] All analyses failed. Check LLM provider.")
+            return
+
+        # ── Synthesize (≥2 runs) ──────────────────────────────────────────────
+        synthesis = ""
+        if len(analyzed) >= 2:
+            print(f"  → Synthesizing {len(analyzed)}-run pattern...", end=" ", flush=True)
+            synthesis = synthesize_brief(analyzed, operator_context, today)
+            print("done")
+    finally:
+        pool.shutdown()
+    print(f"  → Runs analyzed in {time.monotonic() - started_at:.1f}s")
 
     # ── Assemble + write ──────────────────────────────────────────────────────
     brief = assemble_brief(
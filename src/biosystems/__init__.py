@@ -32,6 +32,14 @@ __version__ = "1.0.0"
 __author__ = "Holistic Performance Enhancement Contributors"
 __license__ = "MIT"
 
-from biosystems import models
+from typing import TYPE_CHECKING
+
+from biosystems._lazy import lazy_exports
+
+# Submodules load on first access, so `import biosystems.<pkg>` stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, {"models": ".models"})
+
+if TYPE_CHECKING:
+    from biosystems import models
 
 __all__ = ["models", "__version__"]
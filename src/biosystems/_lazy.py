@@ -0,0 +1,49 @@
+"""
+Lazy package exports.
+
+Package ``__init__`` modules re-export their submodules' public names, but
+importing those submodules eagerly drags pandas, numpy and the pydantic
+models into every ``import biosystems...`` — including each short-lived
+CLI call. ``lazy_exports`` builds a module-level ``__getattr__`` / ``__dir__``
+pair (PEP 562) that imports the defining submodule on first attribute
+access instead.
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    package: str,
+    exports: dict[str, str],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Return ``(__getattr__, __dir__)`` for ``package``.
+
+    Parameters
+    ----------
+    package : str
+        The package's ``__name__``.
+    exports : dict[str, str]
+        Public name → relative submodule defining it (e.g.
+        ``{"parse_gpx": ".gpx"}``). A name that equals its submodule
+        (``{"models": ".models"}``) resolves to the submodule itself.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def _getattr(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(submodule, package)
+        value = module if submodule.lstrip(".") == name else getattr(module, name)
+        namespace[name] = value  # later lookups bypass __getattr__
+        return value
+
+    def _dir() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return _getattr, _dir
@@ -0,0 +1,323 @@
+"""
+Run Pipeline Helpers
+====================
+
+The steps shared by every command and API call that turns a Strava
+activity into a run report and a history entry: locating and loading the
+zone config, flagging walk samples, joining weather onto the samples,
+prefetching weather and wellness for a batch of runs, building the
+history entry from a finished report, and the whole per-activity step of
+``sync`` and ``backfill-streams`` (``process_strava_run``).
+
+Used by ``biosystems.cli`` and ``biosystems.api``; not a public API. Like
+the CLI fast paths, importing this module costs nothing beyond the standard
+library — pandas, pydantic and the weather and wellness modules are
+imported by the functions that need them.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from biosystems.environment.weather import WeatherCache
+    from biosystems.models import FullRunReport, RunContext, ZoneConfig
+
+# _PKG_ROOT is the editable-install repo root, used only as a last-resort
+# fallback for zones_path when neither BIOSYSTEMS_ZONES_PATH nor the
+# XDG config path exists. Under a regular pip install this resolves to
+# site-packages/../../.. (not useful), so default_zones_path() always
+# tries env var and XDG first.
+_PKG_ROOT = Path(__file__).resolve().parents[2]
+
+
+def default_zones_path() -> Path:
+    """
+    Determine which zones YAML file to use based on configured priorities.
+
+    Searches in this order and returns the first path found:
+    1. Path specified by the `BIOSYSTEMS_ZONES_PATH` environment variable.
+    2. User config at `~/.config/biosystems/zones.yml` if that file exists.
+    3. Fallback to the repository-installed file at `<repo-root>/data/zones_personal.yml`.
+
+    Returns:
+        Path: Filesystem path to the selected zones YAML file.
+    """
+    env_override = os.environ.get("BIOSYSTEMS_ZONES_PATH")
+    if env_override:
+        return Path(env_override)
+
+    xdg_path = Path.home() / ".config" / "biosystems" / "zones.yml"
+    if xdg_path.exists():
+        return xdg_path
+
+    return _PKG_ROOT / "data" / "zones_personal.yml"
+
+
+# resolved path → ((st_mtime_ns, st_size), config); keeps `biosystems serve` from re-parsing per request
+_zone_config_cache: dict[str, tuple[tuple[int, int], ZoneConfig]] = {}
+
+
+def load_zone_config(yaml_path: Path) -> ZoneConfig:
+    """Load zones from YAML and return a validated ZoneConfig (cached until the file changes)."""
+    if not yaml_path.exists():
+        raise FileNotFoundError(f"Zone configuration not found at {yaml_path}")
+    st = yaml_path.stat()
+    key = str(yaml_path.resolve())
+    cached = _zone_config_cache.get(key)
+    if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+        return cached[1]
+    config = _parse_zone_config(yaml_path)
+    _zone_config_cache[key] = ((st.st_mtime_ns, st.st_size), config)
+    return config
+
+
+def _parse_zone_config(yaml_path: Path) -> ZoneConfig:
+    import yaml
+
+    from biosystems.models import HeartRateZone, ZoneConfig
+
+    with yaml_path.open() as f:
+        raw = yaml.safe_load(f)
+
+    # Clean up metadata
+    raw.pop("model", None)
+
+    zones: dict[str, HeartRateZone] = {}
+    for name, data in raw.items():
+        if not isinstance(data, dict) or "bpm" not in data or "pace_min_per_km" not in data:
+            continue
+
+        zones[name] = HeartRateZone(
+            name=name,
+            bpm=tuple(data["bpm"]),
+            pace_min_per_km=tuple(data["pace_min_per_km"]),
+        )
+
+    # Use defaults for physiological markers if not in YAML
+    return ZoneConfig(
+        resting_hr=raw.get("resting_hr", 50),
+        threshold_hr=raw.get("threshold_hr", 186),
+        max_hr=raw.get("max_hr", 201),
+        zones=zones
+    )
+
+
+def flag_walks(df):
+    """Add ``pace_min_per_km`` and ``is_walk`` columns (pace OR cadence below running threshold)."""
+    df["pace_min_per_km"] = df["pace_sec_km"] / 60
+    df["is_walk"] = (df["pace_min_per_km"] > 9.5) | (df["cadence"].fillna(999) < 140)
+    if "moving" in df.columns:
+        df["is_walk"] = df["is_walk"] | (~df["moving"].fillna(True).astype(bool))
+    return df
+
+
+def history_entry_from_report(
+    report,
+    run_date: str,
+    activity_name: str | None,
+    activity_id: int | None,
+    activity_meta: dict,
+) -> tuple[dict, dict[str, int] | None]:
+    """
+    Build the ``biosystems_strava`` history entry and best-effort map for a run report.
+
+    Returns:
+        tuple[dict, dict[str, int] | None]: (history_entry, strava_efforts) ready
+            to pass to ``append_run``.
+    """
+    m = report.run_only
+    history_entry: dict = {"date": run_date}
+    if activity_id is not None:
+        history_entry["strava_activity_id"] = activity_id
+    history_entry.update({
+        "hrTSS": round(m.hr_tss, 1),
+        "distance_km": round(m.distance_km, 2),
+        "avg_hr": round(m.avg_hr, 1),
+        "avg_pace_min_per_km": round(m.avg_pace_min_per_km, 2),
+        "ef": round(m.efficiency_factor, 5),
+        "ef_gap": report.ef_grade_adjusted,
+        "decoupling_pct": round(m.decoupling_pct, 2),
+        "avg_cadence": round(m.avg_cadence, 1) if m.avg_cadence else None,
+        "activity_name": activity_name,
+        "source": "biosystems_strava",
+    })
+    if report.weather_profile is not None and report.weather_profile.temp_mean_c is not None:
+        history_entry["temp_c"] = report.weather_profile.temp_mean_c
+    strava_efforts_store: dict[str, int] = {
+        e["name"]: e["elapsed_time_s"]
+        for e in activity_meta.get("best_efforts", [])
+        if e.get("name") and e.get("elapsed_time_s")
+    }
+    return history_entry, strava_efforts_store or None
+
+
+def weather_context(weather: dict | None) -> RunContext | None:
+    """Build a RunContext from a single-hour Open-Meteo payload (None if unusable)."""
+    from biosystems.environment.weather import WMO_WEATHER_CODES
+    from biosystems.models import RunContext
+
+    if not weather or "hourly" not in weather:
+        return None
+    hourly = weather["hourly"]
+    code = hourly["weathercode"][0] if hourly.get("weathercode") else None
+    return RunContext(
+        temperature_c=hourly["temperature_2m"][0] if hourly.get("temperature_2m") else None,
+        weather_code=code,
+        weather_description=WMO_WEATHER_CODES.get(int(code), "Unknown") if code is not None else None,
+    )
+
+
+def attach_sample_weather(df, context: RunContext | None, cache, fetch: bool = True) -> RunContext | None:
+    """
+    Join hourly weather onto the activity samples and refine the run context.
+
+    Adds ``temp_c``, ``wind_kmh``, ``gust_kmh``, ``wind_dir_deg``,
+    ``precip_mm_h`` and ``weather_code`` columns to ``df`` in place, and
+    replaces the context's single start-hour temperature with the
+    time-weighted run mean. Returns ``context`` unchanged if no weather is
+    available.
+    """
+    from biosystems.environment.weather import (
+        WMO_WEATHER_CODES,
+        summarize_sample_weather,
+        weather_for_samples,
+    )
+    from biosystems.models import RunContext
+
+    try:
+        aligned = weather_for_samples(df, cache, fetch=fetch)
+    except Exception:
+        return context
+    if aligned is None:
+        return context
+    for col in aligned.columns:
+        df[col] = aligned[col].to_numpy()
+    summary = summarize_sample_weather(df)
+    if not summary:
+        return context
+    code = summary["weather_code"]
+    update = {
+        "temperature_c": summary["temp_mean_c"],
+        "weather_code": code,
+        "weather_description": WMO_WEATHER_CODES.get(code, "Unknown") if code is not None else None,
+    }
+    return context.model_copy(update=update) if context is not None else RunContext(**update)
+
+
+def prefetch_weather_contexts(summaries: list[dict], cache=None) -> dict[int, RunContext]:
+    """
+    Batch-fetch weather for Strava run summaries and return a RunContext per activity ID.
+
+    Uses each summary's ``start_latlng`` / ``start_date``; runs are grouped by
+    rounded start location so a backfill costs one Open-Meteo request per
+    location and date span, and results land in the shared weather cache
+    (``cache`` if given, else the default on-disk cache).
+    """
+    from datetime import datetime
+
+    from biosystems.environment.weather import WeatherCache, fetch_weather_batch, weather_cache_path
+
+    points = []
+    ids = []
+    for s in summaries:
+        latlng = s.get("start_latlng")
+        start = s.get("start_date")
+        if not start or not latlng or len(latlng) != 2:
+            continue
+        points.append((float(latlng[0]), float(latlng[1]), datetime.fromisoformat(start.replace("Z", "+00:00"))))
+        ids.append(int(s["id"]))
+    if not points:
+        return {}
+
+    if cache is not None:
+        results = fetch_weather_batch(points, cache=cache)
+    else:
+        with WeatherCache(weather_cache_path(), precision=2) as local:
+            results = fetch_weather_batch(points, cache=local)
+
+    contexts: dict[int, RunContext] = {}
+    for activity_id, weather in zip(ids, results):
+        ctx = weather_context(weather)
+        if ctx is not None:
+            contexts[activity_id] = ctx
+    return contexts
+
+
+def prefetch_wellness(summaries: list[dict]) -> dict[str, dict]:
+    """
+    Resolve wellness for every run date in *summaries* with one cache lookup.
+
+    Returns ``{date_str: wellness}`` for ``enrich_run_context(..., wellness=)``;
+    {} if the wellness cache is unavailable (runs then go unenriched).
+    """
+    dates = [s.get("start_date_local", "")[:10] for s in summaries]
+    try:
+        from biosystems.wellness.cache import get_wellness_for_dates
+        return get_wellness_for_dates(d for d in dates if d)
+    except Exception:
+        return {}
+
+
+class ReportError(Exception):
+    """``build_run_report`` rejected an activity's data; fetching it again will not help."""
+
+
+def process_strava_run(
+    summary: dict,
+    access_token: str,
+    zone_config: ZoneConfig,
+    weather_contexts: dict[int, RunContext],
+    weather_cache: WeatherCache | None,
+    wellness: dict[str, dict],
+) -> tuple[FullRunReport, dict, dict[str, int] | None]:
+    """
+    Fetch one listed Strava run and build its report and history entry.
+
+    The per-activity step of ``sync`` and ``backfill-streams``: fetch the
+    streams, flag walks, join weather from ``weather_cache`` onto the samples
+    (starting from the run's prefetched ``weather_contexts`` entry), add the
+    run date's prefetched ``wellness`` and build the report.
+
+    Returns:
+        tuple: (report, history_entry, strava_efforts) — the last two as
+            from ``history_entry_from_report``.
+
+    Raises:
+        ReportError: The report could not be built from the fetched streams.
+        Exception: Whatever fetching the streams raised (network / API errors).
+    """
+    from biosystems.ingestion.strava import fetch_activity_streams
+    from biosystems.physics.report import build_run_report
+
+    activity_id = int(summary["id"])
+    run_date = summary.get("start_date_local", "")[:10]
+    activity_name = summary.get("name", "")
+
+    df, activity_meta = fetch_activity_streams(activity_id, access_token=access_token)
+    flag_walks(df)
+
+    context = weather_contexts.get(activity_id)
+    if weather_cache is not None:
+        context = attach_sample_weather(df, context, weather_cache)
+    if run_date in wellness:
+        from biosystems.wellness.cache import enrich_run_context
+        context = enrich_run_context(run_date, context, wellness=wellness[run_date])
+
+    try:
+        report = build_run_report(
+            df,
+            zone_config,
+            context=context,
+            activity_name=activity_name,
+            activity_meta=activity_meta,
+        )
+    except Exception as e:
+        raise ReportError(str(e)) from e
+
+    history_entry, strava_efforts = history_entry_from_report(
+        report, run_date, activity_name, activity_id, activity_meta
+    )
+    return report, history_entry, strava_efforts
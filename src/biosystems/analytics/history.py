@@ -7,17 +7,43 @@ trending can be computed across sessions.
 
 Storage location: ~/.biosystems/history.jsonl
 Each line is a JSON object with the fields written by ``append_run``.
+
+Concurrency model: writers serialise on ``history.lock`` and publish each
+new version as an immutable snapshot — a uniquely named temp file, fsynced,
+then atomically renamed over ``history.jsonl``. Readers take no lock: they
+open the current file once and parse it, so they never block behind a long
+backfill and never observe a partially written file. Parsed snapshots are
+cached in-process keyed by (inode, mtime, size), so repeated reads of an
+unchanged history cost one ``fstat``.
+
+Analytics read a columnar view instead: ``load_history_frame`` (one typed
+row per run) and ``load_efforts_frame`` (one row per recorded best effort),
+backed by ``history.parquet`` / ``history_efforts.parquet`` — mirrors tagged
+with the snapshot they were built from and rebuilt lazily when it changes,
+so a fresh process reads only the columns and rows it asks for. The
+analytics commands switch to them once the history reaches
+``FRAME_MIN_BYTES`` (see ``prefer_frames``); shorter histories are cheaper
+to loop over than to import pandas for.
+
+Alongside the history lives ``strava_cursor.json``, the high-water mark
+(latest ingested ``start_date`` + activity ID) used by ``biosystems sync``
+to list only activities newer than what has already been ingested.
 """
 
 from __future__ import annotations
 
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from filelock import FileLock
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def history_path() -> Path:
     """
@@ -38,24 +64,41 @@ def _lock_path() -> Path:
     return history_path().with_suffix(".lock")
 
 
-def load_history() -> list[dict[str, Any]]:
-    """
-    Load the persistent run history from the history JSON Lines file and return deduplicated entries sorted by ascending date.
+# (path, st_ino, st_mtime_ns, st_size) → parsed, deduplicated entries
+_snapshot_cache: tuple[tuple[str, int, int, int], list[dict[str, Any]]] | None = None
+_snapshot_guard = threading.Lock()
 
-    Reads each non-empty line as a JSON object (invalid JSON lines are ignored). If the history file does not exist, returns an empty list. Deduplication keys entries by `strava_activity_id` when present (keyed as `id:{strava_activity_id}`) and otherwise by the entry's `date` (last-write-wins for date-only entries).
 
-    Returns:
-        list[dict[str, Any]]: A list of run-entry objects sorted by `date` (ISO yyyy-mm-dd strings). Each entry contains at minimum:
-            - `date` (str): ISO date string.
-            - `hrTSS` (float).
-        Optional keys that may appear in entries include: `ef`, `ef_gap`, `decoupling_pct`, `distance_km`, `avg_hr`, `avg_pace_min_per_km`, `avg_cadence`, `activity_name`, and `strava_activity_id`.
+def _read_snapshot(path: Path) -> list[dict[str, Any]]:
     """
-    path = history_path()
-    if not path.exists():
-        return []
+    Parse the history snapshot currently published at ``path``.
+
+    The file is opened once and identified via ``fstat`` on that handle, so
+    the bytes parsed and the cache key always describe the same snapshot
+    even if a writer renames a new version in mid-read.
+    """
+    return _snapshot(path)[1]
+
+
+def _snapshot(path: Path) -> tuple[tuple[str, int, int, int] | None, list[dict[str, Any]]]:
+    """``_read_snapshot`` plus the snapshot's cache key (None when there is no file)."""
+    global _snapshot_cache
+
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return None, []
+    with fh:
+        st = os.fstat(fh.fileno())
+        key = (str(path), st.st_ino, st.st_mtime_ns, st.st_size)
+        with _snapshot_guard:
+            cached = _snapshot_cache
+        if cached is not None and cached[0] == key:
+            return key, cached[1]
+        raw = fh.read().decode()
 
     entries: list[dict[str, Any]] = []
-    for line in path.read_text().splitlines():
+    for line in raw.splitlines():
         line = line.strip()
         if not line:
             continue
@@ -67,15 +110,424 @@ def load_history() -> list[dict[str, Any]]:
     # Dedup: activity_id-keyed entries coexist; date-only entries dedup by date
     by_key: dict[str, dict[str, Any]] = {}
     for e in entries:
-        activity_id = e.get("strava_activity_id")
-        if activity_id:
-            key = f"id:{activity_id}"
-        else:
-            key = e.get("date", "")
-        if key:
-            by_key[key] = e
+        k = _entry_key(e)
+        if k:
+            by_key[k] = e
+
+    result = sorted(by_key.values(), key=lambda x: x["date"])
+    with _snapshot_guard:
+        _snapshot_cache = (key, result)
+    return key, result
+
+
+def load_history() -> list[dict[str, Any]]:
+    """
+    Load the persistent run history from the history JSON Lines file and return deduplicated entries sorted by ascending date.
+
+    Reads each non-empty line as a JSON object (invalid JSON lines are ignored). If the history file does not exist, returns an empty list. Deduplication keys entries by `strava_activity_id` when present (keyed as `id:{strava_activity_id}`) and otherwise by the entry's `date` (last-write-wins for date-only entries).
+
+    Lock-free: reads whichever snapshot is currently published and never waits on writers. Unchanged snapshots are served from an in-process cache; each call returns fresh shallow copies of the entries, so callers may modify them freely.
+
+    Returns:
+        list[dict[str, Any]]: A list of run-entry objects sorted by `date` (ISO yyyy-mm-dd strings). Each entry contains at minimum:
+            - `date` (str): ISO date string.
+            - `hrTSS` (float).
+        Optional keys that may appear in entries include: `ef`, `ef_gap`, `decoupling_pct`, `distance_km`, `avg_hr`, `avg_pace_min_per_km`, `avg_cadence`, `activity_name`, and `strava_activity_id`.
+    """
+    return [dict(e) for e in _read_snapshot(history_path())]
+
+
+def _entry_key(entry: dict[str, Any]) -> str:
+    """Dedup key: ``id:{strava_activity_id}`` when present, else the entry's date."""
+    activity_id = entry.get("strava_activity_id")
+    if activity_id:
+        return f"id:{activity_id}"
+    return str(entry.get("date", ""))
+
+
+# ---------------------------------------------------------------------------
+# Columnar view
+# ---------------------------------------------------------------------------
+
+#: Numeric entry fields exposed as float64 columns by ``load_history_frame``.
+FLOAT_COLUMNS = (
+    "hrTSS", "distance_km", "ef", "ef_gap", "decoupling_pct",
+    "avg_hr", "avg_pace_min_per_km", "avg_cadence", "temp_c",
+)
+#: Text entry fields exposed as string columns.
+TEXT_COLUMNS = ("activity_name", "source")
+#: Every column of the run frame, in order.
+FRAME_COLUMNS = ("date", "strava_activity_id", *FLOAT_COLUMNS, *TEXT_COLUMNS)
+#: The whole entry as JSON text; mirrored too, but only read when asked for by name.
+RAW_COLUMN = "raw"
+
+# Parquet schema-metadata key holding the history snapshot a mirror was built from
+_MIRROR_KEY = b"biosystems.history_snapshot"
+
+# snapshot tag → (run frame, efforts frame) for the snapshot last mirrored in-process
+_frame_cache: tuple[str, pd.DataFrame, pd.DataFrame] | None = None
 
-    return sorted(by_key.values(), key=lambda x: x["date"])
+
+def history_frame_path() -> Path:
+    """Return the path of the Parquet mirror of the run history (next to the history file)."""
+    return history_path().with_name("history.parquet")
+
+
+def efforts_frame_path() -> Path:
+    """Return the path of the Parquet mirror of recorded best efforts."""
+    return history_path().with_name("history_efforts.parquet")
+
+
+def _snapshot_tag(key: tuple[str, int, int, int] | None) -> str | None:
+    """Version tag for a snapshot cache key: ``"inode:mtime_ns:size"`` (stamped on derived tables)."""
+    return None if key is None else f"{key[1]}:{key[2]}:{key[3]}"
+
+
+def _build_frames(entries: list[dict[str, Any]]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Convert parsed history entries into the run frame and the long-format efforts frame.
+
+    Both frames are indexed by the entry's position in the snapshot (the same
+    order ``load_history`` returns).
+    """
+    import pandas as pd
+
+    def _col(name: str) -> pd.Series:
+        return pd.Series([e.get(name) for e in entries], dtype=object)
+
+    runs = pd.DataFrame({
+        "date": pd.to_datetime(_col("date"), format="ISO8601", errors="coerce"),
+        "strava_activity_id": pd.to_numeric(_col("strava_activity_id"), errors="coerce").astype("Int64"),
+        **{c: pd.to_numeric(_col(c), errors="coerce").astype("float64") for c in FLOAT_COLUMNS},
+        **{c: _col(c).map(lambda v: None if v is None else str(v)).astype("str") for c in TEXT_COLUMNS},
+        RAW_COLUMN: pd.Series([json.dumps(e) for e in entries], dtype="str"),
+    })
+
+    positions: list[int] = []
+    distances: list[str] = []
+    elapsed: list[int] = []
+    for i, e in enumerate(entries):
+        for name, t in (e.get("strava_efforts") or {}).items():
+            if isinstance(t, int) and t > 0:
+                positions.append(i)
+                distances.append(name)
+                elapsed.append(t)
+    efforts = pd.DataFrame(
+        {
+            "date": runs["date"].to_numpy()[positions],
+            "distance": pd.Series(distances, dtype="str"),
+            "elapsed_s": pd.Series(elapsed, dtype="int64"),
+        },
+    )
+    efforts.index = pd.Index(positions, dtype="int64")
+    return runs, efforts
+
+
+def _write_mirror(frame: pd.DataFrame, path: Path, tag: str) -> None:
+    """Publish ``frame`` as a Parquet mirror tagged with its snapshot (temp file + rename)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(frame.rename_axis("entry").reset_index(), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _MIRROR_KEY: tag.encode()})
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _read_mirror(
+    path: Path,
+    tag: str | None,
+    columns: list[str] | None,
+    filters: list[tuple[str, str, Any]],
+) -> pd.DataFrame | None:
+    """Read the mirror at ``path`` with projection and filters, or None if it is missing or stale."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        if tag is None or (pq.read_schema(path).metadata or {}).get(_MIRROR_KEY) != tag.encode():
+            return None
+        table = pq.read_table(
+            path,
+            columns=None if columns is None else ["entry", *columns],
+            filters=filters or None,
+        )
+    except (OSError, pa.ArrowException):
+        return None
+    frame: pd.DataFrame = table.to_pandas().set_index("entry").rename_axis(None)
+    return frame
+
+
+def _mirrored_frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Full run and efforts frames for the current snapshot.
+
+    Served from the in-process cache when the snapshot is unchanged;
+    otherwise parsed from the JSON Lines history and re-mirrored to Parquet
+    (best effort — a read-only home still gets the frames).
+    """
+    global _frame_cache
+
+    key, entries = _snapshot(history_path())
+    tag = _snapshot_tag(key)
+    with _snapshot_guard:
+        cached = _frame_cache
+    if cached is not None and cached[0] == tag:
+        return cached[1], cached[2]
+
+    runs, efforts = _build_frames(entries)
+    if tag is not None:
+        try:
+            _write_mirror(efforts, efforts_frame_path(), tag)
+            _write_mirror(runs, history_frame_path(), tag)
+        except OSError:
+            pass
+        with _snapshot_guard:
+            _frame_cache = (tag, runs, efforts)
+    return runs, efforts
+
+
+def _load_frame(
+    which: int,
+    path: Path,
+    columns: list[str] | None,
+    filters: list[tuple[str, str, Any]],
+) -> pd.DataFrame:
+    """
+    Shared reader for the run (``which=0``) and efforts (``which=1``) frames.
+
+    A current in-process frame is sliced directly; a current Parquet mirror
+    is read with column projection and filter pushdown; anything else
+    rebuilds both mirrors from the history file first.
+    """
+    try:
+        st = os.stat(history_path())
+    except FileNotFoundError:
+        frame = _build_frames([])[which]
+        return frame if columns is None else frame[columns]
+    tag = _snapshot_tag((str(history_path()), st.st_ino, st.st_mtime_ns, st.st_size))
+
+    with _snapshot_guard:
+        cached = _frame_cache
+    if cached is not None and cached[0] == tag:
+        frame = cached[1:][which]
+    else:
+        mirrored = _read_mirror(path, tag, columns, filters)
+        if mirrored is not None:
+            return mirrored
+        frame = _mirrored_frames()[which]
+
+    mask = None
+    for col, op, value in filters:
+        series = frame[col]
+        hit = series.isin(value) if op == "in" else (series >= value) if op == ">=" else (series == value)
+        mask = hit if mask is None else mask & hit
+    if mask is not None:
+        frame = frame[mask.fillna(False).astype(bool)]
+    result: pd.DataFrame = (frame if columns is None else frame[columns]).copy()
+    return result
+
+
+def load_history_frame(
+    columns: list[str] | None = None,
+    since: str | None = None,
+    min_dist: float | None = None,
+    source: str | None = None,
+) -> pd.DataFrame:
+    """
+    Load the run history as a typed columnar frame.
+
+    Same entries as ``load_history`` (deduplicated, sorted by date), one row
+    per run, indexed by the entry's position in that list. ``date`` is
+    datetime64, ``strava_activity_id`` nullable Int64, the ``FLOAT_COLUMNS``
+    float64 (missing → NaN) and the ``TEXT_COLUMNS`` strings. Other entry
+    keys (``strava_efforts`` — see ``load_efforts_frame``) are only in the
+    ``RAW_COLUMN`` text, which is returned only when named in ``columns``.
+
+    Backed by ``history.parquet``, a mirror of the history file tagged with
+    the snapshot it was built from and rebuilt lazily whenever the history
+    changes, so a fresh process reads only the requested columns and rows
+    instead of parsing every JSON line.
+
+    Parameters:
+        columns (list[str] | None): Columns to return (default: all ``FRAME_COLUMNS``).
+        since (str | None): Keep runs on or after this ISO date.
+        min_dist (float | None): Keep runs with ``distance_km >= min_dist``;
+            a missing distance counts as 0, so values <= 0 keep every run.
+        source (str | None): Keep runs whose ``source`` equals this value.
+
+    Returns:
+        pd.DataFrame: The filtered runs in date order.
+    """
+    import pandas as pd
+
+    filters: list[tuple[str, str, Any]] = []
+    if since:
+        filters.append(("date", ">=", pd.Timestamp(since)))
+    if min_dist is not None and min_dist > 0:
+        filters.append(("distance_km", ">=", float(min_dist)))
+    if source:
+        filters.append(("source", "==", source))
+    return _load_frame(0, history_frame_path(), list(FRAME_COLUMNS if columns is None else columns), filters)
+
+
+def load_efforts_frame(
+    since: str | None = None,
+    distances: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Load recorded best efforts (``strava_efforts``) in long format.
+
+    One row per (run, effort distance) with a positive integer time, with
+    columns ``date`` (datetime64), ``distance`` (effort name, e.g. ``"5K"``)
+    and ``elapsed_s`` (int64), indexed by the run's position in
+    ``load_history``. Backed by ``history_efforts.parquet``, mirrored
+    alongside ``history.parquet``.
+
+    Parameters:
+        since (str | None): Keep efforts from runs on or after this ISO date.
+        distances (list[str] | None): Keep only these effort names.
+    """
+    import pandas as pd
+
+    filters: list[tuple[str, str, Any]] = []
+    if since:
+        filters.append(("date", ">=", pd.Timestamp(since)))
+    if distances is not None:
+        filters.append(("distance", "in", list(distances)))
+    return _load_frame(1, efforts_frame_path(), None, filters)
+
+
+#: History files at least this large (roughly 40,000 runs) are analysed as
+#: frames. Below it, importing pandas and pyarrow (~0.4 s) costs more than
+#: parsing the JSON lines and looping over them, so shorter histories keep
+#: the analytics commands pandas-free (see benchmarks/test_bench_history.py).
+FRAME_MIN_BYTES = 16 << 20
+
+
+def prefer_frames() -> bool:
+    """Whether the history is large enough for analytics to read ``load_history_frame``."""
+    try:
+        return os.stat(history_path()).st_size >= FRAME_MIN_BYTES
+    except FileNotFoundError:
+        return False
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    """
+    Publish ``text`` at ``path`` as a new immutable file.
+
+    Writes to a uniquely named temp file in the same directory, fsyncs it,
+    then ``os.replace``s it over ``path`` (atomic on POSIX and Windows) and
+    fsyncs the directory so the rename itself is durable.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)  # keep the published file's mode
+        except FileNotFoundError:
+            os.chmod(tmp_name, 0o644)
+        with os.fdopen(fd, "w") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows — directory fsync unsupported
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def _write_history(entries: list[dict[str, Any]]) -> None:
+    """Publish a new history snapshot (see ``_atomic_write_text``). Caller holds the lock."""
+    lines = [json.dumps(e, separators=(",", ":")) for e in sorted(entries, key=lambda x: x["date"])]
+    _atomic_write_text(history_path(), "\n".join(lines) + "\n")
+
+
+def append_runs(entries: list[dict[str, Any]]) -> list[str]:
+    """
+    Merge a batch of run entries into the history file under one lock and one write.
+
+    Uses the same dedup rules as ``append_run`` (activity ID when present,
+    else date; last write wins, including within the batch). The file is
+    rewritten once, atomically, via a temp file and rename, so a crash
+    mid-batch leaves the previous history intact. The week/month rollup
+    tables (``biosystems.analytics.rollups``) are patched with the batch
+    under the same lock.
+
+    Parameters
+    ----------
+    entries : list[dict]
+        Entries as accepted by ``append_run``; store best efforts under the
+        ``strava_efforts`` key.
+
+    Returns
+    -------
+    list[str]
+        Per-entry status, aligned with ``entries``: ``"inserted"``,
+        ``"replaced"`` or ``"skipped"`` (entry has no ``date``).
+    """
+    if not any("date" in e for e in entries):
+        return ["skipped"] * len(entries)
+
+    try:
+        lock = FileLock(str(_lock_path()), timeout=15)
+    except Exception as exc:
+        raise RuntimeError(f"Cannot acquire history lock: {exc}") from exc
+
+    from biosystems.analytics.rollups import update_rollups
+
+    statuses: list[str] = []
+    with lock:
+        snapshot_key, current = _snapshot(history_path())
+        by_key: dict[str, dict[str, Any]] = {}
+        for e in current:
+            key = _entry_key(e)
+            if key:
+                by_key[key] = e
+
+        removed: list[dict[str, Any]] = []
+        added: list[dict[str, Any]] = []
+        for entry in entries:
+            if "date" not in entry:
+                statuses.append("skipped")
+                continue
+            key = _entry_key(entry)
+            previous = by_key.get(key)
+            statuses.append("replaced" if previous is not None else "inserted")
+            if previous is not None:
+                removed.append(previous)
+            added.append(entry)
+            by_key[key] = entry
+
+        _write_history(list(by_key.values()))
+        try:
+            update_rollups(_snapshot_tag(snapshot_key), removed, added, by_key.values())
+        except OSError:
+            pass  # left tagged with the old snapshot, so the next read rebuilds it
+
+    return statuses
 
 
 def append_run(entry: dict[str, Any], strava_efforts: dict[str, int] | None = None) -> None:
@@ -83,7 +535,9 @@ def append_run(entry: dict[str, Any], strava_efforts: dict[str, int] | None = No
     Append a run entry to the history file.
 
     If an entry with the same date already exists, the new entry
-    replaces it (full rewrite to preserve dedup invariant).
+    replaces it (full rewrite to preserve dedup invariant). For many
+    entries at once use ``append_runs``, which takes the lock and
+    rewrites the file only once.
 
     Parameters
     ----------
@@ -101,32 +555,104 @@ def append_run(entry: dict[str, Any], strava_efforts: dict[str, int] | None = No
         entry = dict(entry)  # avoid mutating caller's dict
         entry["strava_efforts"] = strava_efforts
 
+    append_runs([entry])
+
+
+def cursor_path() -> Path:
+    """Return the path of the Strava sync cursor file (next to the history file)."""
+    return history_path().with_name("strava_cursor.json")
+
+
+def _cursor_key(start_date: str, activity_id: int) -> tuple[str, int]:
+    """Ordering key for cursor positions: UTC ISO start time, then activity ID."""
+    return (start_date, int(activity_id))
+
+
+def load_sync_cursor() -> dict[str, Any] | None:
+    """
+    Load the persisted Strava sync high-water mark.
+
+    Returns:
+        dict | None: ``{"start_date": str, "activity_id": int, "updated_at": str}``
+            where ``start_date`` is the activity's UTC ISO-8601 start time
+            (Strava ``start_date``), or None when no cursor has been saved yet
+            or the file is unreadable.
+    """
+    path = cursor_path()
+    if not path.exists():
+        return None
     try:
-        lock = FileLock(str(_lock_path()), timeout=15)
-    except Exception as exc:
-        raise RuntimeError(f"Cannot acquire history lock: {exc}") from exc
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or not data.get("start_date") or data.get("activity_id") is None:
+        return None
+    return data
 
-    with lock:
-        existing = load_history()
-
-        # Dedup by activity_id when present, else by date
-        activity_id = entry.get("strava_activity_id")
-        if activity_id:
-            by_key: dict[str, dict[str, Any]] = {}
-            for e in existing:
-                eid = e.get("strava_activity_id")
-                k = f"id:{eid}" if eid else e.get("date", "")
-                if k:
-                    by_key[k] = e
-            by_key[f"id:{activity_id}"] = entry
-        else:
-            by_key = {e.get("strava_activity_id") and f"id:{e['strava_activity_id']}" or e["date"]: e
-                      for e in existing if e.get("date")}
-            by_key[entry["date"]] = entry
 
-        path = history_path()
-        lines = [json.dumps(e, separators=(",", ":")) for e in sorted(by_key.values(), key=lambda x: x["date"])]
-        path.write_text("\n".join(lines) + "\n")
+def save_sync_cursor(start_date: str, activity_id: int) -> dict[str, Any]:
+    """
+    Persist the Strava sync cursor unconditionally (atomic replace).
+
+    Parameters
+    ----------
+    start_date : str
+        UTC ISO-8601 start time of the newest ingested activity
+        (e.g. ``"2025-06-01T07:30:00Z"``).
+    activity_id : int
+        Strava activity ID of that activity.
+
+    Returns
+    -------
+    dict
+        The cursor as written.
+    """
+    from datetime import datetime, timezone
+
+    cursor = {
+        "start_date": start_date,
+        "activity_id": int(activity_id),
+        "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    _atomic_write_text(cursor_path(), json.dumps(cursor, indent=2) + "\n")
+    return cursor
+
+
+def advance_sync_cursor(start_date: str, activity_id: int) -> dict[str, Any]:
+    """
+    Move the sync cursor forward to (start_date, activity_id).
+
+    The cursor never moves backwards: if the stored position is already at
+    or beyond the given one, it is left untouched.
+
+    Returns
+    -------
+    dict
+        The cursor in effect after the call.
+    """
+    current = load_sync_cursor()
+    if current is not None and _cursor_key(
+        current["start_date"], current["activity_id"]
+    ) >= _cursor_key(start_date, activity_id):
+        return current
+    return save_sync_cursor(start_date, activity_id)
+
+
+def is_after_cursor(activity: dict[str, Any], cursor: dict[str, Any] | None) -> bool:
+    """
+    Return True when a Strava SummaryActivity lies strictly after the cursor.
+
+    Activities sharing the cursor's start second are disambiguated by ID, so
+    two activities started in the same second are never skipped or repeated.
+    """
+    if cursor is None:
+        return True
+    start_date = activity.get("start_date")
+    if not start_date:
+        return False
+    return _cursor_key(start_date, activity["id"]) > _cursor_key(
+        cursor["start_date"], cursor["activity_id"]
+    )
 
 
 def detect_block_bests(
@@ -210,6 +736,7 @@ def backfill_from_strava(
     n: int,
     zone_config: ZoneConfig,  # type: ignore[name-defined]  # noqa: F821
     access_token: str | None = None,
+    chunk_size: int = 50,
 ) -> list[dict[str, Any]]:
     """
     Estimate hrTSS for recent Strava run summaries and append entries for dates not already present in history.
@@ -220,6 +747,7 @@ def backfill_from_strava(
         n (int): Number of recent run summaries to fetch from Strava.
         zone_config (ZoneConfig): Provides `threshold_hr` for the TSS estimation.
         access_token (str | None): Optional Strava access token to use for the fetch.
+        chunk_size (int): Entries committed per ``append_runs`` call.
 
     Returns:
         list[dict[str, Any]]: Entries that were added to history (each entry as written to the history file).
@@ -260,7 +788,10 @@ def backfill_from_strava(
             "activity_name": s.get("name"),
             "source": "strava_summary_estimate",
         }
-        append_run(entry)
         new_entries.append(entry)
 
+    step = max(int(chunk_size), 1)
+    for i in range(0, len(new_entries), step):
+        append_runs(new_entries[i:i + step])
+
     return new_entries
@@ -0,0 +1,468 @@
+"""
+Run History Rollups
+===================
+
+Materialized per-period aggregates of the run history, maintained by
+``append_runs`` so that period summaries cost O(periods) rather than a pass
+over every run.
+
+Two grains are kept: ISO week (``"2025-W14"``) and calendar month
+(``"2025-04"``). Each period is split into cells by run ``source`` and by
+whole kilometres of distance (``floor(distance_km)``, missing = 0, capped at
+``MAX_KM_BUCKET``), so ``--source`` and integer ``--min-dist`` filters are
+answered by merging cells. Every cell holds one ``Accumulator`` (count, sum,
+min, max) per metric, with the inclusion rules ``summary`` has always used:
+
+    ef, avg_hr, avg_pace_min_per_km   recorded and non-zero
+    decoupling_pct, hrTSS             recorded
+    distance_km                       every run (missing = 0), so its count
+                                      is the run count
+
+Accumulators merge exactly: cells combine into periods, months into "all",
+and a replaced run is subtracted from its old cell. Removing a value that was
+its cell's min or max cannot be undone from the accumulator alone, so those
+cells are recomputed from their runs.
+
+Storage: ``~/.biosystems/history_rollups.json``, tagged with the history
+snapshot (inode:mtime_ns:size) it describes. A missing or stale file — the
+history was edited by hand, or a write was interrupted between the history
+and its rollups — is rebuilt from the history on the next read.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from biosystems.analytics.history import (
+    _atomic_write_text,
+    _snapshot,
+    _snapshot_tag,
+    history_path,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+#: Rolled-up metrics; ``distance_km`` doubles as the run counter.
+METRICS = ("distance_km", "hrTSS", "ef", "decoupling_pct", "avg_hr", "avg_pace_min_per_km")
+#: Metrics that only count when non-zero (a zero means "not measured").
+NONZERO_METRICS = ("ef", "avg_hr", "avg_pace_min_per_km")
+#: Stored grains; "all" is answered by merging months.
+GRAINS = ("week", "month")
+#: Distance buckets above this many km are pooled.
+MAX_KM_BUCKET = 50
+
+_ROLLUPS_VERSION = 1
+
+Cell = tuple[str, str, str]  # (grain, period, "km|source")
+Periods = dict[str, dict[str, "Accumulator"]]
+
+
+@dataclass(slots=True)
+class Accumulator:
+    """Mergeable count / sum / min / max of one metric."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def discard(self, value: float) -> bool:
+        """Remove one previously added ``value``; False if min/max now need recomputing."""
+        self.count -= 1
+        if self.count <= 0:
+            self.count, self.total, self.min, self.max = 0, 0.0, math.inf, -math.inf
+            return True
+        self.total -= value
+        return self.min < value < self.max
+
+    def merge(self, other: Accumulator) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    @property
+    def best(self) -> float | None:
+        """Maximum, or None when empty."""
+        return self.max if self.count else None
+
+    def to_json(self) -> list[Any]:
+        if not self.count:
+            return [0, 0.0, None, None]
+        return [self.count, self.total, self.min, self.max]
+
+    @classmethod
+    def from_json(cls, data: list[Any]) -> Accumulator:
+        count, total, lo, hi = data
+        return cls(int(count), float(total), math.inf if lo is None else lo, -math.inf if hi is None else hi)
+
+
+def merge_periods(periods: Iterable[dict[str, Accumulator]]) -> dict[str, Accumulator]:
+    """Merge per-metric accumulators into fresh ones (inputs are left untouched)."""
+    merged = {m: Accumulator() for m in METRICS}
+    for accs in periods:
+        for m, acc in accs.items():
+            merged[m].merge(acc)
+    return merged
+
+
+def rollups_path() -> Path:
+    """Return the path of the rollup tables (next to the history file)."""
+    return history_path().with_name("history_rollups.json")
+
+
+def finite_number(value: Any) -> float | None:
+    """Finite float value of a history field, or None."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        x = float(value)
+    except (TypeError, ValueError):
+        return None
+    return x if math.isfinite(x) else None
+
+
+def _values(entry: dict[str, Any]) -> dict[str, float]:
+    """Metric values one run contributes, after the inclusion rules."""
+    values = {"distance_km": finite_number(entry.get("distance_km")) or 0.0}
+    for m in METRICS[1:]:
+        x = finite_number(entry.get(m))
+        if x is not None and not (x == 0 and m in NONZERO_METRICS):
+            values[m] = x
+    return values
+
+
+def _cells(entry: dict[str, Any]) -> list[Cell]:
+    """The (grain, period, cell) slots one run falls into; empty if it has no valid date."""
+    try:
+        day = date.fromisoformat(str(entry.get("date", ""))[:10])
+    except ValueError:
+        return []
+    km = min(math.floor(finite_number(entry.get("distance_km")) or 0.0), MAX_KM_BUCKET)
+    source = entry.get("source")
+    cell = f"{km}|{'' if source is None else source}"
+    year, week, _ = day.isocalendar()
+    return [("week", f"{year}-W{week:02d}", cell), ("month", f"{day.year}-{day.month:02d}", cell)]
+
+
+def _period_start(grain: str, period: str) -> date:
+    if grain == "week":
+        year, week = period.split("-W")
+        return date.fromisocalendar(int(year), int(week), 1)
+    return date.fromisoformat(f"{period}-01")
+
+
+class HistoryRollups:
+    """Week and month rollup tables: ``tables[grain][period][cell][metric]``."""
+
+    def __init__(
+        self,
+        tables: dict[str, dict[str, dict[str, dict[str, Accumulator]]]] | None = None,
+        snapshot: str | None = None,
+    ) -> None:
+        self.tables = tables if tables is not None else {g: {} for g in GRAINS}
+        self.snapshot = snapshot
+
+    @classmethod
+    def build(cls, entries: Iterable[dict[str, Any]], snapshot: str | None = None) -> HistoryRollups:
+        rollups = cls(snapshot=snapshot)
+        for entry in entries:
+            rollups.add(entry)
+        return rollups
+
+    def _cell(self, grain: str, period: str, cell: str) -> dict[str, Accumulator]:
+        cells = self.tables[grain].setdefault(period, {})
+        if cell not in cells:
+            cells[cell] = {m: Accumulator() for m in METRICS}
+        return cells[cell]
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Fold one run into its cells."""
+        values = _values(entry)
+        for grain, period, cell in _cells(entry):
+            accs = self._cell(grain, period, cell)
+            for m, x in values.items():
+                accs[m].add(x)
+
+    def discard(self, entry: dict[str, Any]) -> set[Cell]:
+        """Subtract one previously added run; return cells whose min/max went stale."""
+        values = _values(entry)
+        stale: set[Cell] = set()
+        for grain, period, cell in _cells(entry):
+            accs = self.tables[grain].get(period, {}).get(cell)
+            if accs is None:
+                stale.add((grain, period, cell))
+                continue
+            for m, x in values.items():
+                if not accs[m].discard(x):
+                    stale.add((grain, period, cell))
+            if accs["distance_km"].count == 0:
+                del self.tables[grain][period][cell]
+                if not self.tables[grain][period]:
+                    del self.tables[grain][period]
+                stale.discard((grain, period, cell))
+        return stale
+
+    def rebuild_cells(self, cells: set[Cell], entries: Iterable[dict[str, Any]]) -> None:
+        """Recompute ``cells`` from scratch out of the runs that fall into them."""
+        for grain, period, cell in cells:
+            self.tables[grain].get(period, {}).pop(cell, None)
+        for entry in entries:
+            hits = [c for c in _cells(entry) if c in cells]
+            if hits:
+                values = _values(entry)
+                for grain, period, cell in hits:
+                    accs = self._cell(grain, period, cell)
+                    for m, x in values.items():
+                        accs[m].add(x)
+        for grain, period, _ in cells:
+            if grain in self.tables and not self.tables[grain].get(period, True):
+                del self.tables[grain][period]
+
+    def periods(
+        self,
+        grain: str,
+        since: str | None = None,
+        min_dist: float | None = None,
+        source: str | None = None,
+    ) -> Periods | None:
+        """
+        Per-period accumulators for ``grain`` ("week", "month" or "all"), sorted by period.
+
+        Returns None when the filters do not line up with the stored cells —
+        ``since`` that is not the first day of a period, or a fractional (or
+        > ``MAX_KM_BUCKET``) ``min_dist`` — so the caller can aggregate the
+        runs directly instead.
+        """
+        base = "month" if grain == "all" else grain
+        start: date | None = None
+        if since:
+            try:
+                start = date.fromisoformat(since)
+            except ValueError:
+                return None
+            if (base == "week" and start.isoweekday() != 1) or (base == "month" and start.day != 1):
+                return None
+        min_km: int | None = None
+        if min_dist is not None and min_dist > 0:
+            if not float(min_dist).is_integer() or min_dist > MAX_KM_BUCKET:
+                return None
+            min_km = int(min_dist)
+
+        selected: dict[str, list[dict[str, Accumulator]]] = {}
+        for period in sorted(self.tables[base]):
+            if start is not None and _period_start(base, period) < start:
+                continue
+            for cell, accs in self.tables[base][period].items():
+                km, src = cell.split("|", 1)
+                if (min_km is not None and int(km) < min_km) or (source and src != source):
+                    continue
+                selected.setdefault("all" if grain == "all" else period, []).append(accs)
+        return {period: merge_periods(cells) for period, cells in selected.items()}
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": _ROLLUPS_VERSION,
+            "snapshot": self.snapshot,
+            **{
+                grain: {
+                    period: {cell: {m: acc.to_json() for m, acc in accs.items()} for cell, accs in cells.items()}
+                    for period, cells in self.tables[grain].items()
+                }
+                for grain in GRAINS
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> HistoryRollups:
+        tables = {
+            grain: {
+                period: {
+                    cell: {m: Accumulator.from_json(acc) for m, acc in accs.items()}
+                    for cell, accs in cells.items()
+                }
+                for period, cells in data.get(grain, {}).items()
+            }
+            for grain in GRAINS
+        }
+        return cls(tables, snapshot=data.get("snapshot"))
+
+
+# snapshot tag → rollups last loaded in-process
+_rollup_cache: tuple[str | None, HistoryRollups] | None = None
+_rollup_guard = threading.Lock()
+
+
+def _read_rollups() -> HistoryRollups | None:
+    """Parse the stored rollups, or None if missing, unreadable or from another version."""
+    try:
+        data = json.loads(rollups_path().read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != _ROLLUPS_VERSION:
+        return None
+    try:
+        return HistoryRollups.from_json(data)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _save_rollups(rollups: HistoryRollups) -> None:
+    global _rollup_cache
+
+    _atomic_write_text(rollups_path(), json.dumps(rollups.to_json(), separators=(",", ":")))
+    with _rollup_guard:
+        _rollup_cache = (rollups.snapshot, rollups)
+
+
+def _current_tag() -> str | None:
+    try:
+        st = os.stat(history_path())
+    except FileNotFoundError:
+        return None
+    return _snapshot_tag((str(history_path()), st.st_ino, st.st_mtime_ns, st.st_size))
+
+
+def load_rollups() -> HistoryRollups:
+    """
+    Return the rollup tables for the current history snapshot.
+
+    Served from the in-process cache or ``history_rollups.json`` when their
+    tag matches the published history; otherwise rebuilt from the history
+    and re-saved (best effort).
+    """
+    global _rollup_cache
+
+    tag = _current_tag()
+    with _rollup_guard:
+        cached = _rollup_cache
+    if cached is not None and cached[0] == tag:
+        return cached[1]
+
+    rollups = _read_rollups()
+    if rollups is None or rollups.snapshot != tag:
+        key, entries = _snapshot(history_path())
+        rollups = HistoryRollups.build(entries, snapshot=_snapshot_tag(key))
+        if key is not None:
+            try:
+                _save_rollups(rollups)
+            except OSError:
+                pass
+    with _rollup_guard:
+        _rollup_cache = (rollups.snapshot, rollups)
+    return rollups
+
+
+def update_rollups(
+    previous: str | None,
+    removed: list[dict[str, Any]],
+    added: list[dict[str, Any]],
+    entries: Iterable[dict[str, Any]],
+) -> None:
+    """
+    Apply one ``append_runs`` batch to the stored rollups.
+
+    Called under the history lock right after the new snapshot is published.
+    ``previous`` is the tag of the snapshot the batch was merged into; if the
+    stored rollups do not describe it they are rebuilt from ``entries`` (the
+    full merged history) instead of patched.
+    """
+    entries = list(entries)
+    rollups = _read_rollups()
+    if rollups is None or rollups.snapshot != previous:
+        rollups = HistoryRollups.build(entries)
+    else:
+        stale: set[Cell] = set()
+        for entry in removed:
+            stale |= rollups.discard(entry)
+        for entry in added:
+            rollups.add(entry)
+        if stale:
+            rollups.rebuild_cells(stale, entries)
+    rollups.snapshot = _current_tag()
+    _save_rollups(rollups)
+
+
+def entry_accumulators(
+    entries: Iterable[dict[str, Any]],
+    grain: str,
+    since: str | None = None,
+    min_dist: float | None = None,
+    source: str | None = None,
+) -> Periods:
+    """
+    Per-period accumulators aggregated straight from history entries, for
+    filters the stored rollups cannot answer. Filters and inclusion rules
+    match ``HistoryRollups.periods``, as does the output shape. Pure Python,
+    so ``summary`` on a short history never needs pandas.
+    """
+    runs = HistoryRollups()
+    for entry in entries:
+        if since and str(entry.get("date", ""))[:10] < since:
+            continue
+        if min_dist is not None and min_dist > 0 and (finite_number(entry.get("distance_km")) or 0.0) < min_dist:
+            continue
+        if source and entry.get("source") != source:
+            continue
+        runs.add(entry)
+    return runs.periods(grain) or {}
+
+
+def frame_accumulators(runs: pd.DataFrame, grain: str) -> Periods:
+    """
+    ``entry_accumulators`` for a ``load_history_frame`` frame (``date`` plus
+    ``METRICS``, already filtered), as pandas group-bys. Used instead of the
+    per-entry pass once the history is long enough to be read as a frame.
+    """
+    import pandas as pd
+
+    if runs.empty:
+        return {}
+    if grain == "week":
+        iso = runs["date"].dt.isocalendar()
+        period = iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+    elif grain == "all":
+        period = pd.Series("all", index=runs.index)
+    else:
+        period = runs["date"].dt.strftime("%Y-%m")
+
+    values = runs[list(METRICS)].copy()
+    values["distance_km"] = values["distance_km"].fillna(0.0)
+    for m in NONZERO_METRICS:
+        values[m] = values[m].where(values[m] != 0)
+    stats = values.groupby(period.rename("period")).agg(["count", "sum", "min", "max"])
+
+    columns = {m: [stats[(m, agg)].tolist() for agg in ("count", "sum", "min", "max")] for m in METRICS}
+    return {
+        str(p): {
+            m: Accumulator(
+                int(count[i]),
+                float(total[i]),
+                float(low[i]) if count[i] else math.inf,
+                float(high[i]) if count[i] else -math.inf,
+            )
+            for m, (count, total, low, high) in columns.items()
+        }
+        for i, p in enumerate(stats.index)
+    }
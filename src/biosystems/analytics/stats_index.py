@@ -0,0 +1,152 @@
+"""
+History Statistics Index
+========================
+
+Sorted per-metric arrays over the run history, built once, so baseline
+questions are answered by binary search instead of a pass over every run:
+
+    percentile_rank(metric, value)   share of runs below ``value`` (0-100)
+    window_mean(metric, since=, until=)   mean over a date range
+    window_count(metric, since=, until=)
+
+Each metric keeps two views of the same values: ascending by value (for
+``searchsorted`` percentile ranks) and ascending by date with prefix sums, so
+a date window costs two ``searchsorted`` calls and one subtraction. Both are
+O(log n) per query; ``percentile_ranks`` ranks many values in one call.
+
+Inclusion rules follow the baselines the daily brief has always used:
+
+    ef, hrTSS, avg_pace_min_per_km   recorded and non-zero
+    decoupling_pct                   recorded
+
+Runs without a valid ``date`` count toward the whole-history statistics but
+never fall inside a date window.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from biosystems.analytics.rollups import finite_number
+
+#: Metrics indexed by default.
+INDEX_METRICS = ("ef", "decoupling_pct", "hrTSS", "avg_pace_min_per_km")
+#: Metrics where 0 means "not measured" and is left out.
+NONZERO_METRICS = ("ef", "hrTSS", "avg_pace_min_per_km")
+
+# Undated runs sort before every real date, outside any window.
+_NO_DATE = np.datetime64("0001-01-01", "D")
+
+
+def _day(value: Any) -> np.datetime64:
+    try:
+        return np.datetime64(date.fromisoformat(str(value or "")[:10]), "D")
+    except ValueError:
+        return _NO_DATE
+
+
+class HistoryStatsIndex:
+    """Percentile ranks and windowed means over run history entries in O(log n)."""
+
+    def __init__(self, entries: Iterable[dict[str, Any]], metrics: Iterable[str] = INDEX_METRICS) -> None:
+        self.metrics = tuple(metrics)
+        columns: dict[str, tuple[list[np.datetime64], list[float]]] = {m: ([], []) for m in self.metrics}
+        for entry in entries:
+            day = None
+            for m in self.metrics:
+                x = finite_number(entry.get(m))
+                if x is None or (x == 0 and m in NONZERO_METRICS):
+                    continue
+                if day is None:
+                    day = _day(entry.get("date"))
+                columns[m][0].append(day)
+                columns[m][1].append(x)
+
+        self._sorted: dict[str, np.ndarray] = {}
+        self._dates: dict[str, np.ndarray] = {}
+        self._prefix: dict[str, np.ndarray] = {}
+        for m, (days, values) in columns.items():
+            dates = np.array(days, dtype="datetime64[D]")
+            vals = np.array(values, dtype="float64")
+            order = np.argsort(dates, kind="stable")
+            self._sorted[m] = np.sort(vals)
+            self._dates[m] = dates[order]
+            self._prefix[m] = np.concatenate(([0.0], np.cumsum(vals[order])))
+
+    def _column(self, metric: str) -> np.ndarray:
+        try:
+            return self._sorted[metric]
+        except KeyError:
+            raise KeyError(f"metric {metric!r} is not indexed (have {', '.join(self.metrics)})") from None
+
+    # -- whole history -----------------------------------------------------
+
+    def count(self, metric: str) -> int:
+        return len(self._column(metric))
+
+    def mean(self, metric: str) -> float | None:
+        values = self._column(metric)
+        return float(self._prefix[metric][-1] / len(values)) if len(values) else None
+
+    def std(self, metric: str) -> float | None:
+        """Sample standard deviation, or None with fewer than two values."""
+        values = self._column(metric)
+        return float(np.std(values, ddof=1)) if len(values) > 1 else None
+
+    def best(self, metric: str) -> float | None:
+        """Maximum, or None when empty."""
+        values = self._column(metric)
+        return float(values[-1]) if len(values) else None
+
+    def sorted_values(self, metric: str) -> np.ndarray:
+        """All values of ``metric`` in ascending order (read-only view)."""
+        view: np.ndarray = self._column(metric).view()
+        view.flags.writeable = False
+        return view
+
+    # -- percentile ranks --------------------------------------------------
+
+    def percentile_rank(self, metric: str, value: float) -> int:
+        """Percentage of recorded values strictly below ``value``, rounded (50 when empty)."""
+        values = self._column(metric)
+        if not len(values):
+            return 50
+        return round(int(np.searchsorted(values, value, side="left")) / len(values) * 100)
+
+    def percentile_ranks(self, metric: str, values: Iterable[float]) -> list[int]:
+        """``percentile_rank`` for many values at once."""
+        column = self._column(metric)
+        queries = np.asarray(list(values), dtype="float64")
+        if not len(column):
+            return [50] * len(queries)
+        below = np.searchsorted(column, queries, side="left")
+        return [round(int(b) / len(column) * 100) for b in below]
+
+    # -- date windows ------------------------------------------------------
+
+    def _window(self, metric: str, since: str | None, until: str | None) -> tuple[int, int]:
+        self._column(metric)
+        dates = self._dates[metric]
+        start = np.datetime64(since, "D") if since else _NO_DATE + 1  # undated runs belong to no window
+        lo = int(np.searchsorted(dates, start, side="left"))
+        hi = int(np.searchsorted(dates, np.datetime64(until, "D"), side="right")) if until else len(dates)
+        return lo, max(lo, hi)
+
+    def window_count(self, metric: str, since: str | None = None, until: str | None = None) -> int:
+        """Number of values dated within [since, until] (ISO dates, both inclusive, open when None)."""
+        lo, hi = self._window(metric, since, until)
+        return hi - lo
+
+    def window_mean(self, metric: str, since: str | None = None, until: str | None = None) -> float | None:
+        """Mean of the values dated within [since, until], or None when there are none."""
+        lo, hi = self._window(metric, since, until)
+        if hi == lo:
+            return None
+        prefix = self._prefix[metric]
+        mean = float((prefix[hi] - prefix[lo]) / (hi - lo))
+        return mean if math.isfinite(mean) else None
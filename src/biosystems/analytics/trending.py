@@ -15,13 +15,23 @@ TSB (Training Stress Balance) = CTL - ATL, computed *before* today's load.
                               Positive = fresh/rested. Negative = fatigued.
 
 These are the Banister Impulse–Response model as popularised by TrainingPeaks.
+
+``compute_pmc`` and ``compute_rolling_stats`` take the entry list;
+``pmc_from_frame`` and ``rolling_stats_from_frame`` return the same rows from
+a ``load_history_frame`` frame, for histories long enough to be read as one.
 """
 
 from __future__ import annotations
 
 import math
 from datetime import date, timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+#: Per-run fields copied onto PMC days and rolling rows.
+_META_FIELDS = ("activity_name", "distance_km", "ef", "ef_gap", "decoupling_pct", "avg_hr", "avg_pace_min_per_km")
 
 
 def compute_pmc(
@@ -184,6 +194,117 @@ def compute_rolling_stats(
     return result
 
 
+def _values(series: pd.Series) -> list[Any]:
+    """Series values as plain Python objects, NaN/NaT → None."""
+    values: list[Any] = series.astype(object).where(series.notna(), None).tolist()
+    return values
+
+
+def _joined_names(names: list[Any]) -> Any:
+    """A multi-run day's ``activity_name``, joined exactly as ``compute_pmc`` joins it."""
+    joined = names[0]
+    for name in names[1:]:
+        prev = joined or ""
+        if name and name != prev:
+            joined = f"{prev} + {name}" if prev else name
+    return joined
+
+
+def pmc_from_frame(
+    runs: pd.DataFrame,
+    decay_atl: int = 7,
+    decay_ctl: int = 42,
+) -> list[dict[str, Any]]:
+    """
+    ``compute_pmc`` over a ``load_history_frame`` frame (``date``, ``hrTSS``
+    and the per-run metadata columns, in history order).
+
+    Daily loads and same-day metadata are aggregated with group-bys and laid
+    onto the full calendar range with a reindex; only the ATL/CTL recurrence
+    itself runs day by day, on plain floats.
+    """
+    import pandas as pd
+
+    runs = runs[runs["date"].notna()]
+    if runs.empty:
+        return []
+
+    day = runs["date"].dt.normalize()
+    by_day = runs.groupby(day)
+    runs_per_day = by_day.size()
+    days = pd.date_range(runs_per_day.index[0], runs_per_day.index[-1], freq="D")
+
+    meta = runs.assign(day=day).drop_duplicates("day").set_index("day")[list(_META_FIELDS)]
+    # Multi-run days: summed distance (missing = 0) and joined names
+    multi = runs_per_day.index[runs_per_day > 1]
+    if len(multi):
+        meta["activity_name"] = meta["activity_name"].astype(object)
+        meta.loc[multi, "distance_km"] = by_day["distance_km"].sum()[multi]
+        on_multi = day.isin(multi)
+        names_by_day: dict[Any, list[Any]] = {}
+        for d, name in zip(day[on_multi].tolist(), _values(runs.loc[on_multi, "activity_name"])):
+            names_by_day.setdefault(d, []).append(name)
+        meta.loc[list(names_by_day), "activity_name"] = [_joined_names(n) for n in names_by_day.values()]
+    meta = meta.reindex(days)
+
+    k_atl = math.exp(-1.0 / decay_atl)
+    k_ctl = math.exp(-1.0 / decay_ctl)
+    g_atl = 1.0 - k_atl
+    g_ctl = 1.0 - k_ctl
+
+    atl = 0.0
+    ctl = 0.0
+    loads: list[tuple[float, float, float, float]] = []
+    for tss in by_day["hrTSS"].sum().reindex(days, fill_value=0.0).tolist():
+        tsb = round(ctl - atl, 1)
+        atl = atl * k_atl + tss * g_atl
+        ctl = ctl * k_ctl + tss * g_ctl
+        loads.append((tss, atl, ctl, tsb))
+
+    columns = [_values(meta[f]) for f in _META_FIELDS]
+    return [
+        {
+            "date": ds,
+            "hrTSS": round(tss, 1) if tss > 0 else None,
+            "atl": round(atl, 1),
+            "ctl": round(ctl, 1),
+            "tsb": tsb,
+            **dict(zip(_META_FIELDS, row)),
+        }
+        for ds, (tss, atl, ctl, tsb), *row in zip(days.strftime("%Y-%m-%d"), loads, *columns)
+    ]
+
+
+def rolling_stats_from_frame(
+    runs: pd.DataFrame,
+    window: int = 10,
+) -> list[dict[str, Any]]:
+    """
+    ``compute_rolling_stats`` over a ``load_history_frame`` frame, with
+    vectorized rolling means: each metric rolls over the runs that recorded
+    it, and runs without it carry the previous value forward.
+    """
+    runs = runs[runs["hrTSS"] > 0]
+
+    def _roll(col: str) -> list[Any]:
+        recorded = runs[col].dropna()
+        means = recorded.rolling(window, min_periods=3).mean()
+        return [None if v is None else round(v, 5) for v in _values(means.reindex(runs.index).ffill())]
+
+    fields = ("date", "activity_name", "distance_km", "hrTSS", "ef", "ef_gap", "decoupling_pct",
+              "ef_roll", "ef_gap_roll", "decoupling_roll", "avg_hr", "avg_pace_min_per_km")
+    columns = {
+        "date": _values(runs["date"].dt.strftime("%Y-%m-%d")),
+        "ef_roll": _roll("ef"),
+        "ef_gap_roll": _roll("ef_gap"),
+        "decoupling_roll": _roll("decoupling_pct"),
+    }
+    for f in fields:
+        if f not in columns:
+            columns[f] = _values(runs[f])
+    return [dict(zip(fields, row)) for row in zip(*(columns[f] for f in fields))]
+
+
 def summarize_trend(
     pmc: list[dict[str, Any]],
     rolling: list[dict[str, Any]],
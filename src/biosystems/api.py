@@ -0,0 +1,508 @@
+"""
+Biosystems Python API
+=====================
+
+In-process equivalents of the CLI's ``--json`` outputs, for callers such as
+the daily running brief that would otherwise shell out to ``biosystems`` and
+parse stdout. Each function returns the same payload the matching command
+prints (plain dicts and lists, JSON-compatible), and the CLI commands are
+built on these functions, so the two cannot drift apart.
+
+    history(since=, min_dist=, source=)          all stored runs, oldest first
+    top(by=, count=, min_dist=, since=, asc=)    biosystems top --json
+    summary(since=, group=, min_dist=, source=)  biosystems summary --json
+    efforts(since=, distances=)                  biosystems efforts --json
+    trend(pmc=, window=)                         biosystems trend --json
+    list_runs(count=)                            biosystems strava --list --json
+    run_report(activity_id, ...)                 biosystems strava ID --json
+    profile(memory=, label=)                     biosystems --profile ...
+
+The ``summary`` and ``strava`` commands also need what sits behind their
+payload (the accumulators for the overall line; the report model and a
+history write whose failure they report), so those steps are public too:
+
+    summary_periods(since, group, min_dist, source)   per-period accumulators
+    summary_rows(periods)                             ``summary`` rows from them
+    strava_report(activity_id, zones_path, temp_c)    (report model, pending history write)
+    persist_report(pending)                           the history write ``run_report`` does
+
+``profile`` (from ``biosystems.profiling``) is a context manager: calls made
+inside it are timed per stage, and ``.report()`` returns the breakdown the
+CLI's ``--profile`` prints. Failures the CLI reports as an error message and exit code 1 raise
+``APIError`` carrying that same message. The module imports nothing heavy;
+each function imports what it needs.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from biosystems.profiling import profile, stage  # noqa: F401 (profile is re-exported)
+
+if TYPE_CHECKING:
+    from biosystems.analytics.rollups import Periods
+    from biosystems.models import FullRunReport
+
+log = logging.getLogger(__name__)
+
+#: ``top --by`` choices → history field.
+TOP_METRICS = {
+    "ef": "ef",
+    "decoupling": "decoupling_pct",
+    "pace": "avg_pace_min_per_km",
+    "tss": "hrTSS",
+    "distance": "distance_km",
+}
+
+#: Effort name → distance in km, for ``efforts`` pace.
+EFFORT_DISTANCES_KM = {
+    "400m": 0.4,
+    "1/2 mile": 0.805,
+    "1K": 1.0,
+    "1 mile": 1.609,
+    "2 mile": 3.219,
+    "5K": 5.0,
+    "10K": 10.0,
+    "15K": 15.0,
+    "10 mile": 16.093,
+    "20K": 20.0,
+    "Half-Marathon": 21.098,
+    "Marathon": 42.195,
+}
+
+DEFAULT_EFFORTS = ("400m", "1K", "1 mile", "5K", "10K", "Half-Marathon")
+
+_NO_HISTORY = "No run history found. Run 'biosystems strava' first, or use --backfill N to seed from Strava."
+
+
+class APIError(RuntimeError):
+    """A step failed; the message is what the CLI would print before exiting with code 1."""
+
+
+# ---------------------------------------------------------------------------
+# History analytics
+# ---------------------------------------------------------------------------
+
+
+def history(
+    since: str | None = None,
+    min_dist: float | None = None,
+    source: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Every stored run, oldest first (the entries ``load_history`` returns).
+
+    Parameters:
+        since (str | None): Keep runs on or after this date (YYYY-MM-DD).
+        min_dist (float | None): Keep runs with ``distance_km >= min_dist``
+            (missing distance counts as 0).
+        source (str | None): Keep runs whose ``source`` equals this value.
+    """
+    from biosystems.analytics.history import load_history
+
+    entries = load_history()
+    if since:
+        entries = [e for e in entries if e.get("date", "") >= since]
+    if min_dist is not None:
+        entries = [e for e in entries if (e.get("distance_km") or 0) >= min_dist]
+    if source:
+        entries = [e for e in entries if e.get("source") == source]
+    return entries
+
+
+def top(
+    by: str = "ef",
+    count: int = 15,
+    min_dist: float = 3.0,
+    since: str | None = None,
+    asc: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    The ``count`` best runs by a metric, as full history entries.
+
+    ``by`` is one of ``TOP_METRICS`` (unknown values rank by EF). Runs without
+    the metric are skipped. Ranking is descending for ef/tss/distance and
+    ascending for pace/decoupling unless ``asc`` is set.
+    """
+    from biosystems.analytics.history import (
+        RAW_COLUMN,
+        load_history,
+        load_history_frame,
+        prefer_frames,
+    )
+
+    field = TOP_METRICS.get(by, "ef")
+    sort_asc = asc if asc else by in ("pace", "decoupling")
+
+    if prefer_frames():
+        import json
+
+        runs = load_history_frame(columns=[field, RAW_COLUMN], since=since, min_dist=min_dist)
+        ranked = runs[runs[field].notna()].sort_values(field, ascending=sort_asc, kind="stable").head(count)
+        return [json.loads(raw) for raw in ranked[RAW_COLUMN]]  # full entries, parsing only these
+
+    entries = load_history()
+    if since:
+        entries = [e for e in entries if e.get("date", "") >= since]
+    entries = [e for e in entries if e.get("distance_km", 0) >= min_dist]
+    entries = [e for e in entries if e.get(field) is not None]
+    return sorted(entries, key=lambda e: e[field], reverse=not sort_asc)[:count]
+
+
+def summary_periods(
+    since: str | None,
+    group: str,
+    min_dist: float,
+    source: str | None,
+) -> Periods:
+    """
+    Per-period accumulators behind ``summary``: the stored rollups, or the runs when filters split a cell.
+
+    For callers that need more than the rows, e.g. ``merge_periods`` for an overall line.
+    """
+    from biosystems.analytics.history import load_history, load_history_frame, prefer_frames
+    from biosystems.analytics.rollups import (
+        METRICS,
+        entry_accumulators,
+        frame_accumulators,
+        load_rollups,
+    )
+
+    grain = group if group in ("week", "all") else "month"
+    periods = load_rollups().periods(grain, since=since, min_dist=min_dist, source=source)
+    if periods is not None:
+        return periods
+    # Filters finer than the rollup cells: aggregate the runs themselves
+    if prefer_frames():
+        runs = load_history_frame(columns=["date", *METRICS], since=since, min_dist=min_dist, source=source)
+        return frame_accumulators(runs, grain)
+    return entry_accumulators(load_history(), grain, since=since, min_dist=min_dist, source=source)
+
+
+def summary_rows(periods: Periods) -> list[dict[str, Any]]:
+    """The ``summary`` payload for ``summary_periods`` output, one row per period."""
+
+    def _rounded(value: float | None, ndigits: int) -> float | None:
+        return None if value is None else round(value, ndigits)
+
+    return [
+        {
+            "period": period,
+            "run_count": accs["distance_km"].count,
+            "ef_mean": _rounded(accs["ef"].mean, 5),
+            "ef_best": _rounded(accs["ef"].best, 5),
+            "decoupling_mean": _rounded(accs["decoupling_pct"].mean, 2),
+            "avg_hr": _rounded(accs["avg_hr"].mean, 1),
+            "avg_pace_min_per_km": _rounded(accs["avg_pace_min_per_km"].mean, 2),
+            "total_tss": round(accs["hrTSS"].total, 1),
+        }
+        for period, accs in periods.items()
+    ]
+
+
+def summary(
+    since: str | None = None,
+    group: str = "month",
+    min_dist: float = 3.0,
+    source: str | None = None,
+) -> list[dict[str, Any]]:
+    """Per-period run count, EF, decoupling, HR, pace and hrTSS (``group``: month | week | all)."""
+    return summary_rows(summary_periods(since, group, min_dist, source))
+
+
+def _effort_times(since: str | None) -> dict[str, list[tuple[str, int]]]:
+    """Every recorded ``(date, elapsed_s)`` per effort distance, in date order."""
+    from collections import defaultdict
+
+    from biosystems.analytics.history import load_history
+
+    entries = load_history()
+    if since:
+        entries = [e for e in entries if e.get("date", "") >= since]
+
+    by_distance: dict[str, list[tuple[str, int]]] = defaultdict(list)
+    for e in entries:
+        for dist, t in (e.get("strava_efforts") or {}).items():
+            if isinstance(t, int) and t > 0:
+                by_distance[dist].append((e["date"], t))
+    return {dist: sorted(times) for dist, times in by_distance.items()}
+
+
+def _effort_times_frame(
+    since: str | None,
+    distances: list[str] | tuple[str, ...],
+) -> dict[str, list[tuple[str, int]]]:
+    """``_effort_times`` for the requested distances, filtered and sorted on ``load_efforts_frame``."""
+    from biosystems.analytics.history import load_efforts_frame
+
+    recorded = load_efforts_frame(since=since, distances=list(distances))
+    recorded = recorded.assign(day=recorded["date"].dt.strftime("%Y-%m-%d"))
+    recorded = recorded.sort_values(["distance", "day", "elapsed_s"], kind="stable")
+    return {
+        str(dist): list(zip(group["day"].tolist(), group["elapsed_s"].tolist()))
+        for dist, group in recorded.groupby("distance", sort=False)
+    }
+
+
+def efforts(
+    since: str | None = None,
+    distances: list[str] | tuple[str, ...] = DEFAULT_EFFORTS,
+) -> list[dict[str, Any]]:
+    """
+    First recorded and best time per effort distance, from the stored ``strava_efforts``.
+
+    One row per requested distance that has recordings, in request order,
+    with the improvement between them and (for 4+ recordings) the last three.
+    """
+    from biosystems.analytics.history import prefer_frames
+
+    by_distance = _effort_times_frame(since, distances) if prefer_frames() else _effort_times(since)
+
+    effort_rows = []
+    for dist in distances:
+        times = by_distance.get(dist, [])
+        if not times:
+            continue
+
+        best_date, best_t = min(times, key=lambda x: x[1])
+        first_date, first_t = times[0]
+        dk = EFFORT_DISTANCES_KM.get(dist, 0)
+        best_pace = round(best_t / 60 / dk, 2) if dk else None
+        improvement_s = first_t - best_t if first_date != best_date or first_t != best_t else None
+        recent = [{"date": d, "elapsed_time_s": t} for d, t in times[-3:]] if len(times) >= 4 else []
+
+        effort_rows.append({
+            "distance": dist,
+            "best_elapsed_s": best_t,
+            "best_date": best_date,
+            "best_pace_min_per_km": best_pace,
+            "first_elapsed_s": first_t,
+            "first_date": first_date,
+            "improvement_s": improvement_s,
+            "recording_count": len(times),
+            "recent": recent,
+        })
+    return effort_rows
+
+
+def trend(pmc: bool = True, window: int = 10) -> dict[str, Any]:
+    """
+    Performance Management Chart and rolling EF/decoupling over the stored runs.
+
+    Returns ``{"summary", "rolling"}`` plus the day-by-day ``"pmc"`` table
+    when ``pmc`` is set.
+
+    Raises:
+        APIError: There is no run history yet.
+    """
+    from biosystems.analytics.history import load_history, load_history_frame, prefer_frames
+    from biosystems.analytics.trending import (
+        compute_pmc,
+        compute_rolling_stats,
+        pmc_from_frame,
+        rolling_stats_from_frame,
+        summarize_trend,
+    )
+
+    if prefer_frames():
+        runs = load_history_frame()
+        if runs.empty:
+            raise APIError(_NO_HISTORY)
+        pmc_data = pmc_from_frame(runs)
+        rolling_data = rolling_stats_from_frame(runs, window=window)
+    else:
+        entries = load_history()
+        if not entries:
+            raise APIError(_NO_HISTORY)
+        pmc_data = compute_pmc(entries)
+        rolling_data = compute_rolling_stats(entries, window=window)
+    output: dict[str, Any] = {"summary": summarize_trend(pmc_data, rolling_data), "rolling": rolling_data}
+    if pmc:
+        output["pmc"] = pmc_data
+    return output
+
+
+# ---------------------------------------------------------------------------
+# Strava
+# ---------------------------------------------------------------------------
+
+
+def _access_token() -> str:
+    from biosystems.ingestion.strava import _refresh_access_token
+
+    try:
+        return _refresh_access_token()
+    except OSError as e:
+        raise APIError(str(e)) from e
+    except Exception as e:
+        raise APIError(f"Auth failed: {e}") from e
+
+
+def _recent_runs(count: int) -> list[dict[str, Any]]:
+    """Raw Strava summaries of the ``count`` most recent runs."""
+    from biosystems.ingestion.strava import fetch_recent_runs
+
+    token = _access_token()
+    try:
+        return fetch_recent_runs(n=count, access_token=token)
+    except Exception as e:
+        raise APIError(f"Failed to fetch activities: {e}") from e
+
+
+def _run_rows(runs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": r["id"],
+            "date": r.get("start_date_local", "")[:10],
+            "name": r.get("name", ""),
+            "distance_km": round(r.get("distance", 0) / 1000, 2),
+            "moving_time_min": round(r.get("moving_time", 0) / 60, 1),
+            "sport_type": r.get("sport_type", ""),
+        }
+        for r in runs
+    ]
+
+
+def list_runs(count: int = 5) -> list[dict[str, Any]]:
+    """The ``count`` most recent Strava runs: id, date, name, distance_km, moving_time_min, sport_type."""
+    return _run_rows(_recent_runs(count))
+
+
+def strava_report(
+    activity_id: int | None,
+    zones_path: Path | None,
+    temp_c: float | None,
+    progress: Callable[[str], None] | None = None,
+) -> tuple[FullRunReport, tuple[dict[str, Any], dict[str, int] | None] | None]:
+    """
+    Fetch a Strava activity (latest run when ``activity_id`` is None) and build its report.
+
+    Returns the report and the ``(history_entry, strava_efforts)`` to persist
+    (None when the stream has no samples to date the run by). ``progress``
+    receives status lines the CLI prints to stderr.
+    """
+    from biosystems._pipeline import (
+        attach_sample_weather,
+        default_zones_path,
+        flag_walks,
+        history_entry_from_report,
+        load_zone_config,
+    )
+    from biosystems.ingestion.strava import fetch_activity_streams, fetch_latest_run
+    from biosystems.models import RunContext
+
+    with stage("strava.auth"):
+        token = _access_token()
+
+    # Fetch streams
+    activity_meta: dict = {}
+    summary: dict = {}
+    try:
+        with stage("strava.fetch"):
+            if activity_id is None:
+                summary, df, activity_meta = fetch_latest_run(access_token=token)
+            else:
+                df, activity_meta = fetch_activity_streams(activity_id, access_token=token)
+    except RuntimeError as e:
+        raise APIError(str(e)) from e
+    except Exception as e:
+        raise APIError(f"Failed to fetch streams: {e}") from e
+    if activity_id is None and progress:
+        progress(f"Using latest run: {summary['name']} ({summary['start_date_local'][:10]})")
+
+    try:
+        with stage("zones"):
+            zone_config = load_zone_config(zones_path or default_zones_path())
+    except Exception as e:
+        raise APIError(f"Error loading zones: {e}") from e
+
+    # --- Walk detection: pace OR cadence below running threshold ---
+    with stage("walk_detection"):
+        flag_walks(df)
+
+    # --- Auto weather context from GPS ---
+    if temp_c is not None:
+        context = RunContext(temperature_c=temp_c)
+    else:
+        context = None
+        lat_col = df["latitude"].dropna()
+        lon_col = df["longitude"].dropna()
+        if not lat_col.empty and not lon_col.empty:
+            from biosystems.environment.weather import WeatherCache, weather_cache_path
+            if progress:
+                progress("Fetching weather context...")
+            try:
+                with stage("weather"), WeatherCache(weather_cache_path(), precision=2) as weather_cache:
+                    context = attach_sample_weather(df, None, weather_cache)
+            except Exception:
+                pass
+
+    # --- Enrich context with wellness data (HRV, RHR, sleep from local cache) ---
+    run_date = str(df.index[0].date()) if len(df) > 0 else None
+    try:
+        from biosystems.wellness.cache import enrich_run_context
+        if run_date:
+            with stage("wellness"):
+                context = enrich_run_context(run_date, context)
+    except Exception:
+        pass  # wellness cache absent or unreadable — degrade gracefully
+
+    # --- Build full run report ---
+    from biosystems.physics.report import build_run_report
+
+    # Activity name comes from the summary (only fetched for the latest run)
+    activity_name = summary.get("name") if activity_id is None else None
+    try:
+        report = build_run_report(
+            df,
+            zone_config,
+            context=context,
+            activity_name=activity_name,
+            activity_meta=activity_meta,
+        )
+    except Exception as e:
+        raise APIError(f"Report generation failed: {e}") from e
+
+    pending = None
+    if run_date:
+        pending = history_entry_from_report(report, run_date, activity_name, activity_id, activity_meta)
+    return report, pending
+
+
+def persist_report(pending: tuple[dict[str, Any], dict[str, int] | None]) -> None:
+    """Append the ``(history_entry, strava_efforts)`` returned by ``strava_report`` to the history."""
+    from biosystems.analytics.history import append_run
+
+    history_entry, strava_efforts = pending
+    with stage("history.write"):
+        append_run(history_entry, strava_efforts=strava_efforts)
+
+
+def run_report(
+    activity_id: int | None = None,
+    zones_path: Path | None = None,
+    temp_c: float | None = None,
+    persist: bool = True,
+) -> dict[str, Any]:
+    """
+    Full run report for a Strava activity (the latest run when ``activity_id`` is None).
+
+    Weather and wellness context are attached as in ``biosystems strava``, and
+    the run is appended to the local history unless ``persist`` is False. A
+    failed history write is logged, not raised — the report is still valid
+    (the CLI signals it with exit code 2).
+
+    Raises:
+        APIError: Authentication, fetching, zone loading or report building failed.
+    """
+    report, pending = strava_report(activity_id, zones_path, temp_c)
+    if persist and pending is not None:
+        try:
+            persist_report(pending)
+        except Exception as exc:
+            log.warning("history write failed — %s", exc)
+    with stage("output"):
+        return report.model_dump(mode="json")
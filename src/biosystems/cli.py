@@ -4,56 +4,40 @@ Bio-Systems CLI
 
 Command-line interface for analyzing human performance metrics.
 Provides a JSON-native output for integration with OpenClaw.
+
+The CLI runs as a short-lived subprocess many times a day, so heavy
+dependencies (pandas, numpy, pyarrow, pydantic models, fitdecode, requests)
+are imported inside the commands that need them, never at module level;
+``tests/test_cli_startup.py`` enforces the budget.
 """
 
+from __future__ import annotations
+
 import os
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import dotenv
 import typer
-import yaml
-from pydantic import ValidationError
 
-from biosystems.ingestion.fit import add_derived_metrics, parse_fit
-from biosystems.ingestion.gpx import parse_gpx
-from biosystems.models import HeartRateZone, RunContext, ZoneConfig
-from biosystems.physics.metrics import run_metrics
+from biosystems._pipeline import (
+    ReportError,
+    default_zones_path,
+    load_zone_config,
+    prefetch_weather_contexts,
+    prefetch_wellness,
+    process_strava_run,
+)
+
+if TYPE_CHECKING:
+    from biosystems.models import RunContext, ZoneConfig
 
 # Load .env using python-dotenv's upward search (CWD → parents).
 # This works for both editable installs (repo root .env) and bare
 # environment injection (OpenClaw / CI), where load_dotenv() is a safe no-op.
 dotenv.load_dotenv()
 
-# _PKG_ROOT is the editable-install repo root, used only as a last-resort
-# fallback for zones_path when neither BIOSYSTEMS_ZONES_PATH nor the
-# XDG config path exists. Under a regular pip install this resolves to
-# site-packages/../../.. (not useful), so _default_zones_path() always
-# tries env var and XDG first.
-_PKG_ROOT = Path(__file__).resolve().parents[2]
-
-
-def _default_zones_path() -> Path:
-    """
-    Determine which zones YAML file to use based on configured priorities.
-
-    Searches in this order and returns the first path found:
-    1. Path specified by the `BIOSYSTEMS_ZONES_PATH` environment variable.
-    2. User config at `~/.config/biosystems/zones.yml` if that file exists.
-    3. Fallback to the repository-installed file at `<repo-root>/data/zones_personal.yml`.
-
-    Returns:
-        Path: Filesystem path to the selected zones YAML file.
-    """
-    env_override = os.environ.get("BIOSYSTEMS_ZONES_PATH")
-    if env_override:
-        return Path(env_override)
-
-    xdg_path = Path.home() / ".config" / "biosystems" / "zones.yml"
-    if xdg_path.exists():
-        return xdg_path
-
-    return _PKG_ROOT / "data" / "zones_personal.yml"
-
 app = typer.Typer(
     help=(
         "Running performance analytics pipeline.\n\n"
@@ -61,6 +45,7 @@ app = typer.Typer(
         "  How have I been trending?     [cyan]biosystems summary[/cyan]\n"
         "  What are my best runs?        [cyan]biosystems top --by ef[/cyan]\n"
         "  Process today's Strava run?   [cyan]biosystems strava[/cyan]\n"
+        "  Pull in new Strava runs?      [cyan]biosystems sync[/cyan]\n"
         "  Catch up on missed runs?      [cyan]biosystems backfill-streams[/cyan]\n"
         "  PMC / fatigue curve?          [cyan]biosystems trend[/cyan]"
     ),
@@ -68,44 +53,48 @@ app = typer.Typer(
 )
 
 
-def load_zone_config(yaml_path: Path) -> ZoneConfig:
-    """Load zones from YAML and return a validated ZoneConfig."""
-    if not yaml_path.exists():
-        raise FileNotFoundError(f"Zone configuration not found at {yaml_path}")
-
-    with yaml_path.open() as f:
-        raw = yaml.safe_load(f)
-
-    # Clean up metadata
-    raw.pop("model", None)
+@app.callback()
+def _global_options(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile",
+        help="Print a per-stage breakdown (calls, wall and CPU time) as JSON to stderr.",
+    ),
+    profile_out: Path | None = typer.Option(
+        None, "--profile-out", dir_okay=False,
+        help="Write the --profile JSON to this file instead of stderr (implies --profile).",
+    ),
+    profile_memory: bool = typer.Option(
+        False, "--profile-memory",
+        help="Add tracemalloc allocation peaks to --profile (slows the command; implies --profile).",
+    ),
+):
+    """Options that apply to every command; give them before the command name."""
+    if not (profile or profile_out or profile_memory):
+        return
+    import json
 
-    zones: dict[str, HeartRateZone] = {}
-    for name, data in raw.items():
-        if not isinstance(data, dict) or "bpm" not in data or "pace_min_per_km" not in data:
-            continue
+    from biosystems.profiling import profile as start_profile
 
-        zones[name] = HeartRateZone(
-            name=name,
-            bpm=tuple(data["bpm"]),
-            pace_min_per_km=tuple(data["pace_min_per_km"]),
-        )
+    def _emit() -> None:
+        text = json.dumps(prof.report(), indent=2)
+        if profile_out is not None:
+            profile_out.write_text(text + "\n")
+        else:
+            typer.echo(text, err=True)
 
-    # Use defaults for physiological markers if not in YAML
-    return ZoneConfig(
-        resting_hr=raw.get("resting_hr", 50),
-        threshold_hr=raw.get("threshold_hr", 186),
-        max_hr=raw.get("max_hr", 201),
-        zones=zones
-    )
+    # Close callbacks run last-registered first: the profile stops, then _emit reports it
+    ctx.call_on_close(_emit)
+    prof = ctx.with_resource(start_profile(memory=profile_memory, label=ctx.invoked_subcommand))
 
 
 @app.command(rich_help_panel="Data Ingestion")
 def analyze(
     file_path: Path = typer.Argument(..., help="Path to activity file (.fit or .gpx)"),
-    zones_path: Path = typer.Option(
-        _default_zones_path(),
+    zones_path: Path | None = typer.Option(
+        None,
         "--zones", "-z",
-        help="Path to zones configuration YAML"
+        help="Path to zones configuration YAML (default: $BIOSYSTEMS_ZONES_PATH or the standard locations)",
     ),
     temp_c: float | None = typer.Option(None, "--temp", help="Ambient temperature in Celsius"),
     json_output: bool = typer.Option(True, "--json/--no-json", help="Output results as JSON"),
@@ -113,10 +102,19 @@ def analyze(
     """
     Analyze an activity file and output physiological metrics.
     """
+    from pydantic import ValidationError
+
+    from biosystems.ingestion.fit import add_derived_metrics, parse_fit
+    from biosystems.ingestion.gpx import parse_gpx
+    from biosystems.models import RunContext
+    from biosystems.physics.metrics import run_metrics
+    from biosystems.profiling import stage
+
     try:
         # 1. Load configuration
         try:
-            zone_config = load_zone_config(zones_path)
+            with stage("zones"):
+                zone_config = load_zone_config(zones_path or default_zones_path())
         except Exception as e:
             typer.secho(f"Error loading zones: {e}", fg=typer.colors.RED, err=True)
             raise typer.Exit(code=1)
@@ -124,14 +122,16 @@ def analyze(
         # 2. Parse activity
         suffix = file_path.suffix.lower()
         if suffix == ".fit":
-            df = parse_fit(file_path)
-            df = add_derived_metrics(df)
+            with stage("parse"):
+                df = parse_fit(file_path)
+                df = add_derived_metrics(df)
         elif suffix == ".gpx":
-            df = parse_gpx(file_path)
-            # GPX parser already adds derived metrics (dist, dt, etc.)
-            # But we might need to rename columns for consistency with metrics.py
-            if "time" in df.columns:
-                df = df.rename(columns={"time": "timestamp"}).set_index("timestamp")
+            with stage("parse"):
+                df = parse_gpx(file_path)
+                # GPX parser already adds derived metrics (dist, dt, etc.)
+                # But we might need to rename columns for consistency with metrics.py
+                if "time" in df.columns:
+                    df = df.rename(columns={"time": "timestamp"}).set_index("timestamp")
         else:
             typer.secho(f"Unsupported file format: {suffix}", fg=typer.colors.RED, err=True)
             raise typer.Exit(code=1)
@@ -144,7 +144,8 @@ def analyze(
 
         # 5. Output
         if json_output:
-            typer.echo(metrics.model_dump_json(indent=2))
+            with stage("output"):
+                typer.echo(metrics.model_dump_json(indent=2))
         else:
             typer.secho("\n--- Physiological Metrics ---", fg=typer.colors.CYAN, bold=True)
             typer.echo(f"Distance:     {metrics.distance_km:.2f} km")
@@ -168,10 +169,10 @@ def strava(
     activity_id: int | None = typer.Argument(
         None, help="Strava activity ID. Omit to use the most recent run."
     ),
-    zones_path: Path = typer.Option(
-        _default_zones_path(),
+    zones_path: Path | None = typer.Option(
+        None,
         "--zones", "-z",
-        help="Path to zones configuration YAML",
+        help="Path to zones configuration YAML (default: $BIOSYSTEMS_ZONES_PATH or the standard locations)",
     ),
     temp_c: float | None = typer.Option(None, "--temp", help="Ambient temperature in Celsius"),
     json_output: bool = typer.Option(True, "--json/--no-json", help="Output results as JSON"),
@@ -193,7 +194,8 @@ def strava(
     Parameters:
         activity_id (int | None): Strava activity ID to fetch; omit to use the most
             recent run.
-        zones_path (Path): Path to zones configuration YAML.
+        zones_path (Path | None): Path to zones configuration YAML; None resolves
+            ``default_zones_path()`` when the command runs.
         temp_c (float | None): Override ambient temperature in Celsius for the run
             context; when omitted the command attempts to fetch weather from GPS.
         json_output (bool): When true emit the full report as JSON; otherwise print
@@ -201,28 +203,14 @@ def strava(
         list_runs (bool): If true list recent runs and exit instead of analyzing an activity.
         n (int): Number of recent runs to list when --list is used.
     """
-    from biosystems.ingestion.strava import (
-        _refresh_access_token,
-        fetch_activity_streams,
-        fetch_latest_run,
-        fetch_recent_runs,
-    )
-
-    try:
-        token = _refresh_access_token()
-    except OSError as e:
-        typer.secho(str(e), fg=typer.colors.RED, err=True)
-        raise typer.Exit(code=1)
-    except Exception as e:
-        typer.secho(f"Auth failed: {e}", fg=typer.colors.RED, err=True)
-        raise typer.Exit(code=1)
+    from biosystems import api
 
     # --list mode: print recent runs and exit
     if list_runs:
         try:
-            runs = fetch_recent_runs(n=n, access_token=token)
-        except Exception as e:
-            typer.secho(f"Failed to fetch activities: {e}", fg=typer.colors.RED, err=True)
+            runs = api.list_runs(n)
+        except api.APIError as e:
+            typer.secho(str(e), fg=typer.colors.RED, err=True)
             raise typer.Exit(code=1)
 
         if not runs:
@@ -234,139 +222,28 @@ def strava(
 
         if json_output:
             import json as _json
-            payload = [
-                {
-                    "id": r["id"],
-                    "date": r.get("start_date_local", "")[:10],
-                    "name": r.get("name", ""),
-                    "distance_km": round(r.get("distance", 0) / 1000, 2),
-                    "moving_time_min": round(r.get("moving_time", 0) / 60, 1),
-                    "sport_type": r.get("sport_type", ""),
-                }
-                for r in runs
-            ]
-            typer.echo(_json.dumps(payload, indent=2))
+            typer.echo(_json.dumps(runs, indent=2))
         else:
             for r in runs:
-                dist_km = r.get("distance", 0) / 1000
-                moving_min = r.get("moving_time", 0) / 60
                 typer.echo(
-                    f"  {r['id']}  {r['start_date_local'][:10]}  "
-                    f"{r['name']:<30}  {dist_km:.1f}km  {moving_min:.0f}min"
+                    f"  {r['id']}  {r['date']}  "
+                    f"{r['name']:<30}  {r['distance_km']:.1f}km  {r['moving_time_min']:.0f}min"
                 )
         raise typer.Exit()
 
-    # Fetch streams
-    activity_meta: dict = {}
-    try:
-        if activity_id is None:
-            summary, df, activity_meta = fetch_latest_run(access_token=token)
-            typer.secho(
-                f"Using latest run: {summary['name']} ({summary['start_date_local'][:10]})",
-                fg=typer.colors.CYAN,
-                err=True,
-            )
-        else:
-            df, activity_meta = fetch_activity_streams(activity_id, access_token=token)
-    except RuntimeError as e:
-        typer.secho(str(e), fg=typer.colors.RED, err=True)
-        raise typer.Exit(code=1)
-    except Exception as e:
-        typer.secho(f"Failed to fetch streams: {e}", fg=typer.colors.RED, err=True)
-        raise typer.Exit(code=1)
-
-    # Load zone config
-    try:
-        zone_config = load_zone_config(zones_path)
-    except Exception as e:
-        typer.secho(f"Error loading zones: {e}", fg=typer.colors.RED, err=True)
-        raise typer.Exit(code=1)
-
-    # --- Walk detection: pace OR cadence below running threshold ---
-    df["pace_min_per_km"] = df["pace_sec_km"] / 60
-    df["is_walk"] = (df["pace_min_per_km"] > 9.5) | (df["cadence"].fillna(999) < 140)
-    if "moving" in df.columns:
-        df["is_walk"] = df["is_walk"] | (~df["moving"].fillna(True).astype(bool))
+    def _progress(message: str) -> None:
+        typer.secho(message, fg=typer.colors.CYAN, err=True)
 
-    # --- Auto weather context from GPS ---
-    if temp_c is not None:
-        context = RunContext(temperature_c=temp_c)
-    else:
-        context = None
-        lat_col = df["latitude"].dropna()
-        lon_col = df["longitude"].dropna()
-        if not lat_col.empty and not lon_col.empty:
-            from biosystems.environment.weather import WMO_WEATHER_CODES, fetch_weather_open_meteo
-            lat = float(lat_col.median())
-            lon = float(lon_col.median())
-            start_dt = df.index[0].to_pydatetime()
-            typer.secho("Fetching weather context...", fg=typer.colors.CYAN, err=True)
-            try:
-                weather, _ = fetch_weather_open_meteo(lat, lon, start_dt)
-                if weather and "hourly" in weather:
-                    hourly = weather["hourly"]
-                    code = hourly["weathercode"][0] if hourly.get("weathercode") else None
-                    context = RunContext(
-                        temperature_c=hourly["temperature_2m"][0] if hourly.get("temperature_2m") else None,
-                        weather_code=code,
-                        weather_description=WMO_WEATHER_CODES.get(int(code), "Unknown") if code is not None else None,
-                    )
-            except Exception:
-                pass
-
-    # --- Enrich context with wellness data (HRV, RHR, sleep from local cache) ---
     try:
-        from biosystems.wellness.cache import enrich_run_context
-        run_date_str = str(df.index[0].date()) if len(df) > 0 else None
-        if run_date_str:
-            context = enrich_run_context(run_date_str, context)
-    except Exception:
-        pass  # wellness cache absent or unreadable — degrade gracefully
-
-    # --- Build full run report ---
-    from biosystems.physics.report import build_run_report
-
-    # Determine activity name from summary (only available when activity_id is None)
-    activity_name_str: str | None = summary.get("name") if activity_id is None else None
-
-    try:
-        report = build_run_report(
-            df,
-            zone_config,
-            context=context,
-            activity_name=activity_name_str,
-            activity_meta=activity_meta,
-        )
-    except Exception as e:
-        typer.secho(f"Report generation failed: {e}", fg=typer.colors.RED, err=True)
+        report, pending = api.strava_report(activity_id, zones_path, temp_c, progress=_progress)
+    except api.APIError as e:
+        typer.secho(str(e), fg=typer.colors.RED, err=True)
         raise typer.Exit(code=1)
 
     # --- Persist to local run history ---
-    from biosystems.analytics.history import append_run
-    run_date = str(df.index[0].date()) if len(df) > 0 else None
-    if run_date:
-        history_entry: dict = {
-            "date": run_date,
-            "hrTSS": round(report.run_only.hr_tss, 1),
-            "distance_km": round(report.run_only.distance_km, 2),
-            "avg_hr": round(report.run_only.avg_hr, 1),
-            "avg_pace_min_per_km": round(report.run_only.avg_pace_min_per_km, 2),
-            "ef": round(report.run_only.efficiency_factor, 5),
-            "ef_gap": report.ef_grade_adjusted,
-            "decoupling_pct": round(report.run_only.decoupling_pct, 2),
-            "avg_cadence": round(report.run_only.avg_cadence, 1) if report.run_only.avg_cadence else None,
-            "activity_name": activity_name_str,
-            "source": "biosystems_strava",
-        }
-        if activity_id is not None:
-            history_entry["strava_activity_id"] = activity_id
-        strava_efforts_store: dict[str, int] = {
-            e["name"]: e["elapsed_time_s"]
-            for e in activity_meta.get("best_efforts", [])
-            if e.get("name") and e.get("elapsed_time_s")
-        }
+    if pending is not None:
         try:
-            append_run(history_entry, strava_efforts=strava_efforts_store or None)
+            api.persist_report(pending)
         except Exception as exc:
             typer.secho(f"WARNING: history write failed — {exc}", fg=typer.colors.YELLOW, err=True)
             if not json_output:
@@ -376,7 +253,10 @@ def strava(
             raise typer.Exit(code=2)  # 2 = analysis OK, persistence failed
 
     if json_output:
-        typer.echo(report.model_dump_json(indent=2))
+        from biosystems.profiling import stage
+
+        with stage("output"):
+            typer.echo(report.model_dump_json(indent=2))
     else:
         m = report.run_only
         typer.secho("\n--- Run Only ---", fg=typer.colors.CYAN, bold=True)
@@ -475,13 +355,17 @@ def strava(
 @app.command(name="backfill-efforts", rich_help_panel="Data Ingestion")
 def backfill_efforts(
     n: int = typer.Argument(50, help="Number of recent runs to backfill efforts for"),
+    chunk_size: int = typer.Option(
+        10, "--chunk-size", min=1,
+        help="Commit to history every N runs (a crash loses at most one chunk).",
+    ),
 ):
     """
     Backfill Strava-detected best-effort times for recent runs into the local history.
 
-    Fetches the last N run summaries from Strava, retrieves each activity's best-effort records (e.g., 400m, 1K, 5K), and appends or merges those effort times into the local history store. Creates a minimal history entry when no existing entry is present. Skips activities that cannot be fetched or that have no effort data.
+    Fetches the last N run summaries from Strava, retrieves each activity's best-effort records (e.g., 400m, 1K, 5K), and appends or merges those effort times into the local history store. Creates a minimal history entry when no existing entry is present. Skips activities that cannot be fetched or that have no effort data. Entries are committed in chunks of ``--chunk-size`` with one history rewrite per chunk.
     """
-    from biosystems.analytics.history import append_run, load_history
+    from biosystems.analytics.history import append_runs, load_history
     from biosystems.ingestion.strava import (
         _refresh_access_token,
         fetch_activity_efforts,
@@ -503,6 +387,21 @@ def backfill_efforts(
 
     existing = {e["date"]: e for e in load_history()}
     updated = 0
+    pending: list[dict] = []
+
+    def _commit() -> None:
+        nonlocal updated
+        if not pending:
+            return
+        try:
+            append_runs(pending)
+            updated += len(pending)
+        except Exception as exc:
+            typer.secho(
+                f"  [warn]  history write failed for {len(pending)} entries: {exc}",
+                fg=typer.colors.YELLOW, err=True,
+            )
+        pending.clear()
 
     for summary in runs:
         activity_id = summary["id"]
@@ -534,10 +433,13 @@ def backfill_efforts(
                 "source": "strava_efforts_only",
             }
 
-        append_run(entry, strava_efforts=efforts_dict)
-        updated += 1
+        entry["strava_efforts"] = efforts_dict
+        pending.append(entry)
         typer.echo(f"  {run_date}  {summary.get('name', ''):<30}  {len(efforts_dict)} efforts")
+        if len(pending) >= chunk_size:
+            _commit()
 
+    _commit()
     typer.secho(f"\nUpdated {updated}/{len(runs)} entries with effort data.", fg=typer.colors.GREEN)
 
 
@@ -548,10 +450,10 @@ def backfill_streams(
         "--after",
         help="Fetch all runs on or after this date (YYYY-MM-DD). Default: day after study end.",
     ),
-    zones_path: Path = typer.Option(
-        _default_zones_path(),
+    zones_path: Path | None = typer.Option(
+        None,
         "--zones", "-z",
-        help="Path to zones configuration YAML",
+        help="Path to zones configuration YAML (default: $BIOSYSTEMS_ZONES_PATH or the standard locations)",
     ),
     skip_existing: bool = typer.Option(
         True,
@@ -567,23 +469,27 @@ def backfill_streams(
         # 1.5 s was ~12× too fast and would hit 429 after ~7 runs.
         help="Seconds to sleep between runs (default 18 s respects Strava 100 req/15 min limit).",
     ),
+    chunk_size: int = typer.Option(
+        10, "--chunk-size", min=1,
+        help="Commit to history every N runs (a crash loses at most one chunk).",
+    ),
+    weather: bool = typer.Option(
+        True, "--weather/--no-weather",
+        help="Attach weather context (batched Open-Meteo fetch, one request per location/date span).",
+    ),
 ):
     """
     Backfill full stream metrics for all runs since a given date.
 
     Fetches GPS/HR streams for every run, computes EF, decoupling, hrTSS, and
     saves each to local history as a biosystems_strava entry. Much slower than
-    backfill-efforts but produces complete physiological metrics.
+    backfill-efforts but produces complete physiological metrics. Entries are
+    committed in chunks of ``--chunk-size`` with one history rewrite per chunk.
     """
     import time
 
-    from biosystems.analytics.history import append_run, load_history
-    from biosystems.ingestion.strava import (
-        _refresh_access_token,
-        fetch_activity_streams,
-        fetch_runs_since,
-    )
-    from biosystems.physics.report import build_run_report
+    from biosystems.analytics.history import append_runs, load_history
+    from biosystems.ingestion.strava import _refresh_access_token, fetch_runs_since
 
     try:
         token = _refresh_access_token()
@@ -592,7 +498,7 @@ def backfill_streams(
         raise typer.Exit(code=1)
 
     try:
-        zone_config = load_zone_config(zones_path)
+        zone_config = load_zone_config(zones_path or default_zones_path())
     except Exception as e:
         typer.secho(f"Error loading zones: {e}", fg=typer.colors.RED, err=True)
         raise typer.Exit(code=1)
@@ -622,102 +528,318 @@ def backfill_streams(
                 else:
                     existing_stream_dates.add(entry["date"])
 
+    to_process = [
+        r for r in runs
+        if not (skip_existing and (
+            r["id"] in existing_stream_ids
+            or (not existing_stream_ids and r.get("start_date_local", "")[:10] in existing_stream_dates)
+        ))
+    ]
+    from biosystems.environment.weather import WeatherCache, weather_cache_path
+
+    weather_contexts: dict[int, RunContext] = {}
     processed = 0
     skipped = 0
     failed = 0
+    pending: list[tuple[dict, str]] = []
 
-    # Strava returns newest-first; reverse to process chronologically
-    for summary in reversed(runs):
-        activity_id = summary["id"]
-        run_date = summary.get("start_date_local", "")[:10]
-        activity_name = summary.get("name", "")
-        dist_km = summary.get("distance", 0) / 1000
-        moving_min = summary.get("moving_time", 0) / 60
-
-        label = f"{run_date}  {activity_name:<28}  {dist_km:.1f}km  {moving_min:.0f}min"
-
-        if skip_existing and (
-            activity_id in existing_stream_ids
-            or (not existing_stream_ids and run_date in existing_stream_dates)
-        ):
-            typer.echo(f"  [skip]  {label}")
-            skipped += 1
-            continue
-
+    def _commit() -> None:
+        nonlocal processed, failed
+        if not pending:
+            return
         try:
-            df, activity_meta = fetch_activity_streams(activity_id, access_token=token)
-        except Exception as e:
-            typer.secho(f"  [fail]  {label}  — {e}", fg=typer.colors.RED, err=True)
-            failed += 1
+            append_runs([entry for entry, _ in pending])
+            processed += len(pending)
+        except Exception as exc:
+            for _, pending_label in pending:
+                typer.secho(
+                    f"  [warn]  {pending_label}  — history write failed: {exc}",
+                    fg=typer.colors.YELLOW, err=True,
+                )
+            failed += len(pending)
+        pending.clear()
+
+    with WeatherCache(weather_cache_path(), precision=2) if weather else nullcontext() as weather_cache:
+        if weather_cache is not None:
+            typer.secho("Fetching weather context (batched)...", fg=typer.colors.CYAN, err=True)
+            try:
+                weather_contexts = prefetch_weather_contexts(to_process, cache=weather_cache)
+            except Exception as e:
+                typer.secho(f"  [warn]  weather prefetch failed: {e}", fg=typer.colors.YELLOW, err=True)
+        run_wellness = prefetch_wellness(to_process)
+
+        # Strava returns newest-first; reverse to process chronologically
+        for summary in reversed(runs):
+            activity_id = summary["id"]
+            run_date = summary.get("start_date_local", "")[:10]
+            activity_name = summary.get("name", "")
+            dist_km = summary.get("distance", 0) / 1000
+            moving_min = summary.get("moving_time", 0) / 60
+
+            label = f"{run_date}  {activity_name:<28}  {dist_km:.1f}km  {moving_min:.0f}min"
+
+            if skip_existing and (
+                activity_id in existing_stream_ids
+                or (not existing_stream_ids and run_date in existing_stream_dates)
+            ):
+                typer.echo(f"  [skip]  {label}")
+                skipped += 1
+                continue
+
+            try:
+                report, history_entry, strava_efforts_store = process_strava_run(
+                    summary, token, zone_config, weather_contexts, weather_cache, run_wellness
+                )
+            except ReportError as e:
+                typer.secho(f"  [fail]  {label}  — report: {e}", fg=typer.colors.RED, err=True)
+                failed += 1
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                typer.secho(f"  [fail]  {label}  — {e}", fg=typer.colors.RED, err=True)
+                failed += 1
+                time.sleep(delay)
+                continue
+
+            if strava_efforts_store:
+                history_entry["strava_efforts"] = strava_efforts_store
+            pending.append((history_entry, label))
+
+            m = report.run_only
+            ef_str = f"EF={m.efficiency_factor:.5f}"
+            dec_str = f"Dec={m.decoupling_pct:+.1f}%"
+            typer.secho(f"  [ok]    {label}  {ef_str}  {dec_str}", fg=typer.colors.GREEN)
+            if len(pending) >= chunk_size:
+                _commit()
             time.sleep(delay)
-            continue
 
-        # Walk detection: pace OR cadence below running threshold
-        df["pace_min_per_km"] = df["pace_sec_km"] / 60
-        df["is_walk"] = (df["pace_min_per_km"] > 9.5) | (df["cadence"].fillna(999) < 140)
-        if "moving" in df.columns:
-            df["is_walk"] = df["is_walk"] | (~df["moving"].fillna(True).astype(bool))
+        _commit()
+    typer.secho(
+        f"\nDone: {processed} processed, {skipped} skipped, {failed} failed.",
+        fg=typer.colors.CYAN,
+    )
 
-        # Enrich context with wellness data for this run's date
-        backfill_context = None
+
+@app.command(rich_help_panel="Data Ingestion")
+def sync(
+    after: str | None = typer.Option(
+        None,
+        "--after",
+        help=(
+            "Seed date (YYYY-MM-DD) used only when no sync cursor exists yet. "
+            "Default: date of the latest history entry (or 30 days ago)."
+        ),
+    ),
+    zones_path: Path | None = typer.Option(
+        None,
+        "--zones", "-z",
+        help="Path to zones configuration YAML (default: $BIOSYSTEMS_ZONES_PATH or the standard locations)",
+    ),
+    delay: float = typer.Option(
+        18.0,
+        "--delay",
+        help="Seconds to sleep between runs (default 18 s respects Strava 100 req/15 min limit).",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="List pending activities without ingesting or moving the cursor."
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Emit a JSON summary on stdout"),
+):
+    """
+    Incrementally ingest new Strava runs since the last sync.
+
+    Keeps a high-water mark (latest ingested start time + activity ID) in
+    ~/.biosystems/strava_cursor.json and lists only activities after it, so a
+    daily sync costs one small list request plus two requests per new run.
+    Runs are ingested oldest-first and the cursor advances after each one; a
+    network/API failure stops the sync so the next invocation resumes there.
+    """
+    import json as _json
+    import time
+    from datetime import date, datetime, timedelta, timezone
+
+    from biosystems.analytics.history import (
+        advance_sync_cursor,
+        append_run,
+        is_after_cursor,
+        load_history,
+        load_sync_cursor,
+    )
+    from biosystems.ingestion.strava import _refresh_access_token, fetch_runs_after
+
+    def _epoch(iso: str) -> int:
+        return int(datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp())
+
+    cursor = load_sync_cursor()
+    history = load_history()
+
+    if cursor is not None:
+        # Strava's `after` is exclusive; back off one second and filter by
+        # (start_date, id) so same-second activities are not lost.
+        after_epoch = _epoch(cursor["start_date"]) - 1
+        origin = f"cursor {cursor['start_date']} (id {cursor['activity_id']})"
+    else:
+        seed = after or (history[-1]["date"] if history else None)
+        if seed is None:
+            seed = (date.today() - timedelta(days=30)).isoformat()
         try:
-            from biosystems.wellness.cache import enrich_run_context
-            backfill_context = enrich_run_context(run_date, None)
-        except Exception:
-            pass
+            seed_dt = datetime.strptime(seed, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            typer.secho(f"Invalid --after date: {seed!r} (expected YYYY-MM-DD)", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=1)
+        after_epoch = int(seed_dt.timestamp())
+        origin = f"seed date {seed} (no cursor yet)"
+
+    try:
+        token = _refresh_access_token()
+    except Exception as e:
+        typer.secho(f"Auth failed: {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    typer.secho(f"Listing runs after {origin}...", fg=typer.colors.CYAN, err=True)
+    try:
+        runs = fetch_runs_after(after_epoch, access_token=token)
+    except Exception as e:
+        typer.secho(f"Failed to list activities: {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    pending = sorted(
+        (r for r in runs if r.get("start_date") and is_after_cursor(r, cursor)),
+        key=lambda r: (r["start_date"], int(r["id"])),
+    )
+
+    existing_ids: set[int] = set()
+    existing_dates: set[str] = set()
+    for entry in history:
+        if entry.get("source") == "biosystems_strava":
+            aid = entry.get("strava_activity_id")
+            if aid:
+                existing_ids.add(int(aid))
+            else:
+                existing_dates.add(entry["date"])
+
+    def _label(r: dict) -> str:
+        return (
+            f"{r.get('start_date_local', '')[:10]}  {r.get('name', ''):<28}  "
+            f"{r.get('distance', 0) / 1000:.1f}km  {r.get('moving_time', 0) / 60:.0f}min"
+        )
 
+    if dry_run:
+        if json_output:
+            typer.echo(_json.dumps({
+                "cursor": cursor,
+                "pending": [
+                    {"id": r["id"], "start_date": r["start_date"], "name": r.get("name", "")}
+                    for r in pending
+                ],
+            }, indent=2))
+        else:
+            for r in pending:
+                typer.echo(f"  [new]   {_label(r)}")
+            typer.secho(f"\n{len(pending)} new run(s) pending.", fg=typer.colors.CYAN)
+        raise typer.Exit()
+
+    zone_config: ZoneConfig | None = None
+    if pending:
         try:
-            report = build_run_report(
-                df,
-                zone_config,
-                context=backfill_context,
-                activity_name=activity_name,
-                activity_meta=activity_meta,
-            )
+            zone_config = load_zone_config(zones_path or default_zones_path())
         except Exception as e:
-            typer.secho(f"  [fail]  {label}  — report: {e}", fg=typer.colors.RED, err=True)
-            failed += 1
-            time.sleep(delay)
-            continue
+            typer.secho(f"Error loading zones: {e}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=1)
 
-        m = report.run_only
-        history_entry: dict = {
-            "date": run_date,
-            "strava_activity_id": activity_id,
-            "hrTSS": round(m.hr_tss, 1),
-            "distance_km": round(m.distance_km, 2),
-            "avg_hr": round(m.avg_hr, 1),
-            "avg_pace_min_per_km": round(m.avg_pace_min_per_km, 2),
-            "ef": round(m.efficiency_factor, 5),
-            "ef_gap": report.ef_grade_adjusted,
-            "decoupling_pct": round(m.decoupling_pct, 2),
-            "avg_cadence": round(m.avg_cadence, 1) if m.avg_cadence else None,
-            "activity_name": activity_name,
-            "source": "biosystems_strava",
-        }
-        strava_efforts_store: dict[str, int] = {
-            e["name"]: e["elapsed_time_s"]
-            for e in activity_meta.get("best_efforts", [])
-            if e.get("name") and e.get("elapsed_time_s")
-        }
-        try:
-            append_run(history_entry, strava_efforts=strava_efforts_store or None)
-        except Exception as exc:
-            typer.secho(f"  [warn]  {label}  — history write failed: {exc}", fg=typer.colors.YELLOW, err=True)
-            failed += 1
-            time.sleep(delay)
-            continue
+    from biosystems.environment.weather import WeatherCache, weather_cache_path
 
-        ef_str = f"EF={m.efficiency_factor:.5f}"
-        dec_str = f"Dec={m.decoupling_pct:+.1f}%"
-        typer.secho(f"  [ok]    {label}  {ef_str}  {dec_str}", fg=typer.colors.GREEN)
-        processed += 1
-        time.sleep(delay)
+    ingested: list[dict] = []
+    skipped = 0
+    failed = 0
+    stopped = False
 
-    typer.secho(
-        f"\nDone: {processed} processed, {skipped} skipped, {failed} failed.",
-        fg=typer.colors.CYAN,
-    )
+    with WeatherCache(weather_cache_path(), precision=2) if pending else nullcontext() as weather_cache:
+        weather_contexts: dict[int, RunContext] = {}
+        if weather_cache is not None:
+            try:
+                weather_contexts = prefetch_weather_contexts(pending, cache=weather_cache)
+            except Exception as e:
+                typer.secho(f"  [warn]  weather prefetch failed: {e}", fg=typer.colors.YELLOW, err=True)
+        run_wellness = prefetch_wellness(pending)
+
+        for i, summary in enumerate(pending):
+            activity_id = int(summary["id"])
+            run_date = summary.get("start_date_local", "")[:10]
+            activity_name = summary.get("name", "")
+            label = _label(summary)
+
+            if activity_id in existing_ids or (not existing_ids and run_date in existing_dates):
+                if not json_output:
+                    typer.echo(f"  [skip]  {label}")
+                skipped += 1
+                cursor = advance_sync_cursor(summary["start_date"], activity_id)
+                continue
+
+            if i > 0 and delay > 0:
+                time.sleep(delay)
+
+            assert zone_config is not None  # loaded above whenever runs are pending
+            try:
+                report, history_entry, strava_efforts_store = process_strava_run(
+                    summary, token, zone_config, weather_contexts, weather_cache, run_wellness
+                )
+            except ReportError as e:
+                # Data problem with this activity — retrying will not help, so move past it
+                typer.secho(f"  [fail]  {label}  — report: {e}", fg=typer.colors.RED, err=True)
+                failed += 1
+                cursor = advance_sync_cursor(summary["start_date"], activity_id)
+                continue
+            except Exception as e:
+                # Transient/API failure: stop without moving the cursor past this run
+                typer.secho(f"  [fail]  {label}  — {e}", fg=typer.colors.RED, err=True)
+                failed += 1
+                stopped = True
+                break
+
+            try:
+                append_run(history_entry, strava_efforts=strava_efforts_store)
+            except Exception as exc:
+                typer.secho(f"  [fail]  {label}  — history write failed: {exc}", fg=typer.colors.RED, err=True)
+                failed += 1
+                stopped = True
+                break
+
+            cursor = advance_sync_cursor(summary["start_date"], activity_id)
+            existing_ids.add(activity_id)
+            ingested.append({
+                "id": activity_id,
+                "date": run_date,
+                "name": activity_name,
+                "distance_km": history_entry["distance_km"],
+                "ef": history_entry["ef"],
+                "hrTSS": history_entry["hrTSS"],
+            })
+            if not json_output:
+                m = report.run_only
+                typer.secho(
+                    f"  [ok]    {label}  EF={m.efficiency_factor:.5f}  Dec={m.decoupling_pct:+.1f}%",
+                    fg=typer.colors.GREEN,
+                )
+
+    if json_output:
+        typer.echo(_json.dumps({
+            "cursor": cursor,
+            "ingested": ingested,
+            "skipped": skipped,
+            "failed": failed,
+            "complete": not stopped,
+        }, indent=2))
+    elif not pending:
+        typer.echo("Already up to date.")
+    else:
+        typer.secho(
+            f"\nDone: {len(ingested)} ingested, {skipped} skipped, {failed} failed.",
+            fg=typer.colors.CYAN,
+        )
+
+    if stopped:
+        raise typer.Exit(code=1)
 
 
 @app.command(rich_help_panel="Analytics")
@@ -740,57 +862,14 @@ def summary(
         source (str | None): If provided, include only runs whose `source` field equals this value.
         json_output (bool): When true, emit the period rows as a JSON array instead of human-readable text.
     """
-    from collections import defaultdict
-
-    from biosystems.analytics.history import load_history
-
-    entries = load_history()
+    from biosystems import api
+    from biosystems.analytics.rollups import merge_periods
 
-    # Filters
-    if since:
-        entries = [e for e in entries if e.get("date", "") >= since]
-    if source:
-        entries = [e for e in entries if e.get("source") == source]
-    entries = [e for e in entries if e.get("distance_km", 0) >= min_dist]
-
-    if not entries:
+    periods = api.summary_periods(since, group, min_dist, source)
+    if not periods:
         typer.echo("No entries match the given filters.")
         raise typer.Exit()
-
-    def _group_key(date_str: str) -> str:
-        if group == "week":
-            from datetime import datetime
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-            iso = dt.isocalendar()
-            return f"{iso[0]}-W{iso[1]:02d}"
-        elif group == "all":
-            return "all"
-        else:  # month
-            return date_str[:7]
-
-    by_group: dict[str, list[dict]] = defaultdict(list)
-    for e in entries:
-        by_group[_group_key(e["date"])].append(e)
-
-    # Build period rows
-    period_rows = []
-    for period in sorted(by_group):
-        runs = by_group[period]
-        efs = [e["ef"] for e in runs if e.get("ef")]
-        decs = [e["decoupling_pct"] for e in runs if e.get("decoupling_pct") is not None]
-        hrs = [e["avg_hr"] for e in runs if e.get("avg_hr")]
-        paces = [e["avg_pace_min_per_km"] for e in runs if e.get("avg_pace_min_per_km")]
-        tss_total = sum(e.get("hrTSS", 0) for e in runs)
-        period_rows.append({
-            "period": period,
-            "run_count": len(runs),
-            "ef_mean": round(sum(efs) / len(efs), 5) if efs else None,
-            "ef_best": round(max(efs), 5) if efs else None,
-            "decoupling_mean": round(sum(decs) / len(decs), 2) if decs else None,
-            "avg_hr": round(sum(hrs) / len(hrs), 1) if hrs else None,
-            "avg_pace_min_per_km": round(sum(paces) / len(paces), 2) if paces else None,
-            "total_tss": round(tss_total, 1),
-        })
+    period_rows = api.summary_rows(periods)
 
     if json_output:
         import json as _json
@@ -809,12 +888,13 @@ def summary(
         typer.echo(f"{row['period']:<12}  {row['run_count']:>4}  {ef_mean_str:>8}  {ef_best_str:>8}  {dec_str:>8}  {hr_str:>7}  {pace_str:>10}  {row['total_tss']:>6.0f}")
 
     typer.echo()
-    all_efs = [e["ef"] for e in entries if e.get("ef")]
-    all_decs = [e["decoupling_pct"] for e in entries if e.get("decoupling_pct") is not None]
-    if all_efs:
+    overall = merge_periods(periods.values())
+    if overall["ef"].count:
+        dec_mean = overall["decoupling_pct"].mean
         typer.secho(
-            f"Overall  {len(entries):>4} runs  EF {sum(all_efs)/len(all_efs):.5f} mean / {max(all_efs):.5f} best  "
-            f"Decoupling {sum(all_decs)/len(all_decs):.1f}% avg",
+            f"Overall  {overall['distance_km'].count:>4} runs  "
+            f"EF {overall['ef'].mean:.5f} mean / {overall['ef'].best:.5f} best  "
+            f"Decoupling {f'{dec_mean:.1f}%' if dec_mean is not None else '—'} avg",
             fg=typer.colors.CYAN,
         )
 
@@ -842,61 +922,10 @@ def efforts(
       biosystems efforts --since 2025-09-08       # post-study only
       biosystems efforts --distances 5K,10K       # specific distances
     """
-    from biosystems.analytics.history import load_history
-
-    dist_km_map = {
-        "400m": 0.4,
-        "1/2 mile": 0.805,
-        "1K": 1.0,
-        "1 mile": 1.609,
-        "2 mile": 3.219,
-        "5K": 5.0,
-        "10K": 10.0,
-        "15K": 15.0,
-        "10 mile": 16.093,
-        "20K": 20.0,
-        "Half-Marathon": 21.098,
-        "Marathon": 42.195,
-    }
+    from biosystems import api
 
     target_distances = [d.strip() for d in distances.split(",")]
-
-    entries = load_history()
-    if since:
-        entries = [e for e in entries if e.get("date", "") >= since]
-
-    # Collect all recorded times per distance, sorted by date
-    from collections import defaultdict
-    by_distance: dict[str, list[tuple[str, int]]] = defaultdict(list)
-    for e in entries:
-        for dist, t in (e.get("strava_efforts") or {}).items():
-            if isinstance(t, int) and t > 0:
-                by_distance[dist].append((e["date"], t))
-
-    effort_rows = []
-    for dist in target_distances:
-        times = sorted(by_distance.get(dist, []))  # sort by date
-        if not times:
-            continue
-
-        best_date, best_t = min(times, key=lambda x: x[1])
-        first_date, first_t = times[0]
-        dk = dist_km_map.get(dist, 0)
-        best_pace = round(best_t / 60 / dk, 2) if dk else None
-        improvement_s = first_t - best_t if first_date != best_date or first_t != best_t else None
-        recent = [{"date": d, "elapsed_time_s": t} for d, t in times[-3:]] if len(times) >= 4 else []
-
-        effort_rows.append({
-            "distance": dist,
-            "best_elapsed_s": best_t,
-            "best_date": best_date,
-            "best_pace_min_per_km": best_pace,
-            "first_elapsed_s": first_t,
-            "first_date": first_date,
-            "improvement_s": improvement_s,
-            "recording_count": len(times),
-            "recent": recent,
-        })
+    effort_rows = api.efforts(since=since, distances=target_distances)
 
     if json_output:
         import json as _json
@@ -955,33 +984,14 @@ def top(
       biosystems top --by pace         # fastest average paces
       biosystems top --by distance     # longest runs
     """
-    from biosystems.analytics.history import load_history
-
-    entries = load_history()
-    if since:
-        entries = [e for e in entries if e.get("date", "") >= since]
-    entries = [e for e in entries if e.get("distance_km", 0) >= min_dist]
-
-    metric_map = {
-        "ef": "ef",
-        "decoupling": "decoupling_pct",
-        "pace": "avg_pace_min_per_km",
-        "tss": "hrTSS",
-        "distance": "distance_km",
-    }
-    field = metric_map.get(by, "ef")
-
-    # Filter to entries that have the metric
-    entries = [e for e in entries if e.get(field) is not None]
+    from biosystems import api
+
+    field = api.TOP_METRICS.get(by, "ef")
+    entries = api.top(by=by, count=n, min_dist=min_dist, since=since, asc=asc)
     if not entries:
         typer.echo(f"No entries with metric '{by}' found.")
         raise typer.Exit()
 
-    # Default sort: descending for ef/tss/distance, ascending for pace/decoupling
-    default_asc = by in ("pace", "decoupling")
-    sort_asc = asc if asc else default_asc
-    entries = sorted(entries, key=lambda e: e[field], reverse=not sort_asc)[:n]
-
     if json_output:
         import json as _json
         typer.echo(_json.dumps(entries, indent=2))
@@ -1013,10 +1023,10 @@ def top(
 
 @app.command(rich_help_panel="Analytics")
 def trend(
-    zones_path: Path = typer.Option(
-        _default_zones_path(),
+    zones_path: Path | None = typer.Option(
+        None,
         "--zones", "-z",
-        help="Path to zones configuration YAML",
+        help="Path to zones configuration YAML (default: $BIOSYSTEMS_ZONES_PATH or the standard locations)",
     ),
     backfill: int = typer.Option(
         0, "--backfill", "-b",
@@ -1032,19 +1042,20 @@ def trend(
     If requested via --backfill, seed local history from the last N Strava activity summaries (no stream fetch) using the provided zones configuration. When --json is set, output is a JSON object containing `summary` and `rolling`, and optionally `pmc` when `--pmc` is enabled; otherwise a human-readable summary and recent runs list are printed.
 
     Parameters:
-        zones_path (Path): Path to zones configuration YAML used when backfilling.
+        zones_path (Path | None): Path to zones configuration YAML used when backfilling;
+            None resolves ``default_zones_path()`` when the command runs.
         backfill (int): Number of recent Strava activity summaries to import into local history before computing trends.
         pmc (bool): Include the full day-by-day PMC table in the output when True.
         rolling_window (int): Window size (in runs) for computing rolling statistics.
         json_output (bool): Emit machine-readable JSON output when True; otherwise print formatted text.
     """
-    from biosystems.analytics.history import backfill_from_strava, load_history
-    from biosystems.analytics.trending import compute_pmc, compute_rolling_stats, summarize_trend
+    from biosystems import api
+    from biosystems.analytics.history import backfill_from_strava
 
     # Optional backfill from Strava summaries
     if backfill > 0:
         try:
-            zone_config = load_zone_config(zones_path)
+            zone_config = load_zone_config(zones_path or default_zones_path())
         except Exception as e:
             typer.secho(f"Error loading zones: {e}", fg=typer.colors.RED, err=True)
             raise typer.Exit(code=1)
@@ -1066,23 +1077,15 @@ def trend(
             typer.secho(f"Backfill failed: {e}", fg=typer.colors.RED, err=True)
             raise typer.Exit(code=1)
 
-    entries = load_history()
-    if not entries:
-        typer.secho(
-            "No run history found. Run 'biosystems strava' first, or use --backfill N to seed from Strava.",
-            fg=typer.colors.YELLOW, err=True,
-        )
+    try:
+        output = api.trend(pmc=pmc and json_output, window=rolling_window)
+    except api.APIError as e:
+        typer.secho(str(e), fg=typer.colors.YELLOW, err=True)
         raise typer.Exit(code=1)
-
-    pmc_data = compute_pmc(entries)
-    rolling_data = compute_rolling_stats(entries, window=rolling_window)
-    summary = summarize_trend(pmc_data, rolling_data)
+    summary, rolling_data = output["summary"], output["rolling"]
 
     if json_output:
         import json
-        output: dict = {"summary": summary, "rolling": rolling_data}
-        if pmc:
-            output["pmc"] = pmc_data
         typer.echo(json.dumps(output, indent=2))
     else:
         typer.secho("\n--- Performance Management ---", fg=typer.colors.CYAN, bold=True)
@@ -1109,11 +1112,16 @@ def wellness_sync(
     date_start: str = typer.Option(None, "--from", help="Start date YYYY-MM-DD (overrides --days)"),
     date_end: str = typer.Option(None, "--to", help="End date YYYY-MM-DD (default: today)"),
     api_key: str = typer.Option(None, "--api-key", envvar="HABITDASH_API_KEY", help="HabitDash API key"),
+    full: bool = typer.Option(False, "--full", help="Ignore per-metric watermarks and refetch the whole window"),
 ) -> None:
     """
     Sync wellness metrics from HabitDash (Whoop + Garmin) into the local cache.
 
-    Cache location: ~/.biosystems/wellness.parquet
+    Cache location: ~/.biosystems/wellness/ (monthly parquet partitions)
+
+    Each metric is fetched only from shortly before its last synced date
+    (watermarks in ~/.biosystems/wellness_watermarks.json); metrics never
+    synced use the --days window. --full or --from refetch every metric.
 
     Fetches: HRV RMSSD, Resting HR, Recovery Score, Sleep Score, Sleep Duration,
     Body Battery, Strain Score, VO2max, and more.
@@ -1129,8 +1137,9 @@ def wellness_sync(
             date_start=date_start,
             date_end=date_end,
             api_key=api_key or None,
+            full=full,
         )
-        typer.secho(f"[wellness-sync] {n} date rows updated → ~/.biosystems/wellness.parquet",
+        typer.secho(f"[wellness-sync] {n} date rows updated → ~/.biosystems/wellness/",
                     fg=typer.colors.GREEN, err=True)
     except ValueError as exc:
         typer.secho(f"[wellness-sync] {exc}", fg=typer.colors.RED, err=True)
@@ -1277,7 +1286,7 @@ def wellness_analyze(
         compute_coverage,
         compute_era_stats,
     )
-    from biosystems.wellness.cache import load_wellness_df, wellness_path
+    from biosystems.wellness.cache import load_wellness_df, wellness_dir
 
     df = load_wellness_df()
     if df.empty:
@@ -1313,7 +1322,7 @@ def wellness_analyze(
         return
 
     # ── Human-readable output ────────────────────────────────────────────────
-    typer.secho(f"\nWellness Analytics — {wellness_path()}", fg=typer.colors.CYAN, bold=True)
+    typer.secho(f"\nWellness Analytics — {wellness_dir()}", fg=typer.colors.CYAN, bold=True)
     typer.secho(f"  {len(df)} date rows  |  {df.index.min().date()} → {df.index.max().date()}\n",
                 fg=typer.colors.CYAN)
 
@@ -1392,10 +1401,10 @@ def wellness_trends(
     """
     import json as _json
 
-    from biosystems.wellness.analytics import compute_longitudinal_fitness
+    from biosystems.wellness.analytics import FITNESS_COLUMNS, compute_longitudinal_fitness
     from biosystems.wellness.cache import load_wellness_df
 
-    df = load_wellness_df()
+    df = load_wellness_df(columns=FITNESS_COLUMNS)
     if df.empty:
         typer.secho(
             "No wellness data found. Run 'biosystems wellness-sync' first.",
@@ -1432,5 +1441,67 @@ def wellness_trends(
         typer.echo()
 
 
+@app.command(rich_help_panel="System")
+def serve(
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon"),
+    status: bool = typer.Option(False, "--status", help="Report whether a daemon is running"),
+    warm: bool = typer.Option(True, "--warm/--no-warm", help="Load history, wellness, weather, zones and token up front"),
+):
+    """
+    Run a warm background process that answers CLI commands over a Unix socket.
+
+    While it runs, every `biosystems` invocation is forwarded to it and returns
+    in milliseconds instead of re-importing and reloading everything. Runs in
+    the foreground until Ctrl-C or `biosystems serve --stop`.
+
+    Examples:
+
+      biosystems serve &              # start (e.g. from a login item or systemd user unit)
+      biosystems serve --status
+      biosystems serve --stop
+    """
+    import sys
+    from datetime import datetime
+
+    from biosystems.daemon import call, open_daemon, socket_path, warm_caches
+
+    if stop or status:
+        try:
+            info = call("shutdown" if stop else "ping")
+        except ConnectionError:
+            typer.echo("No biosystems daemon running.")
+            raise typer.Exit(code=1 if status else 0)
+        if stop:
+            typer.echo(f"Stopped biosystems daemon (pid {info['pid']}).")
+        else:
+            since = datetime.fromtimestamp(info["started"]).strftime("%Y-%m-%d %H:%M")
+            typer.echo(f"biosystems daemon pid {info['pid']}, up since {since}, {info['served']} requests served.")
+        return
+
+    def log(message: str) -> None:
+        print(f"[{datetime.now():%H:%M:%S}] {message}", file=sys.stderr, flush=True)
+
+    try:
+        daemon = open_daemon(log=log)
+    except RuntimeError as e:
+        typer.secho(str(e), fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+    if warm:
+        warm_caches(log)
+    log(f"serving on {socket_path()} (pid {os.getpid()})")
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    log("stopped")
+
+
 if __name__ == "__main__":
+    import sys
+
+    from biosystems.daemon import forward
+
+    exit_code = forward(sys.argv[1:])  # None: no daemon running, run here
+    if exit_code is not None:
+        raise SystemExit(exit_code)
     app()
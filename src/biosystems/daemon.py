@@ -0,0 +1,514 @@
+"""
+Biosystems Daemon
+=================
+
+``biosystems serve`` keeps one warm process around so repeated CLI queries
+skip interpreter start-up, imports and cache loading. The in-process caches
+the commands already use stay populated between requests: the history
+snapshot and rollups, the wellness frame and feature table, the weather
+table, the parsed zone config and the Strava access token.
+
+Protocol
+--------
+JSON-RPC 2.0 over a Unix stream socket, one request line per connection.
+The daemon answers with zero or more notification lines and then one
+response line. Methods:
+
+    run       params {"argv": [...], "cwd": str, "color": bool, "env": {...}}
+              notifications {"method": "output", "params": {"stream", "data"}}
+              as the command writes, and {"method": "heartbeat"} every
+              HEARTBEAT_S while it runs
+              → {"exit_code": int}
+    ping      → {"pid": int, "started": float, "served": int}
+    shutdown  → {"pid": int}; the daemon exits after replying
+
+The socket lives next to the history (``$BIOSYSTEMS_HOME/biosystems.sock``),
+so a client only ever reaches a daemon that serves the same data directory,
+and is created mode 0600.
+
+Each connection gets its own thread, but only one command runs at a time:
+commands change the working directory and environment of the whole
+process. A ``run`` that arrives while another is in progress is answered
+with a busy error (``BUSY``) without running anything, and the client runs
+the command in-process instead of waiting behind a long ``sync``.
+
+A command runs in the client's working directory, with the client's
+variables named ``BIOSYSTEMS_*``, ``STRAVA_*``, ``HABITDASH_*`` and
+``OPEN_METEO_*`` applied on top of the daemon's environment for its
+duration. Variables the client does not set keep the daemon's values,
+including those loaded from the daemon's ``.env``. Output written by the
+command's thread is streamed to the client; output from threads the command
+starts goes to the daemon's own stdout/stderr.
+
+``main`` is the ``biosystems`` console entry point: it calls ``forward``
+first and only imports the Typer app when no daemon answers, so a forwarded
+command never pays for the CLI imports. Set ``BIOSYSTEMS_NO_DAEMON=1`` to
+always run in-process.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, TextIO
+
+#: Seconds a client waits to connect before running in-process instead.
+CONNECT_TIMEOUT_S = 0.5
+#: Seconds the daemon waits for a connected client to send its request.
+REQUEST_TIMEOUT_S = 10.0
+#: Seconds a client waits for the next line (output, heartbeat or reply) before giving up.
+READ_TIMEOUT_S = 30.0
+#: Seconds between heartbeats while a command produces no output.
+HEARTBEAT_S = 5.0
+#: JSON-RPC error code for a ``run`` refused because another command is running.
+BUSY = -32001
+#: Client environment variables forwarded with each command (by prefix).
+FORWARDED_ENV_PREFIXES = ("BIOSYSTEMS_", "STRAVA_", "HABITDASH_", "OPEN_METEO_")
+
+
+class DaemonBusyError(ConnectionError):
+    """The daemon is running another command; the request was not run."""
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path (respects BIOSYSTEMS_HOME env var)."""
+    base = Path(os.environ.get("BIOSYSTEMS_HOME", Path.home() / ".biosystems"))
+    base.mkdir(parents=True, exist_ok=True)
+    return base / "biosystems.sock"
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def call(
+    method: str,
+    params: dict[str, Any] | None = None,
+    path: Path | None = None,
+    on_output: Callable[[str, str], None] | None = None,
+) -> Any:
+    """
+    Send one JSON-RPC request to the daemon and return its ``result``.
+
+    ``on_output(stream, data)`` receives the command output the daemon
+    streams before its reply (``stream`` is ``"stdout"`` or ``"stderr"``).
+    The daemon must send something at least every ``READ_TIMEOUT_S``; it
+    sends heartbeats while a command runs.
+
+    Raises:
+        ConnectionError: Nothing was run: no daemon is listening on the socket,
+            or it is busy with another command (``DaemonBusyError``).
+        RuntimeError: The daemon answered with an error, stopped responding, or
+            the connection broke after the request was sent.
+    """
+    path = path or socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT_S)
+        try:
+            sock.connect(str(path))
+        except OSError as e:  # missing socket file, stale socket, timeout
+            raise ConnectionError(f"no biosystems daemon at {path}") from e
+        sock.settimeout(READ_TIMEOUT_S)
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+        with sock.makefile("rb") as stream:
+            try:
+                sock.sendall(json.dumps(request).encode() + b"\n")
+                while True:
+                    line = stream.readline()
+                    if not line:
+                        raise RuntimeError("biosystems daemon closed the connection without replying")
+                    response = json.loads(line)
+                    if "id" in response:
+                        break
+                    if response.get("method") == "output" and on_output is not None:
+                        on_output(response["params"]["stream"], response["params"]["data"])
+            except TimeoutError as e:
+                raise RuntimeError(f"biosystems daemon sent nothing for {READ_TIMEOUT_S:g} s") from e
+    finally:
+        sock.close()
+
+    if "error" in response:
+        message = response["error"].get("message")
+        if response["error"].get("code") == BUSY:
+            raise DaemonBusyError(f"biosystems daemon is busy: {message}")
+        raise RuntimeError(f"biosystems daemon error: {message}")
+    return response["result"]
+
+
+def forwarded_env() -> dict[str, str]:
+    """The variables of this process that ``forward`` sends with a command."""
+    return {k: v for k, v in os.environ.items() if k.startswith(FORWARDED_ENV_PREFIXES)}
+
+
+def forward(argv: list[str]) -> int | None:
+    """
+    Run a CLI command on the daemon, echoing its output here.
+
+    Returns the command's exit code, or None when the caller should run the
+    command in-process itself: no daemon is listening, the daemon is busy
+    with another command, ``BIOSYSTEMS_NO_DAEMON`` is set, or the command is
+    ``serve``. Output is echoed as the daemon streams it.
+    """
+    if argv[:1] == ["serve"] or os.environ.get("BIOSYSTEMS_NO_DAEMON"):
+        return None
+    params = {"argv": argv, "cwd": os.getcwd(), "color": sys.stdout.isatty(), "env": forwarded_env()}
+
+    def echo(stream: str, data: str) -> None:
+        out = sys.stderr if stream == "stderr" else sys.stdout
+        out.write(data)
+        out.flush()
+
+    try:
+        result = call("run", params, on_output=echo)
+    except ConnectionError:
+        return None
+    except RuntimeError as e:
+        # The request reached the daemon, so re-running it here could repeat side effects.
+        print(str(e), file=sys.stderr)
+        return 1
+    return int(result["exit_code"])
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class _StreamSink(io.TextIOBase):
+    """Text stream handing every write to ``write(name, text)``."""
+
+    def __init__(self, name: str, write: Callable[[str, str], None]) -> None:
+        self._name = name
+        self._write = write
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            self._write(self._name, text)
+        return len(text)
+
+
+class _ThreadRoutedStream:
+    """
+    Stands in for ``sys.stdout`` / ``sys.stderr`` during a command: writes
+    from the command's thread go to its sink, writes from any other thread
+    (the daemon log, other connections) to the stream it replaced.
+    """
+
+    def __init__(self, sink: io.TextIOBase, fallback: TextIO) -> None:
+        self._thread = threading.get_ident()
+        self._sink = sink
+        self._fallback = fallback
+
+    def _target(self) -> io.TextIOBase | TextIO:
+        return self._sink if threading.get_ident() == self._thread else self._fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return self._target().isatty()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+
+@contextlib.contextmanager
+def _applied_env(env: Mapping[str, str]) -> Iterator[None]:
+    """Set *env* in ``os.environ`` for the block, then restore the previous values."""
+    previous = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for k, v in previous.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def run_command(
+    argv: list[str],
+    cwd: str | None = None,
+    color: bool = False,
+    env: Mapping[str, str] | None = None,
+    write: Callable[[str, str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run ``biosystems <argv>`` in this process and return its exit code and output.
+
+    Runs in *cwd* with *env* applied on top of ``os.environ``. Only output
+    written from the calling thread is captured. With *write*, output is
+    passed to ``write(stream, text)`` as it is produced and the returned
+    ``stdout`` / ``stderr`` are empty.
+    """
+    from biosystems.cli import app
+
+    out: io.TextIOBase
+    err: io.TextIOBase
+    buffers: tuple[io.StringIO, io.StringIO] | None = None
+    if write is None:
+        out, err = buffers = io.StringIO(), io.StringIO()
+    else:
+        out, err = _StreamSink("stdout", write), _StreamSink("stderr", write)
+    previous_cwd = os.getcwd()
+    previous_streams = sys.stdout, sys.stderr
+    exit_code = 0
+    try:
+        if cwd:
+            os.chdir(cwd)
+        sys.stdout = _ThreadRoutedStream(out, previous_streams[0])  # type: ignore[assignment]
+        sys.stderr = _ThreadRoutedStream(err, previous_streams[1])  # type: ignore[assignment]
+        with _applied_env(env or {}):
+            try:
+                app(args=argv, prog_name="biosystems", color=color)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        sys.stdout, sys.stderr = previous_streams
+        os.chdir(previous_cwd)
+    if buffers is None:
+        return {"exit_code": exit_code, "stdout": "", "stderr": ""}
+    return {"exit_code": exit_code, "stdout": buffers[0].getvalue(), "stderr": buffers[1].getvalue()}
+
+
+def warm_caches(log=None) -> None:
+    """Populate the in-process caches the commands read, skipping any that are unavailable."""
+    from biosystems._pipeline import default_zones_path, load_zone_config
+    from biosystems.analytics.history import load_history
+    from biosystems.analytics.rollups import load_rollups
+    from biosystems.environment.weather import WeatherCache, weather_cache_path
+    from biosystems.ingestion.strava import _refresh_access_token
+    from biosystems.wellness.cache import load_wellness_df
+
+    steps = [
+        ("history", load_history),
+        ("rollups", load_rollups),
+        ("zones", lambda: load_zone_config(default_zones_path())),
+        ("wellness", load_wellness_df),
+        ("weather", lambda: WeatherCache(weather_cache_path(), precision=2)),
+        ("strava token", _refresh_access_token),
+    ]
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:  # a cold cache only costs the first request
+            if log:
+                log(f"warm {name}: skipped ({e.__class__.__name__}: {e})")
+            continue
+        if log:
+            log(f"warm {name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    timeout = REQUEST_TIMEOUT_S
+    server: BiosystemsDaemon
+
+    def setup(self) -> None:
+        super().setup()
+        self._send_lock = threading.Lock()
+        self._gone = False
+
+    def _send(self, message: dict[str, Any]) -> None:
+        with self._send_lock:
+            if self._gone:
+                return
+            try:
+                self.wfile.write(json.dumps(message).encode() + b"\n")
+            except OSError:
+                self._gone = True  # client went away; a running command still finishes
+
+    def _notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        message: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._send(message)
+
+    def handle(self) -> None:
+        try:
+            line = self.rfile.readline()
+        except OSError:
+            return
+        if not line:
+            return
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            result = self.server.dispatch(request.get("method"), request.get("params") or {}, self._notify)
+            response: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except DaemonBusyError as e:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": BUSY, "message": str(e)}}
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32600, "message": str(e)}}
+        self._send(response)
+
+
+class BiosystemsDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """JSON-RPC server executing CLI commands in a warm process, one command at a time."""
+
+    daemon_threads = True
+    timeout = 0.2  # serve() re-checks for a shutdown request this often
+
+    def __init__(self, path: Path, log=None) -> None:
+        self.path = path
+        self.log = log
+        self.started = time.time()
+        self.served = 0
+        self._stop = False
+        self._run_lock = threading.Lock()
+        super().__init__(str(path), _Handler)
+
+    def server_bind(self) -> None:
+        # bind() creates the socket file; under umask 0o177 it is born 0600,
+        # so no other user can connect between bind and a later chmod.
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def dispatch(
+        self,
+        method: str | None,
+        params: dict[str, Any],
+        notify: Callable[[str, dict[str, Any] | None], None] | None = None,
+    ) -> Any:
+        """
+        Answer one request. ``run`` streams output and heartbeats through
+        ``notify(method, params)``.
+
+        Raises:
+            DaemonBusyError: ``run`` while another command is running.
+        """
+        if method == "run":
+            argv = params["argv"]
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise TypeError("argv must be a list of strings")
+            if argv[:1] == ["serve"]:
+                raise ValueError("cannot run `serve` inside the daemon")
+            env = params.get("env") or {}
+            if not isinstance(env, dict) or not all(isinstance(v, str) for v in env.values()):
+                raise TypeError("env must map names to strings")
+            env = {k: v for k, v in env.items() if k.startswith(FORWARDED_ENV_PREFIXES)}
+            if not self._run_lock.acquire(blocking=False):
+                raise DaemonBusyError("another command is running")
+            try:
+                start = time.perf_counter()
+                with self._heartbeat(notify):
+                    result = run_command(
+                        argv,
+                        cwd=params.get("cwd"),
+                        color=bool(params.get("color")),
+                        env=env,
+                        write=None if notify is None else (
+                            lambda stream, data: notify("output", {"stream": stream, "data": data})
+                        ),
+                    )
+                self.served += 1
+            finally:
+                self._run_lock.release()
+            if self.log:
+                self.log(f"{' '.join(argv)} → {result['exit_code']} in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return result if notify is None else {"exit_code": result["exit_code"]}
+        if method == "ping":
+            return {"pid": os.getpid(), "started": self.started, "served": self.served}
+        if method == "shutdown":
+            self._stop = True
+            return {"pid": os.getpid()}
+        raise ValueError(f"unknown method {method!r}")
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _heartbeat(notify: Callable[[str, dict[str, Any] | None], None] | None) -> Iterator[None]:
+        """Send a heartbeat every ``HEARTBEAT_S`` while the block runs, so the client's read timeout holds."""
+        if notify is None:
+            yield
+            return
+        done = threading.Event()
+
+        def beat() -> None:
+            while not done.wait(HEARTBEAT_S):
+                notify("heartbeat", None)
+
+        thread = threading.Thread(target=beat, name="biosystems-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def serve(self) -> None:
+        """
+        Handle requests until a ``shutdown`` request or KeyboardInterrupt.
+
+        The socket is removed straight away, so new clients run in-process;
+        a command already running is allowed to finish first.
+        """
+        try:
+            while not self._stop:
+                self.handle_request()
+        finally:
+            self.server_close()
+            with self._run_lock:
+                pass
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def open_daemon(path: Path | None = None, log=None) -> BiosystemsDaemon:
+    """
+    Bind the daemon socket, replacing a stale socket file.
+
+    Raises:
+        RuntimeError: Another daemon is already listening on ``path``.
+    """
+    path = path or socket_path()
+    if path.exists():
+        try:
+            pid = call("ping", path=path)["pid"]
+        except ConnectionError:
+            path.unlink()  # left behind by a daemon that did not exit cleanly
+        else:
+            raise RuntimeError(f"biosystems daemon already running (pid {pid}) on {path}")
+    return BiosystemsDaemon(path, log=log)
+
+
+def main() -> None:
+    """Console entry point: hand the command to a running daemon, else run the CLI here."""
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        raise SystemExit(exit_code)
+    from biosystems.cli import app
+
+    app(prog_name="biosystems")
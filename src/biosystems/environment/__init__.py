@@ -8,16 +8,43 @@ Features:
 - Weather data integration (Open-Meteo API)
 - Temperature and weather code lookup
 - Caching for offline analysis
+- Per-sample weather alignment for long activities
 """
 
-from biosystems.environment.weather import (
-    WeatherCache,
-    fetch_weather_open_meteo,
-    get_weather_description,
-)
+from typing import TYPE_CHECKING
+
+from biosystems._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    name: ".weather"
+    for name in (
+        "WeatherCache",
+        "align_weather_to_samples",
+        "fetch_weather_open_meteo",
+        "get_weather_description",
+        "summarize_sample_weather",
+        "weather_cache_path",
+        "weather_for_samples",
+    )
+})
+
+if TYPE_CHECKING:
+    from biosystems.environment.weather import (
+        WeatherCache,
+        align_weather_to_samples,
+        fetch_weather_open_meteo,
+        get_weather_description,
+        summarize_sample_weather,
+        weather_cache_path,
+        weather_for_samples,
+    )
 
 __all__ = [
+    "align_weather_to_samples",
     "fetch_weather_open_meteo",
     "get_weather_description",
+    "summarize_sample_weather",
     "WeatherCache",
+    "weather_cache_path",
+    "weather_for_samples",
 ]
@@ -4,11 +4,20 @@ Weather Data Integration
 
 Fetch and cache weather data from Open-Meteo API to provide environmental
 context for activities.
+
+Single runs use ``fetch_weather_open_meteo``; backfills should use
+``fetch_weather_batch``, which groups runs by rounded location and pulls
+each group's whole date span in one request. Set ``OPEN_METEO_API_ROOT``
+to target a local stand-in (see ``biosystems.testing.open_meteo_standin``).
 """
 
 import json
+import os
 import sys
+import tempfile
+import threading
 import time
+import weakref
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, cast
@@ -98,19 +107,186 @@ def make_json_serializable(obj: Any) -> Any:
         return obj
 
 
+def weather_cache_path() -> Path:
+    """
+    Return the default on-disk weather cache location.
+
+    Lives next to the run history (``$BIOSYSTEMS_HOME`` or ``~/.biosystems``).
+    """
+    base = Path(os.environ.get("BIOSYSTEMS_HOME", Path.home() / ".biosystems"))
+    base.mkdir(parents=True, exist_ok=True)
+    return base / "weather_cache.parquet"
+
+
+# Typed hourly table layout (one row per grid cell and UTC hour)
+WEATHER_COLUMNS: tuple[str, ...] = (
+    "temperature_2m",
+    "precipitation",
+    "weathercode",
+    "windspeed_10m",
+    "windgusts_10m",
+    "winddirection_10m",
+)
+_KEY_COLUMNS = ["lat_cell", "lon_cell", "timestamp"]
+_TABLE_COLUMNS = _KEY_COLUMNS + list(WEATHER_COLUMNS)
+
+
+def _empty_table() -> pd.DataFrame:
+    table: pd.DataFrame = pd.DataFrame({
+        "lat_cell": pd.Series(dtype="float64"),
+        "lon_cell": pd.Series(dtype="float64"),
+        "timestamp": pd.Series(dtype="datetime64[ns, UTC]"),
+    })
+    for col in WEATHER_COLUMNS:
+        table[col] = pd.Series(dtype="Int16" if col == "weathercode" else "float32")
+    return table
+
+
+def _coerce_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast an hourly table to the storage dtypes (float32 values, Int16 weathercode, UTC timestamps)."""
+    out: pd.DataFrame = pd.DataFrame({
+        "lat_cell": pd.to_numeric(df["lat_cell"]).astype("float64"),
+        "lon_cell": pd.to_numeric(df["lon_cell"]).astype("float64"),
+        "timestamp": pd.to_datetime(df["timestamp"], utc=True).astype("datetime64[ns, UTC]"),
+    })
+    for col in WEATHER_COLUMNS:
+        values = pd.to_numeric(df[col], errors="coerce") if col in df.columns else np.nan
+        if col == "weathercode":
+            out[col] = pd.Series(values, index=out.index, dtype="float64").round().astype("Int16")
+        else:
+            out[col] = pd.Series(values, index=out.index, dtype="float64").astype("float32")
+    return out
+
+
+def _payload_to_rows(lat_cell: float, lon_cell: float, weather: dict[Any, Any]) -> pd.DataFrame:
+    """
+    Convert an Open-Meteo hourly payload into typed table rows.
+
+    Days on which any hour has no temperature (archive not yet published)
+    are dropped so they are fetched again later rather than cached as blanks.
+    """
+    hourly = (weather or {}).get("hourly") or {}
+    times = hourly.get("time") or []
+    if not times:
+        return _empty_table()
+    n = len(times)
+    data: dict[str, Any] = {
+        "lat_cell": np.full(n, lat_cell),
+        "lon_cell": np.full(n, lon_cell),
+        "timestamp": pd.to_datetime(times, utc=True),
+    }
+    for col in WEATHER_COLUMNS:
+        values = hourly.get(col)
+        data[col] = (
+            np.array([np.nan if v is None else v for v in values], dtype="float64")
+            if values is not None and len(values) == n
+            else np.full(n, np.nan)
+        )
+    rows = pd.DataFrame(data)
+    day = rows["timestamp"].dt.floor("D")
+    complete = rows["temperature_2m"].notna().groupby(day).transform("all")
+    return _coerce_table(rows[complete.to_numpy()])
+
+
+def _legacy_blobs_to_table(df: pd.DataFrame, precision: int) -> pd.DataFrame:
+    """Migrate the former (lat, lon, date, weather-JSON) layout to hourly rows."""
+    frames = []
+    for lat, lon, weather in zip(df["lat"].tolist(), df["lon"].tolist(), df["weather"].tolist()):
+        if isinstance(weather, str):
+            try:
+                weather = json.loads(weather)
+            except Exception:
+                continue
+        if not isinstance(weather, dict):
+            continue
+        rows = _payload_to_rows(round(float(lat), precision), round(float(lon), precision), weather)
+        if not rows.empty:
+            frames.append(rows)
+    return pd.concat(frames, ignore_index=True) if frames else _empty_table()
+
+
+def _merge_tables(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate hourly tables; later frames win on duplicate keys; result sorted by key."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return _empty_table()
+    merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    merged = merged.drop_duplicates(_KEY_COLUMNS, keep="last")
+    return cast(pd.DataFrame, merged.sort_values(_KEY_COLUMNS, kind="mergesort").reset_index(drop=True))
+
+
+# (path, precision) → ((st_ino, st_mtime_ns, st_size), table). Tables are replaced, never
+# modified in place, so every WeatherCache opened on an unchanged file shares one parsed copy.
+_table_cache: dict[tuple[str, int], tuple[tuple[int, int, int], pd.DataFrame]] = {}
+_table_guard = threading.Lock()
+
+
+class _HourlyStore:
+    """Mutable cache state shared with the exit-time flush finalizer."""
+
+    def __init__(self) -> None:
+        self.table = _empty_table()
+        self.pending: list[pd.DataFrame] = []  # added rows not yet merged into `table`
+        self.dirty: list[pd.DataFrame] = []    # added rows not yet written to disk
+        self.cells: dict[tuple[float, float], tuple[int, int]] = {}
+        self.ts: np.ndarray = np.empty(0, dtype="int64")
+
+    def consolidate(self) -> None:
+        if not self.pending:
+            return
+        self.table = _merge_tables([self.table, *self.pending])
+        self.pending.clear()
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Rebuild cell → row-range bounds and the int64 timestamp array used for searchsorted."""
+        self.ts = self.table["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64")
+        lat = self.table["lat_cell"].to_numpy()
+        lon = self.table["lon_cell"].to_numpy()
+        self.cells = {}
+        if len(lat) == 0:
+            return
+        change = np.flatnonzero((lat[1:] != lat[:-1]) | (lon[1:] != lon[:-1])) + 1
+        starts = np.concatenate([[0], change])
+        ends = np.concatenate([change, [len(lat)]])
+        for lo, hi in zip(starts.tolist(), ends.tolist()):
+            self.cells[(float(lat[lo]), float(lon[lo]))] = (lo, hi)
+
+
 class WeatherCache:
     """
-    Simple weather data cache using Parquet file storage.
+    Hourly weather cache stored as a typed, sorted columnar table.
+
+    One row per (lat_cell, lon_cell, timestamp) with ``temperature_2m``,
+    ``precipitation``, ``weathercode``, ``windspeed_10m``, ``windgusts_10m``
+    and ``winddirection_10m`` (float32 / Int16), where the cell is the
+    coordinate rounded to ``precision`` decimal places (4 ≈ 11 m, 2 ≈ 1.1 km)
+    so nearby start points share rows. The table is kept sorted by key, and
+    lookups are a dict hit for the cell plus a binary search on time — no
+    JSON is parsed or produced.
+
+    Writes are buffered and flushed every ``flush_every`` added days, on
+    ``flush()`` / ``close()``, when used as a context manager, and at
+    interpreter exit. A flush takes a file lock, merges with whatever other
+    processes have written since, and atomically replaces the Parquet file.
+    Caches written in the former JSON-blob layout are migrated on load.
 
     Attributes
     ----------
     cache_path : Path
         Path to cache Parquet file
     cache : pd.DataFrame
-        In-memory cache
+        The hourly table
+    precision : int
+        Decimal places used to round coordinates into grid cells
     """
 
-    def __init__(self, cache_path: Path | None = None):
+    def __init__(
+        self,
+        cache_path: Path | None = None,
+        precision: int = 4,
+        flush_every: int = 32,
+    ):
         """
         Initialize weather cache.
 
@@ -118,34 +294,150 @@ class WeatherCache:
         ----------
         cache_path : Path, optional
             Path to cache file. If None, caching is memory-only.
+        precision : int
+            Decimal places for coordinate rounding into grid cells.
+        flush_every : int
+            Number of buffered ``set`` calls (days) that triggers a flush to disk.
         """
         self.cache_path = cache_path
+        self.precision = precision
+        self.flush_every = max(int(flush_every), 1)
+        self._store = _HourlyStore()
 
-        # Load existing cache if available
         if cache_path and cache_path.exists():
+            table, legacy = self._read_table(cache_path, precision)
+            self._store.table = table
+            self._store.reindex()
+            if legacy:
+                # One-time migration: rewrite in the typed layout
+                self._store.dirty.append(table)
+                self.flush()
+
+        if cache_path is not None:
+            # Flush any buffered rows at exit if the caller never closes us.
+            self._finalizer = weakref.finalize(self, WeatherCache._flush_store, cache_path, precision, self._store)
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+
+    def _cell(self, lat: float, lon: float) -> tuple[float, float]:
+        return (round(float(lat), self.precision), round(float(lon), self.precision))
+
+    @staticmethod
+    def _read_table(path: Path, precision: int) -> tuple[pd.DataFrame, bool]:
+        """Read the Parquet cache → (sorted typed table, was_legacy_layout); cached per file version."""
+        try:
+            st = path.stat()
+        except OSError:
+            return _empty_table(), False
+        key, stamp = (str(path), precision), (st.st_ino, st.st_mtime_ns, st.st_size)
+        with _table_guard:
+            hit = _table_cache.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1], False
+        try:
+            df = pd.read_parquet(path)
+        except Exception:
+            # If reading fails (e.g. empty file), start fresh
+            return _empty_table(), False
+        if "weather" in df.columns and "timestamp" not in df.columns:
+            return _merge_tables([_legacy_blobs_to_table(df, precision)]), True
+        if not set(_KEY_COLUMNS).issubset(df.columns):
+            return _empty_table(), False
+        table = _merge_tables([_coerce_table(df)])
+        with _table_guard:
+            _table_cache[key] = (stamp, table)
+        return table, False
+
+    @staticmethod
+    def _flush_store(path: Path, precision: int, store: _HourlyStore) -> None:
+        """Merge unsaved rows into the on-disk table under a file lock (atomic replace)."""
+        if not store.dirty:
+            return
+        from filelock import FileLock
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(path.with_suffix(path.suffix + ".lock")), timeout=30):
+            on_disk = WeatherCache._read_table(path, precision)[0] if path.exists() else _empty_table()
+            merged = _merge_tables([on_disk, *store.dirty])
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            os.close(fd)
             try:
-                self.cache = pd.read_parquet(cache_path)
-                # Ensure weather column is always a string (JSON)
-                if "weather" in self.cache.columns:
-
-                    def safe_serialize(x):
-                        if isinstance(x, dict):
-                            try:
-                                return json.dumps(make_json_serializable(x))
-                            except Exception:
-                                return None
-                        return x if pd.notnull(x) else None
-
-                    self.cache["weather"] = self.cache["weather"].apply(safe_serialize)
-            except Exception:
-                # If reading fails (e.g. empty file), start fresh
-                self.cache = pd.DataFrame(columns=["lat", "lon", "date", "weather"])
+                merged.to_parquet(tmp_name, index=False)
+                os.replace(tmp_name, path)
+            except BaseException:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+                raise
+        # Adopt rows other processes flushed since we loaded; our unmerged rows still win
+        store.table = _merge_tables([merged, store.table])
+        store.reindex()
+        store.dirty.clear()
+
+    def _rows(self, lat: float, lon: float, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Rows for the cell containing (lat, lon) with start <= timestamp < end."""
+        store = self._store
+        store.consolidate()
+        bounds = store.cells.get(self._cell(lat, lon))
+        if bounds is None:
+            return cast(pd.DataFrame, store.table.iloc[0:0])
+        lo, hi = bounds
+        ts = store.ts[lo:hi]
+        i = lo + int(np.searchsorted(ts, start.value, side="left"))
+        j = lo + int(np.searchsorted(ts, end.value, side="left"))
+        return cast(pd.DataFrame, store.table.iloc[i:j])
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @property
+    def cache(self) -> pd.DataFrame:
+        """The hourly table (lat_cell, lon_cell, timestamp, weather columns), sorted by key."""
+        self._store.consolidate()
+        return self._store.table
+
+    @cache.setter
+    def cache(self, df: pd.DataFrame) -> None:
+        if "weather" in df.columns and "timestamp" not in df.columns:
+            table = _legacy_blobs_to_table(df, self.precision)
         else:
-            self.cache = pd.DataFrame(columns=["lat", "lon", "date", "weather"])
+            table = _coerce_table(df)
+        self._store.table = _merge_tables([table])
+        self._store.pending.clear()
+        self._store.dirty.clear()
+        self._store.reindex()
+
+    def __len__(self) -> int:
+        """Number of cached hourly rows."""
+        return len(self.cache)
+
+    def query(
+        self,
+        lat: float,
+        lon: float,
+        start: datetime | pd.Timestamp,
+        end: datetime | pd.Timestamp,
+    ) -> pd.DataFrame:
+        """
+        Hourly rows for the cell containing (lat, lon) between ``start`` and ``end`` (inclusive).
+
+        Returns
+        -------
+        pd.DataFrame
+            Weather columns indexed by UTC ``timestamp`` (empty if nothing cached).
+        """
+        start_ts = pd.Timestamp(start)
+        end_ts = pd.Timestamp(end)
+        start_ts = start_ts.tz_localize("UTC") if start_ts.tzinfo is None else start_ts.tz_convert("UTC")
+        end_ts = end_ts.tz_localize("UTC") if end_ts.tzinfo is None else end_ts.tz_convert("UTC")
+        rows = self._rows(lat, lon, start_ts, end_ts + pd.Timedelta(1, "ns"))
+        return cast(pd.DataFrame, rows.set_index("timestamp")[list(WEATHER_COLUMNS)])
 
     def get(self, lat: float, lon: float, date_str: str) -> dict[Any, Any] | None:
         """
-        Get cached weather data.
+        Get cached weather for one UTC day.
 
         Parameters
         ----------
@@ -159,31 +451,51 @@ class WeatherCache:
         Returns
         -------
         dict or None
-            Weather data if cached, None otherwise
+            Open-Meteo-shaped payload (``hourly.time`` plus one list per
+            weather column) if the day is cached, None otherwise
         """
-        if self.cache.empty:
+        day = pd.Timestamp(date_str, tz="UTC")
+        rows = self._rows(lat, lon, day, day + pd.Timedelta(days=1))
+        if rows.empty:
             return None
+        lat_c, lon_c = self._cell(lat, lon)
+        hourly: dict[str, list[Any]] = {"time": rows["timestamp"].dt.strftime("%Y-%m-%dT%H:%M").tolist()}
+        for col in WEATHER_COLUMNS:
+            values = rows[col]
+            if col == "weathercode":
+                hourly[col] = [None if pd.isna(v) else int(v) for v in values]
+            else:
+                # float32 storage; Open-Meteo values carry at most 2 decimals
+                arr = np.round(values.to_numpy(dtype="float64"), 2)
+                hourly[col] = [None if np.isnan(v) else float(v) for v in arr]
+        return {"latitude": lat_c, "longitude": lon_c, "timezone": "UTC", "hourly": hourly}
 
-        cached = self.cache[
-            (self.cache["lat"] == lat)
-            & (self.cache["lon"] == lon)
-            & (self.cache["date"] == date_str)
-        ]
-
-        if not cached.empty:
-            weather = cached.iloc[0]["weather"]
-            if isinstance(weather, str):
-                try:
-                    return cast(dict[Any, Any], json.loads(weather))
-                except Exception:
-                    pass
-            return cast(dict[Any, Any], weather)
+    def add_hourly(self, lat: float, lon: float, weather: dict[Any, Any]) -> int:
+        """
+        Add every complete day of an Open-Meteo hourly payload to the cache.
 
-        return None
+        Returns
+        -------
+        int
+            Number of hourly rows added.
+        """
+        lat_c, lon_c = self._cell(lat, lon)
+        rows = _payload_to_rows(lat_c, lon_c, weather)
+        if rows.empty:
+            return 0
+        self._store.pending.append(rows)
+        if self.cache_path:
+            self._store.dirty.append(rows)
+            if len(self._store.dirty) >= self.flush_every:
+                self.flush()
+        return len(rows)
 
     def set(self, lat: float, lon: float, date_str: str, weather: dict[Any, Any]):
         """
-        Save weather data to cache.
+        Save one day of hourly weather to the cache.
+
+        Rows are visible to ``get`` immediately and persisted on the next
+        flush. Hours outside ``date_str`` are ignored.
 
         Parameters
         ----------
@@ -194,28 +506,37 @@ class WeatherCache:
         date_str : str
             Date in YYYY-MM-DD format
         weather : dict
-            Weather data to cache
-        """
-        # Add to in-memory cache
-        new_row = pd.DataFrame(
-            [
-                {
-                    "lat": lat,
-                    "lon": lon,
-                    "date": date_str,
-                    "weather": json.dumps(make_json_serializable(weather)),
-                }
-            ]
-        )
+            Open-Meteo hourly payload
 
-        if self.cache.empty:
-            self.cache = new_row
-        else:
-            self.cache = pd.concat([self.cache, new_row], ignore_index=True)
+        Raises
+        ------
+        ValueError
+            If ``weather`` has no ``hourly.time`` series.
+        """
+        hourly = (weather or {}).get("hourly") if isinstance(weather, dict) else None
+        if not hourly or not hourly.get("time"):
+            raise ValueError("WeatherCache.set expects an Open-Meteo payload with an hourly.time series")
+        keep = [i for i, t in enumerate(hourly["time"]) if t[:10] == date_str]
+        day_hourly = {
+            k: [v[i] for i in keep] for k, v in hourly.items() if isinstance(v, list) and len(v) == len(hourly["time"])
+        }
+        self.add_hourly(lat, lon, {"hourly": day_hourly})
 
-        # Save to disk if path provided
+    def flush(self) -> None:
+        """Persist buffered rows to disk (no-op for memory-only caches)."""
         if self.cache_path:
-            self.cache.to_parquet(self.cache_path, index=False)
+            self._store.consolidate()
+            self._flush_store(self.cache_path, self.precision, self._store)
+
+    def close(self) -> None:
+        """Flush buffered rows."""
+        self.flush()
+
+    def __enter__(self) -> "WeatherCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
 
 def _weather_base_url(dt: datetime) -> str:
@@ -235,9 +556,172 @@ def _weather_base_url(dt: datetime) -> str:
     age_days = (now.date() - dt.date()).days if dt.tzinfo is None else (
         now.replace(tzinfo=timezone.utc) - dt.replace(tzinfo=timezone.utc)
     ).days
+    root = os.environ.get("OPEN_METEO_API_ROOT", "").rstrip("/")
     if age_days > 3:
-        return "https://archive-api.open-meteo.com/v1/archive"
-    return "https://api.open-meteo.com/v1/forecast"
+        return f"{root}/v1/archive" if root else "https://archive-api.open-meteo.com/v1/archive"
+    return f"{root}/v1/forecast" if root else "https://api.open-meteo.com/v1/forecast"
+
+
+_HOURLY_VARS = "temperature_2m,precipitation,weathercode,windspeed_10m,windgusts_10m,winddirection_10m"
+
+# Batch requests never span more than this many days, and a gap longer than
+# _BATCH_MAX_GAP_DAYS between pending dates starts a new request rather than
+# downloading the empty stretch in between.
+_BATCH_MAX_SPAN_DAYS = 366
+_BATCH_MAX_GAP_DAYS = 14
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _slice_hour(
+    weather: dict[Any, Any], dt: datetime
+) -> tuple[dict[Any, Any] | None, float | None]:
+    """
+    Cut the hour containing ``dt`` (or ±1 h) out of a multi-hour response.
+
+    Returns the payload in the single-hour shape produced by
+    ``fetch_weather_open_meteo`` (every ``hourly`` list has one element) and
+    the offset used. Payloads without an ``hourly.time`` series are returned
+    unchanged with offset 0.
+    """
+    hourly = weather.get("hourly") if isinstance(weather, dict) else None
+    if not isinstance(hourly, dict) or not hourly.get("time"):
+        return weather, 0.0
+    times = hourly["time"]
+    target = _utc(dt)
+    for offset_h in (0, 1, -1):
+        hour_str = (target + timedelta(hours=offset_h)).strftime("%Y-%m-%dT%H:00")
+        try:
+            i = times.index(hour_str)
+        except ValueError:
+            continue
+        temps = hourly.get("temperature_2m") or []
+        if i >= len(temps) or temps[i] is None:
+            continue
+        sliced = {k: v for k, v in weather.items() if k != "hourly"}
+        sliced["hourly"] = {k: [v[i]] for k, v in hourly.items() if isinstance(v, list) and len(v) > i}
+        return sliced, float(offset_h)
+    return None, None
+
+
+def _date_spans(dates: list[str]) -> list[tuple[str, str]]:
+    """Group sorted ISO dates into (start, end) request spans."""
+    spans: list[tuple[str, str]] = []
+    parsed = sorted({datetime.strptime(d, "%Y-%m-%d") for d in dates})
+    if not parsed:
+        return spans
+    start = prev = parsed[0]
+    for d in parsed[1:]:
+        if (d - prev).days > _BATCH_MAX_GAP_DAYS or (d - start).days >= _BATCH_MAX_SPAN_DAYS:
+            spans.append((start.strftime("%Y-%m-%d"), prev.strftime("%Y-%m-%d")))
+            start = d
+        prev = d
+    spans.append((start.strftime("%Y-%m-%d"), prev.strftime("%Y-%m-%d")))
+    return spans
+
+
+def _get_hourly_range(
+    base_url: str,
+    lat: float,
+    lon: float,
+    start_date: str,
+    end_date: str,
+    max_retries: int,
+    max_backoff: float,
+) -> dict[Any, Any] | None:
+    """One Open-Meteo request for the full hourly series between two dates (inclusive)."""
+    params: dict[str, str | float] = {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": _HOURLY_VARS,
+        "start_date": start_date,
+        "end_date": end_date,
+        "timezone": "UTC",
+    }
+    for attempt in range(max_retries):
+        try:
+            resp = requests.get(base_url, params=params, timeout=15)
+            if resp.status_code == 200:
+                return cast(dict[Any, Any], resp.json())
+            print(
+                f"[Weather] HTTP {resp.status_code} for {start_date}..{end_date} "
+                f"at lat={lat}, lon={lon}",
+                file=sys.stderr,
+            )
+        except Exception as e:
+            print(f"[Weather] Error on attempt {attempt + 1}: {e}", file=sys.stderr)
+        if attempt < max_retries - 1:
+            time.sleep(min(max_backoff, 0.2 * (2 ** attempt)))
+    return None
+
+
+def fetch_weather_batch(
+    points: list[tuple[float, float, datetime]],
+    cache: WeatherCache | None = None,
+    precision: int | None = None,
+    base_url: str | None = None,
+    max_retries: int = 3,
+    max_backoff: float = 2.0,
+) -> list[dict[Any, Any] | None]:
+    """
+    Fetch weather for many (lat, lon, datetime) points with as few requests as possible.
+
+    Points are grouped by location rounded to ``precision`` decimal places
+    (the cache's precision when a cache is given, else 2 ≈ 1.1 km) and by
+    endpoint (archive vs forecast). For each group, dates not already cached
+    are fetched as full hourly series — one request per contiguous date span —
+    and every complete day is written to the hourly table, so later lookups
+    for any hour of those days are served locally.
+
+    Parameters
+    ----------
+    points : list of (lat, lon, datetime)
+        Target locations and times (UTC; tz-naive values are treated as UTC).
+    cache : WeatherCache, optional
+        Cache to read from and fill at day granularity.
+    precision : int, optional
+        Grouping precision when no cache is supplied.
+    base_url : str, optional
+        Override the Open-Meteo endpoint for every request.
+    max_retries : int
+        Attempts per span request.
+    max_backoff : float
+        Maximum backoff duration in seconds.
+
+    Returns
+    -------
+    list[dict | None]
+        One entry per input point, aligned with ``points``: the single-hour
+        payload (same shape as ``fetch_weather_open_meteo``) or None.
+    """
+    prec = cache.precision if cache is not None else (2 if precision is None else precision)
+    local = cache if cache is not None else WeatherCache(None, precision=prec)
+
+    # (lat_cell, lon_cell, url) → dates that still need fetching
+    pending: dict[tuple[float, float, str], set[str]] = {}
+    for lat, lon, dt in points:
+        dt_utc = _utc(dt)
+        date_str = dt_utc.strftime("%Y-%m-%d")
+        cell = (round(float(lat), prec), round(float(lon), prec))
+        if local.get(cell[0], cell[1], date_str) is not None:
+            continue
+        url = base_url or _weather_base_url(dt_utc)
+        pending.setdefault((cell[0], cell[1], url), set()).add(date_str)
+
+    for (lat_c, lon_c, url), dates in pending.items():
+        for start_date, end_date in _date_spans(sorted(dates)):
+            weather = _get_hourly_range(url, lat_c, lon_c, start_date, end_date, max_retries, max_backoff)
+            if not weather:
+                continue
+            local.add_hourly(lat_c, lon_c, weather)
+
+    results: list[dict[Any, Any] | None] = []
+    for lat, lon, dt in points:
+        day_payload = local.get(lat, lon, _utc(dt).strftime("%Y-%m-%d"))
+        results.append(_slice_hour(day_payload, dt)[0] if day_payload else None)
+    return results
 
 
 def fetch_weather_open_meteo(
@@ -256,8 +740,11 @@ def fetch_weather_open_meteo(
     lat/lon to the nearest grid cell automatically, so lat/lon nudging is
     unnecessary and has been removed.
 
-    Tries the target hour and ±1 hour offsets (3 requests per attempt at
-    most) with exponential backoff on transient errors.
+    With a cache, the whole UTC day is fetched once (via
+    ``fetch_weather_batch``) and stored, and the requested hour is sliced
+    out of it. Without one — or if the day request fails — tries the target
+    hour and ±1 hour offsets (3 requests per attempt at most) with
+    exponential backoff on transient errors.
 
     Parameters
     ----------
@@ -281,51 +768,47 @@ def fetch_weather_open_meteo(
     offset_hours : float or None
         Hour offset used (0.0 on cache hit or exact match).
     """
-    from datetime import timezone as _tz
+    date_str = _utc(dt).strftime("%Y-%m-%d")
 
-    date_str = pd.to_datetime(dt).strftime("%Y-%m-%d")
-
-    if cache:
+    if cache is not None:
         cached = cache.get(lat, lon, date_str)
+        if not cached:
+            # Fill the cache with the whole day so other runs that day hit locally
+            fetch_weather_batch([(lat, lon, dt)], cache=cache, max_retries=max_retries, max_backoff=max_backoff)
+            cached = cache.get(lat, lon, date_str)
         if cached:
-            return cached, 0.0
+            sliced, offset = _slice_hour(cached, dt)
+            if sliced is not None:
+                return sliced, offset
 
     base_url = _weather_base_url(dt)
     lat_r = round(lat, 4)
     lon_r = round(lon, 4)
-    hourly_vars = "temperature_2m,precipitation,weathercode,windspeed_10m,windgusts_10m,winddirection_10m"
+    hourly_vars = _HOURLY_VARS
 
     # Try exact hour first, then ±1 hour — 3 requests max per attempt
     time_offsets = [timedelta(hours=h) for h in (0, 1, -1)]
 
     attempt = 0
     while attempt < max_retries:
-        for offset in time_offsets:
-            target = dt + offset
-            if target.tzinfo is None:
-                target = target.replace(tzinfo=_tz.utc)
-            hour_str = target.strftime("%Y-%m-%dT%H:00")
+        for shift in time_offsets:
+            hour_str = _utc(dt + shift).strftime("%Y-%m-%dT%H:00")
 
             try:
-                resp = requests.get(
-                    base_url,
-                    params={
-                        "latitude": lat_r,
-                        "longitude": lon_r,
-                        "hourly": hourly_vars,
-                        "start_hour": hour_str,
-                        "end_hour": hour_str,
-                        "timezone": "UTC",
-                    },
-                    timeout=8,
-                )
+                params: dict[str, str | float] = {
+                    "latitude": lat_r,
+                    "longitude": lon_r,
+                    "hourly": hourly_vars,
+                    "start_hour": hour_str,
+                    "end_hour": hour_str,
+                    "timezone": "UTC",
+                }
+                resp = requests.get(base_url, params=params, timeout=8)
                 if resp.status_code == 200:
                     weather = resp.json()
                     temps = (weather.get("hourly") or {}).get("temperature_2m")
                     if temps:
-                        if cache:
-                            cache.set(lat, lon, date_str, weather)
-                        return weather, offset.total_seconds() / 3600
+                        return weather, shift.total_seconds() / 3600
             except Exception as e:
                 print(f"[Weather] Error on attempt {attempt + 1}: {e}", file=sys.stderr)
 
@@ -336,3 +819,246 @@ def fetch_weather_open_meteo(
 
     print(f"[Weather] Failed after {max_retries} retries for lat={lat_r}, lon={lon_r}, time={dt}", file=sys.stderr)
     return None, None
+
+
+# ---------------------------------------------------------------------------
+# Per-sample alignment
+# ---------------------------------------------------------------------------
+
+# Hourly table column → per-sample activity column
+SAMPLE_WEATHER_COLUMNS: dict[str, str] = {
+    "temperature_2m": "temp_c",
+    "precipitation": "precip_mm_h",
+    "weathercode": "weather_code",
+    "windspeed_10m": "wind_kmh",
+    "windgusts_10m": "gust_kmh",
+    "winddirection_10m": "wind_dir_deg",
+}
+_LINEAR_COLUMNS = ("temperature_2m", "windspeed_10m", "windgusts_10m")
+
+
+def _as_utc_index(times: pd.Index | pd.Series) -> pd.DatetimeIndex:
+    idx = pd.DatetimeIndex(times)
+    idx = idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")
+    return cast(pd.DatetimeIndex, idx.as_unit("ns"))
+
+
+def align_weather_to_samples(times: pd.Index | pd.Series, hourly: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join hourly weather onto activity sample timestamps.
+
+    Each sample is bracketed by the hourly rows at or before and at or after
+    it (two ``merge_asof`` passes, so O(n log m) with no per-sample Python)
+    and values are interpolated between them: linearly for temperature, wind
+    speed and gusts, on the unit circle for wind direction, nearest hour for
+    the weather code. Open-Meteo precipitation is the total for the hour
+    *ending* at its timestamp, so samples take the following row's value as
+    a rate in mm/h. Samples more than an hour from any row are NaN.
+
+    Parameters
+    ----------
+    times : pd.Index or pd.Series
+        Sample timestamps (tz-naive values are treated as UTC); need not be sorted.
+    hourly : pd.DataFrame
+        Hourly weather indexed by UTC timestamp with Open-Meteo column names,
+        as returned by ``WeatherCache.query``.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per sample, in input order, with the ``SAMPLE_WEATHER_COLUMNS``
+        output columns (weather_code as nullable Int16).
+    """
+    idx = _as_utc_index(times)
+    n = len(idx)
+    out: pd.DataFrame = pd.DataFrame(index=pd.Index(times) if not isinstance(times, pd.Index) else times)
+    if n == 0 or hourly.empty:
+        for src, dst in SAMPLE_WEATHER_COLUMNS.items():
+            out[dst] = pd.array([pd.NA] * n, dtype="Int16") if src == "weathercode" else np.full(n, np.nan)
+        return out
+
+    order = np.argsort(idx.to_numpy(dtype="datetime64[ns]").view("int64"), kind="stable")
+    left = pd.DataFrame({"t": idx[order]})
+    right = hourly.copy()
+    right.index = _as_utc_index(right.index)
+    right = right[~right.index.duplicated(keep="last")].sort_index()
+    values = {
+        col: (right[col].to_numpy(dtype="float64", na_value=np.nan) if col in right.columns else np.full(len(right), np.nan))
+        for col in SAMPLE_WEATHER_COLUMNS
+    }
+    keys = pd.DataFrame({"t": right.index, "row": np.arange(len(right))})
+    tolerance = pd.Timedelta(hours=1)
+    before = pd.merge_asof(left, keys, on="t", direction="backward", tolerance=tolerance)["row"].to_numpy(dtype="float64", na_value=np.nan)
+    after = pd.merge_asof(left, keys, on="t", direction="forward", tolerance=tolerance)["row"].to_numpy(dtype="float64", na_value=np.nan)
+
+    has0 = ~np.isnan(before)
+    has1 = ~np.isnan(after)
+    i0 = np.where(has0, before, 0).astype(np.int64)
+    i1 = np.where(has1, after, 0).astype(np.int64)
+    t = left["t"].to_numpy(dtype="datetime64[ns]").view("int64").astype("float64")
+    rt = right.index.asi8.astype("float64")
+    span = rt[i1] - rt[i0]
+    w = np.where(has0 & has1 & (span > 0), (t - rt[i0]) / np.where(span > 0, span, 1.0), 0.0)
+    # Only one neighbour (edge of table or gap): use it as-is
+    w = np.where(~has0 & has1, 1.0, w)
+    valid = has0 | has1
+
+    def _pick(arr: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        v0 = np.where(has0, arr[i0], np.nan)
+        v1 = np.where(has1, arr[i1], np.nan)
+        return np.where(np.isnan(v0), v1, v0), np.where(np.isnan(v1), v0, v1)
+
+    sorted_cols: dict[str, np.ndarray] = {}
+    for col in _LINEAR_COLUMNS:
+        v0, v1 = _pick(values[col])
+        sorted_cols[col] = v0 + w * (v1 - v0)
+
+    rad = np.deg2rad(values["winddirection_10m"])
+    s0, s1 = _pick(np.sin(rad))
+    c0, c1 = _pick(np.cos(rad))
+    direction = np.mod(np.rad2deg(np.arctan2(s0 + w * (s1 - s0), c0 + w * (c1 - c0))), 360.0)
+    sorted_cols["winddirection_10m"] = np.where(np.isclose(direction, 360.0), 0.0, direction)
+
+    code0, code1 = _pick(values["weathercode"])
+    sorted_cols["weathercode"] = np.where(w < 0.5, code0, code1)
+
+    p0, p1 = _pick(values["precipitation"])
+    sorted_cols["precipitation"] = np.where(has1, p1, p0)
+
+    inverse = np.empty(n, dtype=np.int64)
+    inverse[order] = np.arange(n)
+    for src, dst in SAMPLE_WEATHER_COLUMNS.items():
+        arr = np.where(valid, sorted_cols[src], np.nan)[inverse]
+        if src == "weathercode":
+            out[dst] = pd.array(np.round(arr), dtype="Float64").astype("Int16")
+        else:
+            out[dst] = arr
+    return out
+
+
+def weather_for_samples(
+    df: pd.DataFrame,
+    cache: WeatherCache | None = None,
+    fetch: bool = True,
+    base_url: str | None = None,
+    max_retries: int = 3,
+    max_backoff: float = 2.0,
+) -> pd.DataFrame | None:
+    """
+    Per-sample weather for an activity DataFrame.
+
+    Looks up the hourly rows bracketing the activity for its median GPS
+    position, fetching any missing UTC days in one
+    ``fetch_weather_batch`` call when ``fetch`` is True, then aligns them
+    onto the samples with ``align_weather_to_samples``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Activity DataFrame with a timestamp index and ``latitude`` /
+        ``longitude`` columns.
+    cache : WeatherCache, optional
+        Hourly cache to read and fill; a memory-only cache is used if None.
+    fetch : bool
+        Fetch missing days from Open-Meteo (False: cache-only).
+    base_url : str, optional
+        Endpoint override passed to ``fetch_weather_batch``.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        Aligned weather columns indexed like ``df``, or None when the
+        activity has no GPS or no weather could be found.
+    """
+    if df.empty or "latitude" not in df.columns or "longitude" not in df.columns:
+        return None
+    lat_s = df["latitude"].dropna()
+    lon_s = df["longitude"].dropna()
+    if lat_s.empty or lon_s.empty:
+        return None
+    lat, lon = float(lat_s.median()), float(lon_s.median())
+
+    idx = _as_utc_index(df.index)
+    start = idx.min().floor("h")
+    end = idx.max().ceil("h")
+    local = cache if cache is not None else WeatherCache(None, precision=2)
+
+    rows = local.query(lat, lon, start, end)
+    if fetch:
+        have = set(pd.DatetimeIndex(rows.index).strftime("%Y-%m-%d")) if not rows.empty else set()
+        days = pd.date_range(start.floor("D"), end.floor("D"), freq="D")
+        missing = [d for d in days if d.strftime("%Y-%m-%d") not in have]
+        if missing:
+            fetch_weather_batch(
+                [(lat, lon, d.to_pydatetime()) for d in missing],
+                cache=local,
+                base_url=base_url,
+                max_retries=max_retries,
+                max_backoff=max_backoff,
+            )
+            rows = local.query(lat, lon, start, end)
+    if rows.empty:
+        return None
+    aligned = align_weather_to_samples(df.index, rows)
+    if aligned["temp_c"].isna().all():
+        return None
+    return aligned
+
+
+def summarize_sample_weather(df: pd.DataFrame) -> dict[str, Any] | None:
+    """
+    Time-weighted summary of per-sample weather columns.
+
+    Uses the ``dt`` column (seconds per sample) as weights when present.
+
+    Returns
+    -------
+    dict or None
+        ``temp_mean_c``, ``temp_min_c``, ``temp_max_c``, ``temp_start_c``,
+        ``temp_end_c``, ``wind_mean_kmh``, ``gust_max_kmh``, ``precip_mm``
+        and ``weather_code`` (time-weighted mode); None if ``df`` has no
+        usable ``temp_c`` column.
+    """
+    if "temp_c" not in df.columns:
+        return None
+    temp = df["temp_c"].to_numpy(dtype="float64", na_value=np.nan)
+    ok = ~np.isnan(temp)
+    if not ok.any():
+        return None
+    dt = df["dt"].to_numpy(dtype="float64", na_value=np.nan) if "dt" in df.columns else np.ones(len(df))
+    dt = np.where(np.isnan(dt) | (dt < 0), 0.0, dt)
+
+    def _wmean(arr: np.ndarray) -> float | None:
+        m = ~np.isnan(arr)
+        weight = dt[m].sum()
+        if not m.any():
+            return None
+        return float(np.average(arr[m], weights=dt[m])) if weight > 0 else float(arr[m].mean())
+
+    def _col(name: str) -> np.ndarray:
+        return df[name].to_numpy(dtype="float64", na_value=np.nan) if name in df.columns else np.full(len(df), np.nan)
+
+    wind = _col("wind_kmh")
+    gust = _col("gust_kmh")
+    precip = _col("precip_mm_h")
+    codes = _col("weather_code")
+
+    weather_code: int | None = None
+    code_ok = ~np.isnan(codes)
+    if code_ok.any():
+        uniq, inv = np.unique(codes[code_ok], return_inverse=True)
+        weather_code = int(uniq[np.argmax(np.bincount(inv, weights=dt[code_ok] + 1e-9))])
+
+    wind_mean = _wmean(wind)
+    temp_mean = _wmean(temp)
+    return {
+        "temp_mean_c": round(temp_mean, 1) if temp_mean is not None else None,
+        "temp_min_c": round(float(temp[ok].min()), 1),
+        "temp_max_c": round(float(temp[ok].max()), 1),
+        "temp_start_c": round(float(temp[ok][0]), 1),
+        "temp_end_c": round(float(temp[ok][-1]), 1),
+        "wind_mean_kmh": round(wind_mean, 1) if wind_mean is not None else None,
+        "gust_max_kmh": round(float(np.nanmax(gust)), 1) if (~np.isnan(gust)).any() else None,
+        "precip_mm": round(float(np.nansum(precip * dt) / 3600.0), 2) if (~np.isnan(precip)).any() else None,
+        "weather_code": weather_code,
+    }
@@ -9,7 +9,18 @@ Available parsers:
 - FIT: Garmin binary format (Flexible and Interoperable Data Transfer)
 """
 
-from biosystems.ingestion.fit import add_derived_metrics, parse_fit
-from biosystems.ingestion.gpx import parse_gpx
+from typing import TYPE_CHECKING
+
+from biosystems._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "add_derived_metrics": ".fit",
+    "parse_fit": ".fit",
+    "parse_gpx": ".gpx",
+})
+
+if TYPE_CHECKING:
+    from biosystems.ingestion.fit import add_derived_metrics, parse_fit
+    from biosystems.ingestion.gpx import parse_gpx
 
 __all__ = ["parse_gpx", "parse_fit", "add_derived_metrics"]
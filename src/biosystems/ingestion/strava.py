@@ -13,8 +13,14 @@ Uses OAuth 2.0 refresh token flow. Requires three environment variables:
     STRAVA_CLIENT_SECRET  - App client secret
     STRAVA_REFRESH_TOKEN  - Long-lived refresh token (from initial OAuth dance)
 
-The refresh token is exchanged for a short-lived access token on every call.
-No tokens are written to disk by this module.
+The refresh token is exchanged for a short-lived access token, which is kept
+in memory and reused until shortly before it expires (so a long-lived
+``biosystems serve`` process refreshes about every six hours, not per
+command). No tokens are written to disk by this module.
+
+Set ``STRAVA_API_ROOT`` (e.g. ``http://127.0.0.1:8123``) to point the client
+at a local stand-in server (see ``biosystems.testing.strava_standin``);
+``/api/v3`` and ``/oauth/token`` are resolved beneath it.
 
 Output Schema
 -------------
@@ -38,17 +44,30 @@ This matches the schema produced by parse_fit() + add_derived_metrics().
 from __future__ import annotations
 
 import os
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import numpy as np
-import pandas as pd
 import requests
 
+if TYPE_CHECKING:  # imported where used: `strava --list` and sync listing never build frames
+    import numpy as np
+    import pandas as pd
+
 _TOKEN_URL = "https://www.strava.com/oauth/token"
 _BASE_URL = "https://www.strava.com/api/v3"
 
+
+def _api_urls() -> tuple[str, str]:
+    """Return (api_base_url, token_url), honouring the ``STRAVA_API_ROOT`` override."""
+    root = os.environ.get("STRAVA_API_ROOT")
+    if not root:
+        return _BASE_URL, _TOKEN_URL
+    root = root.rstrip("/")
+    return f"{root}/api/v3", f"{root}/oauth/token"
+
+
 # Streams to request — order doesn't matter, Strava aligns them by index
 _STREAM_KEYS = "time,distance,latlng,altitude,heartrate,cadence,velocity_smooth,moving"
 
@@ -131,10 +150,21 @@ def _get_credentials() -> tuple[str, str, str]:
     )
 
 
+# (token_url, client_id, refresh_token) → (access_token, expires_at epoch)
+_token_cache: dict[tuple[str, str, str], tuple[str, float]] = {}
+_token_guard = threading.Lock()
+#: Refresh this many seconds before Strava's ``expires_at``.
+_TOKEN_EXPIRY_MARGIN_S = 300
+
+
 def _refresh_access_token() -> str:
     """
     Exchange the refresh token for a short-lived access token.
 
+    The token is cached in-process per credentials and endpoint until
+    ``_TOKEN_EXPIRY_MARGIN_S`` before the ``expires_at`` Strava returns;
+    responses without an expiry are not cached.
+
     Returns
     -------
     str
@@ -148,9 +178,15 @@ def _refresh_access_token() -> str:
         If Strava rejects the token request.
     """
     client_id, client_secret, refresh_token = _get_credentials()
+    token_url = _api_urls()[1]
+    key = (token_url, client_id, refresh_token)
+    with _token_guard:
+        cached = _token_cache.get(key)
+    if cached is not None and time.time() < cached[1] - _TOKEN_EXPIRY_MARGIN_S:
+        return cached[0]
 
     resp = requests.post(
-        _TOKEN_URL,
+        token_url,
         data={
             "client_id": client_id,
             "client_secret": client_secret,
@@ -160,7 +196,12 @@ def _refresh_access_token() -> str:
         timeout=15,
     )
     resp.raise_for_status()
-    return resp.json()["access_token"]
+    payload = resp.json()
+    token = payload["access_token"]
+    if isinstance(payload.get("expires_at"), (int, float)):
+        with _token_guard:
+            _token_cache[key] = (token, float(payload["expires_at"]))
+    return token
 
 
 def _auth_headers(access_token: str) -> dict[str, str]:
@@ -189,7 +230,7 @@ def fetch_activity_efforts(
     """
     token = access_token or _refresh_access_token()
     resp = _get_with_backoff(
-        f"{_BASE_URL}/activities/{activity_id}",
+        f"{_api_urls()[0]}/activities/{activity_id}",
         headers=_auth_headers(token),
         params={"include_all_efforts": True},
     )
@@ -199,57 +240,88 @@ def fetch_activity_efforts(
     return run_date, efforts
 
 
-def fetch_runs_since(
-    after_date: str,
+def fetch_runs_after(
+    after_epoch: int,
     access_token: str | None = None,
+    per_page: int = 200,
 ) -> list[dict[str, Any]]:
     """
-    Return all running activities since a given date, paginating as needed.
+    Return all running activities that started after a Unix timestamp.
+
+    This is the primitive behind both ``fetch_runs_since`` (date-window
+    listing) and the incremental ``biosystems sync`` command, which passes
+    the epoch of its persisted high-water mark so that a daily sync costs a
+    single small list request.
 
     Parameters
     ----------
-    after_date : str
-        ISO date string (YYYY-MM-DD). Activities with start_date_local >= this
-        date are returned.
+    after_epoch : int
+        Unix timestamp (seconds, UTC). Forwarded as Strava's ``after`` filter.
     access_token : str, optional
         Pre-fetched access token. If None, obtained via refresh flow.
+    per_page : int
+        Page size (Strava caps this at 200).
 
     Returns
     -------
     list[dict]
         All SummaryActivity dicts with sport_type in {Run, TrailRun, VirtualRun},
-        ordered newest-first (Strava default).
+        in the order Strava returns them.
     """
-    import calendar
-
     token = access_token or _refresh_access_token()
 
-    # Convert date to Unix timestamp for Strava's `after` parameter
-    dt = datetime.strptime(after_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-    after_epoch = int(calendar.timegm(dt.timetuple()))
-
     run_types = {"Run", "TrailRun", "VirtualRun"}
     all_runs: list[dict[str, Any]] = []
     page = 1
 
     while True:
         resp = _get_with_backoff(
-            f"{_BASE_URL}/athlete/activities",
+            f"{_api_urls()[0]}/athlete/activities",
             headers=_auth_headers(token),
-            params={"per_page": 200, "page": page, "after": after_epoch},
+            params={"per_page": per_page, "page": page, "after": int(after_epoch)},
         )
         batch = resp.json()
         if not batch:
             break
         runs = [a for a in batch if a.get("sport_type") in run_types]
         all_runs.extend(runs)
-        if len(batch) < 200:
+        if len(batch) < per_page:
             break
         page += 1
 
     return all_runs
 
 
+def fetch_runs_since(
+    after_date: str,
+    access_token: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Return all running activities since a given date, paginating as needed.
+
+    Parameters
+    ----------
+    after_date : str
+        ISO date string (YYYY-MM-DD). Activities with start_date_local >= this
+        date are returned.
+    access_token : str, optional
+        Pre-fetched access token. If None, obtained via refresh flow.
+
+    Returns
+    -------
+    list[dict]
+        All SummaryActivity dicts with sport_type in {Run, TrailRun, VirtualRun},
+        ordered newest-first (Strava default).
+    """
+    import calendar
+
+    # Convert date to Unix timestamp for Strava's `after` parameter
+    dt = datetime.strptime(after_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    after_epoch = int(calendar.timegm(dt.timetuple()))
+
+    return fetch_runs_after(after_epoch, access_token=access_token)
+
+
 def fetch_recent_runs(n: int = 10, access_token: str | None = None) -> list[dict[str, Any]]:
     """
     Return the most recent running activities for the authenticated athlete.
@@ -277,7 +349,7 @@ def fetch_recent_runs(n: int = 10, access_token: str | None = None) -> list[dict
     per_page = min(n * 2, 200)  # over-fetch to account for non-Run activities
 
     resp = _get_with_backoff(
-        f"{_BASE_URL}/athlete/activities",
+        f"{_api_urls()[0]}/athlete/activities",
         headers=_auth_headers(token),
         params={"per_page": per_page, "page": 1},
     )
@@ -326,6 +398,9 @@ def parse_strava_streams(
     ValueError
         If the 'time' stream is missing (required for index construction).
     """
+    import numpy as np
+    import pandas as pd
+
     if "time" not in streams:
         raise ValueError(
             f"Activity {activity_id}: 'time' stream is required but was not returned by Strava."
@@ -341,80 +416,125 @@ def parse_strava_streams(
 
     time_offsets = pd.to_timedelta(streams["time"], unit="s")
     timestamps = start_dt + time_offsets
+    n = len(timestamps)
 
-    len(streams["time"])
-    df = pd.DataFrame(index=timestamps)
-    df.index.name = "timestamp"
+    # Every stream is converted once to a float64 ndarray; zero-masking and
+    # scaling happen in place so no intermediate Series/columns are allocated.
 
     # --- Heart rate ---
-    if "heartrate" in streams:
-        hr = pd.array(streams["heartrate"], dtype="float64")
-        df["hr"] = hr
-        df["hr"] = df["hr"].replace(0, np.nan)
-    else:
-        df["hr"] = np.nan
+    hr = _float_stream(streams, "heartrate", n)
+    hr[hr == 0] = np.nan
 
     # --- Cadence ---
-    if "cadence" in streams:
-        # Strava reports running cadence as single-foot RPM.
-        # Multiply by 2 to get total steps per minute, matching FIT file convention.
-        df["cadence"] = pd.array(streams["cadence"], dtype="float64") * 2
-        df["cadence"] = df["cadence"].replace(0, np.nan)
-    else:
-        df["cadence"] = np.nan
+    # Strava reports running cadence as single-foot RPM.
+    # Multiply by 2 to get total steps per minute, matching FIT file convention.
+    cadence = _float_stream(streams, "cadence", n)
+    cadence *= 2
+    cadence[cadence == 0] = np.nan
 
     # --- Elevation ---
-    if "altitude" in streams:
-        df["ele"] = pd.array(streams["altitude"], dtype="float64")
-    else:
-        df["ele"] = np.nan
+    ele = _float_stream(streams, "altitude", n)
 
     # --- GPS coordinates ---
-    if "latlng" in streams:
-        latlng = streams["latlng"]
-        df["latitude"] = [pt[0] if pt else np.nan for pt in latlng]
-        df["longitude"] = [pt[1] if pt else np.nan for pt in latlng]
-    else:
-        df["latitude"] = np.nan
-        df["longitude"] = np.nan
+    latitude, longitude = _latlng_columns(streams.get("latlng"), n)
 
     # --- Moving flag ---
-    if "moving" in streams:
-        df["moving"] = streams["moving"]
-    else:
-        df["moving"] = True
+    moving: Any = streams["moving"] if "moving" in streams else np.ones(n, dtype=bool)
 
     # --- Velocity and pace ---
-    if "velocity_smooth" in streams:
-        df["speed_mps"] = pd.array(streams["velocity_smooth"], dtype="float64")
-        df["speed_mps"] = df["speed_mps"].replace(0, np.nan)
-    else:
-        df["speed_mps"] = np.nan
-
-    df["pace_sec_km"] = (1000.0 / df["speed_mps"]).replace([np.inf, -np.inf], np.nan)
+    speed = _float_stream(streams, "velocity_smooth", n)
+    speed[speed == 0] = np.nan
+    with np.errstate(divide="ignore"):
+        pace = 1000.0 / speed
+    pace[np.isinf(pace)] = np.nan
 
     # --- Segment distance and time delta ---
     # Strava's 'distance' is cumulative. Diff gives per-point segment metres.
     if "distance" in streams:
-        dist_cumulative = pd.array(streams["distance"], dtype="float64")
-        dist_diff = np.diff(dist_cumulative, prepend=0.0)
-        df["dist"] = dist_diff
-        df["distance_cumulative_km"] = dist_cumulative / 1000.0
+        dist_cumulative = np.asarray(streams["distance"], dtype="float64")
+        dist = np.diff(dist_cumulative, prepend=0.0)
+        dist_cumulative_km = dist_cumulative / 1000.0
     else:
-        df["dist"] = np.nan
-        df["distance_cumulative_km"] = np.nan
+        dist = np.full(n, np.nan)
+        dist_cumulative_km = np.full(n, np.nan)
 
     # Time delta in seconds per point
-    time_secs = np.array(streams["time"], dtype="float64")
-    df["dt"] = np.diff(time_secs, prepend=0.0)
+    time_secs = np.asarray(streams["time"], dtype="float64")
+    dt = np.diff(time_secs, prepend=0.0)
 
     # Fill first-point speed from second point (no delta at t=0)
-    df["speed_mps"] = df["speed_mps"].bfill()
-    df["pace_sec_km"] = df["pace_sec_km"].bfill()
-
+    _bfill_inplace(speed)
+    _bfill_inplace(pace)
+
+    df = pd.DataFrame(
+        {
+            "hr": hr,
+            "cadence": cadence,
+            "ele": ele,
+            "latitude": latitude,
+            "longitude": longitude,
+            "moving": moving,
+            "speed_mps": speed,
+            "pace_sec_km": pace,
+            "dist": dist,
+            "distance_cumulative_km": dist_cumulative_km,
+            "dt": dt,
+        },
+        index=timestamps,
+        copy=False,
+    )
+    df.index.name = "timestamp"
     return df
 
 
+def _float_stream(streams: dict[str, list[Any]], key: str, n: int) -> np.ndarray:
+    """Return a stream as a fresh float64 array (None → NaN), or all-NaN if absent."""
+    import numpy as np
+
+    if key not in streams:
+        return np.full(n, np.nan)
+    return np.array(streams[key], dtype="float64")
+
+
+def _latlng_columns(latlng: list[Any] | None, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split Strava's ``latlng`` stream into latitude / longitude float arrays.
+
+    The common case (every point a ``[lat, lng]`` pair) is a single reshape
+    to an (n, 2) array. Streams with missing points (``None`` / ``[]``) fall
+    back to a per-point unpack with NaN for the gaps.
+    """
+    import numpy as np
+
+    if latlng is None:
+        return np.full(n, np.nan), np.full(n, np.nan)
+    try:
+        pts = np.asarray(latlng, dtype="float64")
+    except (TypeError, ValueError):
+        pts = None
+    if pts is None or pts.ndim != 2 or pts.shape[1] != 2:
+        pts = np.full((len(latlng), 2), np.nan)
+        for i, pt in enumerate(latlng):
+            if pt:
+                pts[i, 0] = pt[0]
+                pts[i, 1] = pt[1]
+    return pts[:, 0], pts[:, 1]
+
+
+def _bfill_inplace(values: np.ndarray) -> None:
+    """Backward-fill NaNs in a 1-D float array in place (trailing NaNs stay NaN)."""
+    import numpy as np
+
+    missing = np.isnan(values)
+    if not missing.any():
+        return
+    n = len(values)
+    idx = np.where(missing, n, np.arange(n))
+    idx = np.minimum.accumulate(idx[::-1])[::-1]
+    filled = idx < n
+    values[missing & filled] = values[idx[missing & filled]]
+
+
 def _parse_best_efforts(raw_efforts: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """
     Extract best effort fields relevant to biosystems from raw Strava effort dicts.
@@ -477,7 +597,7 @@ def fetch_activity_streams(
 
     # Fetch full activity detail (include_all_efforts=True gets best_efforts list)
     activity_resp = _get_with_backoff(
-        f"{_BASE_URL}/activities/{activity_id}",
+        f"{_api_urls()[0]}/activities/{activity_id}",
         headers=_auth_headers(token),
         params={"include_all_efforts": True},
     )
@@ -503,7 +623,7 @@ def fetch_activity_streams(
 
     # Fetch streams
     streams_resp = _get_with_backoff(
-        f"{_BASE_URL}/activities/{activity_id}/streams",
+        f"{_api_urls()[0]}/activities/{activity_id}/streams",
         headers=_auth_headers(token),
         params={"keys": _STREAM_KEYS, "key_by_type": True},
     )
@@ -347,6 +347,19 @@ class DistributionStats(BaseModel):
     max: float
 
 
+class WeatherProfile(BaseModel):
+    """Time-weighted weather over the run, from hourly weather aligned per sample."""
+    temp_mean_c: float | None = None
+    temp_min_c: float | None = None
+    temp_max_c: float | None = None
+    temp_start_c: float | None = None
+    temp_end_c: float | None = None
+    wind_mean_kmh: float | None = None
+    gust_max_kmh: float | None = None
+    precip_mm: float | None = None
+    weather_code: int | None = None
+
+
 class FullRunReport(BaseModel):
     """
     Comprehensive run report combining session and run-only metrics,
@@ -411,6 +424,9 @@ class FullRunReport(BaseModel):
     # Own training-block bests (replaces/supplements Strava all-time best_efforts)
     block_bests: list[BlockBest] = Field(default_factory=list)
 
+    # Per-sample weather summary (when weather columns were joined onto the samples)
+    weather_profile: WeatherProfile | None = None
+
     # Context
     context: RunContext | None = None
 
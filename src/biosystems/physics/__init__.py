@@ -11,21 +11,40 @@ Core Metrics:
 - Grade Adjusted Pace (GAP): Normalized pace accounting for elevation
 """
 
-from biosystems.physics.gap import (
-    calculate_average_gap,
-    calculate_gap_from_dataframe,
-    calculate_gap_segment,
-    calculate_grade_percent,
-    minetti_energy_cost,
-)
-from biosystems.physics.metrics import (
-    calculate_decoupling,
-    calculate_efficiency_factor,
-    calculate_hr_tss,
-    compute_training_zones,
-    lower_z2_bpm,
-    run_metrics,
-)
+from typing import TYPE_CHECKING
+
+from biosystems._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "calculate_average_gap": ".gap",
+    "calculate_gap_from_dataframe": ".gap",
+    "calculate_gap_segment": ".gap",
+    "calculate_grade_percent": ".gap",
+    "minetti_energy_cost": ".gap",
+    "calculate_decoupling": ".metrics",
+    "calculate_efficiency_factor": ".metrics",
+    "calculate_hr_tss": ".metrics",
+    "compute_training_zones": ".metrics",
+    "lower_z2_bpm": ".metrics",
+    "run_metrics": ".metrics",
+})
+
+if TYPE_CHECKING:
+    from biosystems.physics.gap import (
+        calculate_average_gap,
+        calculate_gap_from_dataframe,
+        calculate_gap_segment,
+        calculate_grade_percent,
+        minetti_energy_cost,
+    )
+    from biosystems.physics.metrics import (
+        calculate_decoupling,
+        calculate_efficiency_factor,
+        calculate_hr_tss,
+        compute_training_zones,
+        lower_z2_bpm,
+        run_metrics,
+    )
 
 __all__ = [
     "run_metrics",
@@ -18,6 +18,7 @@ import pandas as pd
 
 from biosystems.models import PhysiologicalMetrics, RunContext, ZoneConfig
 from biosystems.physics.gap import calculate_average_gap, check_elevation_quality
+from biosystems.profiling import profiled, stage
 
 log = logging.getLogger(__name__)
 
@@ -47,6 +48,7 @@ def lower_z2_bpm(zone_config: ZoneConfig) -> int:
     raise ValueError("No Z2 (Aerobic) zone found in configuration")
 
 
+@profiled("training_zones")
 def compute_training_zones(
     hr_array: pd.Series, pace_array: pd.Series, zone_config: ZoneConfig
 ) -> tuple[pd.Series, pd.Series, list[Any]]:
@@ -112,6 +114,7 @@ def compute_training_zones(
     return zone_hr_col, zone_pace_col, zone_effective_col
 
 
+@profiled("efficiency_factor")
 def calculate_efficiency_factor(df: pd.DataFrame, zone_config: ZoneConfig) -> float:
     """
     Calculate Efficiency Factor: avg speed / avg heart rate.
@@ -153,6 +156,7 @@ def calculate_efficiency_factor(df: pd.DataFrame, zone_config: ZoneConfig) -> fl
     return float(avg_speed / avg_hr)
 
 
+@profiled("decoupling")
 def calculate_decoupling(df: pd.DataFrame, zone_config: ZoneConfig) -> float:
     """
     Calculate aerobic decoupling (Pa:HR drift).
@@ -219,6 +223,7 @@ def calculate_decoupling(df: pd.DataFrame, zone_config: ZoneConfig) -> float:
     return float(decouple_pct)
 
 
+@profiled("hr_tss")
 def calculate_hr_tss(df: pd.DataFrame, zone_config: ZoneConfig) -> float:
     """
     Calculate heart rate-based Training Stress Score.
@@ -249,6 +254,7 @@ def calculate_hr_tss(df: pd.DataFrame, zone_config: ZoneConfig) -> float:
     return float(hr_tss)
 
 
+@profiled()
 def run_metrics(
     df: pd.DataFrame, zone_config: ZoneConfig, context: RunContext | None = None
 ) -> PhysiologicalMetrics:
@@ -322,9 +328,10 @@ def run_metrics(
                     gap_quality_note = ele_reason
                     log.warning("GAP skipped — elevation quality check failed: %s", ele_reason)
                 else:
-                    gap_sec_km = calculate_average_gap(
-                        df, pace_col="pace_sec_km", ele_col="ele", dist_col="dist", dt_col="dt"
-                    )
+                    with stage("gap"):
+                        gap_sec_km = calculate_average_gap(
+                            df, pace_col="pace_sec_km", ele_col="ele", dist_col="dist", dt_col="dt"
+                        )
                     if not np.isnan(gap_sec_km):
                         gap_min_per_km = round(gap_sec_km / 60, 2)
             except Exception:
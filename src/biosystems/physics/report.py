@@ -31,16 +31,19 @@ from biosystems.models import (
     RunDynamics,
     StrideSegment,
     WalkSummary,
+    WeatherProfile,
     ZoneConfig,
     ZoneTimeEntry,
 )
 from biosystems.physics.metrics import compute_training_zones, lower_z2_bpm, run_metrics
+from biosystems.profiling import profiled
 
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
 
+@profiled("distributions")
 def _percentile_stats(series: pd.Series) -> DistributionStats | None:
     """Compute percentile distribution stats for a numeric series."""
     clean = series.dropna()
@@ -59,6 +62,7 @@ def _percentile_stats(series: pd.Series) -> DistributionStats | None:
     )
 
 
+@profiled("zone_times")
 def _zone_time_distribution(
     zone_col: pd.Series, dt_col: pd.Series
 ) -> list[ZoneTimeEntry]:
@@ -80,6 +84,7 @@ def _zone_time_distribution(
     return entries
 
 
+@profiled("strides")
 def _detect_strides(
     df: pd.DataFrame,
     pace_threshold_min_km: float = 4.5,
@@ -135,6 +140,7 @@ def _detect_strides(
     return strides
 
 
+@profiled("dynamics")
 def _compute_dynamics(run_df: pd.DataFrame) -> RunDynamics | None:
     """Compute HR drift, pace strategy, and HR/pace correlation."""
     valid = run_df.dropna(subset=["hr", "pace_min_per_km"])
@@ -179,6 +185,7 @@ def _compute_dynamics(run_df: pd.DataFrame) -> RunDynamics | None:
     )
 
 
+@profiled("aev")
 def _compute_aev(
     run_df: pd.DataFrame, ref_hr: int = 140
 ) -> tuple[float | None, int | None]:
@@ -223,6 +230,7 @@ def _compute_aev(
     return round(predicted_pace, 2), ref_hr
 
 
+@profiled("ef_reliability")
 def _compute_ef_reliability(work_df: pd.DataFrame) -> float | None:
     """
     Coefficient of variation of instantaneous EF = speed_mps / hr.
@@ -242,6 +250,7 @@ def _compute_ef_reliability(work_df: pd.DataFrame) -> float | None:
     return round(float(inst_ef.std()) / mean_ef, 4)
 
 
+@profiled("walks")
 def _compute_walk_summary(
     df: pd.DataFrame,
     session_duration_s: float,
@@ -321,6 +330,7 @@ def _compute_walk_summary(
     return walk_summary, segments
 
 
+@profiled("elevation_gain")
 def _compute_elevation_gain(df: pd.DataFrame) -> float | None:
     """Sum positive elevation differences (gain only)."""
     if "ele" not in df.columns:
@@ -333,6 +343,18 @@ def _compute_elevation_gain(df: pd.DataFrame) -> float | None:
     return round(gain, 1) if gain > 0 else None
 
 
+@profiled("weather_profile")
+def _compute_weather_profile(df: pd.DataFrame) -> WeatherProfile | None:
+    """Summarise per-sample weather columns (temp_c, wind_kmh, ...) if present."""
+    if "temp_c" not in df.columns:
+        return None
+    from biosystems.environment.weather import summarize_sample_weather
+
+    summary = summarize_sample_weather(df)
+    return WeatherProfile(**summary) if summary else None
+
+
+@profiled("splits")
 def _parse_km_splits(splits_metric: list[dict]) -> list[KmSplit]:
     """
     Convert Strava splits_metric list into KmSplit model instances.
@@ -389,6 +411,7 @@ def _workout_type_str(wt: int | None) -> str | None:
     return _WT.get(wt) if wt else None
 
 
+@profiled("laps")
 def _parse_laps(raw_laps: list[dict]) -> list[Lap]:
     """Convert Strava laps list into Lap model instances."""
     result: list[Lap] = []
@@ -422,6 +445,7 @@ def _parse_laps(raw_laps: list[dict]) -> list[Lap]:
 # ---------------------------------------------------------------------------
 
 
+@profiled()
 def build_run_report(
     df: pd.DataFrame,
     zone_config: ZoneConfig,
@@ -523,6 +547,9 @@ def build_run_report(
     # --- Elevation gain ---
     elevation_gain = _compute_elevation_gain(df)
 
+    # --- Per-sample weather ---
+    weather_profile = _compute_weather_profile(df)
+
     # --- Activity metadata from activity_meta ---
     splits_km: list[KmSplit] = []
     laps: list[Lap] = []
@@ -624,5 +651,6 @@ def build_run_report(
         description=description,
         best_efforts=parsed_efforts,
         block_bests=block_bests,
+        weather_profile=weather_profile,
         context=context,
     )
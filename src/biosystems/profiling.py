@@ -0,0 +1,203 @@
+"""
+Profiling
+=========
+
+Opt-in per-stage timers for the slow paths (``biosystems strava``,
+``analyze``, the run report). Code marks its stages with
+
+    with stage("weather"):
+        ...
+
+    @profiled("run_metrics")
+    def run_metrics(...): ...
+
+and nothing is measured unless a profile is active: ``stage`` then returns a
+shared no-op context manager and a ``profiled`` wrapper makes one global
+lookup before calling through, so the markers can stay in hot code.
+
+    with profile() as prof:
+        api.run_report(123)
+    prof.report()   # {"wall_s": ..., "stages": [{"stage": "strava.fetch", ...}, ...]}
+
+The CLI's global ``--profile`` option wraps any command the same way and
+prints the report as JSON to stderr (or to ``--profile-out FILE``).
+
+Per stage the report gives the call count, wall time and CPU time
+(process-wide, so worker threads count). With ``memory=True``
+(``--profile-memory``) it adds the tracemalloc peak: the most memory
+allocated above the level at stage entry during any one call, tracked on the
+thread that started the profile. Tracing every allocation makes pandas- and
+parser-heavy stages several times slower, so it is off by default and
+timings from a memory profile should only be compared with each other.
+Nested stages are keyed by their path, e.g. ``build_run_report/run_metrics``.
+One profile can be active per process at a time.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_active: Profiler | None = None
+_guard = threading.Lock()
+_NULL = contextlib.nullcontext()
+_local = threading.local()  # .stack: names of the stages open on this thread
+
+
+class Profiler:
+    """Per-stage totals for one profile; see ``profile``."""
+
+    def __init__(self, memory: bool = False, label: str | None = None) -> None:
+        self.memory = memory
+        self.label = label
+        self.wall_s: float | None = None
+        self.cpu_s: float | None = None
+        self.peak_alloc_bytes: int | None = None
+        self._stages: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.get_ident()
+        self._peaks: list[int] = []  # running peak of each open stage on the owning thread
+        self._owns_tracing = False
+
+    def _start(self) -> None:
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            self._base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            self._peaks = [0]
+        self._t0, self._c0 = time.perf_counter(), time.process_time()
+
+    def _stop(self) -> None:
+        self.wall_s = time.perf_counter() - self._t0
+        self.cpu_s = time.process_time() - self._c0
+        if self.memory:
+            peak = max(self._peaks[0], tracemalloc.get_traced_memory()[1])
+            self.peak_alloc_bytes = peak - self._base
+            if self._owns_tracing:
+                tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        path = "/".join([*stack, name])
+        track = self.memory and threading.get_ident() == self._thread
+        if track:
+            entry, peak = tracemalloc.get_traced_memory()
+            self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        stack.append(name)
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - t0, time.process_time() - c0
+            stack.pop()
+            alloc = None
+            if track:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                self._peaks[-1] = max(self._peaks[-1], peak)
+                alloc = peak - entry
+            self._record(path, wall, cpu, alloc)
+
+    def _record(self, path: str, wall: float, cpu: float, alloc: int | None) -> None:
+        with self._lock:
+            s = self._stages.get(path)
+            if s is None:
+                s = self._stages[path] = {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_alloc_bytes": None}
+            s["calls"] += 1
+            s["wall_s"] += wall
+            s["cpu_s"] += cpu
+            if alloc is not None:
+                s["peak_alloc_bytes"] = max(s["peak_alloc_bytes"] or 0, alloc)
+
+    def report(self) -> dict[str, Any]:
+        """The breakdown as a JSON-ready dict; stages in the order they first ran."""
+        with self._lock:
+            stages = [
+                {
+                    "stage": path,
+                    "calls": s["calls"],
+                    "wall_s": round(s["wall_s"], 6),
+                    "cpu_s": round(s["cpu_s"], 6),
+                    "peak_alloc_bytes": s["peak_alloc_bytes"],
+                }
+                for path, s in self._stages.items()
+            ]
+        return {
+            "label": self.label,
+            "wall_s": None if self.wall_s is None else round(self.wall_s, 6),
+            "cpu_s": None if self.cpu_s is None else round(self.cpu_s, 6),
+            "peak_alloc_bytes": self.peak_alloc_bytes,
+            "stages": stages,
+        }
+
+
+@contextlib.contextmanager
+def profile(memory: bool = False, label: str | None = None) -> Iterator[Profiler]:
+    """
+    Measure every ``stage`` entered until the block exits.
+
+    Parameters
+    ----------
+    memory : bool
+        Trace allocations for per-stage peaks (starts tracemalloc if it is
+        not already running).
+    label : str, optional
+        Copied into the report (the CLI uses the command name).
+
+    Raises
+    ------
+    RuntimeError
+        Another profile is already active in this process.
+    """
+    global _active
+
+    prof = Profiler(memory=memory, label=label)
+    with _guard:
+        if _active is not None:
+            raise RuntimeError("a profile is already active")
+        _active = prof
+    prof._start()
+    try:
+        yield prof
+    finally:
+        with _guard:
+            _active = None
+        prof._stop()
+
+
+def stage(name: str) -> contextlib.AbstractContextManager[None]:
+    """Context manager timing ``name`` under the active profile (a shared no-op when none is)."""
+    prof = _active
+    return _NULL if prof is None else prof._measure(name)
+
+
+def profiled(name: str | None = None) -> Callable[[F], F]:
+    """Decorator: run each call of the function as a stage (named after it by default)."""
+
+    def decorate(fn: F) -> F:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            prof = _active
+            if prof is None:
+                return fn(*args, **kwargs)
+            with prof._measure(label):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -10,11 +10,22 @@ Features:
 - Segment identification and classification
 """
 
-from biosystems.signal.walk_detection import (
-    filter_gps_jitter,
-    summarize_walk_segments,
-    walk_block_segments,
-)
+from typing import TYPE_CHECKING
+
+from biosystems._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "filter_gps_jitter": ".walk_detection",
+    "summarize_walk_segments": ".walk_detection",
+    "walk_block_segments": ".walk_detection",
+})
+
+if TYPE_CHECKING:
+    from biosystems.signal.walk_detection import (
+        filter_gps_jitter,
+        summarize_walk_segments,
+        walk_block_segments,
+    )
 
 __all__ = [
     "walk_block_segments",
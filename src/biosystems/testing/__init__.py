@@ -0,0 +1,43 @@
+"""
+Testing Module
+==============
+
+Offline stand-ins for the external services biosystems talks to, so the
+ingestion paths can be exercised and benchmarked without real credentials
+or API quotas.
+
+Features:
+- Strava V3 API stand-in server (synthetic or recorded activities)
+- Open-Meteo archive/forecast stand-in (deterministic synthetic weather)
+- HabitDash data stand-in (synthetic daily wellness, rate-limit headers)
+- Configurable latency, 429/5xx injection and rate-limit headers
+- Deterministic synthetic GPX, FIT, Strava streams, history and wellness
+  at any scale (see ``biosystems.testing.synthetic``)
+"""
+
+from biosystems.testing.habitdash_standin import HabitDashStandIn
+from biosystems.testing.open_meteo_standin import OpenMeteoStandIn
+from biosystems.testing.strava_standin import StravaStandIn, synthetic_activity
+from biosystems.testing.synthetic import (
+    synthetic_fit,
+    synthetic_fit_frame,
+    synthetic_gpx,
+    synthetic_history,
+    synthetic_samples,
+    synthetic_streams,
+    synthetic_wellness,
+)
+
+__all__ = [
+    "HabitDashStandIn",
+    "OpenMeteoStandIn",
+    "StravaStandIn",
+    "synthetic_activity",
+    "synthetic_fit",
+    "synthetic_fit_frame",
+    "synthetic_gpx",
+    "synthetic_history",
+    "synthetic_samples",
+    "synthetic_streams",
+    "synthetic_wellness",
+]
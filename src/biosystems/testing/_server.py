@@ -0,0 +1,145 @@
+"""
+Shared plumbing for the local HTTP stand-in servers.
+
+``StandInServer`` owns the threaded HTTP server, its lifecycle (start /
+stop / context manager), JSON responses with optional latency, and
+per-route / per-status request accounting. Subclasses implement
+``_handle_get`` (and optionally ``_handle_post``).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import ParseResult, urlparse
+
+
+class StandInServer:
+    """
+    Base class for threaded local API stand-ins.
+
+    Parameters
+    ----------
+    latency_s : float
+        Delay added to every response.
+    host, port : str, int
+        Bind address (port 0 = pick a free port).
+    """
+
+    def __init__(self, latency_s: float = 0.0, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.latency_s = latency_s
+        self._lock = threading.Lock()
+        self._counts: Counter[tuple[str, int]] = Counter()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def root_url(self) -> str:
+        """``http://host:port`` of the running server."""
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def start(self) -> Any:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> Any:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        """Request counts: total, per route, and per status code."""
+        with self._lock:
+            by_route: Counter[str] = Counter()
+            by_status: Counter[int] = Counter()
+            for (route, status), count in self._counts.items():
+                by_route[route] += count
+                by_status[status] += count
+            return {
+                "requests": sum(by_route.values()),
+                "by_route": dict(by_route),
+                "by_status": dict(by_status),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _handle_get(self, handler: BaseHTTPRequestHandler, url: ParseResult) -> None:
+        self._send(handler, 404, {"message": "Not Found"}, "unknown")
+
+    def _handle_post(self, handler: BaseHTTPRequestHandler, url: ParseResult, body: bytes) -> None:
+        self._send(handler, 404, {"message": "Not Found"}, "unknown")
+
+    def _send(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        body: Any,
+        route: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Write a JSON response and record it under ``route``."""
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        payload = json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        for k, v in (headers or {}).items():
+            handler.send_header(k, v)
+        handler.end_headers()
+        handler.wfile.write(payload)
+        with self._lock:
+            self._counts[(route, status)] += 1
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass  # keep benchmark/test output clean
+
+            def do_GET(self) -> None:  # noqa: N802
+                standin._handle_get(self, urlparse(self.path))
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                standin._handle_post(self, urlparse(self.path), body)
+
+        return Handler
@@ -0,0 +1,150 @@
+"""
+HabitDash Stand-in
+==================
+
+A local HTTP server answering HabitDash ``GET /v1/data/`` requests
+(``field_id``, ``date_start``, ``date_end``) with deterministic synthetic
+daily values, for offline tests and wellness-sync benchmarks.
+
+Rate limiting mirrors the real API: every response carries
+``x-ratelimit-limit``, ``x-ratelimit-remaining`` and ``x-ratelimit-reset``
+(seconds until the window resets), and requests beyond ``rate_limit`` in a
+window get 429. ``max_concurrency`` records the most requests seen in
+flight at once, and every request's query parameters are kept in
+``requests``.
+
+Usage
+-----
+    with HabitDashStandIn(rate_limit=20, rate_window_s=1.0) as hd:
+        client = HabitDashClient(api_key="standin", base_url=hd.root_url)
+        client.fetch_all_metrics("2025-01-01", "2025-03-31")
+        assert hd.stats()["by_status"] == {200: len(hd.requests)}
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler
+from typing import Any
+from urllib.parse import ParseResult, parse_qs
+
+from biosystems.testing._server import StandInServer
+
+
+def synthetic_value(field_id: int, day: date) -> float:
+    """Deterministic daily value for one HabitDash field."""
+    n = day.toordinal()
+    return float(40 + (field_id * 7 + n * 13) % 50) + (n % 10) / 10
+
+
+class HabitDashStandIn(StandInServer):
+    """
+    Threaded local HabitDash stand-in.
+
+    Parameters
+    ----------
+    first_day, last_day : date, optional
+        Span with data; requests outside it return no rows. Defaults to the
+        year ending today.
+    last_days : dict[int, date], optional
+        Per-``field_id`` override of ``last_day`` (e.g. a device that stopped
+        syncing).
+    rate_limit : int
+        Requests allowed per ``rate_window_s``; 0 disables limiting (headers
+        still report a budget of 1000).
+    rate_window_s : float
+        Length of the rate-limit window.
+    max_range_days : int
+        If > 0, requests spanning more days return 400.
+    latency_s : float
+        Delay added to every response.
+    host, port : str, int
+        Bind address (port 0 = pick a free port).
+
+    Pass ``root_url`` as ``base_url=`` or export it as ``HABITDASH_API_ROOT``.
+    """
+
+    def __init__(
+        self,
+        first_day: date | None = None,
+        last_day: date | None = None,
+        last_days: dict[int, date] | None = None,
+        rate_limit: int = 0,
+        rate_window_s: float = 60.0,
+        max_range_days: int = 0,
+        latency_s: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.last_day = last_day or date.today()
+        self.first_day = first_day or (self.last_day - timedelta(days=364))
+        self.last_days = dict(last_days or {})
+        self.rate_limit = rate_limit
+        self.rate_window_s = rate_window_s
+        self.max_range_days = max_range_days
+        self.requests: list[dict[str, str]] = []
+        self.max_concurrency = 0
+        self._active = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        super().__init__(latency_s=latency_s, host=host, port=port)
+
+    def _admit(self, query: dict[str, str]) -> tuple[bool, dict[str, str]]:
+        """Count the request against the window; return (allowed, rate headers)."""
+        with self._lock:
+            self.requests.append(query)
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window_s:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            limit = self.rate_limit or 1000
+            reset = self.rate_window_s - (now - self._window_start)
+            headers = {
+                "x-ratelimit-limit": str(limit),
+                "x-ratelimit-remaining": str(max(limit - self._window_count, 0)),
+                "x-ratelimit-reset": f"{max(reset, 0.0):.3f}",
+            }
+            return not (self.rate_limit and self._window_count > self.rate_limit), headers
+
+    def _rows(self, field_id: int, start: date, end: date) -> list[dict[str, Any]]:
+        day = max(start, self.first_day)
+        stop = min(end, self.last_days.get(field_id, self.last_day))
+        rows = []
+        while day <= stop:
+            rows.append({"date": day.isoformat(), "value": synthetic_value(field_id, day)})
+            day += timedelta(days=1)
+        return rows
+
+    def _handle_get(self, handler: BaseHTTPRequestHandler, url: ParseResult) -> None:
+        if url.path.rstrip("/") != "/v1/data":
+            self._send(handler, 404, {"detail": "Not found."}, "unknown")
+            return
+        if not handler.headers.get("x-api-key"):
+            self._send(handler, 401, {"detail": "Missing API key."}, "data")
+            return
+
+        with self._lock:
+            self._active += 1
+            self.max_concurrency = max(self.max_concurrency, self._active)
+        try:
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            allowed, headers = self._admit(query)
+            if not allowed:
+                self._send(handler, 429, {"detail": "Request was throttled."}, "data", headers)
+                return
+            try:
+                field_id = int(query["field_id"])
+                start = date.fromisoformat(query["date_start"])
+                end = date.fromisoformat(query["date_end"])
+            except (KeyError, ValueError) as exc:
+                self._send(handler, 400, {"detail": f"Bad request: {exc}"}, "data", headers)
+                return
+            if self.max_range_days and (end - start).days + 1 > self.max_range_days:
+                self._send(handler, 400, {"detail": "Date range too long."}, "data", headers)
+                return
+            self._send(handler, 200, {"results": self._rows(field_id, start, end)}, "data", headers)
+        finally:
+            with self._lock:
+                self._active -= 1
@@ -0,0 +1,131 @@
+"""
+Open-Meteo Stand-in
+===================
+
+A local HTTP server answering Open-Meteo ``/v1/archive`` and ``/v1/forecast``
+hourly requests with deterministic synthetic weather, for offline tests and
+weather-backfill benchmarks.
+
+Supports both request styles used by ``biosystems.environment.weather``:
+``start_date``/``end_date`` (whole days) and ``start_hour``/``end_hour``.
+Every request's query parameters are recorded in ``requests`` so tests can
+assert how many round-trips a code path made.
+
+Usage
+-----
+    with OpenMeteoStandIn() as om:
+        os.environ["OPEN_METEO_API_ROOT"] = om.root_url
+        fetch_weather_batch(points, cache=cache)
+        assert len(om.requests) == 1
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler
+from typing import Any
+from urllib.parse import ParseResult, parse_qs
+
+from biosystems.testing._server import StandInServer
+
+_VARS = ("temperature_2m", "precipitation", "weathercode", "windspeed_10m", "windgusts_10m", "winddirection_10m")
+
+
+def synthetic_hour(lat: float, lon: float, ts: datetime) -> dict[str, float | int]:
+    """Deterministic weather for one location and UTC hour (diurnal temperature cycle)."""
+    day = ts.toordinal()
+    hour = ts.hour
+    temp = 12.0 + 0.1 * lat + 3.0 * math.sin(day / 9.0) + 7.0 * math.sin(2 * math.pi * (hour - 9) / 24)
+    rain = 0.4 if (day + hour) % 11 == 0 else 0.0
+    return {
+        "temperature_2m": round(temp, 1),
+        "precipitation": rain,
+        "weathercode": 61 if rain else (day % 4),
+        "windspeed_10m": round(8.0 + 4.0 * math.sin(hour / 3.0), 1),
+        "windgusts_10m": round(14.0 + 6.0 * math.sin(hour / 3.0), 1),
+        "winddirection_10m": (day * 37 + hour * 15) % 360,
+    }
+
+
+class OpenMeteoStandIn(StandInServer):
+    """
+    Threaded local Open-Meteo stand-in.
+
+    Parameters
+    ----------
+    latency_s : float
+        Delay added to every response.
+    fail_every : int
+        If > 0, every Nth request returns 503.
+    missing_after : datetime, optional
+        Hours at or after this (naive UTC) time are returned as ``null``,
+        mimicking the archive's publication lag.
+    host, port : str, int
+        Bind address (port 0 = pick a free port).
+
+    ``root_url`` is the value to export as ``OPEN_METEO_API_ROOT``.
+    """
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        fail_every: int = 0,
+        missing_after: datetime | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.fail_every = fail_every
+        self.missing_after = missing_after
+        self.requests: list[dict[str, str]] = []
+        super().__init__(latency_s=latency_s, host=host, port=port)
+
+    def _hours(self, query: dict[str, str]) -> list[datetime]:
+        if "start_date" in query:
+            start = datetime.strptime(query["start_date"], "%Y-%m-%d")
+            end = datetime.strptime(query.get("end_date", query["start_date"]), "%Y-%m-%d") + timedelta(hours=23)
+        else:
+            start = datetime.strptime(query["start_hour"], "%Y-%m-%dT%H:%M")
+            end = datetime.strptime(query.get("end_hour", query["start_hour"]), "%Y-%m-%dT%H:%M")
+        n = int((end - start).total_seconds() // 3600) + 1
+        return [start + timedelta(hours=i) for i in range(max(n, 0))]
+
+    def _handle_get(self, handler: BaseHTTPRequestHandler, url: ParseResult) -> None:
+        route = url.path.rsplit("/", 1)[-1]
+        if url.path not in ("/v1/archive", "/v1/forecast"):
+            self._send(handler, 404, {"error": True, "reason": "Not Found"}, "unknown")
+            return
+
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with self._lock:
+            self.requests.append(query)
+            n_requests = len(self.requests)
+        if self.fail_every and n_requests % self.fail_every == 0:
+            self._send(handler, 503, {"error": True, "reason": "Service Unavailable"}, route)
+            return
+
+        try:
+            lat = float(query["latitude"])
+            lon = float(query["longitude"])
+            hours = self._hours(query)
+        except (KeyError, ValueError) as exc:
+            self._send(handler, 400, {"error": True, "reason": f"Bad request: {exc}"}, route)
+            return
+
+        requested = [v for v in query.get("hourly", ",".join(_VARS)).split(",") if v in _VARS]
+        hourly: dict[str, list[Any]] = {"time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours]}
+        for var in requested:
+            hourly[var] = []
+        for h in hours:
+            values = synthetic_hour(lat, lon, h)
+            missing = self.missing_after is not None and h >= self.missing_after
+            for var in requested:
+                hourly[var].append(None if missing else values[var])
+
+        self._send(handler, 200, {
+            "latitude": lat,
+            "longitude": lon,
+            "timezone": "UTC",
+            "hourly_units": {"time": "iso8601", "temperature_2m": "°C"},
+            "hourly": hourly,
+        }, route)
@@ -0,0 +1,340 @@
+"""
+Strava API Stand-in
+===================
+
+A local HTTP server that speaks the subset of the Strava V3 API used by
+``biosystems.ingestion.strava``:
+
+    POST /oauth/token                          → {"access_token": ...}
+    GET  /api/v3/athlete/activities            → SummaryActivity list (after/before/page/per_page)
+    GET  /api/v3/activities/{id}               → DetailedActivity (best_efforts, laps, …)
+    GET  /api/v3/activities/{id}/streams       → key_by_type stream dict
+
+Activities are either synthetic (``StravaStandIn(n_activities=...)``) or
+loaded from a recording directory (``StravaStandIn.from_recording(path)``)
+with the layout::
+
+    activities.json            # list of SummaryActivity dicts
+    activities/{id}.json       # DetailedActivity
+    streams/{id}.json          # key_by_type streams response
+
+Fault injection
+---------------
+``latency_s``      fixed delay added to every response
+``error_rate``     probability of a 500/502/503 on any API GET
+``fail_every``     deterministic alternative: every Nth API GET returns 503
+``rate_limit``     short-window request budget; exceeding it returns 429 with
+                   ``Retry-After`` (``retry_after_s``) until the window resets
+
+Every API response carries Strava-style ``X-RateLimit-Limit`` and
+``X-RateLimit-Usage`` headers. ``stats()`` reports request counts by route
+and status for benchmark harnesses.
+
+Usage
+-----
+    with StravaStandIn(n_activities=20, latency_s=0.02) as api:
+        os.environ["STRAVA_API_ROOT"] = api.root_url
+        runs = fetch_runs_since("2025-01-01", access_token="standin")
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any
+from urllib.parse import ParseResult, parse_qs
+
+import numpy as np
+
+from biosystems.testing._server import StandInServer
+
+_ACTIVITY_RE = re.compile(r"^/api/v3/activities/(\d+)$")
+_STREAMS_RE = re.compile(r"^/api/v3/activities/(\d+)/streams$")
+
+
+def synthetic_activity(
+    activity_id: int,
+    start: datetime,
+    n_points: int = 3600,
+    seed: int | None = None,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """
+    Generate one synthetic run as (summary, detail, streams) API payloads.
+
+    Parameters
+    ----------
+    activity_id : int
+        Strava activity ID to assign.
+    start : datetime
+        UTC start time.
+    n_points : int
+        Number of 1 Hz stream samples.
+    seed : int, optional
+        RNG seed (defaults to ``activity_id``) so payloads are reproducible.
+
+    Returns
+    -------
+    (summary, detail, streams)
+        SummaryActivity dict, DetailedActivity dict and key_by_type streams dict.
+    """
+    rng = np.random.default_rng(activity_id if seed is None else seed)
+    speed = np.clip(rng.normal(3.0, 0.25, n_points), 0.5, None)
+    distance = np.cumsum(speed)
+    hr = np.clip(130 + np.linspace(0, 15, n_points) + rng.normal(0, 2, n_points), 90, 200)
+    lat = 40.0 + np.cumsum(rng.normal(0, 1e-5, n_points))
+    lon = -74.0 + np.cumsum(rng.normal(0, 1e-5, n_points))
+    altitude = 50 + np.cumsum(rng.normal(0, 0.05, n_points))
+
+    start_utc = start.astimezone(timezone.utc)
+    start_iso = start_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
+    total_m = float(distance[-1])
+    summary = {
+        "id": activity_id,
+        "name": f"Synthetic Run {activity_id}",
+        "sport_type": "Run",
+        "type": "Run",
+        "start_date": start_iso,
+        "start_date_local": start_iso,
+        "start_latlng": [float(lat[0]), float(lon[0])],
+        "distance": round(total_m, 1),
+        "moving_time": n_points,
+        "elapsed_time": n_points,
+        "average_heartrate": round(float(hr.mean()), 1),
+        "max_heartrate": round(float(hr.max()), 1),
+        "total_elevation_gain": round(float(np.clip(np.diff(altitude), 0, None).sum()), 1),
+    }
+
+    best_efforts = []
+    for name, metres in (("400m", 400), ("1K", 1000), ("1 mile", 1609), ("5K", 5000)):
+        if total_m >= metres:
+            end_idx = int(np.searchsorted(distance, metres))
+            best_efforts.append({
+                "name": name,
+                "distance": metres,
+                "elapsed_time": end_idx + 1,
+                "moving_time": end_idx + 1,
+                "start_index": 0,
+                "pr_rank": None,
+            })
+
+    detail = dict(summary)
+    detail.update({
+        "best_efforts": best_efforts,
+        "splits_metric": [],
+        "laps": [],
+        "max_speed": round(float(speed.max()), 2),
+        "calories": round(total_m / 1000 * 65, 0),
+        "perceived_exertion": None,
+        "workout_type": 0,
+        "device_name": "Stand-in Device",
+        "description": None,
+        "pr_count": 0,
+    })
+
+    def _stream(data: list[Any]) -> dict[str, Any]:
+        return {"data": data, "series_type": "time", "original_size": n_points, "resolution": "high"}
+
+    streams = {
+        "time": _stream(list(range(n_points))),
+        "distance": _stream(np.round(distance, 1).tolist()),
+        "latlng": _stream(np.round(np.column_stack([lat, lon]), 6).tolist()),
+        "altitude": _stream(np.round(altitude, 1).tolist()),
+        "heartrate": _stream(np.round(hr).astype(int).tolist()),
+        "cadence": _stream(rng.integers(84, 90, n_points).tolist()),
+        "velocity_smooth": _stream(np.round(speed, 2).tolist()),
+        "moving": _stream([True] * n_points),
+    }
+    return summary, detail, streams
+
+
+class StravaStandIn(StandInServer):
+    """
+    Threaded local Strava API stand-in.
+
+    Parameters
+    ----------
+    n_activities : int
+        Number of synthetic runs to generate (ignored when ``activities`` is given).
+    n_points : int
+        Stream samples per synthetic run.
+    start : datetime, optional
+        Start time of the oldest synthetic run (one run per day after it).
+        Defaults to ``n_activities`` days before now.
+    activities : list[tuple[dict, dict, dict]], optional
+        Pre-built (summary, detail, streams) payloads, e.g. from a recording.
+    latency_s : float
+        Delay added to every response.
+    error_rate : float
+        Probability (0–1) that an API GET returns a random 5xx.
+    fail_every : int
+        If > 0, every Nth API GET returns 503.
+    rate_limit : int
+        Requests allowed per ``rate_window_s``; 0 disables limiting.
+    rate_window_s : float
+        Length of the short rate-limit window.
+    retry_after_s : int
+        ``Retry-After`` value sent with 429 responses.
+    seed : int
+        Seed for the fault-injection RNG.
+    host, port : str, int
+        Bind address (port 0 = pick a free port).
+
+    ``root_url`` is the value to export as ``STRAVA_API_ROOT``.
+    """
+
+    def __init__(
+        self,
+        n_activities: int = 10,
+        n_points: int = 3600,
+        start: datetime | None = None,
+        activities: list[tuple[dict[str, Any], dict[str, Any], dict[str, Any]]] | None = None,
+        latency_s: float = 0.0,
+        error_rate: float = 0.0,
+        fail_every: int = 0,
+        rate_limit: int = 0,
+        rate_window_s: float = 900.0,
+        retry_after_s: int = 1,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if activities is None:
+            first = start or (datetime.now(timezone.utc) - timedelta(days=n_activities))
+            activities = [
+                synthetic_activity(1_000_000 + i, first + timedelta(days=i), n_points=n_points)
+                for i in range(n_activities)
+            ]
+        self._summaries = sorted((a[0] for a in activities), key=lambda s: s["start_date"], reverse=True)
+        self._details = {int(a[1]["id"]): a[1] for a in activities}
+        self._streams = {int(a[0]["id"]): a[2] for a in activities}
+
+        self.error_rate = error_rate
+        self.fail_every = fail_every
+        self.rate_limit = rate_limit
+        self.rate_window_s = rate_window_s
+        self.retry_after_s = retry_after_s
+
+        self._rng = random.Random(seed)
+        self._api_calls = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._daily_count = 0
+        super().__init__(latency_s=latency_s, host=host, port=port)
+
+    # ------------------------------------------------------------------
+    # Construction helpers
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_recording(cls, path: str | Path, **kwargs: Any) -> StravaStandIn:
+        """Build a stand-in serving payloads recorded under ``path`` (see module docstring)."""
+        root = Path(path)
+        summaries = json.loads((root / "activities.json").read_text())
+        activities = []
+        for s in summaries:
+            aid = int(s["id"])
+            detail_file = root / "activities" / f"{aid}.json"
+            streams_file = root / "streams" / f"{aid}.json"
+            detail = json.loads(detail_file.read_text()) if detail_file.exists() else dict(s)
+            streams = json.loads(streams_file.read_text()) if streams_file.exists() else {}
+            activities.append((s, detail, streams))
+        return cls(activities=activities, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    @property
+    def activity_ids(self) -> list[int]:
+        """Activity IDs served, newest first."""
+        return [int(s["id"]) for s in self._summaries]
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _admit(self) -> tuple[int | None, dict[str, str]]:
+        """Apply rate limiting / fault injection; return (error_status or None, headers)."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window_s:
+                self._window_start = now
+                self._window_count = 0
+            self._api_calls += 1
+            self._window_count += 1
+            self._daily_count += 1
+            limit = self.rate_limit or 100
+            headers = {
+                "X-RateLimit-Limit": f"{limit},{limit * 10}",
+                "X-RateLimit-Usage": f"{self._window_count},{self._daily_count}",
+            }
+            if self.rate_limit and self._window_count > self.rate_limit:
+                headers["Retry-After"] = str(self.retry_after_s)
+                return 429, headers
+            if self.fail_every and self._api_calls % self.fail_every == 0:
+                return 503, headers
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return self._rng.choice((500, 502, 503)), headers
+            return None, headers
+
+    def _list_activities(self, query: dict[str, list[str]]) -> list[dict[str, Any]]:
+        after = int(query.get("after", ["0"])[0])
+        before = int(query["before"][0]) if "before" in query else None
+        page = max(int(query.get("page", ["1"])[0]), 1)
+        per_page = min(max(int(query.get("per_page", ["30"])[0]), 1), 200)
+
+        def _epoch(s: dict[str, Any]) -> int:
+            return int(datetime.fromisoformat(s["start_date"].replace("Z", "+00:00")).timestamp())
+
+        selected = [
+            s for s in self._summaries
+            if _epoch(s) > after and (before is None or _epoch(s) < before)
+        ]
+        return selected[(page - 1) * per_page: page * per_page]
+
+    def _handle_post(self, handler: BaseHTTPRequestHandler, url: ParseResult, body: bytes) -> None:
+        if url.path != "/oauth/token":
+            self._send(handler, 404, {"message": "Record Not Found"}, "unknown")
+            return
+        self._send(handler, 200, {
+            "token_type": "Bearer",
+            "access_token": "standin-access-token",
+            "expires_at": int(time.time()) + 21600,
+            "expires_in": 21600,
+            "refresh_token": "standin-refresh-token",
+        }, "token")
+
+    def _handle_get(self, handler: BaseHTTPRequestHandler, url: ParseResult) -> None:
+        path = url.path
+        if path == "/api/v3/athlete/activities":
+            route = "list"
+        elif _STREAMS_RE.match(path):
+            route = "streams"
+        elif _ACTIVITY_RE.match(path):
+            route = "activity"
+        else:
+            self._send(handler, 404, {"message": "Record Not Found"}, "unknown")
+            return
+
+        error, headers = self._admit()
+        if error is not None:
+            message = "Rate Limit Exceeded" if error == 429 else "Server Error"
+            self._send(handler, error, {"message": message}, route, headers)
+            return
+
+        if route == "list":
+            self._send(handler, 200, self._list_activities(parse_qs(url.query)), route, headers)
+            return
+
+        match = _STREAMS_RE.match(path) or _ACTIVITY_RE.match(path)
+        aid = int(match.group(1))  # type: ignore[union-attr]
+        table = self._streams if route == "streams" else self._details
+        if aid not in table:
+            self._send(handler, 404, {"message": "Record Not Found"}, route, headers)
+            return
+        self._send(handler, 200, table[aid], route, headers)
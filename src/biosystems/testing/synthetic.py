@@ -0,0 +1,408 @@
+"""
+Synthetic Activity Data
+=======================
+
+Deterministic generators for every input the pipeline reads, at any scale,
+for benchmarks and offline tests:
+
+    synthetic_samples(duration_s, seed)   1 Hz run samples every format is built from
+    synthetic_gpx(duration_s, seed)       GPX 1.1 document (TrackPointExtension HR/cadence)
+    synthetic_fit(duration_s, seed)       FIT activity file bytes (file_id + record messages)
+    synthetic_fit_frame(duration_s, seed) the DataFrame ``parse_fit`` returns for that file
+    synthetic_streams(duration_s, seed)   decoded Strava streams, as ``parse_strava_streams`` takes them
+    synthetic_history(n_runs, seed)       ``history.jsonl`` entries
+    synthetic_wellness(days, seed)        daily wellness frame in the store's column names
+
+The activity formats generated from the same ``(duration_s, seed, start)``
+describe the same run, so parsers can be compared on identical data, and the
+same arguments always give identical output. Durations run from minutes to
+multi-day ultras (48 h is 172,800 samples); runs include periodic walk breaks,
+rolling hills, HR lag and cardiac drift so walk detection, decoupling and GAP
+have real work to do.
+"""
+
+from __future__ import annotations
+
+import struct
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+#: Start time used when none is given.
+DEFAULT_START = datetime(2025, 6, 1, 6, 0, tzinfo=timezone.utc)
+#: Last day of generated history and wellness when none is given.
+DEFAULT_END = date(2025, 12, 31)
+
+_WALK_EVERY_S = 1500  # a 60 s walk break closes every 25 minutes
+_WALK_S = 60
+_M_PER_DEG = 111_320.0
+
+
+def _smooth(rng: np.random.Generator, n: int, window: int, scale: float) -> np.ndarray:
+    """Unit-variance noise smoothed over ``window`` samples, times ``scale``."""
+    kernel = np.ones(window) / window
+    noise = rng.normal(0, 1, n + window - 1)
+    smoothed: np.ndarray = np.convolve(noise, kernel, mode="valid") * scale * np.sqrt(window)
+    return smoothed
+
+
+def synthetic_samples(
+    duration_s: int = 3600,
+    seed: int = 0,
+    start: datetime = DEFAULT_START,
+) -> pd.DataFrame:
+    """
+    Generate one run as 1 Hz samples.
+
+    Parameters
+    ----------
+    duration_s : int
+        Number of samples (seconds).
+    seed : int
+        RNG seed.
+    start : datetime
+        UTC start time.
+
+    Returns
+    -------
+    pd.DataFrame
+        UTC ``timestamp`` index; columns lat, lon, ele (m, 0.2 m steps),
+        hr (bpm), cadence (steps/min), speed_mps and distance_m
+        (cumulative, 0 at the first sample).
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration_s)
+    t = np.arange(n, dtype="float64")
+
+    fatigue = 1 - 0.15 * (1 - np.exp(-t / 36_000))
+    speed: np.ndarray = (rng.uniform(2.7, 3.2) + _smooth(rng, n, 60, 0.15)) * fatigue
+    walking = (t % _WALK_EVERY_S) >= _WALK_EVERY_S - _WALK_S
+    speed[walking] = 1.4 + rng.normal(0, 0.1, int(walking.sum()))
+    speed = np.round(np.clip(speed, 0.5, 6.0), 3)
+
+    distance = np.round(np.concatenate(([0.0], np.cumsum(speed[1:]))), 2)
+    phase = rng.uniform(0, 2 * np.pi)
+    ele = 100 + 15 * np.sin(2 * np.pi * distance / 1800) + 6 * np.sin(2 * np.pi * distance / 530 + phase)
+    ele = np.round(ele * 5) / 5
+    grade = np.gradient(ele) / np.maximum(np.gradient(distance), 0.1) if n > 1 else np.zeros(n)
+
+    effort = 130 + 28 * (speed - 2.9) + 120 * np.clip(grade, -0.05, 0.1)
+    lag = np.convolve(np.concatenate((np.full(29, effort[0]), effort)), np.ones(30) / 30, mode="valid")
+    drift = 12 * (1 - np.exp(-t / 7200))
+    hr = np.clip(np.round(lag + drift + rng.normal(0, 1.5, n)), 90, 195)
+
+    cadence = np.where(walking, 112, 166 + 6 * (speed - 3.0)) + rng.normal(0, 1.5, n)
+    cadence = np.clip(np.round(cadence), 90, 200)
+
+    heading = rng.uniform(0, 2 * np.pi) + np.cumsum(_smooth(rng, n, 120, 0.002))
+    lat0, lon0 = 40.0 + rng.uniform(-0.5, 0.5), -74.0 + rng.uniform(-0.5, 0.5)
+    step = np.concatenate(([0.0], speed[1:]))
+    lat = lat0 + np.cumsum(step * np.cos(heading)) / _M_PER_DEG
+    lon = lon0 + np.cumsum(step * np.sin(heading)) / (_M_PER_DEG * np.cos(np.radians(lat0)))
+
+    index = pd.DatetimeIndex(
+        pd.Timestamp(start).tz_convert("UTC") + pd.to_timedelta(t, unit="s"), name="timestamp"
+    )
+    samples: pd.DataFrame = pd.DataFrame(
+        {
+            "lat": np.round(lat, 7),
+            "lon": np.round(lon, 7),
+            "ele": ele,
+            "hr": hr.astype("int64"),
+            "cadence": cadence.astype("int64"),
+            "speed_mps": speed,
+            "distance_m": distance,
+        },
+        index=index,
+    )
+    return samples
+
+
+# ── GPX ──────────────────────────────────────────────────────────────────────
+
+_GPX_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<gpx version="1.1" creator="biosystems.testing"'
+    ' xmlns="http://www.topografix.com/GPX/1/1"'
+    ' xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">\n'
+    " <metadata><time>{start}</time></metadata>\n"
+    " <trk><name>{name}</name><type>running</type><trkseg>\n"
+)
+_GPX_POINT = (
+    '  <trkpt lat="{:.7f}" lon="{:.7f}"><ele>{:.1f}</ele><time>{}</time>'
+    "<extensions><gpxtpx:TrackPointExtension><gpxtpx:hr>{}</gpxtpx:hr>"
+    "<gpxtpx:cad>{}</gpxtpx:cad></gpxtpx:TrackPointExtension></extensions></trkpt>\n"
+)
+
+
+def synthetic_gpx(duration_s: int = 3600, seed: int = 0, start: datetime = DEFAULT_START) -> str:
+    """The run from ``synthetic_samples`` as a GPX 1.1 document (cadence in steps/min)."""
+    s = synthetic_samples(duration_s, seed, start)
+    times = pd.DatetimeIndex(s.index).strftime("%Y-%m-%dT%H:%M:%SZ")
+    parts = [_GPX_HEAD.format(start=times[0] if len(times) else "", name=f"Synthetic Run {seed}")]
+    parts.extend(
+        _GPX_POINT.format(*row)
+        for row in zip(s["lat"], s["lon"], s["ele"], times, s["hr"], s["cadence"])
+    )
+    parts.append(" </trkseg></trk>\n</gpx>\n")
+    return "".join(parts)
+
+
+# ── FIT ──────────────────────────────────────────────────────────────────────
+
+_FIT_EPOCH_S = 631_065_600  # 1989-12-31T00:00:00Z
+_FIT_CRC_TABLE = (
+    0x0000, 0xCC01, 0xD801, 0x1400, 0xF001, 0x3C00, 0x2800, 0xE401,
+    0xA001, 0x6C00, 0x7800, 0xB401, 0x5000, 0x9C01, 0x8801, 0x4400,
+)
+
+
+def _crc_byte_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = 0
+        for nibble in (byte & 0xF, byte >> 4):
+            tmp = _FIT_CRC_TABLE[crc & 0xF]
+            crc = ((crc >> 4) & 0x0FFF) ^ tmp ^ _FIT_CRC_TABLE[nibble]
+        table.append(crc)
+    return table
+
+
+_CRC_BYTE_TABLE = _crc_byte_table()
+
+
+def _fit_crc(data: bytes, crc: int = 0) -> int:
+    """FIT CRC-16 (the SDK's nibble algorithm, a byte at a time)."""
+    table = _CRC_BYTE_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+# (field number, size, base type): enum 0x00, uint8 0x02, uint16 0x84, sint32 0x85, uint32 0x86
+_FILE_ID_FIELDS = ((0, 1, 0x00), (1, 2, 0x84), (2, 2, 0x84), (4, 4, 0x86))
+_RECORD_FIELDS = (
+    (253, 4, 0x86),  # timestamp (s since FIT epoch)
+    (0, 4, 0x85),    # position_lat (semicircles)
+    (1, 4, 0x85),    # position_long (semicircles)
+    (2, 2, 0x84),    # altitude (scale 5, offset 500)
+    (3, 1, 0x02),    # heart_rate
+    (4, 1, 0x02),    # cadence
+    (5, 4, 0x86),    # distance (scale 100)
+    (6, 2, 0x84),    # speed (scale 1000)
+)
+_RECORD_DTYPE = np.dtype([
+    ("header", "u1"), ("timestamp", "<u4"), ("lat", "<i4"), ("lon", "<i4"), ("altitude", "<u2"),
+    ("hr", "u1"), ("cadence", "u1"), ("distance", "<u4"), ("speed", "<u2"),
+])
+
+
+def _fit_definition(local: int, global_num: int, fields: tuple[tuple[int, int, int], ...]) -> bytes:
+    body = struct.pack("<BBBHB", 0x40 | local, 0, 0, global_num, len(fields))
+    return body + b"".join(struct.pack("<BBB", *f) for f in fields)
+
+
+def _fit_records(s: pd.DataFrame) -> np.ndarray:
+    """Record-message rows for the samples, quantised as the FIT profile stores them."""
+    records = np.zeros(len(s), dtype=_RECORD_DTYPE)
+    records["header"] = 1
+    seconds = pd.DatetimeIndex(s.index).as_unit("s").to_numpy(dtype="datetime64[s]").view("int64")
+    records["timestamp"] = seconds - _FIT_EPOCH_S
+    records["lat"] = np.round(s["lat"].to_numpy() * (2**31 / 180.0))
+    records["lon"] = np.round(s["lon"].to_numpy() * (2**31 / 180.0))
+    records["altitude"] = np.round((s["ele"].to_numpy() + 500) * 5)
+    records["hr"] = s["hr"].to_numpy()
+    records["cadence"] = s["cadence"].to_numpy()
+    records["distance"] = np.round(s["distance_m"].to_numpy() * 100)
+    records["speed"] = np.round(s["speed_mps"].to_numpy() * 1000)
+    return records
+
+
+def synthetic_fit(duration_s: int = 3600, seed: int = 0, start: datetime = DEFAULT_START) -> bytes:
+    """
+    The run from ``synthetic_samples`` as a FIT activity file.
+
+    A file_id message followed by one record message per sample (timestamp,
+    position, altitude, heart rate, cadence in steps/min, distance, speed),
+    with valid header and file CRCs, so ``fitdecode`` reads it like a
+    device file.
+    """
+    s = synthetic_samples(duration_s, seed, start)
+    created = int(pd.Timestamp(start).timestamp()) - _FIT_EPOCH_S
+    data = b"".join((
+        _fit_definition(0, 0, _FILE_ID_FIELDS),
+        struct.pack("<BBHHI", 0, 4, 255, 0, created),  # activity file, development manufacturer
+        _fit_definition(1, 20, _RECORD_FIELDS),
+        _fit_records(s).tobytes(),
+    ))
+    header = struct.pack("<BBHI4s", 14, 0x20, 2132, len(data), b".FIT")
+    header += struct.pack("<H", _fit_crc(header))
+    return header + data + struct.pack("<H", _fit_crc(data, _fit_crc(header)))
+
+
+def synthetic_fit_frame(duration_s: int = 3600, seed: int = 0, start: datetime = DEFAULT_START) -> pd.DataFrame:
+    """
+    What ``parse_fit`` returns for ``synthetic_fit(duration_s, seed, start)``,
+    built directly from the samples without encoding or decoding a file.
+    """
+    records = _fit_records(synthetic_samples(duration_s, seed, start))
+    latitude = records["lat"] * (180.0 / 2**31)
+    longitude = records["lon"] * (180.0 / 2**31)
+    index = pd.to_datetime((records["timestamp"].astype("int64") + _FIT_EPOCH_S), unit="s", utc=True).as_unit("us")
+    df: pd.DataFrame = pd.DataFrame(
+        {
+            "ele": records["altitude"] / 5.0 - 500,
+            "hr": records["hr"].astype("int64"),
+            "cadence": records["cadence"].astype("int64"),
+            "speed": records["speed"] / 1000.0,
+            "distance": records["distance"] / 100.0,
+            "latitude": latitude,
+            "longitude": longitude,
+            "lat": latitude,
+            "lon": longitude,
+        },
+        index=index.rename("timestamp"),
+    )
+    df["cadence"] = df["cadence"].replace(0, np.nan)
+    df["hr"] = df["hr"].replace(0, np.nan)
+    return df
+
+
+# ── Strava ───────────────────────────────────────────────────────────────────
+
+def synthetic_streams(duration_s: int = 3600, seed: int = 0, start: datetime = DEFAULT_START) -> dict[str, list[Any]]:
+    """
+    The run from ``synthetic_samples`` as decoded Strava streams.
+
+    The ``{type: data}`` dict of plain lists that ``fetch_activity_streams``
+    passes to ``parse_strava_streams`` (cadence in single-foot RPM, as Strava
+    reports it). For the raw API payload see ``synthetic_activity``.
+    """
+    s = synthetic_samples(duration_s, seed, start)
+    return {
+        "time": list(range(len(s))),
+        "distance": s["distance_m"].tolist(),
+        "latlng": np.column_stack([s["lat"], s["lon"]]).tolist(),
+        "altitude": s["ele"].tolist(),
+        "heartrate": s["hr"].tolist(),
+        "cadence": (s["cadence"] // 2).tolist(),
+        "velocity_smooth": s["speed_mps"].tolist(),
+        "moving": [True] * len(s),
+    }
+
+
+# ── History and wellness ─────────────────────────────────────────────────────
+
+_EFFORTS_M = {"400m": 400, "1K": 1000, "1 mile": 1609, "5K": 5000, "10K": 10_000, "Half-Marathon": 21_097}
+
+
+def synthetic_history(
+    n_runs: int,
+    seed: int = 0,
+    end: date = DEFAULT_END,
+    span_days: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Generate ``n_runs`` history entries ending on ``end``, sorted by date.
+
+    Entries carry the fields ``biosystems strava`` records (hrTSS, distance,
+    HR, pace, EF, decoupling, cadence, temperature, Strava best efforts) with
+    a unique ``strava_activity_id`` each. Runs are roughly one a day with
+    occasional doubles and rest days, or spread over ``span_days`` when given.
+    """
+    rng = np.random.default_rng(seed)
+    if span_days is None:
+        back = np.cumsum(rng.choice([0, 1, 1, 1, 2], n_runs))
+        back -= back[:1].sum()
+    else:
+        back = np.sort(rng.integers(0, max(span_days, 1), n_runs))
+    days = [end - timedelta(days=int(b)) for b in back[::-1]]
+
+    distance = np.clip(rng.lognormal(np.log(8.0), 0.45, n_runs), 2.0, 45.0)
+    pace = np.clip(rng.normal(5.9, 0.45, n_runs) + 0.012 * distance, 4.0, 8.5)
+    avg_hr = np.clip(rng.normal(148, 7, n_runs) - 8 * (pace - 5.9), 115, 180)
+    ef = (1000 / (pace * 60)) / avg_hr
+    minutes = pace * distance
+    season = np.array([np.sin(2 * np.pi * (d.timetuple().tm_yday - 105) / 365) for d in days]) if days else np.zeros(0)
+    temp = 12 + 11 * season + rng.normal(0, 4, n_runs)
+    decoupling = rng.normal(3.5, 3.0, n_runs) + 0.08 * distance + 0.15 * np.clip(temp - 18, 0, None)
+
+    entries = []
+    for i, day in enumerate(days):
+        d = float(distance[i])
+        best_pace_s = float(pace[i]) * 60 * 0.94
+        entries.append({
+            "date": day.isoformat(),
+            "strava_activity_id": 10_000_000_000 + seed * 1_000_000 + i,
+            "hrTSS": round(float(minutes[i] * (0.7 + (avg_hr[i] - 130) / 100)), 1),
+            "distance_km": round(d, 2),
+            "avg_hr": round(float(avg_hr[i]), 1),
+            "avg_pace_min_per_km": round(float(pace[i]), 2),
+            "ef": round(float(ef[i]), 5),
+            "ef_gap": round(float(ef[i]) * 1.01, 5),
+            "decoupling_pct": round(float(decoupling[i]), 2),
+            "avg_cadence": round(float(166 - 4 * (pace[i] - 5.9)), 1),
+            "activity_name": "Long Run" if d > 16 else "Easy Run",
+            "source": "biosystems_strava",
+            "temp_c": round(float(temp[i]), 1),
+            "strava_efforts": {
+                name: int(best_pace_s * metres / 1000 * (1 + 0.02 * np.log2(metres / 400)))
+                for name, metres in _EFFORTS_M.items()
+                if d * 1000 >= metres
+            },
+        })
+    return entries
+
+
+# column → (mean, sd, low, high); names follow habitdash.COLUMN_MAP
+_WELLNESS_MODEL: dict[str, tuple[float, float, float, float]] = {
+    "hrv_rmssd": (62, 12, 20, 140),
+    "resting_hr_whoop": (52, 3, 40, 75),
+    "recovery_score": (62, 18, 1, 99),
+    "sleep_score": (80, 10, 30, 100),
+    "sleep_duration_s": (26_000, 3_000, 12_000, 36_000),
+    "sleep_disturbances_ph": (1.2, 0.5, 0, 5),
+    "sleep_consistency": (75, 10, 30, 99),
+    "strain_score": (11, 3.5, 2, 21),
+    "skin_temp_c": (33.6, 0.4, 32, 35.5),
+    "respiratory_rate_whoop": (15.0, 0.5, 12, 19),
+    "resting_hr_garmin": (53, 3, 40, 76),
+    "body_battery": (65, 18, 5, 100),
+    "steps": (11_000, 3_500, 1_500, 35_000),
+    "active_time_s": (5_400, 2_000, 600, 21_600),
+    "avg_stress": (28, 7, 8, 70),
+    "respiratory_rate_garmin": (14.6, 0.5, 11, 19),
+    "vo2max": (51, 1, 45, 58),
+}
+_INTEGER_WELLNESS = ("steps", "active_time_s", "sleep_duration_s", "body_battery", "recovery_score")
+
+
+def synthetic_wellness(days: int = 3 * 365, seed: int = 0, end: date = DEFAULT_END) -> pd.DataFrame:
+    """
+    Generate ``days`` of daily wellness ending on ``end``.
+
+    Columns are the store's names (``habitdash.COLUMN_MAP`` values) on a
+    ``date`` DatetimeIndex, as ``cache._save_df`` writes them. HRV, resting
+    HR, recovery and body battery move together around a slow fitness trend;
+    about 3% of each column is missing, as with real device syncs.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(end=pd.Timestamp(end), periods=days, freq="D", name="date")
+    readiness = _smooth(rng, days, 3, 0.8) if days else np.zeros(0)
+    trend = np.sin(2 * np.pi * np.arange(days) / 180) * 0.3
+
+    data: dict[str, np.ndarray] = {}
+    for col, (mean, sd, low, high) in _WELLNESS_MODEL.items():
+        coupling = {"hrv_rmssd": 1, "recovery_score": 1, "body_battery": 0.8, "sleep_score": 0.4,
+                    "resting_hr_whoop": -0.8, "resting_hr_garmin": -0.8, "avg_stress": -0.6}.get(col, 0)
+        z = coupling * (readiness + trend) + np.sqrt(max(1 - coupling**2 * 0.7, 0.1)) * rng.normal(0, 1, days)
+        if col == "vo2max":
+            z = 2 * trend + rng.normal(0, 0.2, days)
+        values = np.clip(mean + sd * z, low, high)
+        values = np.round(values) if col in _INTEGER_WELLNESS else np.round(values, 1)
+        values[rng.random(days) < 0.03] = np.nan
+        data[col] = values
+    wellness: pd.DataFrame = pd.DataFrame(data, index=index)
+    return wellness
@@ -333,6 +333,11 @@ def _compute_norms(df: pd.DataFrame, garmin_df: pd.DataFrame) -> dict[str, Any]:
 
 # ── Longitudinal Fitness ───────────────────────────────────────────────────────
 
+# Columns compute_longitudinal_fitness reads; callers pass these as
+# ``load_wellness_df(columns=FITNESS_COLUMNS)`` to skip the rest of the store.
+FITNESS_COLUMNS: tuple[str, ...] = ("resting_hr_garmin", "resting_hr_whoop", "vo2max")
+
+
 def compute_longitudinal_fitness(df: pd.DataFrame) -> dict[str, Any]:
     """
     Track long-term fitness arc: RHR and VO2max monthly trends.
@@ -427,6 +432,10 @@ def compute_longitudinal_fitness(df: pd.DataFrame) -> dict[str, Any]:
 
 # ── Sleep Debt ─────────────────────────────────────────────────────────────────
 
+# Sleep-duration columns compute_sleep_debt merges (Whoop, then Garmin).
+SLEEP_COLUMNS: tuple[str, ...] = ("sleep_duration_s", "sleep_duration_s_garmin")
+
+
 def compute_sleep_debt(
     df: pd.DataFrame,
     personal_mean_h: float | None = None,
@@ -453,7 +462,7 @@ def compute_sleep_debt(
         if not s.empty:
             sleep_s = s
     else:
-        for col in ["sleep_duration_s", "sleep_duration_s_garmin"]:
+        for col in SLEEP_COLUMNS:
             if col in df.columns:
                 s = df[col].dropna()
                 if not s.empty:
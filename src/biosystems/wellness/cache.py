@@ -2,13 +2,27 @@
 Wellness Cache
 ==============
 
-Manages the local wellness parquet store at ~/.biosystems/wellness.parquet.
+Manages the local wellness store at ~/.biosystems/wellness/ — one parquet
+partition per calendar month plus a manifest (see "Parquet I/O" below).
 
 Responsibilities:
-  - sync_wellness()          pull HabitDash → merge into parquet
+  - sync_wellness()          pull HabitDash → merge into parquet (incremental
+                             per metric from wellness_watermarks.json)
   - get_wellness_for_date()  single-day raw values
+  - get_wellness_for_dates() the same for many dates in one lookup
   - compute_wellness_context()  raw values + 1d/7d deltas + G/A/R signal
-  - load_wellness_df()       public accessor for the full DataFrame
+                             (a row of the materialised feature table, see
+                             biosystems.wellness.features)
+  - compute_wellness_context_batch()  contexts for many dates, keyed by date
+  - enrich_run_context[_batch]()  fill RunContext wellness fields
+  - load_wellness_df()       public accessor (optionally only some columns /
+                             a date range, read from just those partitions)
+  - get_wellness_window()    a date window, optionally projected to columns
+
+The store is read at most once per version: the loaded frame is cached
+in-process keyed by the manifest's (inode, mtime, size), and threshold
+calibration / sleep debt are memoised against that frame, so enriching
+hundreds of runs in one process costs a single read and calibration.
 
 Signal timing (critical for correct interpretation):
   OVERNIGHT (pre-run valid)  — RHR, sleep duration/score, respiratory rate, HRV
@@ -27,105 +41,469 @@ only signal that reliably predicts pre-run readiness.
 
 from __future__ import annotations
 
+import json
 import logging
 import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Mapping
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
 import pandas as pd
+from filelock import FileLock
 
 log = logging.getLogger(__name__)
 
-# ── Fallback thresholds (used before calibration data is available) ────────────
-_RHR_SPIKE_RED   = 8.0   # bpm above 7d mean → RED
-_RHR_SPIKE_AMBER = 5.0   # bpm above 7d mean → AMBER
-_HRV_DROP_RED    = 20.0  # % drop from 7d mean → RED
-_HRV_DROP_AMBER  = 10.0  # % drop from 7d mean → AMBER
-_RECOVERY_RED    = 34    # Whoop recovery score
-_RECOVERY_AMBER  = 67
-_SLEEP_RED       = 60    # sleep score
-_SLEEP_AMBER     = 80
-_BB_RED          = 30    # Body Battery absolute → RED
-_BB_AMBER        = 45    # Body Battery absolute → AMBER
-
-
 def wellness_path() -> Path:
-    """~/.biosystems/wellness.parquet (respects BIOSYSTEMS_HOME env var)."""
+    """
+    ~/.biosystems/wellness.parquet (respects BIOSYSTEMS_HOME env var).
+
+    The single-file cache used before the store was partitioned; when present
+    it is imported into ``wellness_dir()`` on first use and renamed to
+    ``wellness.parquet.migrated``.
+    """
     base = Path(os.environ.get("BIOSYSTEMS_HOME", Path.home() / ".biosystems"))
     base.mkdir(parents=True, exist_ok=True)
     return base / "wellness.parquet"
 
 
+def wellness_dir() -> Path:
+    """~/.biosystems/wellness/ — the partitioned store (respects BIOSYSTEMS_HOME env var)."""
+    return wellness_path().with_name("wellness")
+
+
+def _manifest_path() -> Path:
+    return wellness_dir() / "_manifest.json"
+
+
+def _lock_path() -> Path:
+    """Advisory lock serialising writers of the store, next to the store directory."""
+    return wellness_dir().with_name("wellness.lock")
+
+
+# One FileLock object per lock file: acquiring the same object again on the
+# same thread is re-entrant, so sync_wellness can hold the lock across its
+# read-merge-write while _save_df takes it too.
+_locks: dict[str, FileLock] = {}
+
+
+def _store_lock() -> FileLock:
+    path = str(_lock_path())
+    with _frame_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = FileLock(path, timeout=30)
+    return lock
+
+
 # ── Parquet I/O ───────────────────────────────────────────────────────────────
+#
+# The store holds one parquet file per calendar month (``YYYY-MM.parquet``,
+# a ``date`` column plus the metric columns present that month) and a
+# ``_manifest.json`` listing each partition's columns. The manifest is
+# replaced atomically after the partitions it describes, so its
+# (inode, mtime, size) identifies a store version. Writes rewrite only the
+# months they touch; reads prune months outside the requested date range,
+# project the requested columns and push the date bounds down to parquet.
+#
+# Writers hold ``_store_lock()`` while they update partitions and manifest.
+# Readers take no lock: a read that fails because a writer replaced or
+# removed a partition under it is retried against the newer manifest.
+
+# store path → ((inode, mtime_ns, size) of the manifest, full frame)
+_frame_cache: dict[str, tuple[tuple[int, int, int], pd.DataFrame]] = {}
+# Results derived from one frame object (thresholds, sleep debt, ...)
+_derived: dict[str, Any] = {"frame": None, "values": {}}
+_frame_guard = threading.Lock()
+
+
+def _read_manifest() -> tuple[tuple[int, int, int], dict[str, Any]] | None:
+    """(stat key, manifest) of the current store version, None if there is no store."""
+    p = _manifest_path()
+    try:
+        with open(p, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            manifest = json.loads(fh.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        log.warning("Could not read wellness manifest (%s): %s", p, exc)
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size), manifest
+
+
+def _current_manifest() -> tuple[tuple[int, int, int], dict[str, Any]] | None:
+    """``_read_manifest`` after importing a legacy ``wellness.parquet``, if one is present."""
+    legacy = wellness_path()
+    if legacy.exists():
+        try:
+            df = pd.read_parquet(legacy)
+            df.index = pd.to_datetime(df.index).normalize()
+            _save_df(df)
+            os.replace(legacy, legacy.with_name(legacy.name + ".migrated"))
+            log.info("Imported %s into the partitioned store %s", legacy, wellness_dir())
+        except Exception as exc:
+            log.warning("Could not import legacy wellness cache (%s): %s", legacy, exc)
+    return _read_manifest()
+
+
+def _cached_frame(key: tuple[int, int, int]) -> pd.DataFrame | None:
+    """The in-process full frame if it is still the store version *key*."""
+    with _frame_guard:
+        hit = _frame_cache.get(str(wellness_dir()))
+    return hit[1] if hit is not None and hit[0] == key else None
+
+
+def _read_partitions(
+    manifest: Mapping[str, Any],
+    columns: Iterable[str] | None = None,
+    start: Any = None,
+    end: Any = None,
+) -> pd.DataFrame:
+    """Read the months overlapping [start, end] and only *columns* (None = all)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    wanted = None if columns is None else list(dict.fromkeys(columns))
+    lo = pd.Timestamp(start).normalize() if start is not None else None
+    hi = pd.Timestamp(end).normalize() if end is not None else None
+    filters = [("date", op, bound.to_pydatetime()) for op, bound in ((">=", lo), ("<=", hi)) if bound is not None]
+
+    store = wellness_dir()
+    tables = []
+    for month, meta in sorted(manifest.get("partitions", {}).items()):
+        if (lo is not None and month < lo.strftime("%Y-%m")) or (hi is not None and month > hi.strftime("%Y-%m")):
+            continue
+        cols = meta["columns"] if wanted is None else [c for c in wanted if c in meta["columns"]]
+        tables.append(pq.read_table(store / f"{month}.parquet", columns=["date", *cols], filters=filters or None))
+    if not tables:
+        return _empty_frame()
+
+    df: pd.DataFrame = pa.concat_tables(tables, promote_options="default").to_pandas()
+    df = df.set_index("date")
+    df.index = pd.to_datetime(df.index).normalize()
+    if wanted is not None:
+        df = df[[c for c in wanted if c in df.columns]]
+    return cast(pd.DataFrame, df.sort_index())
+
+
+def _empty_frame() -> pd.DataFrame:
+    """A new empty frame, typed for mypy (the bare constructor infers Any)."""
+    return cast(pd.DataFrame, pd.DataFrame())
+
+
+_READ_ATTEMPTS = 3
+
+
+def _retry_manifest(
+    key: tuple[int, int, int], exc: Exception
+) -> tuple[tuple[int, int, int], dict[str, Any]] | None:
+    """
+    The store version to retry a failed read of version *key* against.
+
+    A writer may have replaced the manifest and removed partitions it listed
+    while they were being read; the newer version is returned then. If the
+    store did not change the read genuinely failed: log it and return None.
+    """
+    latest = _read_manifest()
+    if latest is not None and latest[0] != key:
+        return latest
+    log.warning("Could not read wellness store (%s): %s", wellness_dir(), exc)
+    return None
+
 
 def _load_df() -> pd.DataFrame:
-    """Load existing wellness cache; return empty DataFrame if absent."""
-    p = wellness_path()
-    if not p.exists():
-        return pd.DataFrame()
-    try:
-        df = pd.read_parquet(p)
-        df.index = pd.to_datetime(df.index).normalize()
+    """
+    Load the full wellness store; return empty DataFrame if absent.
+
+    The frame is shared between callers until the store changes — treat it
+    as read-only (``load_wellness_df`` returns a copy).
+    """
+    loaded = _current_manifest()
+    for _ in range(_READ_ATTEMPTS):
+        if loaded is None:
+            return _empty_frame()
+        key, manifest = loaded
+        cached = _cached_frame(key)
+        if cached is not None:
+            return cached
+        try:
+            df = _read_partitions(manifest)
+        except Exception as exc:
+            loaded = _retry_manifest(key, exc)
+            continue
+        with _frame_guard:
+            _frame_cache[str(wellness_dir())] = (key, df)
         return df
-    except Exception as exc:
-        log.warning("Could not read wellness cache (%s): %s", p, exc)
-        return pd.DataFrame()
+    log.warning("Wellness store %s kept changing while being read", wellness_dir())
+    return _empty_frame()
+
+
+def _load_subset(
+    columns: Iterable[str] | None = None,
+    start: Any = None,
+    end: Any = None,
+) -> pd.DataFrame:
+    """
+    Rows in [start, end] and *columns* only: sliced from the in-process
+    frame when it is current, otherwise read from just the partitions and
+    columns needed (not cached).
+    """
+    loaded = _current_manifest()
+    df = None
+    for _ in range(_READ_ATTEMPTS):
+        if loaded is None:
+            return _empty_frame()
+        key, manifest = loaded
+        df = _cached_frame(key)
+        if df is not None:
+            break
+        try:
+            return _read_partitions(manifest, columns, start, end)
+        except Exception as exc:
+            loaded = _retry_manifest(key, exc)
+    if df is None:
+        log.warning("Wellness store %s kept changing while being read", wellness_dir())
+        return _empty_frame()
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df.index >= pd.Timestamp(start).normalize()
+    if end is not None:
+        mask &= df.index <= pd.Timestamp(end).normalize()
+    cols = list(df.columns) if columns is None else [c for c in dict.fromkeys(columns) if c in df.columns]
+    return cast(pd.DataFrame, df.loc[mask.to_numpy(), cols])
+
+
+def _memo(frame: pd.DataFrame, key: Any, compute: Callable[[], Any]) -> Any:
+    """Return ``compute()`` memoised per ``key`` for as long as ``frame`` is the current frame."""
+    with _frame_guard:
+        if _derived["frame"] is not frame:
+            _derived["frame"] = frame
+            _derived["values"] = {}
+        values = _derived["values"]
+        if key in values:
+            return values[key]
+    result = compute()
+    with _frame_guard:
+        if _derived["frame"] is frame:
+            _derived["values"][key] = result
+    return result
+
+
+def load_wellness_df(
+    columns: Iterable[str] | None = None,
+    start: Any = None,
+    end: Any = None,
+) -> pd.DataFrame:
+    """
+    Public accessor for the wellness DataFrame (a copy).
+
+    With *columns* and/or a *start* / *end* date only those columns and
+    the partitions overlapping the range are read.
+    """
+    if columns is None and start is None and end is None:
+        return cast(pd.DataFrame, _load_df().copy())
+    return cast(pd.DataFrame, _load_subset(columns, start, end).copy())
+
+
+def _atomic_replace(path: Path, write: Callable[[str], object]) -> None:
+    """Call ``write(tmp)`` on a uniquely named temp file beside *path*, then rename it over *path*."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
 
 
-def load_wellness_df() -> pd.DataFrame:
-    """Public accessor for the full wellness DataFrame."""
-    return _load_df()
+def _atomic_parquet(table: pd.DataFrame, path: Path) -> None:
+    _atomic_replace(path, lambda tmp: table.to_parquet(tmp, index=False))
 
 
-def _save_df(df: pd.DataFrame) -> None:
-    """Write DataFrame to parquet, sorted by date."""
-    df = df.sort_index()
-    df.to_parquet(wellness_path())
+def _save_df(df: pd.DataFrame, months: Iterable[str] | None = None) -> None:
+    """
+    Write DataFrame to the store, sorted by date.
+
+    Only the ``YYYY-MM`` partitions in *months* are rewritten (every month,
+    and stale partitions removed, when None); *df* must be the complete
+    frame either way, and becomes the cached current version. Holds the
+    store lock while partitions and manifest are updated.
+    """
+    df = df.sort_index().dropna(axis=1, how="all")
+    df.index = pd.DatetimeIndex(df.index).normalize().rename("date")
+    with _store_lock():
+        _write_store(df, months)
+
+
+def _write_store(df: pd.DataFrame, months: Iterable[str] | None) -> None:
+    """The body of ``_save_df``; caller holds the store lock."""
+    store = wellness_dir()
+    store.mkdir(parents=True, exist_ok=True)
+
+    loaded = _read_manifest()
+    manifest: dict[str, Any] = loaded[1] if loaded is not None else {"version": 0, "partitions": {}}
+    partitions: dict[str, Any] = manifest.setdefault("partitions", {})
+    keys = pd.DatetimeIndex(df.index).strftime("%Y-%m")
+    touched = set(keys) | set(partitions) if months is None else set(months)
+
+    removed = []
+    for month in sorted(touched):
+        part = df[keys == month].dropna(axis=1, how="all")
+        if part.empty:
+            if partitions.pop(month, None) is not None:
+                removed.append(store / f"{month}.parquet")
+            continue
+        _atomic_parquet(part.reset_index(), store / f"{month}.parquet")
+        partitions[month] = {"rows": len(part), "columns": list(part.columns)}
+
+    manifest["version"] = int(manifest.get("version", 0)) + 1
+    p = _manifest_path()
+    text = json.dumps(manifest, indent=1, sort_keys=True)
+    _atomic_replace(p, lambda tmp: Path(tmp).write_text(text))
+    for path in removed:
+        path.unlink(missing_ok=True)
+
+    st = p.stat()
+    with _frame_guard:
+        _frame_cache[str(store)] = ((st.st_ino, st.st_mtime_ns, st.st_size), df)
 
 
 # ── Sync ─────────────────────────────────────────────────────────────────────
 
+_OVERLAP_DAYS = 3  # re-request this many days before each watermark (late data)
+
+
+def watermarks_path() -> Path:
+    """~/.biosystems/wellness_watermarks.json, next to the wellness parquet."""
+    return wellness_path().with_name("wellness_watermarks.json")
+
+
+def load_watermarks() -> dict[str, dict[str, str]]:
+    """
+    Per-metric sync watermarks, keyed ``"source/field_key"``.
+
+    Each entry may hold ``last_value`` (latest date with a value) and
+    ``checked`` (end of the last successfully fetched range).
+    """
+    path = watermarks_path()
+    if not path.exists():
+        return {}
+    try:
+        marks = json.loads(path.read_text())
+    except (OSError, ValueError) as exc:
+        log.warning("Ignoring unreadable wellness watermarks %s: %s", path, exc)
+        return {}
+    return marks if isinstance(marks, dict) else {}
+
+
+def _save_watermarks(marks: Mapping[str, Mapping[str, str]]) -> None:
+    text = json.dumps(marks, indent=2, sort_keys=True)
+    _atomic_replace(watermarks_path(), lambda tmp: Path(tmp).write_text(text))
+
+
+def _incremental_ranges(
+    marks: Mapping[str, Mapping[str, str]],
+    default_start: str,
+    date_end: str,
+) -> dict[tuple[str, str], tuple[str, str]]:
+    """
+    Per-metric request ranges: from ``_OVERLAP_DAYS`` before the later of
+    the metric's ``last_value`` / ``checked`` watermarks, or *default_start*
+    for metrics never synced, through *date_end*.
+    """
+    from biosystems.wellness.habitdash import COLUMN_MAP
+
+    ranges: dict[tuple[str, str], tuple[str, str]] = {}
+    for source, field_key in COLUMN_MAP:
+        mark = marks.get(f"{source}/{field_key}", {})
+        since = max((mark[k] for k in ("last_value", "checked") if mark.get(k)), default=None)
+        if since is None:
+            start = default_start
+        else:
+            start = (date.fromisoformat(since) - timedelta(days=_OVERLAP_DAYS)).isoformat()
+        ranges[(source, field_key)] = (min(start, date_end), date_end)
+    return ranges
+
+
 def sync_wellness(
     days: int = 7,
     date_start: str | None = None,
     date_end: str | None = None,
     api_key: str | None = None,
+    full: bool = False,
 ) -> int:
     """
     Fetch wellness metrics from HabitDash and merge into the local cache.
 
+    By default each metric is requested only from a few days
+    (``_OVERLAP_DAYS``) before its persisted watermark, so a daily sync is
+    one tiny request per metric; metrics without a watermark fall back to
+    the *days* window. An explicit range or *full* fetches every metric
+    over the whole window.
+
     Parameters
     ----------
     days : int
-        Number of days to look back from today (used when date_start/end not set).
+        Number of days to look back from today (used when date_start/end not
+        set, and for metrics with no watermark yet).
     date_start, date_end : str | None
-        Explicit YYYY-MM-DD range; overrides *days* when both provided.
+        Explicit YYYY-MM-DD range; overrides *days* and the watermarks when
+        date_start is provided.
     api_key : str | None
         HabitDash API key; falls back to HABITDASH_API_KEY env var.
+    full : bool
+        Ignore watermarks and refetch the whole window for every metric.
 
     Returns
     -------
     int
         Number of date rows updated/inserted.
     """
-    from biosystems.wellness.habitdash import HabitDashClient
+    from biosystems.wellness.habitdash import COLUMN_MAP, HabitDashClient, metric_records
 
+    explicit = date_start is not None
     if date_end is None:
         date_end = date.today().isoformat()
     if date_start is None:
         date_start = (date.today() - timedelta(days=days)).isoformat()
 
-    log.info("Syncing HabitDash wellness %s → %s", date_start, date_end)
-
     try:
         client = HabitDashClient(api_key=api_key)
     except ValueError as exc:
         log.error("%s", exc)
         raise
 
-    records = client.fetch_all_metrics(date_start, date_end)
+    marks = load_watermarks()
+    if explicit or full:
+        log.info("Syncing HabitDash wellness %s → %s", date_start, date_end)
+        records = client.fetch_all_metrics(date_start, date_end)
+    else:
+        ranges = _incremental_ranges(marks, date_start, date_end)
+        log.info("Syncing HabitDash wellness incrementally (%d metrics) → %s", len(ranges), date_end)
+        results = client.fetch_metrics(ranges)
+        for key, rows in results.items():
+            if rows is not None:
+                marks.setdefault("/".join(key), {})["checked"] = ranges[key][1]
+        records = metric_records(results)
+
+    keys = {col: "/".join(key) for key, col in COLUMN_MAP.items()}
+    for rec in records:
+        if rec["column"] not in keys:
+            continue
+        mark = marks.setdefault(keys[rec["column"]], {})
+        day = str(rec["date"])[:10]
+        if day > mark.get("last_value", ""):
+            mark["last_value"] = day
+
     if not records:
+        _save_watermarks(marks)
         log.warning("No wellness data returned for %s–%s", date_start, date_end)
         return 0
 
@@ -137,26 +515,55 @@ def sync_wellness(
     )
     pivoted.columns.name = None  # remove column axis name
 
-    # Merge with existing cache (new data wins on conflict)
-    existing = _load_df()
-    if existing.empty:
-        combined = pivoted
-    else:
-        combined = pivoted.combine_first(existing)
-        for col in pivoted.columns:
-            if col in combined.columns:
-                combined[col] = combined[col].where(
-                    pivoted[col].isna(), pivoted[col]
-                )
-
-    combined = combined.sort_index()
-    _save_df(combined)
+    # Merge with existing cache (new data wins on conflict). The lock spans
+    # the read too, so a concurrent sync cannot drop the rows merged here.
+    with _store_lock():
+        existing = _load_df()
+        previous_source = _source_signature(existing)
+        if existing.empty:
+            combined = pivoted
+        else:
+            combined = pivoted.combine_first(existing)
+            for col in pivoted.columns:
+                if col in combined.columns:
+                    # Align to the full index first: an unaligned condition is
+                    # filled with False, which would blank every older date
+                    new_vals = pivoted[col].reindex(combined.index)
+                    combined[col] = combined[col].where(new_vals.isna(), new_vals)
+
+        combined = combined.sort_index()
+        _save_df(combined, months=set(pivoted.index.strftime("%Y-%m")))
+        _save_watermarks(marks)
+    _refresh_features(changed_from=pivoted.index.min(), previous_source=previous_source)
 
     updated = len(pivoted)
-    log.info("Wellness cache updated: %d date rows written to %s", updated, wellness_path())
+    log.info("Wellness cache updated: %d date rows written to %s", updated, wellness_dir())
     return updated
 
 
+def _refresh_features(
+    changed_from: pd.Timestamp | None = None,
+    previous_source: str | None = None,
+) -> None:
+    """Incrementally update the persisted feature table after a cache write."""
+    from biosystems.wellness.features import update_feature_table
+
+    full_df = _load_df()
+    source = _source_signature(full_df)
+    if full_df.empty or source is None:
+        return
+    thresholds, sleep_debt = _calibration(full_df)
+    try:
+        table = update_feature_table(
+            full_df, thresholds, sleep_debt,
+            source=source, changed_from=changed_from, previous_source=previous_source,
+        )
+    except Exception as exc:
+        log.warning("Could not update wellness feature table: %s", exc)
+        return
+    _memo(full_df, "features", lambda: table)
+
+
 # ── Lookup ────────────────────────────────────────────────────────────────────
 
 def get_wellness_for_date(date_str: str) -> dict[str, Any]:
@@ -174,31 +581,42 @@ def get_wellness_for_date(date_str: str) -> dict[str, Any]:
     return {k: (None if pd.isna(v) else v) for k, v in row.items()}
 
 
+def get_wellness_for_dates(dates: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """
+    Return raw wellness columns for many dates, keyed by the input date string.
+
+    One frame load and one vectorized reindex; dates not in the cache map
+    to {} exactly as ``get_wellness_for_date`` would return.
+    """
+    dates = list(dict.fromkeys(dates))
+    df = _load_df()
+    if df.empty or not dates:
+        return {d: {} for d in dates}
+    targets = pd.DatetimeIndex([pd.Timestamp(d) for d in dates]).normalize()
+    present = targets.isin(df.index)
+    picked = df.reindex(targets[present])
+    records = iter(picked.astype(object).where(picked.notna(), None).to_dict("records"))
+    return {d: (next(records) if hit else {}) for d, hit in zip(dates, present)}
+
+
 def get_wellness_window(
     date_str: str,
     days: int = 30,
+    columns: Iterable[str] | None = None,
 ) -> pd.DataFrame:
     """
     Return a DataFrame of the *days* days ending on date_str (inclusive).
     Used for delta computation.
+
+    Only the partitions overlapping the window (and *columns*, if given)
+    are read.
     """
-    df = _load_df()
-    if df.empty:
-        return pd.DataFrame()
     end   = pd.Timestamp(date_str).normalize()
     start = end - timedelta(days=days - 1)
-    mask  = (df.index >= start) & (df.index <= end)
-    return df[mask].copy()
-
+    return cast(pd.DataFrame, _load_subset(columns, start, end).copy())
 
-# ── Delta computation ─────────────────────────────────────────────────────────
-
-def _pct_change(today: float | None, reference: float | None) -> float | None:
-    """Return (today - reference) / reference * 100 or None."""
-    if today is None or reference is None or reference == 0:
-        return None
-    return (today - reference) / abs(reference) * 100
 
+# ── Readiness context ─────────────────────────────────────────────────────────
 
 def compute_wellness_context(date_str: str) -> dict[str, Any]:
     """
@@ -222,271 +640,202 @@ def compute_wellness_context(date_str: str) -> dict[str, Any]:
               `avg_stress_timing`, `stale`, `staleness_days`.
           Returns an empty dict if no wellness data exists for the requested window.
     """
-    # Single parquet load — used for both window slice and threshold calibration
+    persisted = _persisted_context(date_str)
+    if persisted is not None:
+        return persisted
+
     full_df = _load_df()
     if full_df.empty:
         return {}
 
+    thresholds, sleep_debt = _calibration(full_df)
+    table = _feature_table(full_df, thresholds, sleep_debt)
+    rows = _memo(full_df, "feature_rows", lambda: table.to_dict("index"))
+
     today_ts = pd.Timestamp(date_str).normalize()
-    end      = today_ts
-    start    = end - timedelta(days=29)  # 30-day window
-    mask     = (full_df.index >= start) & (full_df.index <= end)
-    window   = full_df[mask].copy()
+    row = rows.get(today_ts)
+    if row is None:
+        # Not a cached date (e.g. today before sync) — same pass, one target
+        from biosystems.wellness.features import compute_wellness_features
+        row = compute_wellness_features(full_df, thresholds, sleep_debt, targets=[today_ts]).iloc[0]
+    return _context_from_row(row, thresholds)
 
-    if window.empty:
-        return {}
 
-    today_row = window[window.index == today_ts]
-    prev_row  = window[window.index < today_ts].tail(1)
+def _persisted_context(date_str: str) -> dict[str, Any] | None:
+    """
+    The context for one date read straight from the persisted feature table
+    (that single row), without loading the store or recalibrating.
 
-    # Staleness check
-    latest_date    = window.index.max()
-    staleness_days = (today_ts - latest_date).days
-    stale          = staleness_days > 1
+    None — use the full path — when the store frame is already in memory,
+    the table was not derived from the current store version, or the date
+    is not in it.
+    """
+    loaded = _current_manifest()
+    if loaded is None:
+        return None
+    key, _ = loaded
+    if _cached_frame(key) is not None:
+        return None
 
-    def _val(df_subset: pd.DataFrame, col: str) -> float | None:
-        if df_subset.empty or col not in df_subset.columns:
-            return None
-        v = df_subset[col].iloc[0]
-        return None if pd.isna(v) else float(v)
+    from biosystems.wellness.features import load_feature_table
 
-    def _7d_mean(col: str) -> float | None:
-        """
-        Compute the mean of the specified column over the seven days immediately before today_ts in the surrounding window.
+    ts = pd.Timestamp(date_str).normalize()
+    table = load_feature_table(dates=[ts])
+    if (
+        table is None
+        or table.attrs.get("source") != f"{key[1]}:{key[2]}"
+        or ts not in table.index
+        or "thresholds" not in table.attrs
+    ):
+        return None
+    return _context_from_row(table.loc[ts].to_dict(), json.loads(table.attrs["thresholds"]))
 
-        Parameters:
-            col (str): Column name in the window DataFrame to average.
 
-        Returns:
-            float | None: The mean of numeric values from up to seven prior days as a float, or `None` if the column is missing, there are no prior rows, or no numeric values are present.
-        """
-        prior = window[window.index < today_ts].tail(7)
-        if prior.empty or col not in prior.columns:
-            return None
-        vals = pd.to_numeric(prior[col], errors="coerce").dropna()
-        return float(vals.mean()) if not vals.empty else None
-
-    # ── Raw values ────────────────────────────────────────────────────────────
-    hrv_today      = _val(today_row, "hrv_rmssd")
-    rhr_today      = (_val(today_row, "resting_hr_whoop")
-                      or _val(today_row, "resting_hr_garmin"))
-    recovery_today = _val(today_row, "recovery_score")
-    sleep_today    = _val(today_row, "sleep_score")
-    sleep_dur_s    = (_val(today_row, "sleep_duration_s")
-                      or _val(today_row, "sleep_duration_s_garmin"))
-    body_battery   = _val(today_row, "body_battery")
-    strain_today   = _val(today_row, "strain_score")
-    avg_stress     = _val(today_row, "avg_stress")
-    vo2max         = _val(today_row, "vo2max")
-
-    sleep_hours = round(sleep_dur_s / 3600, 1) if sleep_dur_s else None
-
-    # ── 1-day deltas ──────────────────────────────────────────────────────────
-    hrv_1d_delta = None
-    rhr_1d_delta = None
-    if not prev_row.empty:
-        hrv_prev = _val(prev_row, "hrv_rmssd")
-        rhr_prev = (_val(prev_row, "resting_hr_whoop")
-                    or _val(prev_row, "resting_hr_garmin"))
-        hrv_1d_delta = (hrv_today - hrv_prev) if (hrv_today and hrv_prev) else None
-        rhr_1d_delta = (rhr_today - rhr_prev) if (rhr_today and rhr_prev) else None
-
-    # ── 7-day rolling mean deltas ─────────────────────────────────────────────
-    hrv_7d_mean   = _7d_mean("hrv_rmssd")
-    rhr_7d_mean   = _7d_mean("resting_hr_whoop") or _7d_mean("resting_hr_garmin")
-    bb_7d_mean    = _7d_mean("body_battery")
-    hrv_7d_pct    = _pct_change(hrv_today, hrv_7d_mean)
-    rhr_7d_delta  = ((rhr_today - rhr_7d_mean)
-                     if (rhr_today and rhr_7d_mean) else None)
-    bb_7d_delta   = ((body_battery - bb_7d_mean)
-                     if (body_battery is not None and bb_7d_mean) else None)
-
-    # ── Calibrated thresholds ─────────────────────────────────────────────────
+def compute_wellness_context_batch(dates: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """
+    ``compute_wellness_context`` for many dates, keyed by the input date string.
+
+    Shares one frame load and one threshold calibration across all dates;
+    cached dates are dictionary lookups into the feature table and any
+    dates outside it are computed together in a single vectorized pass.
+    """
+    dates = list(dict.fromkeys(dates))
+    full_df = _load_df()
+    if full_df.empty or not dates:
+        return {d: {} for d in dates}
+
+    thresholds, sleep_debt = _calibration(full_df)
+    table = _feature_table(full_df, thresholds, sleep_debt)
+    rows = _memo(full_df, "feature_rows", lambda: table.to_dict("index"))
+
+    targets = {d: pd.Timestamp(d).normalize() for d in dates}
+    missing = sorted({ts for ts in targets.values() if ts not in rows})
+    extra: dict[Any, dict[Any, Any]] = {}
+    if missing:
+        from biosystems.wellness.features import compute_wellness_features
+        extra = compute_wellness_features(
+            full_df, thresholds, sleep_debt, targets=missing,
+        ).to_dict("index")
+
+    return {
+        d: _context_from_row(rows.get(ts) or extra[ts], thresholds)
+        for d, ts in targets.items()
+    }
+
+
+def _calibration(full_df: pd.DataFrame) -> tuple[dict[str, Any], pd.Series | None]:
+    """(calibrated thresholds, sleep-debt series) for the frame, memoised."""
     try:
         from biosystems.wellness.analytics import calibrate_thresholds, compute_sleep_debt
-        thresholds = calibrate_thresholds(full_df)
+        thresholds = _memo(full_df, "thresholds", lambda: calibrate_thresholds(full_df))
     except Exception:
-        thresholds = {}
-        compute_sleep_debt = None  # type: ignore[assignment]
-
-    hrv_drop_red   = thresholds.get("hrv_pct_drop_red",   _HRV_DROP_RED)
-    hrv_drop_amber = thresholds.get("hrv_pct_drop_amber", _HRV_DROP_AMBER)
-    rhr_spike_red  = thresholds.get("rhr_spike_red",      _RHR_SPIKE_RED)
-    rhr_spike_amb  = thresholds.get("rhr_spike_amber",    _RHR_SPIKE_AMBER)
-    bb_red         = thresholds.get("body_battery", {}).get("red",   _BB_RED)
-    bb_amber       = thresholds.get("body_battery", {}).get("amber", _BB_AMBER)
-    str_red        = thresholds.get("avg_stress",   {}).get("red",   55.0)
-    str_amber      = thresholds.get("avg_stress",   {}).get("amber", 40.0)
-    norms          = thresholds.get("norms", {})
-    rr_thresholds  = thresholds.get("respiratory_rate", {})
-
-    # ── Sleep debt ────────────────────────────────────────────────────────────
-    sleep_debt_7d: float | None = None
-    if compute_sleep_debt is not None:
-        try:
-            personal_sleep_mean = norms.get("sleep_h_mean")
-            debt_series = compute_sleep_debt(full_df, personal_mean_h=personal_sleep_mean)
-            if not debt_series.empty and today_ts in debt_series.index:
-                v = debt_series[today_ts]
-                sleep_debt_7d = round(float(v), 1) if not pd.isna(v) else None
-        except Exception:
-            pass
+        return {}, None
 
-    # ── Respiratory rate + sigma ──────────────────────────────────────────────
-    resp_rate: float | None = None
-    rr_sigma:  float | None = None
-    for rr_col in ["respiratory_rate_garmin", "respiratory_rate_whoop"]:
-        v = _val(today_row, rr_col)
-        if v is not None:
-            resp_rate = v
-            if rr_thresholds:
-                rr_mean = rr_thresholds.get("mean")
-                rr_std  = rr_thresholds.get("std")
-                if rr_mean and rr_std and rr_std > 0:
-                    rr_sigma = round((resp_rate - rr_mean) / rr_std, 2)
-            break
+    personal_sleep_mean = thresholds.get("norms", {}).get("sleep_h_mean")
+    try:
+        sleep_debt = _memo(
+            full_df,
+            ("sleep_debt", personal_sleep_mean),
+            lambda: compute_sleep_debt(full_df, personal_mean_h=personal_sleep_mean),
+        )
+    except Exception:
+        sleep_debt = None
+    return thresholds, sleep_debt
 
-    # ── G/A/R classification ──────────────────────────────────────────────────
-    red_signals:   list[str] = []
-    amber_signals: list[str] = []
-
-    if hrv_7d_pct is not None:
-        if hrv_7d_pct < -hrv_drop_red:
-            red_signals.append(f"HRV {hrv_7d_pct:+.0f}% vs 7d mean")
-        elif hrv_7d_pct < -hrv_drop_amber:
-            amber_signals.append(f"HRV {hrv_7d_pct:+.0f}% vs 7d mean")
-
-    if rhr_7d_delta is not None:
-        if rhr_7d_delta > rhr_spike_red:
-            red_signals.append(f"RHR +{rhr_7d_delta:.0f} bpm vs 7d mean")
-        elif rhr_7d_delta > rhr_spike_amb:
-            amber_signals.append(f"RHR +{rhr_7d_delta:.0f} bpm vs 7d mean")
-
-    if recovery_today is not None:
-        if recovery_today < _RECOVERY_RED:
-            red_signals.append(f"Recovery {recovery_today:.0f}%")
-        elif recovery_today < _RECOVERY_AMBER:
-            amber_signals.append(f"Recovery {recovery_today:.0f}%")
-
-    if sleep_today is not None:
-        if sleep_today < _SLEEP_RED:
-            red_signals.append(f"Sleep {sleep_today:.0f}%")
-        elif sleep_today < _SLEEP_AMBER:
-            amber_signals.append(f"Sleep {sleep_today:.0f}%")
-
-    if body_battery is not None:
-        if body_battery < bb_red:
-            red_signals.append(f"Body Battery {body_battery:.0f}% (low)")
-        elif body_battery < bb_amber:
-            amber_signals.append(f"Body Battery {body_battery:.0f}% (below norm)")
-
-    if avg_stress is not None:
-        if avg_stress > str_red:
-            red_signals.append(f"Stress {avg_stress:.0f}")
-        elif avg_stress > str_amber:
-            amber_signals.append(f"Stress {avg_stress:.0f}")
-
-    if resp_rate is not None and rr_thresholds:
-        rr_red   = rr_thresholds.get("red")
-        rr_amber = rr_thresholds.get("amber")
-        if rr_red and resp_rate >= rr_red:
-            red_signals.append(f"Resp rate {resp_rate:.1f} brpm (+{rr_sigma:.1f}σ)")
-        elif rr_amber and resp_rate >= rr_amber:
-            amber_signals.append(f"Resp rate {resp_rate:.1f} brpm (+{rr_sigma:.1f}σ)")
-
-    if red_signals:
-        gar        = "🔴 RED"
-        gar_detail = "; ".join(red_signals)
-    elif amber_signals:
-        gar        = "🟡 AMBER"
-        gar_detail = "; ".join(amber_signals)
-    else:
-        gar        = "🟢 GREEN"
-        gar_detail = "all signals stable"
-
-    # ── Overnight-only G/A/R (pre-run valid) ─────────────────────────────────
-    # Uses only signals measured during sleep/overnight: RHR, sleep metrics,
-    # HRV, respiratory rate. Excludes Body Battery and Avg Stress (daily avgs).
-    on_red:   list[str] = []
-    on_amber: list[str] = []
-
-    if hrv_7d_pct is not None:
-        if hrv_7d_pct < -hrv_drop_red:
-            on_red.append(f"HRV {hrv_7d_pct:+.0f}% vs 7d mean")
-        elif hrv_7d_pct < -hrv_drop_amber:
-            on_amber.append(f"HRV {hrv_7d_pct:+.0f}% vs 7d mean")
-
-    if rhr_7d_delta is not None:
-        if rhr_7d_delta > rhr_spike_red:
-            on_red.append(f"RHR +{rhr_7d_delta:.0f} bpm vs 7d mean")
-        elif rhr_7d_delta > rhr_spike_amb:
-            on_amber.append(f"RHR +{rhr_7d_delta:.0f} bpm vs 7d mean")
-
-    if recovery_today is not None:
-        if recovery_today < _RECOVERY_RED:
-            on_red.append(f"Recovery {recovery_today:.0f}%")
-        elif recovery_today < _RECOVERY_AMBER:
-            on_amber.append(f"Recovery {recovery_today:.0f}%")
-
-    if sleep_today is not None:
-        if sleep_today < _SLEEP_RED:
-            on_red.append(f"Sleep score {sleep_today:.0f}%")
-        elif sleep_today < _SLEEP_AMBER:
-            on_amber.append(f"Sleep score {sleep_today:.0f}%")
-
-    if resp_rate is not None and rr_thresholds:
-        rr_red_t   = rr_thresholds.get("red")
-        rr_amber_t = rr_thresholds.get("amber")
-        if rr_red_t and resp_rate >= rr_red_t:
-            on_red.append(f"Resp rate {resp_rate:.1f} brpm (+{rr_sigma:.1f}σ)")
-        elif rr_amber_t and resp_rate >= rr_amber_t:
-            on_amber.append(f"Resp rate {resp_rate:.1f} brpm (+{rr_sigma:.1f}σ)")
-
-    if on_red:
-        gar_overnight        = "🔴 RED"
-        gar_overnight_detail = "; ".join(on_red)
-    elif on_amber:
-        gar_overnight        = "🟡 AMBER"
-        gar_overnight_detail = "; ".join(on_amber)
-    else:
-        gar_overnight        = "🟢 GREEN"
-        gar_overnight_detail = "all overnight signals stable"
 
+def _source_signature(full_df: pd.DataFrame) -> str | None:
+    """Signature of the wellness file ``full_df`` was loaded from (None if not from disk)."""
+    with _frame_guard:
+        hit = _frame_cache.get(str(wellness_dir()))
+    if hit is None or hit[1] is not full_df:
+        return None
+    _, mtime_ns, size = hit[0]
+    return f"{mtime_ns}:{size}"
+
+
+def _feature_table(
+    full_df: pd.DataFrame,
+    thresholds: dict[str, Any],
+    sleep_debt: pd.Series | None,
+) -> pd.DataFrame:
+    """
+    The materialised feature table for ``full_df``.
+
+    Uses the persisted table when it was derived from the current wellness
+    file with the same thresholds; otherwise rebuilds (and persists) it.
+    """
+    from biosystems.wellness.features import (
+        compute_wellness_features,
+        load_feature_table,
+        thresholds_fingerprint,
+        update_feature_table,
+    )
+
+    def _build() -> pd.DataFrame:
+        source = _source_signature(full_df)
+        if source is None:
+            # Frame not backed by the on-disk cache: compute in memory only
+            return compute_wellness_features(full_df, thresholds, sleep_debt)
+        table = load_feature_table()
+        if (
+            table is not None
+            and table.attrs.get("source") == source
+            and table.attrs.get("thresholds") == thresholds_fingerprint(thresholds)
+        ):
+            return table
+        return update_feature_table(full_df, thresholds, sleep_debt, source=source)
+
+    return cast(pd.DataFrame, _memo(full_df, "features", _build))
+
+
+def _context_from_row(row: Mapping[str, Any], thresholds: dict[str, Any]) -> dict[str, Any]:
+    """Shape one feature-table row as the ``compute_wellness_context`` dict."""
+    if not bool(row["has_window"]):
+        return {}
+
+    def _f(col: str, ndigits: int | None = None) -> float | None:
+        v = row[col]
+        if v is None or pd.isna(v):
+            return None
+        return round(float(v), ndigits) if ndigits is not None else float(v)
+
+    staleness_days = int(row["staleness_days"])
+    stale = staleness_days > 1
     ctx: dict[str, Any] = {
         # Raw values
-        "hrv_rmssd":          hrv_today,
-        "resting_hr":         rhr_today,
-        "recovery_score":     recovery_today,
-        "sleep_score":        sleep_today,
-        "sleep_duration_s":   sleep_dur_s,
-        "sleep_hours":        sleep_hours,
-        "body_battery":       body_battery,
-        "strain_score":       strain_today,
-        "avg_stress":         avg_stress,
-        "vo2max":             vo2max,
-        "respiratory_rate":   resp_rate,
+        "hrv_rmssd":          _f("hrv_rmssd"),
+        "resting_hr":         _f("resting_hr"),
+        "recovery_score":     _f("recovery_score"),
+        "sleep_score":        _f("sleep_score"),
+        "sleep_duration_s":   _f("sleep_duration_s"),
+        "sleep_hours":        _f("sleep_hours", 1),
+        "body_battery":       _f("body_battery"),
+        "strain_score":       _f("strain_score"),
+        "avg_stress":         _f("avg_stress"),
+        "vo2max":             _f("vo2max"),
+        "respiratory_rate":   _f("respiratory_rate"),
         # Deltas
-        "hrv_1d_delta":       round(hrv_1d_delta, 1)  if hrv_1d_delta  is not None else None,
-        "hrv_7d_pct":         round(hrv_7d_pct, 1)    if hrv_7d_pct    is not None else None,
-        "hrv_7d_mean":        round(hrv_7d_mean, 1)   if hrv_7d_mean   is not None else None,
-        "rhr_1d_delta":       round(rhr_1d_delta, 1)  if rhr_1d_delta  is not None else None,
-        "rhr_7d_delta":       round(rhr_7d_delta, 1)  if rhr_7d_delta  is not None else None,
-        "rhr_7d_mean":        round(rhr_7d_mean, 1)   if rhr_7d_mean   is not None else None,
-        "bb_7d_mean":         round(bb_7d_mean, 1)    if bb_7d_mean    is not None else None,
-        "bb_7d_delta":        round(bb_7d_delta, 1)   if bb_7d_delta   is not None else None,
-        "rr_sigma":           rr_sigma,
-        "sleep_debt_7d":      sleep_debt_7d,
+        "hrv_1d_delta":       _f("hrv_1d_delta", 1),
+        "hrv_7d_pct":         _f("hrv_7d_pct", 1),
+        "hrv_7d_mean":        _f("hrv_7d_mean", 1),
+        "rhr_1d_delta":       _f("rhr_1d_delta", 1),
+        "rhr_7d_delta":       _f("rhr_7d_delta", 1),
+        "rhr_7d_mean":        _f("rhr_7d_mean", 1),
+        "bb_7d_mean":         _f("bb_7d_mean", 1),
+        "bb_7d_delta":        _f("bb_7d_delta", 1),
+        "rr_sigma":           _f("rr_sigma", 2),
+        "sleep_debt_7d":      _f("sleep_debt_7d", 1),
         # G/A/R — full day (reflects how the day went, includes daily-avg signals)
-        "gar":                gar,
-        "gar_detail":         gar_detail,
+        "gar":                row["gar"],
+        "gar_detail":         row["gar_detail"],
         # G/A/R — overnight only (pre-run valid: RHR + sleep + HRV + resp rate)
-        "gar_overnight":         gar_overnight,
-        "gar_overnight_detail":  gar_overnight_detail,
+        "gar_overnight":         row["gar_overnight"],
+        "gar_overnight_detail":  row["gar_overnight_detail"],
         # Signal timing metadata
         "body_battery_timing": "daily_avg",   # HabitDash exports intraday average
         "avg_stress_timing":   "daily_avg",
         # Personal norms (from calibrated thresholds)
-        "norms":              norms,
+        "norms":              dict(thresholds.get("norms", {})),
         "thresholds_calibrated": thresholds.get("calibrated", False),
         # Metadata
         "stale":              stale,
@@ -601,13 +950,35 @@ def predict_recovery_status(
 def enrich_run_context(
     date_str: str,
     existing_context: Any | None,
+    wellness: Mapping[str, Any] | None = None,
 ) -> Any | None:
     """
     Populate RunContext.rest_hr / sleep_score / hrv_rmssd from wellness cache.
     Returns the original context object if no wellness data is available.
     Imports RunContext lazily to avoid circular dependency.
+
+    Pass *wellness* (a value from ``get_wellness_for_dates``) to skip the
+    per-date lookup when the caller has already resolved a batch.
+    """
+    if wellness is None:
+        wellness = get_wellness_for_date(date_str)
+    return _apply_wellness(wellness, existing_context)
+
+
+def enrich_run_context_batch(
+    contexts: Mapping[str, Any | None],
+) -> dict[str, Any | None]:
     """
-    wellness = get_wellness_for_date(date_str)
+    ``enrich_run_context`` for many runs at once, keyed by date string.
+
+    All dates are resolved with a single ``get_wellness_for_dates`` lookup.
+    """
+    wellness = get_wellness_for_dates(contexts)
+    return {d: _apply_wellness(wellness[d], ctx) for d, ctx in contexts.items()}
+
+
+def _apply_wellness(wellness: Mapping[str, Any], existing_context: Any | None) -> Any | None:
+    """Merge one day's raw wellness values into a RunContext (or a new one)."""
     if not wellness:
         return existing_context
 
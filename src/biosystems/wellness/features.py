@@ -0,0 +1,461 @@
+"""
+Wellness Feature Table
+======================
+
+Vectorized daily readiness features over the whole wellness cache, persisted
+at ~/.biosystems/wellness_features.parquet.
+
+One pass computes, for every day in the cache's date range (gap days
+included), exactly what
+``compute_wellness_context`` reports for that date: raw values, 1-day deltas,
+7-day means (over the up-to-7 cached rows before the date within its 30-day
+window), sleep debt, respiratory-rate sigma and both G/A/R verdicts. Rolling
+features use shifted index arithmetic (``searchsorted`` + a rows × 7 lag
+matrix); G/A/R levels use ``np.select`` per signal. Per-date context then
+becomes a row lookup, and readiness over years of history is one call.
+
+Columns fall into two stages:
+  rolling   — depend only on the data (recomputed for changed dates onward)
+  classified — also depend on calibrated thresholds (recomputed when the
+               threshold fingerprint changes)
+
+Functions:
+  compute_wellness_features(df, thresholds, sleep_debt, targets=None)
+  update_feature_table(df, thresholds, sleep_debt, source, changed_from=None, ...)
+  load_feature_table()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# ── Fallback thresholds (used before calibration data is available) ────────────
+_RHR_SPIKE_RED   = 8.0   # bpm above 7d mean → RED
+_RHR_SPIKE_AMBER = 5.0   # bpm above 7d mean → AMBER
+_HRV_DROP_RED    = 20.0  # % drop from 7d mean → RED
+_HRV_DROP_AMBER  = 10.0  # % drop from 7d mean → AMBER
+_RECOVERY_RED    = 34    # Whoop recovery score
+_RECOVERY_AMBER  = 67
+_SLEEP_RED       = 60    # sleep score
+_SLEEP_AMBER     = 80
+_BB_RED          = 30    # Body Battery absolute → RED
+_BB_AMBER        = 45    # Body Battery absolute → AMBER
+
+_WINDOW_DAYS = 30        # context window ending on the target date
+_PRIOR_ROWS  = 7         # rows averaged for 7-day means
+_NS_PER_DAY  = 86_400_000_000_000
+
+_GREEN, _AMBER, _RED = "🟢 GREEN", "🟡 AMBER", "🔴 RED"
+
+ROLLING_COLUMNS: list[str] = [
+    "has_window", "staleness_days",
+    "hrv_rmssd", "resting_hr", "recovery_score", "sleep_score",
+    "sleep_duration_s", "sleep_hours", "body_battery", "strain_score",
+    "avg_stress", "vo2max", "respiratory_rate",
+    "hrv_1d_delta", "hrv_7d_pct", "hrv_7d_mean",
+    "rhr_1d_delta", "rhr_7d_delta", "rhr_7d_mean",
+    "bb_7d_mean", "bb_7d_delta",
+]
+CLASSIFIED_COLUMNS: list[str] = [
+    "rr_sigma", "sleep_debt_7d",
+    "gar", "gar_detail", "gar_overnight", "gar_overnight_detail",
+]
+
+
+def features_path() -> Path:
+    """~/.biosystems/wellness_features.parquet (respects BIOSYSTEMS_HOME env var)."""
+    base = Path(os.environ.get("BIOSYSTEMS_HOME", Path.home() / ".biosystems"))
+    base.mkdir(parents=True, exist_ok=True)
+    return base / "wellness_features.parquet"
+
+
+# ── Rolling stage ─────────────────────────────────────────────────────────────
+
+def _truthy(a: np.ndarray) -> np.ndarray:
+    """Python truthiness of optional floats: present and non-zero."""
+    truthy: np.ndarray = ~np.isnan(a) & (a != 0)
+    return truthy
+
+
+def _first_truthy(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Vectorized ``a or b`` for optional floats."""
+    return np.where(_truthy(a), a, b)
+
+
+def _rolling_features(df: pd.DataFrame, targets: pd.DatetimeIndex) -> pd.DataFrame:
+    """Data-only features for each target date (see module docstring)."""
+    index = pd.DatetimeIndex(df.index).normalize()
+    keep = ~index.duplicated(keep="first")
+    df = df[keep]
+    index = index[keep]
+    order = np.argsort(index.asi8, kind="stable")
+    df = df.iloc[order]
+    days = index[order].as_unit("ns").asi8 // _NS_PER_DAY
+    tdays = pd.DatetimeIndex(targets).normalize().as_unit("ns").asi8 // _NS_PER_DAY
+
+    n, m = len(days), len(tdays)
+    pos = np.searchsorted(days, tdays, side="left")
+    safe_pos = np.clip(pos, 0, max(n - 1, 0))
+    present = (pos < n) & (days[safe_pos] == tdays) if n else np.zeros(m, dtype=bool)
+
+    lo_day = tdays - (_WINDOW_DAYS - 1)
+    lags = pos[:, None] - np.arange(1, _PRIOR_ROWS + 1)[None, :]
+    safe_lags = np.clip(lags, 0, max(n - 1, 0))
+    in_window = (lags >= 0) & (days[safe_lags] >= lo_day[:, None]) if n else np.zeros((m, _PRIOR_ROWS), dtype=bool)
+    has_prev = in_window[:, 0]
+
+    def col(name: str) -> np.ndarray:
+        if name not in df.columns:
+            return np.full(n, np.nan)
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    def today(arr: np.ndarray) -> np.ndarray:
+        return np.where(present, arr[safe_pos], np.nan) if n else np.full(m, np.nan)
+
+    def prev(arr: np.ndarray) -> np.ndarray:
+        return np.where(has_prev, arr[safe_lags[:, 0]], np.nan) if n else np.full(m, np.nan)
+
+    def mean7(arr: np.ndarray) -> np.ndarray:
+        if not n:
+            return np.full(m, np.nan)
+        vals = np.where(in_window, arr[safe_lags], np.nan)
+        counts = (~np.isnan(vals)).sum(axis=1)
+        sums = np.nansum(vals, axis=1)
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    hrv = col("hrv_rmssd")
+    rhr_whoop, rhr_garmin = col("resting_hr_whoop"), col("resting_hr_garmin")
+    bb = col("body_battery")
+
+    hrv_today = today(hrv)
+    rhr_today = _first_truthy(today(rhr_whoop), today(rhr_garmin))
+    sleep_dur = _first_truthy(today(col("sleep_duration_s")), today(col("sleep_duration_s_garmin")))
+    bb_today = today(bb)
+
+    hrv_prev = prev(hrv)
+    rhr_prev = _first_truthy(prev(rhr_whoop), prev(rhr_garmin))
+
+    hrv_7d_mean = mean7(hrv)
+    rhr_7d_mean = _first_truthy(mean7(rhr_whoop), mean7(rhr_garmin))
+    bb_7d_mean = mean7(bb)
+
+    rr_garmin, rr_whoop = today(col("respiratory_rate_garmin")), today(col("respiratory_rate_whoop"))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hrv_7d_pct = np.where(
+            ~np.isnan(hrv_today) & ~np.isnan(hrv_7d_mean) & (hrv_7d_mean != 0),
+            (hrv_today - hrv_7d_mean) / np.abs(hrv_7d_mean) * 100,
+            np.nan,
+        )
+
+    latest = np.where(present, tdays, np.where(has_prev, days[safe_lags[:, 0]] if n else 0, tdays))
+    out = {
+        "has_window": present | has_prev,
+        "staleness_days": (tdays - latest).astype(np.int64),
+        "hrv_rmssd": hrv_today,
+        "resting_hr": rhr_today,
+        "recovery_score": today(col("recovery_score")),
+        "sleep_score": today(col("sleep_score")),
+        "sleep_duration_s": sleep_dur,
+        "sleep_hours": np.where(_truthy(sleep_dur), sleep_dur / 3600, np.nan),
+        "body_battery": bb_today,
+        "strain_score": today(col("strain_score")),
+        "avg_stress": today(col("avg_stress")),
+        "vo2max": today(col("vo2max")),
+        "respiratory_rate": np.where(~np.isnan(rr_garmin), rr_garmin, rr_whoop),
+        "hrv_1d_delta": np.where(_truthy(hrv_today) & _truthy(hrv_prev), hrv_today - hrv_prev, np.nan),
+        "hrv_7d_pct": hrv_7d_pct,
+        "hrv_7d_mean": hrv_7d_mean,
+        "rhr_1d_delta": np.where(_truthy(rhr_today) & _truthy(rhr_prev), rhr_today - rhr_prev, np.nan),
+        "rhr_7d_delta": np.where(_truthy(rhr_today) & _truthy(rhr_7d_mean), rhr_today - rhr_7d_mean, np.nan),
+        "rhr_7d_mean": rhr_7d_mean,
+        "bb_7d_mean": bb_7d_mean,
+        "bb_7d_delta": np.where(~np.isnan(bb_today) & _truthy(bb_7d_mean), bb_today - bb_7d_mean, np.nan),
+    }
+    rolling: pd.DataFrame = pd.DataFrame(out, index=pd.DatetimeIndex(targets).normalize())
+    return rolling
+
+
+# ── Classification stage ──────────────────────────────────────────────────────
+
+def _levels(red: np.ndarray, amber: np.ndarray) -> np.ndarray:
+    """0 = none, 1 = amber, 2 = red (NaN values never trigger)."""
+    return np.select([red, amber], [2, 1], 0)
+
+
+def _messages(level: np.ndarray, fmt_red: str, fmt_amber: str, *values: np.ndarray) -> np.ndarray:
+    """Signal text for flagged rows ('' elsewhere); only flagged rows are formatted."""
+    out = np.full(len(level), "", dtype=object)
+    for i in np.flatnonzero(level):
+        fmt = fmt_red if level[i] == 2 else fmt_amber
+        out[i] = fmt.format(*(v[i] for v in values))
+    return out
+
+
+def _verdict(
+    signals: list[tuple[np.ndarray, np.ndarray]], stable: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """Combine per-signal (level, message) arrays into (verdict, detail) in signal order."""
+    n = len(signals[0][0]) if signals else 0
+    worst = np.zeros(n, dtype=np.int64)
+    for level, _ in signals:
+        worst = np.maximum(worst, level)
+    detail = np.full(n, "", dtype=object)
+    for level, msg in signals:
+        hit = (level == worst) & (worst > 0)
+        detail = np.where(hit, np.where(detail == "", msg, detail + "; " + msg), detail)
+    verdict = np.select([worst == 2, worst == 1], [_RED, _AMBER], _GREEN).astype(object)
+    detail = np.where(worst == 0, stable, detail)
+    return verdict, detail
+
+
+def _classify(
+    rolling: pd.DataFrame,
+    thresholds: dict[str, Any],
+    sleep_debt: pd.Series | None,
+) -> pd.DataFrame:
+    """Threshold-dependent columns (rr_sigma, sleep debt, both G/A/R verdicts)."""
+    hrv_drop_red   = thresholds.get("hrv_pct_drop_red",   _HRV_DROP_RED)
+    hrv_drop_amber = thresholds.get("hrv_pct_drop_amber", _HRV_DROP_AMBER)
+    rhr_spike_red  = thresholds.get("rhr_spike_red",      _RHR_SPIKE_RED)
+    rhr_spike_amb  = thresholds.get("rhr_spike_amber",    _RHR_SPIKE_AMBER)
+    bb_red         = thresholds.get("body_battery", {}).get("red",   _BB_RED)
+    bb_amber       = thresholds.get("body_battery", {}).get("amber", _BB_AMBER)
+    str_red        = thresholds.get("avg_stress",   {}).get("red",   55.0)
+    str_amber      = thresholds.get("avg_stress",   {}).get("amber", 40.0)
+    rr_thresholds  = thresholds.get("respiratory_rate", {})
+
+    def arr(name: str) -> np.ndarray:
+        return rolling[name].to_numpy(dtype="float64", na_value=np.nan)
+
+    hrv_pct, rhr_delta = arr("hrv_7d_pct"), arr("rhr_7d_delta")
+    recovery, sleep = arr("recovery_score"), arr("sleep_score")
+    bb, stress, rr = arr("body_battery"), arr("avg_stress"), arr("respiratory_rate")
+
+    rr_sigma = np.full(len(rolling), np.nan)
+    rr_mean, rr_std = rr_thresholds.get("mean"), rr_thresholds.get("std")
+    if rr_thresholds and rr_mean and rr_std and rr_std > 0:
+        rr_sigma = (rr - rr_mean) / rr_std
+
+    with np.errstate(invalid="ignore"):
+        hrv_lvl = _levels(hrv_pct < -hrv_drop_red, hrv_pct < -hrv_drop_amber)
+        rhr_lvl = _levels(rhr_delta > rhr_spike_red, rhr_delta > rhr_spike_amb)
+        rec_lvl = _levels(recovery < _RECOVERY_RED, recovery < _RECOVERY_AMBER)
+        slp_lvl = _levels(sleep < _SLEEP_RED, sleep < _SLEEP_AMBER)
+        bb_lvl  = _levels(bb < bb_red, bb < bb_amber)
+        str_lvl = _levels(stress > str_red, stress > str_amber)
+        rr_red, rr_amber = rr_thresholds.get("red"), rr_thresholds.get("amber")
+        rr_lvl = np.select(
+            [
+                (rr >= rr_red) if (rr_thresholds and rr_red) else np.zeros(len(rr), dtype=bool),
+                (rr >= rr_amber) if (rr_thresholds and rr_amber) else np.zeros(len(rr), dtype=bool),
+            ],
+            [2, 1],
+            0,
+        )
+
+    hrv_msg = _messages(hrv_lvl, "HRV {:+.0f}% vs 7d mean", "HRV {:+.0f}% vs 7d mean", hrv_pct)
+    rhr_msg = _messages(rhr_lvl, "RHR +{:.0f} bpm vs 7d mean", "RHR +{:.0f} bpm vs 7d mean", rhr_delta)
+    rec_msg = _messages(rec_lvl, "Recovery {:.0f}%", "Recovery {:.0f}%", recovery)
+    rr_msg  = _messages(
+        rr_lvl, "Resp rate {:.1f} brpm (+{:.1f}σ)", "Resp rate {:.1f} brpm (+{:.1f}σ)", rr, np.round(rr_sigma, 2)
+    )
+
+    gar, gar_detail = _verdict([
+        (hrv_lvl, hrv_msg),
+        (rhr_lvl, rhr_msg),
+        (rec_lvl, rec_msg),
+        (slp_lvl, _messages(slp_lvl, "Sleep {:.0f}%", "Sleep {:.0f}%", sleep)),
+        (bb_lvl, _messages(bb_lvl, "Body Battery {:.0f}% (low)", "Body Battery {:.0f}% (below norm)", bb)),
+        (str_lvl, _messages(str_lvl, "Stress {:.0f}", "Stress {:.0f}", stress)),
+        (rr_lvl, rr_msg),
+    ], "all signals stable")
+
+    # Overnight-only: RHR, sleep, HRV, recovery, resp rate (no daily averages)
+    gar_on, gar_on_detail = _verdict([
+        (hrv_lvl, hrv_msg),
+        (rhr_lvl, rhr_msg),
+        (rec_lvl, rec_msg),
+        (slp_lvl, _messages(slp_lvl, "Sleep score {:.0f}%", "Sleep score {:.0f}%", sleep)),
+        (rr_lvl, rr_msg),
+    ], "all overnight signals stable")
+
+    if sleep_debt is not None and not sleep_debt.empty:
+        debt = sleep_debt.copy()
+        debt.index = pd.DatetimeIndex(debt.index).normalize()
+        debt = debt[~debt.index.duplicated(keep="last")]
+        debt_7d = debt.reindex(rolling.index).to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        debt_7d = np.full(len(rolling), np.nan)
+    classified: pd.DataFrame = pd.DataFrame({
+        "rr_sigma": np.where(np.isnan(rr), np.nan, rr_sigma),
+        "sleep_debt_7d": debt_7d,
+        "gar": gar,
+        "gar_detail": gar_detail,
+        "gar_overnight": gar_on,
+        "gar_overnight_detail": gar_on_detail,
+    }, index=rolling.index)
+    return classified
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def compute_wellness_features(
+    df: pd.DataFrame,
+    thresholds: dict[str, Any],
+    sleep_debt: pd.Series | None = None,
+    targets: pd.DatetimeIndex | list[Any] | None = None,
+) -> pd.DataFrame:
+    """
+    Compute readiness features for many dates in one vectorized pass.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Date-indexed wellness frame (as loaded from the wellness cache).
+    thresholds : dict
+        Output of ``calibrate_thresholds(df)``.
+    sleep_debt : pd.Series, optional
+        Output of ``compute_sleep_debt(df, ...)``.
+    targets : dates, optional
+        Dates to compute (need not be in ``df``). Defaults to every calendar
+        day from the first to the last cached date, gaps included.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by normalized target date with ``ROLLING_COLUMNS`` +
+        ``CLASSIFIED_COLUMNS`` (values unrounded). Rows with ``has_window``
+        False have no data in their 30-day window.
+    """
+    if targets is None:
+        targets = _calendar(df)
+    index = pd.DatetimeIndex(pd.to_datetime(list(targets) if not isinstance(targets, pd.Index) else targets))
+    rolling = _rolling_features(df, index)
+    return pd.concat([rolling, _classify(rolling, thresholds, sleep_debt)], axis=1)
+
+
+def _calendar(df: pd.DataFrame) -> pd.DatetimeIndex:
+    """Every day from the first to the last cached date."""
+    index: pd.DatetimeIndex = pd.DatetimeIndex(df.index).normalize()
+    if index.empty:
+        return index
+    return pd.date_range(index.min(), index.max(), freq="D")
+
+
+def thresholds_fingerprint(thresholds: dict[str, Any]) -> str:
+    """Stable string identifying a threshold set (stored with the table)."""
+    return json.dumps(thresholds, sort_keys=True, default=str)
+
+
+def load_feature_table(
+    path: Path | None = None,
+    dates: list[Any] | None = None,
+) -> pd.DataFrame | None:
+    """
+    Read the persisted feature table (None if absent or unreadable).
+
+    With *dates*, only those rows are read (the filter is pushed down to
+    the parquet reader on the stored ``date`` column).
+    """
+    p = path or features_path()
+    if not p.exists():
+        return None
+    try:
+        if dates is None:
+            table = pd.read_parquet(p)
+        else:
+            wanted = [pd.Timestamp(d).normalize().to_pydatetime() for d in dates]
+            table = pd.read_parquet(p, filters=[("date", "in", wanted)])
+    except Exception as exc:
+        log.warning("Could not read wellness feature table (%s): %s", p, exc)
+        return None
+    table.index = pd.DatetimeIndex(table.index).normalize().rename(None)
+    return table
+
+
+def _write_table(table: pd.DataFrame, path: Path) -> None:
+    """Atomically replace the feature table (temp file + rename)."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        table.rename_axis("date").to_parquet(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def update_feature_table(
+    df: pd.DataFrame,
+    thresholds: dict[str, Any],
+    sleep_debt: pd.Series | None,
+    source: str,
+    changed_from: pd.Timestamp | None = None,
+    previous_source: str | None = None,
+    path: Path | None = None,
+) -> pd.DataFrame:
+    """
+    Bring the persisted feature table up to date with ``df`` and write it.
+
+    Rows before ``changed_from`` keep their rolling features (a date's
+    features only look back), so only dates from ``changed_from`` onward are
+    recomputed. Classified columns are recomputed for those dates, or for
+    every date if the threshold fingerprint changed. The table is rebuilt in
+    full when there is no ``changed_from``, or when the existing table was
+    not derived from ``previous_source`` (the file version before this
+    change), since then its older rows cannot be trusted either.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The complete, current wellness frame.
+    source : str
+        Signature of the wellness file the table was derived from; stored
+        in the table's attrs so readers can detect a stale table.
+
+    Returns
+    -------
+    pd.DataFrame
+        The updated table.
+    """
+    p = path or features_path()
+    fingerprint = thresholds_fingerprint(thresholds)
+    all_dates = _calendar(df)
+    existing = load_feature_table(p) if changed_from is not None else None
+
+    if (
+        existing is None
+        or changed_from is None
+        or existing.attrs.get("source") != previous_source
+        or not set(ROLLING_COLUMNS + CLASSIFIED_COLUMNS).issubset(existing.columns)
+    ):
+        table = compute_wellness_features(df, thresholds, sleep_debt, targets=all_dates)
+    else:
+        cut = pd.Timestamp(changed_from).normalize()
+        kept = existing[(existing.index < cut) & existing.index.isin(all_dates)]
+        fresh = _rolling_features(df, all_dates[all_dates >= cut])
+        rolling = pd.concat([kept[ROLLING_COLUMNS], fresh]).sort_index()
+        if existing.attrs.get("thresholds") == fingerprint:
+            classified = pd.concat([kept[CLASSIFIED_COLUMNS], _classify(fresh, thresholds, sleep_debt)]).sort_index()
+        else:
+            classified = _classify(rolling, thresholds, sleep_debt)
+        table = pd.concat([rolling, classified], axis=1)
+
+    table.attrs = {"source": source, "thresholds": fingerprint}
+    try:
+        _write_table(table, p)
+    except Exception as exc:
+        log.warning("Could not write wellness feature table (%s): %s", p, exc)
+    return table
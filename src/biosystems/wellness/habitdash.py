@@ -5,25 +5,132 @@ HabitDash API Client
 Fetches wellness telemetry (Whoop + Garmin) from the HabitDash aggregation API.
 
 Requires HABITDASH_API_KEY environment variable.
-Rate limit: ~4 req/min → 15s inter-request delay (matches old cultivation sync).
-Retry logic: up to 3 attempts on 429 with exponential backoff.
+Set ``HABITDASH_API_ROOT`` (e.g. ``http://127.0.0.1:8123``) or pass
+``base_url=`` to target a local stand-in (see
+``biosystems.testing.habitdash_standin``); ``/v1`` is resolved beneath it.
+
+Rate limiting: every request draws from a token bucket shared by the
+client's worker threads. The bucket is refilled from the
+``x-ratelimit-remaining`` / ``x-ratelimit-reset`` headers of each response,
+so a sync spends the window's whole budget concurrently and then waits for
+the reset. Until the server has reported a budget (or if it never does),
+requests are paced one per ``_REQUEST_DELAY`` (15s, matches old cultivation
+sync). Retry logic: up to 3 attempts on 429 / transport errors.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 log = logging.getLogger(__name__)
 
 BASE_URL = "https://api.habitdash.com/v1"
-_REQUEST_DELAY = 15.0  # seconds between requests (matches old cultivation sync)
+_REQUEST_DELAY = 15.0  # seconds between requests when no budget is reported
 _MAX_RETRIES   = 3
-_RETRY_WAIT    = 60.0  # seconds to wait after a 429
+_RETRY_WAIT    = 60.0  # seconds to wait after a 429 without a reset header
+_MAX_WORKERS   = 4     # concurrent metric requests
+_CHUNK_DAYS    = 90    # longest date range requested in one call
+
+
+def _api_root(base_url: str | None = None) -> str:
+    """Return the ``/v1`` base URL, honouring *base_url* then ``HABITDASH_API_ROOT``."""
+    root = base_url or os.environ.get("HABITDASH_API_ROOT")
+    if not root:
+        return BASE_URL
+    return f"{root.rstrip('/')}/v1"
+
+
+def _date_chunks(date_start: str, date_end: str, days: int = _CHUNK_DAYS) -> list[tuple[str, str]]:
+    """Split an inclusive YYYY-MM-DD range into consecutive spans of at most *days*."""
+    start, end = date.fromisoformat(date_start), date.fromisoformat(date_end)
+    chunks: list[tuple[str, str]] = []
+    while start <= end:
+        stop = min(start + timedelta(days=days - 1), end)
+        chunks.append((start.isoformat(), stop.isoformat()))
+        start = stop + timedelta(days=1)
+    return chunks
+
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket driven by HabitDash's rate-limit headers.
+
+    ``acquire()`` blocks until a request may be sent; every acquire must be
+    paired with ``update()`` once its response (or failure) is known.
+    A response reporting ``remaining`` / ``reset`` sets the bucket to the
+    remaining budget minus requests still in flight and schedules the
+    refill; when the window resets a single probe request is let through
+    and its headers open the next window. Without headers the bucket
+    degrades to one request per *interval* seconds.
+    """
+
+    def __init__(self, interval: float = _REQUEST_DELAY) -> None:
+        self._cond = threading.Condition()
+        self._interval = interval
+        self._tokens = 1.0
+        self._refill_at = 0.0              # monotonic time the next probe is allowed
+        self._window_end: float | None = None
+        self._in_flight = 0
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._tokens < 1 and now >= self._refill_at:
+                    self._tokens = 1.0
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    if self._tokens < 1 and now >= self._refill_at:
+                        self._refill_at = now + self._interval
+                    return
+                self._cond.wait(max(self._refill_at - now, 0.001))
+
+    def update(self, remaining: int | None = None, reset_s: float | None = None) -> None:
+        """Release an in-flight slot and fold in the response's budget, if reported."""
+        with self._cond:
+            self._in_flight = max(self._in_flight - 1, 0)
+            if remaining is not None and reset_s is not None:
+                now = time.monotonic()
+                end = now + max(reset_s, 0.0)
+                budget = max(remaining - self._in_flight, 0)
+                if self._window_end is None or now >= self._window_end or end > self._window_end + 0.5:
+                    self._tokens = float(budget)   # a new window opened
+                else:
+                    self._tokens = min(self._tokens, float(budget))
+                self._window_end = end
+                self._refill_at = end
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for *seconds* (429 without a usable reset header)."""
+        with self._cond:
+            self._tokens = 0.0
+            self._refill_at = max(self._refill_at, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+
+def _rate_headers(resp: requests.Response) -> tuple[int | None, float | None]:
+    """(remaining, reset seconds) from a response, None where absent or unparsable."""
+    try:
+        remaining = resp.headers.get("x-ratelimit-remaining")
+        reset = resp.headers.get("x-ratelimit-reset")
+        return (
+            int(float(remaining)) if remaining is not None else None,
+            min(float(reset), 3600.0) if reset is not None else None,
+        )
+    except ValueError:
+        return None, None
 
 
 # ── Field ID registry ────────────────────────────────────────────────────────
@@ -77,16 +184,39 @@ COLUMN_MAP: dict[tuple[str, str], str] = {
 
 
 class HabitDashClient:
-    """Thin wrapper around the HabitDash REST API."""
+    """
+    Thin wrapper around the HabitDash REST API.
 
-    def __init__(self, api_key: str | None = None) -> None:
+    Parameters
+    ----------
+    api_key : str, optional
+        Falls back to the HABITDASH_API_KEY env var.
+    base_url : str, optional
+        Server root (``/v1`` is appended); defaults to ``HABITDASH_API_ROOT``
+        or the public API.
+    max_workers : int
+        Concurrent requests issued by ``fetch_all_metrics``.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        max_workers: int = _MAX_WORKERS,
+    ) -> None:
         key = api_key or os.environ.get("HABITDASH_API_KEY", "")
         if not key:
             raise ValueError(
                 "HABITDASH_API_KEY not set. "
                 "Export it or pass api_key= explicitly."
             )
+        self._base_url = _api_root(base_url)
+        self._max_workers = max(int(max_workers), 1)
+        self._limiter = _RateLimiter()
         self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self._max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         self._session.headers.update({
             "accept":    "application/json",
             "x-api-key": key,
@@ -94,38 +224,53 @@ class HabitDashClient:
 
     def _get(self, endpoint: str, params: dict[str, Any] | None = None) -> Any:
         """GET request with header-aware rate limiting and 429 retry."""
-        url = f"{BASE_URL}/{endpoint}/"
+        url = f"{self._base_url}/{endpoint}/"
         for attempt in range(1, _MAX_RETRIES + 1):
-            time.sleep(_REQUEST_DELAY)
+            self._limiter.acquire()
             try:
                 resp = self._session.get(url, params=params, timeout=15)
+            except requests.exceptions.RequestException as exc:
+                self._limiter.update()
+                log.error("Request failed (%s): %s", url, exc)
+                if attempt == _MAX_RETRIES:
+                    return None
+                continue
 
-                # Honor rate-limit headers proactively
-                remaining = resp.headers.get("x-ratelimit-remaining")
-                reset_secs = resp.headers.get("x-ratelimit-reset")
-                if remaining is not None and int(remaining) == 0 and reset_secs is not None:
-                    wait = min(int(reset_secs) + 1, 3600)
-                    log.warning("Rate limit exhausted — waiting %ds for reset", wait)
-                    time.sleep(wait)
-
-                if resp.status_code == 429:
-                    wait = _RETRY_WAIT * attempt
-                    log.warning("429 rate-limit on %s — waiting %.0fs (attempt %d/%d)",
-                                endpoint, wait, attempt, _MAX_RETRIES)
-                    time.sleep(wait)
-                    continue
+            remaining, reset_secs = _rate_headers(resp)
+            self._limiter.update(remaining, reset_secs)
+            if resp.status_code == 429:
+                wait = reset_secs if reset_secs is not None else _RETRY_WAIT * attempt
+                self._limiter.pause(wait)
+                log.warning("429 rate-limit on %s — waiting %.0fs (attempt %d/%d)",
+                            endpoint, wait, attempt, _MAX_RETRIES)
+                continue
+            try:
                 resp.raise_for_status()
                 data = resp.json()
-                # HabitDash may wrap results in {"results": [...]} or return a plain list
-                if isinstance(data, dict):
-                    return data.get("results", data)
-                return data
-            except requests.exceptions.RequestException as exc:
+            except (requests.exceptions.RequestException, ValueError) as exc:
                 log.error("Request failed (%s): %s", url, exc)
                 if attempt == _MAX_RETRIES:
                     return None
+                continue
+            # HabitDash may wrap results in {"results": [...]} or return a plain list
+            if isinstance(data, dict):
+                return data.get("results", data)
+            return data
         return None
 
+    def _fetch_range(self, field_id: int, date_start: str, date_end: str) -> list[dict[str, Any]] | None:
+        """One request for one field over one (already chunked) date range; None on failure."""
+        result = self._get("data", params={
+            "field_id":   field_id,
+            "date_start": date_start,
+            "date_end":   date_end,
+        })
+        if result is None:
+            return None
+        if isinstance(result, list):
+            return result
+        return []
+
     def fetch_metric(
         self,
         source: str,
@@ -136,6 +281,8 @@ class HabitDashClient:
         """
         Fetch a single metric for a date range.
 
+        Ranges longer than ``_CHUNK_DAYS`` are requested in consecutive chunks.
+
         Parameters
         ----------
         source : str
@@ -154,16 +301,52 @@ class HabitDashClient:
         if not field_id:
             log.warning("No field ID for %s/%s — skipping", source, field_key)
             return []
-        result = self._get("data", params={
-            "field_id":   field_id,
-            "date_start": date_start,
-            "date_end":   date_end,
-        })
-        if not result:
-            return []
-        if isinstance(result, list):
-            return result
-        return []
+        rows: list[dict[str, Any]] = []
+        for chunk_start, chunk_end in _date_chunks(date_start, date_end):
+            rows.extend(self._fetch_range(field_id, chunk_start, chunk_end) or [])
+        return rows
+
+    def fetch_metrics(
+        self,
+        ranges: Mapping[tuple[str, str], tuple[str, str]],
+    ) -> dict[tuple[str, str], list[dict[str, Any]] | None]:
+        """
+        Fetch several metrics, each over its own date range.
+
+        Parameters
+        ----------
+        ranges : mapping
+            (source, field_key) → (date_start, date_end), YYYY-MM-DD inclusive.
+
+        Returns
+        -------
+        dict
+            (source, field_key) → rows as from ``fetch_metric``, or None if
+            any request for that metric failed. Unknown fields are omitted.
+
+        Each (metric, date chunk) is one request; requests run on
+        ``max_workers`` threads under the shared rate limiter.
+        """
+        jobs: list[tuple[tuple[str, str], int, str, str]] = []
+        out: dict[tuple[str, str], list[dict[str, Any]] | None] = {}
+        for key, (date_start, date_end) in ranges.items():
+            field_id = FIELD_IDS.get(key[0], {}).get(key[1])
+            if not field_id:
+                log.warning("No field ID for %s/%s — skipping", *key)
+                continue
+            out[key] = []
+            jobs.extend((key, field_id, a, b) for a, b in _date_chunks(date_start, date_end))
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            results = list(pool.map(lambda job: self._fetch_range(*job[1:]), jobs))
+
+        for (key, _, _, _), rows in zip(jobs, results):
+            acc = out[key]
+            if rows is None or acc is None:
+                out[key] = None
+            else:
+                acc.extend(rows)
+        return out
 
     def fetch_all_metrics(
         self,
@@ -173,19 +356,31 @@ class HabitDashClient:
         """
         Fetch every metric in FIELD_IDS for the given date range.
 
-        Returns flat list of {"date", "column", "value"} records.
+        Returns flat list of {"date", "column", "value"} records, in
+        FIELD_IDS order.
         """
-        records: list[dict[str, Any]] = []
-        for source, fields in FIELD_IDS.items():
-            for field_key in fields:
-                col = COLUMN_MAP.get((source, field_key))
-                if not col:
-                    continue
-                rows = self.fetch_metric(source, field_key, date_start, date_end)
-                for row in rows:
-                    date_val = row.get("date")
-                    value    = row.get("value")
-                    if date_val is not None and value is not None:
-                        records.append({"date": date_val, "column": col, "value": value})
-                        log.debug("  %s %s %s = %s", source, field_key, date_val, value)
-        return records
+        ranges = {
+            (source, field_key): (date_start, date_end)
+            for source, fields in FIELD_IDS.items()
+            for field_key in fields
+            if (source, field_key) in COLUMN_MAP
+        }
+        return metric_records(self.fetch_metrics(ranges))
+
+
+def metric_records(
+    results: Mapping[tuple[str, str], list[dict[str, Any]] | None],
+) -> list[dict[str, Any]]:
+    """Flatten ``fetch_metrics`` output to {"date", "column", "value"} records."""
+    records: list[dict[str, Any]] = []
+    for (source, field_key), rows in results.items():
+        col = COLUMN_MAP.get((source, field_key))
+        if not col or not rows:
+            continue
+        for row in rows:
+            date_val = row.get("date")
+            value    = row.get("value")
+            if date_val is not None and value is not None:
+                records.append({"date": date_val, "column": col, "value": value})
+                log.debug("  %s %s %s = %s", source, field_key, date_val, value)
+    return records
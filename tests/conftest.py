@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_biosystems_home(tmp_path_factory, monkeypatch):
+    """Keep every test off the real ~/.biosystems (tests may override it)."""
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path_factory.mktemp("biosystems_home")))
@@ -0,0 +1,182 @@
+"""
+Tests for src/biosystems/api.py
+
+Covers: each API function returns exactly what the matching CLI command
+prints with --json (history analytics and the Strava report, with Strava
+HTTP replaced by in-memory fakes), APIError carrying the CLI's message, and
+run_report persisting the run unless asked not to, and the API loading
+without the CLI.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+import biosystems.analytics.history as hist_mod
+import biosystems.ingestion.strava as strava_mod
+from biosystems import api
+from biosystems.cli import app
+
+runner = CliRunner()
+
+
+def _summary(activity_id, start_date, name="Easy Run"):
+    return {
+        "id": activity_id,
+        "sport_type": "Run",
+        "name": name,
+        "start_date": start_date,
+        "start_date_local": start_date,
+        "distance": 5000.0,
+        "moving_time": 1800,
+    }
+
+
+def _fake_streams(activity_id, access_token=None):
+    n = 1800
+    rng = np.random.default_rng(activity_id)
+    streams = {
+        "time": list(range(n)),
+        "distance": list(np.cumsum(np.full(n, 2.8))),
+        "heartrate": list(145 + rng.integers(-3, 4, n)),
+        "cadence": list(np.full(n, 85)),
+        "velocity_smooth": list(np.full(n, 2.8)),
+        "altitude": list(np.full(n, 100.0)),
+    }
+    df = strava_mod.parse_strava_streams(streams, "2025-06-01T07:00:00Z", activity_id)
+    return df, {"best_efforts": []}
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+    monkeypatch.setattr(strava_mod, "_refresh_access_token", lambda: "tok")
+    monkeypatch.setattr(strava_mod, "fetch_activity_streams", _fake_streams)
+    monkeypatch.setattr(
+        strava_mod, "fetch_recent_runs",
+        lambda n=5, access_token=None: [_summary(7, "2025-06-01T07:00:00Z"), _summary(6, "2025-05-30T07:00:00Z")][:n],
+    )
+    yield tmp_path
+
+
+@pytest.fixture
+def seeded_history():
+    hist_mod.append_runs([
+        {"date": f"2025-03-{day:02d}", "hrTSS": 40.0 + day, "distance_km": 2.0 + day % 5, "ef": 0.017 + day / 10_000,
+         "decoupling_pct": 1.0 + day % 4, "avg_hr": 148.0, "avg_pace_min_per_km": 6.0 - day / 100,
+         "source": "biosystems_strava" if day % 2 else "fit", "strava_activity_id": day,
+         "strava_efforts": {"5K": 1600 - day, "1K": 300 + day % 3}}
+        for day in range(1, 21)
+    ])
+
+
+def _cli_json(*args):
+    result = runner.invoke(app, list(args))
+    assert result.exit_code == 0, result.output
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize(
+    "args, call",
+    [
+        (["top", "--json"], lambda: api.top()),
+        (["top", "--by", "pace", "-n", "5", "--since", "2025-03-10", "--json"],
+         lambda: api.top(by="pace", count=5, since="2025-03-10")),
+        (["summary", "--json"], lambda: api.summary()),
+        (["summary", "--group", "week", "--source", "fit", "--min-dist", "4", "--json"],
+         lambda: api.summary(group="week", source="fit", min_dist=4)),
+        (["efforts", "--json"], lambda: api.efforts()),
+        (["efforts", "-d", "5K", "--since", "2025-03-15", "--json"], lambda: api.efforts(since="2025-03-15", distances=["5K"])),
+        (["trend", "--json"], lambda: api.trend()),
+        (["trend", "--no-pmc", "-w", "5", "--json"], lambda: api.trend(pmc=False, window=5)),
+    ],
+)
+def test_analytics_match_cli_json(args, call, seeded_history):
+    assert call() == _cli_json(*args)
+
+
+def test_history_filters():
+    hist_mod.append_runs([
+        {"date": "2025-03-01", "distance_km": 0.8, "ef": 0.02, "strava_activity_id": 1},
+        {"date": "2025-03-02", "distance_km": None, "ef": 0.02, "strava_activity_id": 2},
+        {"date": "2025-03-03", "distance_km": 9.0, "source": "fit", "strava_activity_id": 3},
+    ])
+    assert len(api.history()) == 3
+    assert [e["strava_activity_id"] for e in api.history(min_dist=1.0)] == [3]
+    assert [e["strava_activity_id"] for e in api.history(since="2025-03-02", source="fit")] == [3]
+
+
+def test_trend_without_history_raises_cli_message():
+    with pytest.raises(api.APIError, match="No run history found"):
+        api.trend()
+    result = runner.invoke(app, ["trend", "--json"])
+    assert result.exit_code == 1
+    assert "No run history found" in result.stderr
+
+
+def test_list_runs_matches_cli_json():
+    assert api.list_runs(1) == _cli_json("strava", "--list", "--count", "1")
+    assert api.list_runs()[0] == {
+        "id": 7, "date": "2025-06-01", "name": "Easy Run",
+        "distance_km": 5.0, "moving_time_min": 30.0, "sport_type": "Run",
+    }
+    listing = runner.invoke(app, ["strava", "--list", "--no-json"])
+    assert listing.exit_code == 0, listing.output
+    assert "  7  2025-06-01  Easy Run" in listing.stdout
+    assert "5.0km  30min" in listing.stdout
+
+
+def test_run_report_matches_cli_json_and_persists():
+    report = api.run_report(42, persist=False)
+    assert hist_mod.load_history() == []
+    assert report == json.loads(json.dumps(report))  # plain JSON types throughout
+
+    assert report == _cli_json("strava", "42", "--json")
+    assert [e["strava_activity_id"] for e in hist_mod.load_history()] == [42]
+
+    api.run_report(43)
+    assert [e["strava_activity_id"] for e in hist_mod.load_history()] == [42, 43]
+
+
+def test_run_report_errors_carry_cli_message(monkeypatch):
+    def failing_streams(activity_id, access_token=None):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(strava_mod, "fetch_activity_streams", failing_streams)
+    with pytest.raises(api.APIError, match="Failed to fetch streams: boom"):
+        api.run_report(42)
+    result = runner.invoke(app, ["strava", "42"])
+    assert result.exit_code == 1
+    assert "Failed to fetch streams: boom" in result.stderr
+
+
+def test_run_report_survives_history_write_failure(monkeypatch):
+    def failing_append(entry, strava_efforts=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(hist_mod, "append_run", failing_append)
+    report = api.run_report(42)
+    assert report["run_only"]["distance_km"] > 0
+
+    result = runner.invoke(app, ["strava", "42", "--json"])
+    assert result.exit_code == 2
+    assert json.loads(result.stdout) == report
+
+
+def test_api_does_not_import_cli():
+    code = (
+        "import sys, biosystems.api, biosystems._pipeline; "
+        "print(sorted(m for m in ('typer', 'biosystems.cli') if m in sys.modules))"
+    )
+    src = Path(__file__).resolve().parents[1] / "src"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env={"PYTHONPATH": str(src)}, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,131 @@
+"""
+Tests for the history analytics commands: ``summary``, ``top``, ``efforts``
+and ``trend``.
+
+History is seeded into a temp BIOSYSTEMS_HOME and the commands are run
+through Typer's CliRunner with JSON output, once on the per-entry path and
+once with the history read as frames (``FRAME_MIN_BYTES`` forced to 0).
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+import biosystems.analytics.history as hist_mod
+from biosystems import api
+from biosystems.cli import app
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True, params=[False, True], ids=["entries", "frames"])
+def seeded_history(request, tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+    if request.param:
+        monkeypatch.setattr(hist_mod, "FRAME_MIN_BYTES", 0)
+    hist_mod.append_runs([
+        {"date": "2025-03-30", "hrTSS": 50.0, "distance_km": 8.0, "ef": 0.018, "decoupling_pct": 4.0,
+         "avg_hr": 150.0, "avg_pace_min_per_km": 6.0, "strava_activity_id": 1,
+         "strava_efforts": {"5K": 1600, "1K": 300}},
+        {"date": "2025-03-31", "hrTSS": 30.0, "distance_km": 5.0, "ef": 0, "avg_hr": 140.0,
+         "avg_pace_min_per_km": 6.5, "strava_activity_id": 2, "strava_efforts": {"5K": 1550}},
+        {"date": "2025-04-02", "hrTSS": 70.0, "distance_km": 14.0, "ef": 0.020, "decoupling_pct": 2.0,
+         "avg_hr": 155.0, "avg_pace_min_per_km": 5.5, "strava_activity_id": 3,
+         "activity_name": "Long Run", "strava_efforts": {"5K": 1500, "1K": 310}},
+        {"date": "2025-04-03", "hrTSS": 10.0, "distance_km": 2.0, "ef": 0.025, "strava_activity_id": 4},
+    ])
+    yield tmp_path
+
+
+def _json(args):
+    result = runner.invoke(app, [*args, "--json"])
+    assert result.exit_code == 0, result.output
+    return json.loads(result.output)
+
+
+def test_summary_groups_by_month():
+    rows = _json(["summary"])
+    assert rows == [
+        {"period": "2025-03", "run_count": 2, "ef_mean": 0.018, "ef_best": 0.018, "decoupling_mean": 4.0,
+         "avg_hr": 145.0, "avg_pace_min_per_km": 6.25, "total_tss": 80.0},
+        {"period": "2025-04", "run_count": 1, "ef_mean": 0.02, "ef_best": 0.02, "decoupling_mean": 2.0,
+         "avg_hr": 155.0, "avg_pace_min_per_km": 5.5, "total_tss": 70.0},
+    ]
+
+
+def test_summary_groups_by_iso_week_and_filters():
+    rows = _json(["summary", "--group", "week", "--min-dist", "0"])
+    assert [(r["period"], r["run_count"]) for r in rows] == [("2025-W13", 1), ("2025-W14", 3)]
+    assert rows[1]["ef_best"] == 0.025
+
+    assert _json(["summary", "--group", "all", "--since", "2025-03-31"])[0]["run_count"] == 2
+    result = runner.invoke(app, ["summary", "--since", "2026-01-01"])
+    assert "No entries match" in result.output
+
+
+def test_top_ranks_and_returns_full_entries():
+    by_ef = _json(["top", "--by", "ef"])
+    assert [e["strava_activity_id"] for e in by_ef] == [3, 1, 2]
+    assert by_ef[0]["strava_efforts"] == {"5K": 1500, "1K": 310}
+
+    by_pace = _json(["top", "--by", "pace", "-n", "2"])
+    assert [e["avg_pace_min_per_km"] for e in by_pace] == [5.5, 6.0]
+
+    result = runner.invoke(app, ["top", "--by", "decoupling"])
+    assert result.exit_code == 0
+    assert "Long Run" in result.output
+
+
+def test_efforts_first_and_best_per_distance():
+    rows = _json(["efforts", "--distances", "5K,1K,10K"])
+    assert [r["distance"] for r in rows] == ["5K", "1K"]
+    five_k = rows[0]
+    assert (five_k["first_date"], five_k["first_elapsed_s"]) == ("2025-03-30", 1600)
+    assert (five_k["best_date"], five_k["best_elapsed_s"]) == ("2025-04-02", 1500)
+    assert five_k["improvement_s"] == 100
+    assert five_k["recording_count"] == 3
+    assert five_k["best_pace_min_per_km"] == 5.0
+    assert rows[1]["improvement_s"] is None  # first recording is still the best
+
+    assert _json(["efforts", "--since", "2025-04-01", "-d", "5K"])[0]["improvement_s"] is None
+
+
+def test_trend_pmc_and_rolling():
+    output = _json(["trend"])
+    assert [d["date"] for d in output["pmc"]] == ["2025-03-30", "2025-03-31", "2025-04-01", "2025-04-02", "2025-04-03"]
+    assert output["pmc"][2]["hrTSS"] is None  # rest day
+    assert output["pmc"][3]["activity_name"] == "Long Run"
+    assert [r["ef_roll"] for r in output["rolling"]] == [None, None, 0.01267, 0.01575]
+    assert output["summary"]["history_runs"] == 4
+
+
+def _analytics(monkeypatch, min_bytes):
+    monkeypatch.setattr(hist_mod, "FRAME_MIN_BYTES", min_bytes)
+    return (
+        api.trend(window=3),
+        api.top(by="pace", count=10, min_dist=0),
+        api.top(by="tss", count=10, min_dist=4.5, since="2025-03-31"),
+        api.efforts(since="2025-03-01", distances=["5K", "1K", "10K"]),
+        api.summary(group="week", since="2025-03-31", min_dist=2.5),
+    )
+
+
+def test_frame_path_matches_entry_path(monkeypatch):
+    hist_mod.append_runs([
+        # same-day runs: summed load and distance, joined names, first run's metrics
+        {"date": "2025-04-05", "hrTSS": 20.0, "distance_km": 4.0, "activity_name": "AM", "ef": 0.019,
+         "avg_pace_min_per_km": 6.0, "strava_activity_id": 5},
+        {"date": "2025-04-05", "hrTSS": 25.0, "activity_name": "PM", "decoupling_pct": 6.0,
+         "strava_activity_id": 6, "strava_efforts": {"5K": 1500, "1K": 295}},
+        {"date": "2025-04-05", "hrTSS": 5.0, "distance_km": 1.0, "activity_name": "AM", "strava_activity_id": 7},
+        {"date": "2025-04-20", "hrTSS": 0.0, "distance_km": 3.0, "ef": 0.017, "strava_activity_id": 8,
+         "strava_efforts": {"5K": 1490}},
+    ])
+    entries = _analytics(monkeypatch, 1 << 40)
+    frames = _analytics(monkeypatch, 0)
+    assert frames == entries
+    assert frames[0]["pmc"][6]["activity_name"] == "AM + PM + AM"
+    assert frames[0]["pmc"][6]["distance_km"] == 5.0
@@ -0,0 +1,65 @@
+"""
+Tests for the backfill-streams / backfill-efforts commands.
+
+Runs the commands in-process against the local Strava stand-in server with
+history redirected to a temp BIOSYSTEMS_HOME.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from typer.testing import CliRunner
+
+import biosystems.analytics.history as hist_mod
+from biosystems.cli import app
+from biosystems.testing import OpenMeteoStandIn, StravaStandIn
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def standin(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+    monkeypatch.setenv("STRAVA_CLIENT_ID", "id")
+    monkeypatch.setenv("STRAVA_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("STRAVA_REFRESH_TOKEN", "refresh")
+    with StravaStandIn(
+        n_activities=5, n_points=900, start=datetime(2025, 6, 1, 7, tzinfo=timezone.utc)
+    ) as api, OpenMeteoStandIn() as om:
+        monkeypatch.setenv("STRAVA_API_ROOT", api.root_url)
+        monkeypatch.setenv("OPEN_METEO_API_ROOT", om.root_url)
+        api.open_meteo = om
+        yield api
+
+
+def test_backfill_streams_commits_in_chunks(standin, monkeypatch):
+    chunks = []
+    real = hist_mod.append_runs
+    monkeypatch.setattr(hist_mod, "append_runs", lambda entries: (chunks.append(len(entries)), real(entries))[1])
+
+    result = runner.invoke(
+        app, ["backfill-streams", "--after", "2025-05-31", "--delay", "0", "--chunk-size", "2"]
+    )
+    assert result.exit_code == 0, result.output
+    assert chunks == [2, 2, 1]
+    entries = hist_mod.load_history()
+    assert {e["strava_activity_id"] for e in entries} == set(standin.activity_ids)
+    assert all(e["strava_efforts"] for e in entries)
+    # All five runs start at the same place on consecutive days → one weather request
+    assert len(standin.open_meteo.requests) == 1
+    # Per-sample weather is aligned from the prefetched days, not refetched
+    assert all(isinstance(e.get("temp_c"), float) for e in entries)
+
+
+def test_backfill_efforts_commits_in_chunks(standin, monkeypatch):
+    chunks = []
+    real = hist_mod.append_runs
+    monkeypatch.setattr(hist_mod, "append_runs", lambda entries: (chunks.append(len(entries)), real(entries))[1])
+
+    result = runner.invoke(app, ["backfill-efforts", "5", "--chunk-size", "3"])
+    assert result.exit_code == 0, result.output
+    assert chunks == [3, 2]
+    assert "Updated 5/5" in result.output
+    assert len(hist_mod.load_history()) == 5
@@ -0,0 +1,110 @@
+"""
+Startup budget for the CLI.
+
+Every ``biosystems`` call is a fresh process, so import cost is paid on each
+invocation. These tests run the analytics commands in a subprocess under
+``python -X importtime`` and check that they never import the heavy
+dependencies (pandas, numpy, pyarrow, fitdecode, the pydantic models) and
+stay within a cumulative import-time and wall-clock budget.
+
+The budgets are deliberately loose (several times the measured cost on a
+laptop) so they only trip when something heavy lands on the import path.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import biosystems.analytics.history as hist_mod
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+#: Modules the fast commands must not import at all.
+HEAVY_MODULES = {"pandas", "numpy", "pyarrow", "fitdecode", "pydantic", "biosystems.models"}
+#: Cumulative ``-X importtime`` budget in milliseconds (measured: ~40-60).
+IMPORT_BUDGET_MS = 300
+#: Wall-clock budget per invocation in seconds (measured: ~0.15).
+WALL_BUDGET_S = 2.0
+
+
+@pytest.fixture
+def seeded_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+    hist_mod.append_runs([
+        {"date": f"2025-03-{day:02d}", "hrTSS": 40.0 + day, "distance_km": 5.0 + day % 4, "ef": 0.018,
+         "decoupling_pct": 3.0, "avg_hr": 148.0, "avg_pace_min_per_km": 6.0, "strava_activity_id": day,
+         "strava_efforts": {"5K": 1600 - day, "1K": 300}}
+        for day in range(1, 21)
+    ])
+    return tmp_path
+
+
+def _run(args: list[str], home: Path) -> tuple[dict[str, int], float]:
+    """
+    Run the CLI under -X importtime. Returns every imported module mapped to
+    its cumulative µs (0 for nested imports, already counted by their
+    top-level importer) and the wall time.
+    """
+    env = {**os.environ, "PYTHONPATH": str(SRC), "BIOSYSTEMS_HOME": str(home)}
+    env.pop("BIOSYSTEMS_NO_DAEMON", None)  # the entry point should look for a daemon, find none
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    # "import time: <self µs> | <cumulative µs> | <2 spaces per nesting level><module>"
+    imported: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header line
+        name = parts[2][1:]
+        top_level = not name.startswith(" ")
+        imported[name.strip()] = int(parts[1]) if top_level else 0
+    return imported, elapsed
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-c", "import biosystems.cli"],
+        ["-m", "biosystems.cli", "summary", "--json"],
+        ["-m", "biosystems.cli", "summary", "--since", "2025-03-05", "--json"],  # per-run fallback
+        ["-m", "biosystems.cli", "top", "--json"],
+        ["-m", "biosystems.cli", "efforts", "--json"],
+        # the `biosystems` console script, with no daemon listening
+        ["-c", "import sys; from biosystems.daemon import main; sys.argv[0] = 'biosystems'; main()",
+         "summary", "--json"],
+    ],
+    ids=["import", "summary", "summary-fallback", "top", "efforts", "entry-point"],
+)
+def test_fast_commands_stay_within_startup_budget(args, seeded_home):
+    imported, elapsed = _run(args, seeded_home)
+
+    assert "biosystems" in imported  # sanity: the trace covers our package (-m runs cli as __main__)
+    assert not HEAVY_MODULES & imported.keys(), sorted(HEAVY_MODULES & imported.keys())
+    total_ms = sum(imported.values()) / 1000
+    assert total_ms < IMPORT_BUDGET_MS, f"imports took {total_ms:.0f} ms"
+    assert elapsed < WALL_BUDGET_S, f"command took {elapsed:.2f} s"
+
+
+def test_lazy_package_exports_resolve_on_access():
+    import biosystems.physics as physics
+    from biosystems.physics import metrics
+
+    assert "run_metrics" in dir(physics)
+    assert physics.run_metrics is metrics.run_metrics
+    assert "run_metrics" in vars(physics)  # cached after the first lookup
+    with pytest.raises(AttributeError):
+        physics.not_an_export  # noqa: B018
@@ -0,0 +1,163 @@
+"""
+Tests for the ``biosystems sync`` command (incremental Strava ingestion).
+
+Strava HTTP calls are replaced with in-memory fakes; history and cursor
+storage are redirected to a temp BIOSYSTEMS_HOME.
+"""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+import biosystems.analytics.history as hist_mod
+import biosystems.ingestion.strava as strava_mod
+from biosystems.cli import app
+
+runner = CliRunner()
+
+
+def _summary(activity_id, start_date, name="Easy Run"):
+    return {
+        "id": activity_id,
+        "sport_type": "Run",
+        "name": name,
+        "start_date": start_date,
+        "start_date_local": start_date,
+        "distance": 5000.0,
+        "moving_time": 1800,
+    }
+
+
+def _fake_streams(activity_id, access_token=None):
+    n = 1800
+    rng = np.random.default_rng(activity_id)
+    streams = {
+        "time": list(range(n)),
+        "distance": list(np.cumsum(np.full(n, 2.8))),
+        "heartrate": list(145 + rng.integers(-3, 4, n)),
+        "cadence": list(np.full(n, 85)),
+        "velocity_smooth": list(np.full(n, 2.8)),
+        "altitude": list(np.full(n, 100.0)),
+    }
+    df = strava_mod.parse_strava_streams(streams, "2025-06-01T07:00:00Z", activity_id)
+    return df, {"best_efforts": []}
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+    monkeypatch.setattr(strava_mod, "_refresh_access_token", lambda: "tok")
+    monkeypatch.setattr(strava_mod, "fetch_activity_streams", _fake_streams)
+    yield tmp_path
+
+
+def test_sync_ingests_new_runs_and_advances_cursor(monkeypatch):
+    listed = [
+        _summary(2, "2025-06-02T07:00:00Z"),
+        _summary(1, "2025-06-01T07:00:00Z"),
+    ]
+    calls: list[int] = []
+
+    def fake_list(after_epoch, access_token=None, per_page=200):
+        calls.append(after_epoch)
+        return listed
+
+    monkeypatch.setattr(strava_mod, "fetch_runs_after", fake_list)
+
+    result = runner.invoke(app, ["sync", "--after", "2025-05-31", "--delay", "0", "--json"])
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.stdout)
+    assert [r["id"] for r in payload["ingested"]] == [1, 2]  # oldest first
+    assert hist_mod.load_sync_cursor()["activity_id"] == 2
+    assert {e["strava_activity_id"] for e in hist_mod.load_history()} == {1, 2}
+
+    # Second sync lists from the cursor and finds nothing new
+    result = runner.invoke(app, ["sync", "--delay", "0", "--json"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["ingested"] == []
+    assert calls[-1] == 1_748_847_600 - 1  # 2025-06-02T07:00:00Z minus one second
+
+
+def test_sync_dry_run_does_not_move_cursor(monkeypatch):
+    monkeypatch.setattr(
+        strava_mod, "fetch_runs_after",
+        lambda after_epoch, access_token=None, per_page=200: [_summary(5, "2025-06-03T07:00:00Z")],
+    )
+    result = runner.invoke(app, ["sync", "--after", "2025-06-01", "--dry-run", "--json"])
+    assert result.exit_code == 0, result.output
+    assert [r["id"] for r in json.loads(result.stdout)["pending"]] == [5]
+    assert hist_mod.load_sync_cursor() is None
+
+
+def test_sync_stops_on_fetch_failure_and_keeps_cursor(monkeypatch):
+    hist_mod.save_sync_cursor("2025-06-01T07:00:00Z", 1)
+    monkeypatch.setattr(
+        strava_mod, "fetch_runs_after",
+        lambda after_epoch, access_token=None, per_page=200: [
+            _summary(3, "2025-06-03T07:00:00Z"),
+            _summary(2, "2025-06-02T07:00:00Z"),
+        ],
+    )
+
+    def failing_streams(activity_id, access_token=None):
+        if activity_id == 3:
+            raise RuntimeError("HTTP 503")
+        return _fake_streams(activity_id)
+
+    monkeypatch.setattr(strava_mod, "fetch_activity_streams", failing_streams)
+    result = runner.invoke(app, ["sync", "--delay", "0", "--json"])
+    assert result.exit_code == 1
+    # Run 2 was ingested, run 3 failed → cursor rests on run 2 for the retry
+    assert hist_mod.load_sync_cursor()["activity_id"] == 2
+
+
+def test_sync_moves_past_a_run_whose_report_fails(monkeypatch):
+    import biosystems.physics.report as report_mod
+
+    monkeypatch.setattr(
+        strava_mod, "fetch_runs_after",
+        lambda after_epoch, access_token=None, per_page=200: [
+            _summary(3, "2025-06-03T07:00:00Z"),
+            _summary(2, "2025-06-02T07:00:00Z"),
+        ],
+    )
+    real = report_mod.build_run_report
+
+    def failing_report(df, zone_config, **kwargs):
+        if kwargs["activity_meta"].get("bad"):
+            raise ValueError("no heart rate")
+        return real(df, zone_config, **kwargs)
+
+    def streams(activity_id, access_token=None):
+        df, meta = _fake_streams(activity_id)
+        return df, {**meta, "bad": activity_id == 2}
+
+    monkeypatch.setattr(strava_mod, "fetch_activity_streams", streams)
+    monkeypatch.setattr(report_mod, "build_run_report", failing_report)
+    result = runner.invoke(app, ["sync", "--after", "2025-06-01", "--delay", "0", "--json"])
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.stdout)
+    assert payload["failed"] == 1
+    assert [r["id"] for r in payload["ingested"]] == [3]
+    assert hist_mod.load_sync_cursor()["activity_id"] == 3
+
+
+def test_sync_closes_the_weather_cache_when_a_run_raises(monkeypatch):
+    from biosystems.environment import weather
+
+    monkeypatch.setattr(
+        strava_mod, "fetch_runs_after",
+        lambda after_epoch, access_token=None, per_page=200: [_summary(2, "2025-06-02T07:00:00Z")],
+    )
+    closed = []
+    real_close = weather.WeatherCache.close
+    monkeypatch.setattr(weather.WeatherCache, "close", lambda self: (closed.append(self), real_close(self)))
+    monkeypatch.setattr(hist_mod, "advance_sync_cursor", lambda *args: 1 / 0)
+
+    result = runner.invoke(app, ["sync", "--after", "2025-06-01", "--delay", "0", "--json"])
+    assert isinstance(result.exception, ZeroDivisionError)
+    assert len(closed) == 1
@@ -0,0 +1,208 @@
+"""
+Tests for src/biosystems/daemon.py
+
+Covers: forwarding CLI commands to a running daemon (output and exit codes
+identical to in-process runs), in-process fallback when no daemon is
+listening, it is busy or forwarding is disabled, streamed output with
+heartbeats and the client's read timeout, forwarded environment and
+per-thread output capture, ping/shutdown, stale-socket replacement versus
+refusing to start twice, and the socket being owner-only from creation.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+
+import biosystems.analytics.history as hist_mod
+from biosystems import daemon as daemon_mod
+
+
+@pytest.fixture(autouse=True)
+def seeded_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+    monkeypatch.delenv("BIOSYSTEMS_NO_DAEMON", raising=False)
+    hist_mod.append_runs([
+        {"date": "2025-03-30", "hrTSS": 50.0, "distance_km": 8.0, "ef": 0.018, "strava_activity_id": 1},
+        {"date": "2025-04-02", "hrTSS": 70.0, "distance_km": 14.0, "ef": 0.020, "strava_activity_id": 3},
+    ])
+    yield tmp_path
+
+
+@pytest.fixture
+def running_daemon():
+    daemon = daemon_mod.open_daemon()
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    yield daemon
+    try:
+        daemon_mod.call("shutdown")
+    except ConnectionError:
+        pass  # the test already stopped it
+    thread.join(timeout=5)
+
+
+def test_forward_without_daemon_returns_none():
+    assert daemon_mod.forward(["top", "--json"]) is None
+
+
+def test_forwarded_commands_match_in_process(running_daemon, capsys):
+    assert daemon_mod.forward(["top", "--json"]) == 0
+    forwarded = capsys.readouterr().out
+    assert [e["strava_activity_id"] for e in json.loads(forwarded)] == [3, 1]
+
+    local = daemon_mod.run_command(["top", "--json"])
+    assert local == {"exit_code": 0, "stdout": forwarded, "stderr": ""}
+
+    # Usage errors keep their exit code and message
+    assert daemon_mod.forward(["top", "-n", "not-a-number"]) == 2
+    assert "not a valid int" in capsys.readouterr().err
+    assert daemon_mod.call("ping")["served"] == 2
+
+
+def test_serve_and_opt_out_are_never_forwarded(running_daemon, monkeypatch):
+    assert daemon_mod.forward(["serve", "--status"]) is None
+    monkeypatch.setenv("BIOSYSTEMS_NO_DAEMON", "1")
+    assert daemon_mod.forward(["top"]) is None
+    assert daemon_mod.call("ping")["served"] == 0
+
+
+def test_shutdown_removes_socket(running_daemon):
+    path = daemon_mod.socket_path()
+    assert path.exists()
+    daemon_mod.call("shutdown")
+    deadline = time.monotonic() + 5
+    while path.exists() and time.monotonic() < deadline:  # serve loop closes after replying
+        time.sleep(0.01)
+    assert not path.exists()
+    with pytest.raises(ConnectionError):
+        daemon_mod.call("ping")
+
+
+def test_open_daemon_replaces_stale_socket_but_not_a_live_one(running_daemon):
+    with pytest.raises(RuntimeError, match="already running"):
+        daemon_mod.open_daemon()
+
+    daemon_mod.call("shutdown")
+    running_daemon.server_close()
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(daemon_mod.socket_path()))  # bound but not listening, as after a crash
+    stale.close()
+    replacement = daemon_mod.open_daemon()
+    replacement.server_close()
+
+
+def _fake_run(body):
+    """A stand-in for ``run_command`` that runs ``body(write)`` and exits with its return value."""
+
+    def run(argv, cwd=None, color=False, env=None, write=None):
+        run.env = env
+        return {"exit_code": body(write), "stdout": "", "stderr": ""}
+
+    return run
+
+
+def test_busy_daemon_falls_back_to_in_process(running_daemon, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def long_sync(write):
+        started.set()
+        release.wait(5)
+        return 0
+
+    monkeypatch.setattr(daemon_mod, "run_command", _fake_run(long_sync))
+    first = threading.Thread(target=daemon_mod.forward, args=(["sync"],))
+    first.start()
+    assert started.wait(5)
+
+    t0 = time.monotonic()
+    assert daemon_mod.forward(["top", "--json"]) is None  # run it here instead of waiting
+    assert time.monotonic() - t0 < 1.0
+    assert daemon_mod.call("ping")["served"] == 0  # other requests are still answered
+
+    release.set()
+    first.join(timeout=5)
+    assert daemon_mod.call("ping")["served"] == 1
+
+
+def test_output_streams_with_heartbeats(running_daemon, monkeypatch):
+    monkeypatch.setattr(daemon_mod, "HEARTBEAT_S", 0.05)
+    monkeypatch.setattr(daemon_mod, "READ_TIMEOUT_S", 0.3)
+
+    def quiet_then_done(write):
+        write("stdout", "fetching\n")
+        time.sleep(0.8)  # quiet for longer than the client's read timeout
+        write("stderr", "done\n")
+        return 3
+
+    monkeypatch.setattr(daemon_mod, "run_command", _fake_run(quiet_then_done))
+    chunks = []
+    result = daemon_mod.call("run", {"argv": ["sync"]}, on_output=lambda *c: chunks.append((*c, time.monotonic())))
+    assert result == {"exit_code": 3}
+    assert [c[:2] for c in chunks] == [("stdout", "fetching\n"), ("stderr", "done\n")]
+    assert chunks[1][2] - chunks[0][2] > 0.5  # the first chunk arrived while the command ran
+
+
+def test_client_gives_up_on_a_silent_daemon(running_daemon, monkeypatch, capsys):
+    monkeypatch.setattr(daemon_mod, "HEARTBEAT_S", 5.0)
+    monkeypatch.setattr(daemon_mod, "READ_TIMEOUT_S", 0.2)
+    monkeypatch.setattr(daemon_mod, "run_command", _fake_run(lambda write: time.sleep(0.6) or 0))
+    assert daemon_mod.forward(["sync"]) == 1
+    assert "sent nothing" in capsys.readouterr().err
+
+
+def test_forward_sends_client_env(running_daemon, monkeypatch):
+    fake = _fake_run(lambda write: 0)
+    monkeypatch.setattr(daemon_mod, "run_command", fake)
+    monkeypatch.setenv("STRAVA_API_ROOT", "http://127.0.0.1:9")
+    monkeypatch.setenv("UNRELATED_SECRET", "x")
+    assert daemon_mod.forward(["sync"]) == 0
+    assert fake.env["STRAVA_API_ROOT"] == "http://127.0.0.1:9"
+    assert fake.env["BIOSYSTEMS_HOME"] == os.environ["BIOSYSTEMS_HOME"]
+    assert "UNRELATED_SECRET" not in fake.env
+
+
+def test_run_command_scopes_env_and_captures_only_its_thread(monkeypatch, capsys):
+    import biosystems.cli as cli_mod
+
+    def fake_app(args, prog_name, color):
+        print(os.environ["BIOSYSTEMS_PROBE"])
+        worker = threading.Thread(target=print, args=("from another thread",))
+        worker.start()
+        worker.join()
+        raise SystemExit(4)
+
+    monkeypatch.setattr(cli_mod, "app", fake_app)
+    monkeypatch.delenv("BIOSYSTEMS_PROBE", raising=False)
+    result = daemon_mod.run_command(["x"], env={"BIOSYSTEMS_PROBE": "client"})
+    assert result == {"exit_code": 4, "stdout": "client\n", "stderr": ""}
+    assert "BIOSYSTEMS_PROBE" not in os.environ
+    assert "from another thread" in capsys.readouterr().out
+
+
+def test_run_command_resolves_zones_default_from_client_env(tmp_path):
+    import biosystems.cli  # noqa: F401 (imported once, as in the daemon)
+
+    client_zones = tmp_path / "client_zones.yml"
+    result = daemon_mod.run_command(["analyze", "run.gpx"], env={"BIOSYSTEMS_ZONES_PATH": str(client_zones)})
+    assert result["exit_code"] == 1
+    assert str(client_zones) in result["stderr"]
+
+
+def test_socket_is_created_owner_only():
+    old_umask = os.umask(0)  # a permissive umask must not leak into the socket's mode
+    try:
+        daemon = daemon_mod.open_daemon()
+        assert os.umask(0) == 0  # and bind() leaves the caller's umask as it was
+    finally:
+        os.umask(old_umask)
+    try:
+        assert stat.S_IMODE(os.stat(daemon.path).st_mode) == 0o600
+    finally:
+        daemon.server_close()
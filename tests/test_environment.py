@@ -6,12 +6,14 @@ Tests weather API integration, caching, and WMO code translation.
 Uses mocking to avoid actual API calls during testing.
 """
 
+import json
 import tempfile
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pandas as pd
+import pytest
 
 from biosystems.environment.weather import (
     WeatherCache,
@@ -21,6 +23,22 @@ from biosystems.environment.weather import (
 )
 
 
+def _hourly_day(date_str, temp=20.0, code=0):
+    """One UTC day of Open-Meteo hourly data with a constant temperature."""
+    times = [f"{date_str}T{h:02d}:00" for h in range(24)]
+    return {
+        "hourly": {
+            "time": times,
+            "temperature_2m": [temp] * 24,
+            "precipitation": [0.0] * 24,
+            "weathercode": [code] * 24,
+            "windspeed_10m": [3.5] * 24,
+            "windgusts_10m": [7.25] * 24,
+            "winddirection_10m": [180.0] * 24,
+        }
+    }
+
+
 class TestGetWeatherDescription:
     """Test WMO weather code translation."""
 
@@ -123,19 +141,16 @@ class TestWeatherCache:
 
         try:
             # Create initial cache with data
-            df = pd.DataFrame([{
-                'lat': 40.7128,
-                'lon': -74.0060,
-                'date': '2024-01-01',
-                'weather': '{"temp": 20}'
-            }])
-            df.to_parquet(cache_path, index=False)
+            seed = WeatherCache(cache_path)
+            seed.set(40.7128, -74.0060, '2024-01-01', _hourly_day('2024-01-01'))
+            seed.flush()
 
             # Load cache
             cache = WeatherCache(cache_path)
 
             assert not cache.cache.empty
-            assert len(cache.cache) == 1
+            assert len(cache.cache) == 24
+            assert str(cache.cache['temperature_2m'].dtype) == 'float32'
         finally:
             if cache_path.exists():
                 cache_path.unlink()
@@ -145,18 +160,22 @@ class TestWeatherCache:
         cache = WeatherCache(None)  # No file, memory only
 
         # Manually add to cache
-        cache.cache = pd.DataFrame([{
-            'lat': 40.7128,
-            'lon': -74.0060,
-            'date': '2024-01-01',
-            'weather': '{"temp": 20, "code": 0}'
-        }])
+        cache.cache = pd.DataFrame({
+            'lat_cell': [40.7128, 40.7128],
+            'lon_cell': [-74.0060, -74.0060],
+            'timestamp': pd.to_datetime(['2024-01-01T00:00', '2024-01-01T01:00'], utc=True),
+            'temperature_2m': [20.0, 19.5],
+            'weathercode': [0, 1],
+        })
 
         # Retrieve
         result = cache.get(40.7128, -74.0060, '2024-01-01')
 
         assert result is not None
-        assert result['temp'] == 20
+        assert result['hourly']['time'] == ['2024-01-01T00:00', '2024-01-01T01:00']
+        assert result['hourly']['temperature_2m'] == [20.0, 19.5]
+        assert result['hourly']['weathercode'] == [0, 1]
+        assert result['hourly']['precipitation'] == [None, None]
 
     def test_get_miss(self):
         """Test cache miss."""
@@ -170,13 +189,19 @@ class TestWeatherCache:
         """Test that set() adds data to cache."""
         cache = WeatherCache(None)  # No file
 
-        weather_data = {'temp': 25, 'code': 1}
+        weather_data = _hourly_day('2024-01-01', temp=25.0, code=1)
         cache.set(40.7128, -74.0060, '2024-01-01', weather_data)
 
         # Should be in cache now
         result = cache.get(40.7128, -74.0060, '2024-01-01')
         assert result is not None
-        assert result['temp'] == 25
+        assert result['hourly'] == weather_data['hourly']
+
+    def test_set_rejects_non_hourly_payload(self):
+        """Only hourly payloads can be stored in the typed table."""
+        cache = WeatherCache(None)
+        with pytest.raises(ValueError):
+            cache.set(40.7128, -74.0060, '2024-01-01', {'temp': 25})
 
 
 class TestFetchWeatherOpenMeteo:
@@ -211,14 +236,14 @@ class TestFetchWeatherOpenMeteo:
         """Test that cache is used when available."""
         # Create cache with data
         cache = WeatherCache(None)
-        cached_weather = {'temp': 20, 'cached': True}
-        cache.set(40.7128, -74.0060, '2024-01-01', cached_weather)
+        cache.set(40.7128, -74.0060, '2024-01-01', _hourly_day('2024-01-01', temp=20.0))
 
         # Fetch (should use cache, not call API)
         dt = datetime(2024, 1, 1, 12, 0)
         weather, offset = fetch_weather_open_meteo(40.7128, -74.0060, dt, cache=cache)
 
-        assert weather == cached_weather
+        assert weather['hourly']['time'] == ['2024-01-01T12:00']
+        assert weather['hourly']['temperature_2m'] == [20.0]
         assert offset == 0
         # API should not have been called
         mock_get.assert_not_called()
@@ -289,3 +314,262 @@ class TestFetchWeatherOpenMeteo:
 
         assert weather is not None
         assert offset is not None
+
+
+class TestWeatherCacheIndexing:
+    """Indexed lookups, spatial rounding and batched persistence."""
+
+    def test_precision_shares_nearby_points(self):
+        cache = WeatherCache(None, precision=2)
+        cache.set(40.71281, -74.00601, '2024-01-01', _hourly_day('2024-01-01'))
+        assert cache.get(40.7149, -74.0081, '2024-01-01') is not None
+        assert cache.get(40.7251, -74.0060, '2024-01-01') is None
+        assert cache.get(40.7149, -74.0081, '2024-01-02') is None
+
+    def test_writes_are_buffered_until_flush_every(self, tmp_path):
+        path = tmp_path / 'weather.parquet'
+        cache = WeatherCache(path, flush_every=3)
+        cache.set(1.0, 2.0, '2024-01-01', _hourly_day('2024-01-01', temp=1.0))
+        cache.set(1.0, 2.0, '2024-01-02', _hourly_day('2024-01-02', temp=2.0))
+        assert not path.exists()
+        cache.set(1.0, 2.0, '2024-01-03', _hourly_day('2024-01-03', temp=3.0))
+        assert len(pd.read_parquet(path)) == 3 * 24
+
+    def test_context_manager_flushes_on_exit(self, tmp_path):
+        path = tmp_path / 'weather.parquet'
+        with WeatherCache(path) as cache:
+            cache.set(1.0, 2.0, '2024-01-01', _hourly_day('2024-01-01', temp=1.0))
+        reloaded = WeatherCache(path)
+        assert reloaded.get(1.0, 2.0, '2024-01-01')['hourly']['temperature_2m'] == [1.0] * 24
+
+    def test_concurrent_writers_merge_on_flush(self, tmp_path):
+        """Two caches on the same file (e.g. two processes) must not clobber each other."""
+        path = tmp_path / 'weather.parquet'
+        a = WeatherCache(path)
+        b = WeatherCache(path)
+        a.set(1.0, 2.0, '2024-01-01', _hourly_day('2024-01-01', temp=1.0))
+        b.set(3.0, 4.0, '2024-01-01', _hourly_day('2024-01-01', temp=3.0))
+        a.flush()
+        b.flush()
+
+        merged = WeatherCache(path)
+        assert len(merged) == 2 * 24
+        assert merged.get(1.0, 2.0, '2024-01-01')['hourly']['temperature_2m'][0] == 1.0
+        assert b.get(1.0, 2.0, '2024-01-01') is not None  # b picked up a's rows
+        assert not list(tmp_path.glob('.weather.parquet.*.tmp'))
+
+
+class TestWeatherCacheTypedTable:
+    """Typed hourly storage, range queries and legacy migration."""
+
+    def test_parquet_schema_is_typed(self, tmp_path):
+        path = tmp_path / 'weather.parquet'
+        with WeatherCache(path) as cache:
+            cache.set(1.0, 2.0, '2024-01-01', _hourly_day('2024-01-01'))
+        on_disk = pd.read_parquet(path)
+        assert 'weather' not in on_disk.columns
+        assert str(on_disk['temperature_2m'].dtype) == 'float32'
+        assert str(on_disk['weathercode'].dtype) == 'Int16'
+        assert str(on_disk['timestamp'].dt.tz) == 'UTC'
+
+    def test_no_json_on_lookup(self):
+        cache = WeatherCache(None)
+        cache.set(1.0, 2.0, '2024-01-01', _hourly_day('2024-01-01'))
+        with patch('biosystems.environment.weather.json.loads') as loads, \
+                patch('biosystems.environment.weather.json.dumps') as dumps:
+            assert cache.get(1.0, 2.0, '2024-01-01') is not None
+        loads.assert_not_called()
+        dumps.assert_not_called()
+
+    def test_query_returns_hour_range(self):
+        cache = WeatherCache(None)
+        cache.set(1.0, 2.0, '2024-01-01', _hourly_day('2024-01-01', temp=5.0))
+        cache.set(1.0, 2.0, '2024-01-02', _hourly_day('2024-01-02', temp=6.0))
+        rows = cache.query(1.0, 2.0, datetime(2024, 1, 1, 22), datetime(2024, 1, 2, 1))
+        assert len(rows) == 4
+        assert rows['temperature_2m'].tolist() == [5.0, 5.0, 6.0, 6.0]
+        assert str(rows.index.tz) == 'UTC'
+        assert cache.query(9.0, 9.0, datetime(2024, 1, 1), datetime(2024, 1, 2)).empty
+
+    def test_days_with_unpublished_hours_are_not_cached(self):
+        cache = WeatherCache(None)
+        payload = _hourly_day('2024-01-01')
+        payload['hourly']['temperature_2m'][23] = None
+        assert cache.add_hourly(1.0, 2.0, payload) == 0
+        assert cache.get(1.0, 2.0, '2024-01-01') is None
+
+    def test_legacy_json_cache_is_migrated(self, tmp_path):
+        path = tmp_path / 'weather.parquet'
+        pd.DataFrame([
+            {'lat': 1.0, 'lon': 2.0, 'date': '2024-01-01',
+             'weather': json.dumps(_hourly_day('2024-01-01', temp=4.0))},
+            {'lat': 1.0, 'lon': 2.0, 'date': '2024-01-02', 'weather': '{"temp": 5}'},
+        ]).to_parquet(path, index=False)
+
+        cache = WeatherCache(path)
+        assert cache.get(1.0, 2.0, '2024-01-01')['hourly']['temperature_2m'] == [4.0] * 24
+        assert cache.get(1.0, 2.0, '2024-01-02') is None  # non-hourly blobs are dropped
+        assert 'weather' not in pd.read_parquet(path).columns
+
+
+class TestFetchWeatherBatch:
+    """Bulk fetch against the local Open-Meteo stand-in."""
+
+    @staticmethod
+    def _standin():
+        from biosystems.testing import OpenMeteoStandIn
+        return OpenMeteoStandIn()
+
+    def test_groups_by_location_and_fetches_span_once(self):
+        from biosystems.environment.weather import fetch_weather_batch
+
+        points = [
+            (40.7128, -74.0060, datetime(2024, 1, d, 7 + d % 5)) for d in range(1, 11)
+        ] + [(51.5074, -0.1278, datetime(2024, 1, 3, 9))]
+        with self._standin() as om:
+            cache = WeatherCache(None, precision=2)
+            results = fetch_weather_batch(points, cache=cache, base_url=f"{om.root_url}/v1/archive")
+            assert len(om.requests) == 2  # one span per location
+            assert om.requests[0]["start_date"] == "2024-01-01"
+            assert om.requests[0]["end_date"] == "2024-01-10"
+
+            # Every point gets its own hour sliced out of the day
+            assert all(r is not None for r in results)
+            assert results[0]["hourly"]["time"] == ["2024-01-01T08:00"]
+            assert len(results[0]["hourly"]["temperature_2m"]) == 1
+
+            # Whole days are cached: other hours on those days need no requests
+            again = fetch_weather_batch(
+                [(40.7128, -74.0060, datetime(2024, 1, 5, 18))], cache=cache,
+                base_url=f"{om.root_url}/v1/archive",
+            )
+            assert again[0]["hourly"]["time"] == ["2024-01-05T18:00"]
+            assert len(om.requests) == 2
+
+    def test_long_gaps_split_into_separate_requests(self):
+        from biosystems.environment.weather import fetch_weather_batch
+
+        points = [(40.0, -74.0, datetime(2024, 1, 1, 8)), (40.0, -74.0, datetime(2024, 6, 1, 8))]
+        with self._standin() as om:
+            fetch_weather_batch(points, base_url=f"{om.root_url}/v1/archive")
+            assert [(r["start_date"], r["end_date"]) for r in om.requests] == [
+                ("2024-01-01", "2024-01-01"), ("2024-06-01", "2024-06-01"),
+            ]
+
+    def test_unpublished_days_are_not_cached(self):
+        from biosystems.environment.weather import fetch_weather_batch
+        from biosystems.testing import OpenMeteoStandIn
+
+        with OpenMeteoStandIn(missing_after=datetime(2024, 1, 2)) as om:
+            cache = WeatherCache(None)
+            results = fetch_weather_batch(
+                [(40.0, -74.0, datetime(2024, 1, 1, 8)), (40.0, -74.0, datetime(2024, 1, 2, 8))],
+                cache=cache, base_url=f"{om.root_url}/v1/archive",
+            )
+        assert results[0] is not None
+        assert results[1] is None
+        assert cache.get(40.0, -74.0, "2024-01-02") is None
+
+    def test_fetch_open_meteo_with_cache_reuses_day(self, monkeypatch):
+        with self._standin() as om:
+            monkeypatch.setenv("OPEN_METEO_API_ROOT", om.root_url)
+            cache = WeatherCache(None, precision=2)
+            morning, off_a = fetch_weather_open_meteo(40.7128, -74.0060, datetime(2024, 1, 1, 7), cache=cache)
+            evening, off_b = fetch_weather_open_meteo(40.7128, -74.0060, datetime(2024, 1, 1, 19), cache=cache)
+            assert len(om.requests) == 1
+        assert morning["hourly"]["time"] == ["2024-01-01T07:00"]
+        assert evening["hourly"]["time"] == ["2024-01-01T19:00"]
+        assert off_a == off_b == 0.0
+
+    def test_fetch_open_meteo_aware_datetime_uses_utc_day(self, monkeypatch):
+        from datetime import timedelta, timezone
+
+        # 20:00 at UTC-5 is 01:00 UTC the next day; the cache is keyed by the UTC day
+        local = datetime(2024, 1, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+        with self._standin() as om:
+            monkeypatch.setenv("OPEN_METEO_API_ROOT", om.root_url)
+            cache = WeatherCache(None, precision=2)
+            weather, offset = fetch_weather_open_meteo(40.7128, -74.0060, local, cache=cache)
+            assert len(om.requests) == 1
+        assert weather["hourly"]["time"] == ["2024-01-02T01:00"]
+        assert offset == 0.0
+        assert cache.get(40.7128, -74.0060, "2024-01-02") is not None
+
+
+class TestAlignWeatherToSamples:
+    """Per-sample interpolation of the hourly table."""
+
+    @staticmethod
+    def _hourly(**overrides):
+        cache = WeatherCache(None)
+        payload = _hourly_day('2024-01-01')
+        payload['hourly']['temperature_2m'] = [float(h) for h in range(24)]
+        payload['hourly'].update(overrides)
+        cache.add_hourly(1.0, 2.0, payload)
+        return cache.query(1.0, 2.0, datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+    def test_linear_interpolation_between_hours(self):
+        from biosystems.environment.weather import align_weather_to_samples
+
+        times = pd.DatetimeIndex(['2024-01-01T10:00', '2024-01-01T10:15', '2024-01-01T10:30', '2024-01-01T11:00'], tz='UTC')
+        out = align_weather_to_samples(times, self._hourly())
+        assert out['temp_c'].tolist() == [10.0, 10.25, 10.5, 11.0]
+        assert out.index.equals(times)
+
+    def test_unsorted_samples_keep_input_order(self):
+        from biosystems.environment.weather import align_weather_to_samples
+
+        times = pd.DatetimeIndex(['2024-01-01T12:30', '2024-01-01T03:30'], tz='UTC')
+        out = align_weather_to_samples(times, self._hourly())
+        assert out['temp_c'].tolist() == [12.5, 3.5]
+
+    def test_wind_direction_interpolates_on_circle(self):
+        from biosystems.environment.weather import align_weather_to_samples
+
+        hourly = self._hourly(winddirection_10m=[350.0, 10.0] * 12)
+        out = align_weather_to_samples(pd.DatetimeIndex(['2024-01-01T00:30'], tz='UTC'), hourly)
+        assert out['wind_dir_deg'].iloc[0] == pytest.approx(0.0, abs=1e-6)
+
+    def test_precipitation_uses_hour_ending_value_and_code_nearest(self):
+        from biosystems.environment.weather import align_weather_to_samples
+
+        hourly = self._hourly(
+            precipitation=[0.0] * 11 + [2.0] + [0.0] * 12,
+            weathercode=[0] * 11 + [61] + [0] * 12,
+        )
+        times = pd.DatetimeIndex(['2024-01-01T10:20', '2024-01-01T10:40'], tz='UTC')
+        out = align_weather_to_samples(times, hourly)
+        assert out['precip_mm_h'].tolist() == [2.0, 2.0]  # 11:00 row covers 10:00–11:00
+        assert out['weather_code'].tolist() == [0, 61]
+
+    def test_samples_far_from_table_are_nan(self):
+        from biosystems.environment.weather import align_weather_to_samples
+
+        out = align_weather_to_samples(pd.DatetimeIndex(['2024-01-03T12:00'], tz='UTC'), self._hourly())
+        assert out['temp_c'].isna().all()
+        assert out['weather_code'].isna().all()
+
+    def test_weather_for_samples_fetches_missing_days_once(self):
+        from biosystems.environment.weather import summarize_sample_weather, weather_for_samples
+        from biosystems.testing import OpenMeteoStandIn
+
+        idx = pd.date_range('2024-01-01T23:00', periods=7200, freq='s', tz='UTC')
+        df = pd.DataFrame({'latitude': 40.7128, 'longitude': -74.0060, 'dt': 1.0}, index=idx)
+        cache = WeatherCache(None, precision=2)
+        with OpenMeteoStandIn() as om:
+            base = f"{om.root_url}/v1/archive"
+            aligned = weather_for_samples(df, cache, base_url=base)
+            assert len(om.requests) == 1  # both days in one span request
+            assert weather_for_samples(df, cache, base_url=base) is not None
+            assert len(om.requests) == 1
+
+        assert aligned.index.equals(df.index)
+        assert aligned['temp_c'].notna().all()
+        summary = summarize_sample_weather(pd.concat([df, aligned], axis=1))
+        assert summary['temp_min_c'] <= summary['temp_mean_c'] <= summary['temp_max_c']
+
+    def test_weather_for_samples_without_gps(self):
+        from biosystems.environment.weather import weather_for_samples
+
+        idx = pd.date_range('2024-01-01', periods=10, freq='s', tz='UTC')
+        assert weather_for_samples(pd.DataFrame({'hr': 150}, index=idx)) is None
@@ -0,0 +1,107 @@
+"""
+Tests for src/biosystems/wellness/habitdash.py
+
+Runs the real HabitDash client against the local stand-in server:
+date-range chunking, concurrent metric fetching, and the header-driven
+rate limiter.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import date
+
+import pytest
+
+from biosystems.testing import HabitDashStandIn
+from biosystems.testing.habitdash_standin import synthetic_value
+from biosystems.wellness.habitdash import (
+    COLUMN_MAP,
+    FIELD_IDS,
+    HabitDashClient,
+    _date_chunks,
+    _RateLimiter,
+)
+
+N_FIELDS = sum(1 for s, fields in FIELD_IDS.items() for f in fields if (s, f) in COLUMN_MAP)
+
+
+@pytest.fixture
+def standin():
+    started: list[HabitDashStandIn] = []
+
+    def _start(**kwargs):
+        kwargs.setdefault("first_day", date(2025, 1, 1))
+        kwargs.setdefault("last_day", date(2025, 12, 31))
+        hd = HabitDashStandIn(**kwargs).start()
+        started.append(hd)
+        return hd
+
+    yield _start
+    for hd in started:
+        hd.stop()
+
+
+def test_date_chunks_cover_range_without_overlap():
+    chunks = _date_chunks("2025-01-01", "2025-07-01", days=90)
+    assert chunks == [
+        ("2025-01-01", "2025-03-31"),
+        ("2025-04-01", "2025-06-29"),
+        ("2025-06-30", "2025-07-01"),
+    ]
+    assert _date_chunks("2025-01-05", "2025-01-05") == [("2025-01-05", "2025-01-05")]
+    assert _date_chunks("2025-01-05", "2025-01-04") == []
+
+
+def test_fetch_all_metrics_concurrent_and_chunked(standin):
+    hd = standin(max_range_days=90, latency_s=0.02)
+    client = HabitDashClient(api_key="k", base_url=hd.root_url, max_workers=4)
+    records = client.fetch_all_metrics("2025-01-01", "2025-07-19")  # 200 days → 3 chunks
+
+    assert len(hd.requests) == N_FIELDS * 3
+    assert hd.stats()["by_status"] == {200: N_FIELDS * 3}
+    assert hd.max_concurrency > 1
+    assert len(records) == N_FIELDS * 200
+
+    hrv = [r for r in records if r["column"] == "hrv_rmssd"]
+    assert [r["date"] for r in hrv][:2] == ["2025-01-01", "2025-01-02"]
+    assert hrv[0]["value"] == synthetic_value(FIELD_IDS["whoop"]["hrv_rmssd"], date(2025, 1, 1))
+
+
+def test_fetch_metric_honours_env_root(standin, monkeypatch):
+    hd = standin()
+    monkeypatch.setenv("HABITDASH_API_ROOT", hd.root_url)
+    rows = HabitDashClient(api_key="k").fetch_metric("garmin", "body_battery", "2025-12-30", "2026-01-02")
+    assert [r["date"] for r in rows] == ["2025-12-30", "2025-12-31"]
+
+
+def test_rate_limit_spent_without_429(standin):
+    hd = standin(rate_limit=8, rate_window_s=0.4)
+    client = HabitDashClient(api_key="k", base_url=hd.root_url, max_workers=6)
+    t0 = time.monotonic()
+    records = client.fetch_all_metrics("2025-03-01", "2025-03-07")
+    elapsed = time.monotonic() - t0
+
+    assert len(records) == N_FIELDS * 7
+    assert hd.stats()["by_status"] == {200: N_FIELDS}
+    # 17 requests at 8 per window need at least two full window resets
+    assert elapsed >= 0.4 * ((N_FIELDS - 1) // 8)
+
+
+def test_limiter_paces_without_headers():
+    limiter = _RateLimiter(interval=0.05)
+    t0 = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+        limiter.update()
+    assert time.monotonic() - t0 >= 0.15
+
+
+def test_limiter_bursts_reported_budget():
+    limiter = _RateLimiter(interval=10.0)
+    limiter.acquire()
+    limiter.update(remaining=5, reset_s=10.0)
+    t0 = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - t0 < 0.5
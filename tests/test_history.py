@@ -2,7 +2,8 @@
 Tests for src/biosystems/analytics/history.py
 
 Covers: append_run deduplication, load_history ordering, file-lock
-concurrency safety, strava_activity_id keying, and detect_block_bests.
+concurrency safety, strava_activity_id keying, the columnar history
+frames and their Parquet mirrors, and detect_block_bests.
 """
 
 from __future__ import annotations
@@ -130,6 +131,144 @@ def test_append_run_concurrent_writes_no_data_loss():
     assert len(entries) == n_threads
 
 
+def test_readers_never_see_torn_history_during_writes(isolated_history):
+    """Lock-free readers running alongside a writer only ever see whole snapshots."""
+    n_writes = 40
+    done = threading.Event()
+    observed: list[int] = []
+    errors: list[Exception] = []
+
+    def writer() -> None:
+        try:
+            for i in range(n_writes):
+                hist_mod.append_run({
+                    "date": f"2025-03-{(i % 28) + 1:02d}",
+                    "hrTSS": float(i),
+                    "strava_activity_id": 70000 + i,
+                    "activity_name": "x" * 200,  # make partial writes observable
+                })
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            done.set()
+
+    def reader() -> None:
+        try:
+            while not done.is_set():
+                entries = hist_mod.load_history()
+                assert all(e["activity_name"] == "x" * 200 for e in entries)
+                observed.append(len(entries))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, errors
+    assert len(hist_mod.load_history()) == n_writes
+    assert not list(isolated_history.glob(".history.jsonl.*.tmp"))
+
+
+def test_load_history_returns_independent_copies():
+    hist_mod.append_run({"date": "2025-05-01", "hrTSS": 40.0})
+    first = hist_mod.load_history()
+    first[0]["hrTSS"] = -1.0
+    assert hist_mod.load_history()[0]["hrTSS"] == 40.0
+
+
+def test_load_history_cache_invalidated_by_new_snapshot():
+    hist_mod.append_run({"date": "2025-05-01", "hrTSS": 40.0})
+    assert len(hist_mod.load_history()) == 1
+    hist_mod.append_run({"date": "2025-05-02", "hrTSS": 41.0})
+    assert len(hist_mod.load_history()) == 2
+
+
+# ---------------------------------------------------------------------------
+# load_history_frame / load_efforts_frame
+# ---------------------------------------------------------------------------
+
+
+def _seed_frame_history():
+    hist_mod.append_runs([
+        {"date": "2025-05-01", "hrTSS": 40.0, "distance_km": 5.0, "ef": 0.018, "source": "biosystems_strava",
+         "strava_activity_id": 11, "strava_efforts": {"5K": 1500, "1K": 290}},
+        {"date": "2025-05-03", "hrTSS": 20.0, "distance_km": 2.0, "activity_name": "Shakeout"},
+        {"date": "2025-05-07", "hrTSS": 65.0, "distance_km": 12.0, "ef": 0.019, "avg_pace_min_per_km": None,
+         "source": "strava_summary_estimate", "strava_efforts": {"5K": 1450, "bad": "n/a"}},
+    ])
+
+
+def test_history_frame_is_typed_and_matches_load_history():
+    _seed_frame_history()
+    frame = hist_mod.load_history_frame()
+
+    assert list(frame.columns) == list(hist_mod.FRAME_COLUMNS)
+    assert str(frame["date"].dtype).startswith("datetime64")
+    assert all(frame[c].dtype == "float64" for c in hist_mod.FLOAT_COLUMNS)
+    assert frame["strava_activity_id"].tolist()[0] == 11
+    entries = hist_mod.load_history()
+    assert [entries[i]["date"] for i in frame.index] == frame["date"].dt.strftime("%Y-%m-%d").tolist()
+    assert frame["avg_pace_min_per_km"].isna().all()
+
+
+def test_history_frame_filters_and_projection():
+    _seed_frame_history()
+    frame = hist_mod.load_history_frame(columns=["date", "hrTSS"], since="2025-05-02", min_dist=3.0)
+    assert list(frame.columns) == ["date", "hrTSS"]
+    assert frame["hrTSS"].tolist() == [65.0]
+    assert list(frame.index) == [2]
+
+    assert len(hist_mod.load_history_frame(min_dist=0)) == 3
+    assert hist_mod.load_history_frame(source="biosystems_strava")["hrTSS"].tolist() == [40.0]
+
+
+def test_history_frame_mirror_serves_fresh_process(isolated_history, monkeypatch):
+    _seed_frame_history()
+    expected = hist_mod.load_history_frame(since="2025-05-02")
+    assert (isolated_history / "history.parquet").exists()
+
+    # A new process: no in-process frame, and the JSONL must not be re-parsed
+    monkeypatch.setattr(hist_mod, "_frame_cache", None)
+    monkeypatch.setattr(hist_mod, "_snapshot", lambda path: pytest.fail("history re-parsed"))
+    mirrored = hist_mod.load_history_frame(since="2025-05-02")
+    assert mirrored.equals(expected)
+    assert mirrored.index.equals(expected.index)
+
+
+def test_history_frame_mirror_rebuilt_after_append(monkeypatch):
+    _seed_frame_history()
+    assert len(hist_mod.load_history_frame()) == 3
+    hist_mod.append_run({"date": "2025-05-09", "hrTSS": 30.0, "distance_km": 6.0})
+    monkeypatch.setattr(hist_mod, "_frame_cache", None)
+    assert hist_mod.load_history_frame()["hrTSS"].tolist() == [40.0, 20.0, 65.0, 30.0]
+
+
+def test_history_frame_empty_history():
+    frame = hist_mod.load_history_frame(columns=["date", "ef"], since="2025-01-01")
+    assert frame.empty and list(frame.columns) == ["date", "ef"]
+
+
+def test_prefer_frames_once_history_is_large(monkeypatch):
+    assert not hist_mod.prefer_frames()  # no history yet
+    _seed_frame_history()
+    assert not hist_mod.prefer_frames()
+    monkeypatch.setattr(hist_mod, "FRAME_MIN_BYTES", hist_mod.history_path().stat().st_size)
+    assert hist_mod.prefer_frames()
+
+
+def test_efforts_frame_long_format():
+    _seed_frame_history()
+    efforts = hist_mod.load_efforts_frame()
+    assert sorted(zip(efforts.index, efforts["distance"], efforts["elapsed_s"])) == [
+        (0, "1K", 290), (0, "5K", 1500), (2, "5K", 1450),
+    ]
+    five_k = hist_mod.load_efforts_frame(since="2025-05-02", distances=["5K"])
+    assert five_k["elapsed_s"].tolist() == [1450]
+
+
 # ---------------------------------------------------------------------------
 # detect_block_bests
 # ---------------------------------------------------------------------------
@@ -187,3 +326,103 @@ def test_detect_block_bests_window_days_restricts_history():
     r = results[0]
     assert r["is_new_best"] is True
     assert r["prev_best_s"] is None
+
+
+# ---------------------------------------------------------------------------
+# Strava sync cursor
+# ---------------------------------------------------------------------------
+
+
+def test_load_sync_cursor_absent_returns_none():
+    assert hist_mod.load_sync_cursor() is None
+
+
+def test_save_and_load_sync_cursor_roundtrip(isolated_history):
+    hist_mod.save_sync_cursor("2025-06-01T07:30:00Z", 123)
+    cursor = hist_mod.load_sync_cursor()
+    assert cursor["start_date"] == "2025-06-01T07:30:00Z"
+    assert cursor["activity_id"] == 123
+    assert (isolated_history / "strava_cursor.json").exists()
+
+
+def test_load_sync_cursor_corrupt_file_returns_none(isolated_history):
+    (isolated_history / "strava_cursor.json").write_text("{not json")
+    assert hist_mod.load_sync_cursor() is None
+
+
+def test_advance_sync_cursor_never_moves_backwards():
+    hist_mod.advance_sync_cursor("2025-06-02T07:00:00Z", 200)
+    hist_mod.advance_sync_cursor("2025-06-01T07:00:00Z", 999)
+    assert hist_mod.load_sync_cursor()["activity_id"] == 200
+
+    hist_mod.advance_sync_cursor("2025-06-02T07:00:00Z", 201)  # same second, higher id
+    assert hist_mod.load_sync_cursor()["activity_id"] == 201
+
+
+def test_is_after_cursor_disambiguates_same_second_by_id():
+    cursor = {"start_date": "2025-06-01T07:00:00Z", "activity_id": 50}
+    assert hist_mod.is_after_cursor({"id": 51, "start_date": "2025-06-01T07:00:00Z"}, cursor)
+    assert not hist_mod.is_after_cursor({"id": 50, "start_date": "2025-06-01T07:00:00Z"}, cursor)
+    assert not hist_mod.is_after_cursor({"id": 99, "start_date": "2025-05-31T07:00:00Z"}, cursor)
+    assert hist_mod.is_after_cursor({"id": 1, "start_date": "2025-06-02T07:00:00Z"}, None)
+
+
+# ---------------------------------------------------------------------------
+# append_runs — batch writes
+# ---------------------------------------------------------------------------
+
+
+def test_append_runs_reports_insert_and_replace_status():
+    hist_mod.append_run({"date": "2025-05-01", "hrTSS": 40.0})
+    statuses = hist_mod.append_runs([
+        {"date": "2025-05-01", "hrTSS": 45.0},
+        {"date": "2025-05-02", "hrTSS": 50.0, "strava_activity_id": 7},
+        {"date": "2025-05-02", "hrTSS": 55.0, "strava_activity_id": 7},  # dup within batch
+        {"hrTSS": 10.0},  # no date
+    ])
+    assert statuses == ["replaced", "inserted", "replaced", "skipped"]
+
+    entries = hist_mod.load_history()
+    assert [(e["date"], e["hrTSS"]) for e in entries] == [("2025-05-01", 45.0), ("2025-05-02", 55.0)]
+
+
+def test_append_runs_writes_once_and_leaves_no_temp_file(isolated_history, monkeypatch):
+    writes = []
+    real_write = hist_mod._write_history
+    monkeypatch.setattr(hist_mod, "_write_history", lambda entries: (writes.append(len(entries)), real_write(entries)))
+
+    hist_mod.append_runs([{"date": f"2025-05-{d:02d}", "hrTSS": 30.0} for d in range(1, 11)])
+    assert writes == [10]
+    assert len(hist_mod.load_history()) == 10
+    assert not list(isolated_history.glob("*.tmp"))
+
+
+def test_append_runs_empty_batch_is_noop(isolated_history):
+    assert hist_mod.append_runs([]) == []
+    assert not (isolated_history / "history.jsonl").exists()
+
+
+def test_backfill_from_strava_commits_in_chunks(monkeypatch):
+    import biosystems.ingestion.strava as strava_mod
+    from biosystems.models import ZoneConfig
+
+    summaries = [
+        {
+            "start_date_local": f"2025-04-{d:02d}T07:00:00Z",
+            "average_heartrate": 150,
+            "moving_time": 1800,
+            "distance": 5000,
+            "name": f"Run {d}",
+        }
+        for d in range(1, 6)
+    ]
+    monkeypatch.setattr(strava_mod, "fetch_recent_runs", lambda n, access_token=None: summaries)
+    calls = []
+    real = hist_mod.append_runs
+    monkeypatch.setattr(hist_mod, "append_runs", lambda entries: (calls.append(len(entries)), real(entries))[1])
+
+    zc = ZoneConfig(resting_hr=50, threshold_hr=180, max_hr=200, zones={})
+    added = hist_mod.backfill_from_strava(5, zc, access_token="tok", chunk_size=2)
+    assert len(added) == 5
+    assert calls == [2, 2, 1]
+    assert len(hist_mod.load_history()) == 5
@@ -0,0 +1,110 @@
+"""
+Tests for src/biosystems/profiling.py
+
+Covers: markers are inert without an active profile, nested stages are keyed
+by path with call counts and allocation peaks, one profile per process, and
+the CLI's --profile / --profile-out options plus the API hook on the Strava
+report path (Strava HTTP replaced by synthetic streams).
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+import biosystems.ingestion.strava as strava_mod
+from biosystems import api, profiling
+from biosystems.cli import app
+from biosystems.testing.synthetic import synthetic_streams
+
+runner = CliRunner()
+
+
+@profiling.profiled("work")
+def _work(n: int) -> int:
+    with profiling.stage("alloc"):
+        block = bytearray(n)
+    return len(block)
+
+
+def test_markers_are_inert_without_a_profile():
+    assert profiling.stage("a") is profiling.stage("b")
+    assert _work(10) == 10
+    assert _work.__name__ == "_work"
+
+
+def test_nested_stages_calls_and_peaks():
+    with profiling.profile(memory=True, label="t") as prof:
+        _work(4_000_000)
+        _work(1_000)
+        with profiling.stage("idle"):
+            pass
+    report = prof.report()
+    stages = {s["stage"]: s for s in report["stages"]}
+
+    assert report["label"] == "t"
+    assert list(stages) == ["work/alloc", "work", "idle"]
+    assert stages["work"]["calls"] == 2 and stages["work/alloc"]["calls"] == 2
+    assert stages["work/alloc"]["peak_alloc_bytes"] >= 4_000_000
+    assert stages["work"]["peak_alloc_bytes"] >= 4_000_000
+    assert stages["idle"]["peak_alloc_bytes"] < 100_000
+    assert report["peak_alloc_bytes"] >= 4_000_000
+    assert report["wall_s"] >= stages["work"]["wall_s"] >= stages["work/alloc"]["wall_s"]
+
+    with profiling.profile() as prof:
+        _work(10)
+    assert prof.report()["stages"][0]["peak_alloc_bytes"] is None  # memory is opt-in
+
+
+def test_one_profile_at_a_time():
+    with profiling.profile():
+        with pytest.raises(RuntimeError, match="already active"):
+            with profiling.profile():
+                pass
+    with profiling.profile():  # released after the first one ends
+        pass
+
+
+@pytest.fixture
+def fake_strava(monkeypatch):
+    def fake_streams(activity_id, access_token=None):
+        streams = synthetic_streams(1800, seed=activity_id)
+        del streams["latlng"]  # no GPS → no weather lookup
+        return strava_mod.parse_strava_streams(streams, "2025-06-01T06:00:00Z", activity_id), {"best_efforts": []}
+
+    monkeypatch.setattr(strava_mod, "_refresh_access_token", lambda: "tok")
+    monkeypatch.setattr(strava_mod, "fetch_activity_streams", fake_streams)
+
+
+def _stage_names(report):
+    return {s["stage"]: s["calls"] for s in report["stages"]}
+
+
+def test_cli_profile_breakdown(fake_strava, tmp_path):
+    plain = runner.invoke(app, ["strava", "42", "--json"])
+    result = runner.invoke(app, ["--profile", "strava", "43", "--json"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout).keys() == json.loads(plain.stdout).keys()
+
+    report = json.loads(result.stderr)
+    calls = _stage_names(report)
+    assert report["label"] == "strava"
+    for name in ("strava.auth", "strava.fetch", "walk_detection", "wellness",
+                 "build_run_report", "history.write", "output"):
+        assert calls[name] == 1, name
+    assert calls["build_run_report/run_metrics"] == 2
+
+    out = tmp_path / "profile.json"
+    result = runner.invoke(app, ["--profile-out", str(out), "summary", "--json"])
+    assert result.exit_code == 0 and result.stderr == ""
+    assert json.loads(out.read_text())["label"] == "summary"
+
+
+def test_api_profile_hook(fake_strava):
+    with api.profile() as prof:
+        api.run_report(44, persist=False)
+    calls = _stage_names(prof.report())
+    assert "history.write" not in calls
+    assert calls["build_run_report"] == 1 and calls["output"] == 1
@@ -0,0 +1,139 @@
+"""
+Tests for src/biosystems/analytics/rollups.py
+
+Covers: accumulator add/discard/merge, rollups patched by append_runs
+matching a full rebuild (including replacements that invalidate min/max),
+staleness detection, and filter handling versus the frame and per-entry
+fallbacks.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+import biosystems.analytics.history as hist_mod
+import biosystems.analytics.rollups as rollups_mod
+from biosystems.analytics.rollups import Accumulator, HistoryRollups
+
+
+@pytest.fixture(autouse=True)
+def isolated_history(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+    monkeypatch.setattr(rollups_mod, "_rollup_cache", None)
+    yield tmp_path
+
+
+def _entry(day, activity_id, **fields):
+    entry = {"date": day, "strava_activity_id": activity_id, "hrTSS": 40.0, "distance_km": 6.0}
+    entry.update(fields)
+    return entry
+
+
+def _tables(rollups: HistoryRollups):
+    """Rounded, comparable form of the rollup tables."""
+    return {
+        grain: {
+            period: {
+                cell: {m: [acc.count, round(acc.total, 9), acc.min, acc.max] for m, acc in accs.items()}
+                for cell, accs in cells.items()
+            }
+            for period, cells in rollups.tables[grain].items()
+        }
+        for grain in rollups.tables
+    }
+
+
+def test_accumulator_add_discard_merge():
+    acc = Accumulator()
+    for x in (3.0, 1.0, 2.0):
+        acc.add(x)
+    assert (acc.count, acc.total, acc.min, acc.max, acc.mean) == (3, 6.0, 1.0, 3.0, 2.0)
+
+    assert acc.discard(2.0) is True  # interior value: min/max still exact
+    assert acc.discard(3.0) is False  # was the max
+    other = Accumulator()
+    other.add(5.0)
+    acc.merge(other)
+    assert (acc.count, acc.total, acc.max) == (2, 6.0, 5.0)
+    assert Accumulator.from_json(acc.to_json()) == acc
+    assert Accumulator().mean is None and Accumulator().best is None
+
+
+def test_append_runs_patches_rollups_like_a_full_rebuild():
+    rng = random.Random(3)
+    days = [f"2025-{m:02d}-{d:02d}" for m in (1, 2, 3) for d in (1, 5, 12, 20, 28)]
+    for batch in range(6):
+        hist_mod.append_runs([
+            _entry(
+                rng.choice(days), rng.randint(1, 25),
+                ef=rng.choice([0, None, round(rng.uniform(0.015, 0.02), 5)]),
+                distance_km=round(rng.uniform(1, 20), 1),
+                decoupling_pct=rng.choice([None, round(rng.uniform(-3, 9), 2)]),
+                source=rng.choice(["biosystems_strava", "strava_summary_estimate"]),
+            )
+            for _ in range(8)
+        ])
+
+    stored = json.loads(rollups_mod.rollups_path().read_text())
+    patched = HistoryRollups.from_json(stored)
+    rebuilt = HistoryRollups.build(hist_mod.load_history())
+    assert _tables(patched) == _tables(rebuilt)
+    assert stored["snapshot"] == rollups_mod._current_tag()
+
+
+def test_replacing_a_run_moves_it_between_periods():
+    hist_mod.append_runs([_entry("2025-03-31", 1, ef=0.02), _entry("2025-03-03", 2, ef=0.018)])
+    hist_mod.append_run(_entry("2025-04-01", 1, ef=0.019))
+
+    months = rollups_mod.load_rollups().periods("month")
+    assert list(months) == ["2025-03", "2025-04"]
+    assert months["2025-03"]["ef"].best == 0.018
+    assert months["2025-04"]["distance_km"].count == 1
+
+
+def test_stale_rollups_rebuilt_from_history(isolated_history):
+    hist_mod.append_run(_entry("2025-03-03", 1))
+    # History rewritten behind the rollups' back
+    (isolated_history / "history.jsonl").write_text(
+        json.dumps(_entry("2025-03-03", 1)) + "\n" + json.dumps(_entry("2025-03-04", 2)) + "\n"
+    )
+    assert rollups_mod.load_rollups().periods("month")["2025-03"]["distance_km"].count == 2
+    assert json.loads(rollups_mod.rollups_path().read_text())["snapshot"] == rollups_mod._current_tag()
+
+
+def test_periods_filters_and_fallback():
+    hist_mod.append_runs([
+        _entry("2025-03-03", 1, distance_km=2.5, source="a"),  # Monday of W10
+        _entry("2025-03-05", 2, distance_km=3.0, source="b"),
+        _entry("2025-03-12", 3, distance_km=None, source="a"),
+        _entry("2025-04-02", 4, distance_km=60.0, source="a"),
+    ])
+    rollups = rollups_mod.load_rollups()
+
+    counts = lambda periods: {p: a["distance_km"].count for p, a in periods.items()}  # noqa: E731
+    assert counts(rollups.periods("month", min_dist=3)) == {"2025-03": 1, "2025-04": 1}
+    assert counts(rollups.periods("month", min_dist=0)) == {"2025-03": 3, "2025-04": 1}
+    assert counts(rollups.periods("week", source="a", since="2025-03-10")) == {"2025-W11": 1, "2025-W14": 1}
+    assert counts(rollups.periods("all")) == {"all": 4}
+
+    # Filters that split a cell are declined …
+    assert rollups.periods("month", min_dist=2.5) is None
+    assert rollups.periods("month", since="2025-03-05") is None
+    assert rollups.periods("week", min_dist=51) is None
+    # … and the frame fallback agrees where both apply
+    frame = hist_mod.load_history_frame(columns=["date", *rollups_mod.METRICS], min_dist=3, source="a")
+    assert counts(rollups_mod.frame_accumulators(frame, "month")) == counts(
+        rollups.periods("month", min_dist=3, source="a")
+    )
+    # … as does the per-entry fallback, including filters the cells cannot answer
+    entries = hist_mod.load_history()
+    assert counts(rollups_mod.entry_accumulators(entries, "month", min_dist=3, source="a")) == counts(
+        rollups.periods("month", min_dist=3, source="a")
+    )
+    frame = hist_mod.load_history_frame(columns=["date", *rollups_mod.METRICS], since="2025-03-05", min_dist=2.5)
+    assert counts(rollups_mod.entry_accumulators(entries, "week", since="2025-03-05", min_dist=2.5)) == counts(
+        rollups_mod.frame_accumulators(frame, "week")
+    ) == {"2025-W10": 1, "2025-W14": 1}
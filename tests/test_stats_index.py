@@ -0,0 +1,89 @@
+"""
+Tests for src/biosystems/analytics/stats_index.py
+
+Covers: percentile ranks and windowed means/counts agree with the linear
+definitions on random histories, inclusion rules (zero EF/TSS/pace skipped,
+zero decoupling kept, undated runs outside every window), and empty or
+unknown metrics.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from statistics import mean, stdev
+
+import pytest
+
+from biosystems.analytics.stats_index import HistoryStatsIndex
+
+
+def _entries(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=rng.randrange(200))).isoformat(),
+            "ef": rng.choice([None, 0.0, round(rng.uniform(0.014, 0.022), 5)]),
+            "decoupling_pct": rng.choice([None, 0.0, round(rng.uniform(-2, 12), 2)]),
+            "hrTSS": round(rng.uniform(20, 150), 1),
+        }
+        for _ in range(n)
+    ]
+
+
+def test_matches_linear_definitions():
+    entries = _entries(400)
+    index = HistoryStatsIndex(entries)
+    efs = sorted(e["ef"] for e in entries if e["ef"])
+
+    assert index.count("ef") == len(efs)
+    assert index.mean("ef") == pytest.approx(mean(efs))
+    assert index.std("ef") == pytest.approx(stdev(efs))
+    assert index.best("ef") == max(efs)
+    assert list(index.sorted_values("ef")) == efs
+
+    queries = [0.0, 0.014, efs[0], efs[len(efs) // 2], 0.0185, efs[-1], 0.03]
+    expected = [round(sum(1 for x in efs if x < q) / len(efs) * 100) for q in queries]
+    assert [index.percentile_rank("ef", q) for q in queries] == expected
+    assert index.percentile_ranks("ef", queries) == expected
+
+    for since, until in [("2025-03-01", None), (None, "2025-02-15"), ("2025-04-10", "2025-05-01"), ("2026-01-01", None)]:
+        window = [
+            e["decoupling_pct"] for e in entries
+            if e["decoupling_pct"] is not None
+            and (since is None or e["date"] >= since)
+            and (until is None or e["date"] <= until)
+        ]
+        assert index.window_count("decoupling_pct", since=since, until=until) == len(window)
+        if window:
+            assert index.window_mean("decoupling_pct", since=since, until=until) == pytest.approx(mean(window))
+        else:
+            assert index.window_mean("decoupling_pct", since=since, until=until) is None
+
+
+def test_inclusion_rules_and_undated_runs():
+    index = HistoryStatsIndex([
+        {"date": "2025-03-01", "ef": 0.0, "decoupling_pct": 0.0, "hrTSS": 0},
+        {"date": "2025-03-02", "ef": 0.02, "decoupling_pct": float("nan"), "avg_pace_min_per_km": 5.5},
+        {"date": "not a date", "ef": 0.01, "decoupling_pct": 4.0},
+        {"ef": True},
+    ])
+    assert index.count("ef") == 2
+    assert index.count("decoupling_pct") == 2  # 0.0 kept, NaN skipped
+    assert index.count("hrTSS") == 0
+    assert index.mean("ef") == pytest.approx(0.015)
+    assert index.window_count("ef") == 1  # the undated run is in no window
+    assert index.window_mean("ef", until="2025-12-31") == pytest.approx(0.02)
+    assert index.window_mean("decoupling_pct", since="2025-03-01", until="2025-03-01") == 0.0
+
+
+def test_empty_and_unknown_metrics():
+    index = HistoryStatsIndex([])
+    assert index.count("ef") == 0
+    assert index.mean("ef") is None and index.std("ef") is None and index.best("ef") is None
+    assert index.percentile_rank("ef", 0.02) == 50
+    assert index.percentile_ranks("ef", [0.01, 0.02]) == [50, 50]
+    assert index.window_mean("hrTSS", since="2025-01-01") is None
+    with pytest.raises(KeyError, match="not indexed"):
+        index.percentile_rank("avg_hr", 150)
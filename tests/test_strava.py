@@ -1,7 +1,7 @@
 """
 Tests for src/biosystems/ingestion/strava.py
 
-Covers: credential validation, parse_strava_streams, fetch_activity_streams
+Covers: credential validation, access-token caching, parse_strava_streams, fetch_activity_streams
 (mocked HTTP), fetch_recent_runs filtering, fetch_runs_since pagination,
 and edge cases (missing streams, rate-limit HTML response, no heartrate data).
 """
@@ -82,6 +82,26 @@ def test_get_credentials_returns_tuple(monkeypatch):
     assert result == ("cid", "csec", "rtok")
 
 
+def test_refresh_access_token_reused_until_near_expiry(monkeypatch):
+    monkeypatch.setenv("STRAVA_CLIENT_ID", "cid")
+    monkeypatch.setenv("STRAVA_CLIENT_SECRET", "csec")
+    monkeypatch.setenv("STRAVA_REFRESH_TOKEN", "rtok-cache-test")
+    monkeypatch.setattr(strava_mod, "_token_cache", {})
+    now = 1_750_000_000.0
+    monkeypatch.setattr(strava_mod.time, "time", lambda: now)
+    responses = [
+        _mock_response({"access_token": "a1", "expires_at": now + 3600}),
+        _mock_response({"access_token": "a2", "expires_at": now + 7200}),
+    ]
+    with patch("requests.post", side_effect=responses) as post:
+        assert strava_mod._refresh_access_token() == "a1"
+        assert strava_mod._refresh_access_token() == "a1"
+        assert post.call_count == 1
+        now += 3600 - strava_mod._TOKEN_EXPIRY_MARGIN_S  # inside the refresh margin
+        assert strava_mod._refresh_access_token() == "a2"
+        assert post.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # parse_strava_streams
 # ---------------------------------------------------------------------------
@@ -141,6 +161,32 @@ def test_parse_strava_streams_latlng_unpacked():
     assert df["longitude"].iloc[2] == pytest.approx(-122.2)
 
 
+def test_parse_strava_streams_latlng_with_gaps_is_nan():
+    streams = _minimal_streams(n=3)
+    streams["latlng"] = [[37.1, -122.0], None, []]
+    df = strava_mod.parse_strava_streams(streams, start_date="2025-05-01T10:00:00Z")
+    assert df["latitude"].iloc[0] == pytest.approx(37.1)
+    assert df["latitude"].iloc[1:].isna().all()
+    assert df["longitude"].iloc[1:].isna().all()
+
+
+def test_parse_strava_streams_schema_dtypes_and_order():
+    streams = _minimal_streams(n=4)
+    streams["velocity_smooth"] = [0.0, 0.0, 3.0, 0.0]
+    streams["moving"] = [False, True, True, True]
+    df = strava_mod.parse_strava_streams(streams, start_date="2025-05-01T10:00:00Z")
+    assert list(df.columns) == [
+        "hr", "cadence", "ele", "latitude", "longitude", "moving",
+        "speed_mps", "pace_sec_km", "dist", "distance_cumulative_km", "dt",
+    ]
+    assert df["moving"].dtype == bool
+    assert all(df[c].dtype == np.float64 for c in df.columns if c != "moving")
+    # Leading zero-speed points are back-filled; trailing ones stay NaN
+    assert df["speed_mps"].tolist()[:3] == [3.0, 3.0, 3.0]
+    assert np.isnan(df["speed_mps"].iloc[3])
+    assert df["pace_sec_km"].iloc[0] == pytest.approx(1000.0 / 3.0)
+
+
 def test_parse_strava_streams_distance_cumulative():
     streams = _minimal_streams(n=4)
     streams["distance"] = [0.0, 100.0, 250.0, 400.0]
@@ -273,6 +319,20 @@ def test_fetch_runs_since_passes_after_epoch():
     assert params["after"] > 1_700_000_000
 
 
+def test_fetch_runs_after_forwards_epoch_verbatim():
+    with patch("requests.get", return_value=_mock_response([])) as mock_get:
+        strava_mod.fetch_runs_after(1_750_000_000, access_token="tok")
+    assert mock_get.call_args[1]["params"]["after"] == 1_750_000_000
+
+
+def test_fetch_runs_after_honours_per_page():
+    batch = [{"id": i, "sport_type": "Run"} for i in range(10)]
+    with patch("requests.get", side_effect=[_mock_response(batch), _mock_response([])]) as mock_get:
+        result = strava_mod.fetch_runs_after(0, access_token="tok", per_page=10)
+    assert mock_get.call_count == 2
+    assert len(result) == 10
+
+
 # ---------------------------------------------------------------------------
 # fetch_activity_streams — mocked HTTP (2-call flow)
 # ---------------------------------------------------------------------------
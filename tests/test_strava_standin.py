@@ -0,0 +1,115 @@
+"""
+Tests for src/biosystems/testing/strava_standin.py
+
+Exercises the real Strava client (``biosystems.ingestion.strava``) against
+the local stand-in server: token refresh, pagination, detail + streams, and
+429 / 5xx retry behaviour.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+import biosystems.ingestion.strava as strava_mod
+from biosystems.testing import StravaStandIn, synthetic_activity
+
+
+@pytest.fixture
+def standin_env(monkeypatch):
+    """Start a small stand-in and point the Strava client at it."""
+    monkeypatch.setenv("STRAVA_CLIENT_ID", "id")
+    monkeypatch.setenv("STRAVA_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("STRAVA_REFRESH_TOKEN", "refresh")
+    monkeypatch.setattr(strava_mod.time, "sleep", lambda s: None)
+
+    def _start(**kwargs):
+        kwargs.setdefault("n_activities", 5)
+        kwargs.setdefault("n_points", 300)
+        kwargs.setdefault("start", datetime(2025, 6, 1, 7, tzinfo=timezone.utc))
+        api = StravaStandIn(**kwargs).start()
+        monkeypatch.setenv("STRAVA_API_ROOT", api.root_url)
+        started.append(api)
+        return api
+
+    started: list[StravaStandIn] = []
+    yield _start
+    for api in started:
+        api.stop()
+
+
+def test_synthetic_activity_payload_shapes():
+    summary, detail, streams = synthetic_activity(7, datetime(2025, 6, 1, tzinfo=timezone.utc), n_points=100)
+    assert summary["id"] == detail["id"] == 7
+    assert summary["start_date"] == "2025-06-01T00:00:00Z"
+    assert len(streams["time"]["data"]) == 100
+    assert len(streams["latlng"]["data"][0]) == 2
+
+
+def test_token_refresh_against_standin(standin_env):
+    standin_env()
+    assert strava_mod._refresh_access_token() == "standin-access-token"
+
+
+def test_fetch_runs_since_paginates_standin(standin_env):
+    api = standin_env(n_activities=5)
+    runs = strava_mod.fetch_runs_after(0, access_token="tok", per_page=2)
+    assert [r["id"] for r in runs] == api.activity_ids
+    assert api.stats()["by_route"]["list"] == 3
+
+
+def test_fetch_runs_since_respects_after_filter(standin_env):
+    standin_env(n_activities=5)
+    runs = strava_mod.fetch_runs_since("2025-06-03", access_token="tok")
+    assert sorted(r["start_date"][:10] for r in runs) == ["2025-06-03", "2025-06-04", "2025-06-05"]
+
+
+def test_fetch_activity_streams_from_standin(standin_env):
+    api = standin_env(n_points=300)
+    df, meta = strava_mod.fetch_activity_streams(api.activity_ids[0], access_token="tok")
+    assert len(df) == 300
+    assert df["latitude"].notna().all()
+    assert meta["device_name"] == "Stand-in Device"
+    assert meta["best_efforts"]
+
+
+def test_rate_limit_429_retries_then_raises(standin_env):
+    api = standin_env(rate_limit=1, rate_window_s=3600)
+    strava_mod.fetch_runs_since("2025-01-01", access_token="tok")  # within budget
+    with pytest.raises(requests.HTTPError):
+        strava_mod.fetch_runs_since("2025-01-01", access_token="tok")
+    # 1 initial attempt + 3 retries, all rejected while the window is exhausted
+    assert api.stats()["by_status"] == {200: 1, 429: 4}
+
+
+def test_injected_5xx_is_retried_then_succeeds(standin_env):
+    api = standin_env(fail_every=2)
+    strava_mod.fetch_runs_since("2025-01-01", access_token="tok")  # call 1 OK
+    runs = strava_mod.fetch_runs_since("2025-01-01", access_token="tok")  # call 2 → 503, retry OK
+    assert len(runs) == 5
+    assert api.stats()["by_status"][503] == 1
+
+
+def test_unknown_activity_returns_404(standin_env):
+    standin_env()
+    with pytest.raises(requests.HTTPError):
+        strava_mod.fetch_activity_efforts(42, access_token="tok")
+
+
+def test_from_recording_roundtrip(tmp_path):
+    import json
+
+    summary, detail, streams = synthetic_activity(11, datetime(2025, 6, 1, tzinfo=timezone.utc), n_points=50)
+    (tmp_path / "activities").mkdir()
+    (tmp_path / "streams").mkdir()
+    (tmp_path / "activities.json").write_text(json.dumps([summary]))
+    (tmp_path / "activities" / "11.json").write_text(json.dumps(detail))
+    (tmp_path / "streams" / "11.json").write_text(json.dumps(streams))
+
+    with StravaStandIn.from_recording(tmp_path) as api:
+        resp = requests.get(f"{api.root_url}/api/v3/activities/11/streams", timeout=5)
+    assert resp.status_code == 200
+    assert resp.headers["X-RateLimit-Usage"] == "1,1"
+    assert len(resp.json()["time"]["data"]) == 50
@@ -0,0 +1,68 @@
+"""
+Tests for src/biosystems/testing/synthetic.py
+
+Covers: generators are deterministic per seed, every activity format parses
+back to the same run (FIT exactly to ``synthetic_fit_frame``), and history
+and wellness output have the shape the history file and wellness store use.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from biosystems.ingestion.fit import parse_fit
+from biosystems.ingestion.gpx import parse_gpx
+from biosystems.ingestion.strava import parse_strava_streams
+from biosystems.testing import synthetic
+from biosystems.wellness.habitdash import COLUMN_MAP
+
+
+def test_deterministic_per_seed():
+    pd.testing.assert_frame_equal(synthetic.synthetic_samples(900, seed=3), synthetic.synthetic_samples(900, seed=3))
+    assert synthetic.synthetic_fit(900, seed=3) == synthetic.synthetic_fit(900, seed=3)
+    assert synthetic.synthetic_gpx(900, seed=3) == synthetic.synthetic_gpx(900, seed=3)
+    assert synthetic.synthetic_history(50, seed=3) == synthetic.synthetic_history(50, seed=3)
+    assert not synthetic.synthetic_samples(900, seed=3).equals(synthetic.synthetic_samples(900, seed=4))
+
+
+def test_activity_formats_parse_to_the_same_run(tmp_path):
+    samples = synthetic.synthetic_samples(1800, seed=5)
+    assert samples["hr"].between(90, 195).all()
+    assert (samples["distance_m"].diff().dropna() > 0).all()
+    assert ((samples["cadence"] < 140) == (samples["speed_mps"] < 2.0)).mean() > 0.99  # the walk break
+
+    fit_path = tmp_path / "run.fit"
+    fit_path.write_bytes(synthetic.synthetic_fit(1800, seed=5))
+    pd.testing.assert_frame_equal(parse_fit(fit_path), synthetic.synthetic_fit_frame(1800, seed=5))
+
+    gpx_path = tmp_path / "run.gpx"
+    gpx_path.write_text(synthetic.synthetic_gpx(1800, seed=5))
+    gpx = parse_gpx(gpx_path)
+    assert len(gpx) == 1800
+    np.testing.assert_array_equal(gpx["hr"].to_numpy(), samples["hr"].to_numpy())
+    assert gpx["dist"].sum() == pytest.approx(samples["distance_m"].iloc[-1], rel=0.01)
+
+    streams = parse_strava_streams(synthetic.synthetic_streams(1800, seed=5), "2025-06-01T06:00:00Z", 1)
+    pd.testing.assert_index_equal(streams.index, samples.index, check_exact=False, exact=False)
+    np.testing.assert_allclose(streams["cadence"], samples["cadence"] // 2 * 2)
+
+
+def test_history_and_wellness_shapes():
+    entries = synthetic.synthetic_history(400, seed=1)
+    assert [e["date"] for e in entries] == sorted(e["date"] for e in entries)
+    assert entries[-1]["date"] == synthetic.DEFAULT_END.isoformat()
+    assert len({e["strava_activity_id"] for e in entries}) == 400
+    assert all(0.012 < e["ef"] < 0.03 and e["hrTSS"] > 0 for e in entries)
+    assert all(set(e["strava_efforts"]) >= {"400m", "1K"} for e in entries)
+
+    spread = synthetic.synthetic_history(20, seed=1, span_days=30)
+    assert spread[0]["date"] >= "2025-12-02"
+
+    wellness = synthetic.synthetic_wellness(730, seed=1)
+    assert list(wellness.columns) == list(COLUMN_MAP.values())
+    assert wellness.index.name == "date" and len(wellness) == 730
+    assert wellness.index[-1] == pd.Timestamp(synthetic.DEFAULT_END)
+    assert 0 < wellness["hrv_rmssd"].isna().mean() < 0.1
+    assert wellness["hrv_rmssd"].corr(wellness["resting_hr_whoop"]) < 0
@@ -110,3 +110,322 @@ class TestSevenDayMean:
         assert ctx is not None
         # rhr columns don't exist, should be None
         assert ctx.get("rhr_7d_mean") is None
+
+
+class TestFrameMemoization:
+    """The parquet is read once per file version, calibration once per frame."""
+
+    @staticmethod
+    def _write(tmp_path, monkeypatch, n_days=40, rhr=55.0):
+        import os
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        dates = pd.date_range("2025-01-01", periods=n_days, freq="D")
+        df = pd.DataFrame({
+            "resting_hr_garmin": np.full(n_days, rhr),
+            "sleep_duration_s_garmin": np.full(n_days, 7.5 * 3600),
+            "body_battery": np.full(n_days, 60.0),
+        }, index=dates)
+        path = tmp_path / "wellness.parquet"
+        df.to_parquet(path)
+        return path, os.stat(path)
+
+    def test_batch_of_dates_reads_once(self, tmp_path, monkeypatch):
+        from biosystems.wellness import analytics
+        from biosystems.wellness import cache as wc
+
+        self._write(tmp_path, monkeypatch)
+        with patch("biosystems.wellness.cache.pd.read_parquet", wraps=pd.read_parquet) as reads, \
+                patch.object(analytics, "calibrate_thresholds", wraps=analytics.calibrate_thresholds) as calib:
+            for d in range(10, 31):
+                assert wc.compute_wellness_context(f"2025-01-{d:02d}")
+                assert wc.get_wellness_for_date(f"2025-01-{d:02d}")
+        assert reads.call_count == 1
+        assert calib.call_count == 1
+
+    def test_file_change_invalidates(self, tmp_path, monkeypatch):
+        import os
+
+        from biosystems.wellness import cache as wc
+
+        path, st = self._write(tmp_path, monkeypatch, rhr=55.0)
+        assert wc.get_wellness_for_date("2025-01-05")["resting_hr_garmin"] == 55.0
+        self._write(tmp_path, monkeypatch, rhr=61.0)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert wc.get_wellness_for_date("2025-01-05")["resting_hr_garmin"] == 61.0
+
+    def test_public_accessor_returns_copy(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+
+        self._write(tmp_path, monkeypatch)
+        df = wc.load_wellness_df()
+        df["resting_hr_garmin"] = 99.0
+        assert wc.get_wellness_for_date("2025-01-05")["resting_hr_garmin"] == 55.0
+
+
+class TestBatchContext:
+    """Batch lookups match the per-date functions and are keyed by date."""
+
+    @staticmethod
+    def _df():
+        dates = pd.date_range("2025-01-01", periods=40, freq="D").delete([20, 21])
+        rng = np.random.default_rng(7)
+        return pd.DataFrame({
+            "hrv_rmssd": rng.normal(60, 6, len(dates)),
+            "resting_hr_garmin": rng.normal(55, 2, len(dates)),
+            "sleep_score": rng.normal(80, 5, len(dates)),
+            "sleep_duration_s_garmin": rng.normal(7.5 * 3600, 1800, len(dates)),
+            "body_battery": rng.normal(60, 8, len(dates)),
+        }, index=dates)
+
+    def test_context_batch_matches_single(self):
+        from biosystems.wellness import cache as wc
+
+        df = self._df()
+        dates = ["2025-01-15", "2025-01-21", "2025-01-22", "2025-02-20", "2024-06-01"]
+        with patch("biosystems.wellness.cache._load_df", return_value=df):
+            batch = wc.compute_wellness_context_batch(dates)
+            single = {d: wc.compute_wellness_context(d) for d in dates}
+        assert list(batch) == dates
+        assert batch == single
+
+    def test_raw_batch_matches_single(self):
+        from biosystems.wellness import cache as wc
+
+        df = self._df()
+        dates = ["2025-01-03", "2025-01-21", "2025-01-03T06:30:00", "2030-01-01"]
+        with patch("biosystems.wellness.cache._load_df", return_value=df):
+            batch = wc.get_wellness_for_dates(dates)
+            assert batch == {d: wc.get_wellness_for_date(d) for d in dates}
+        assert batch["2025-01-21"] == {}
+        assert batch["2025-01-03"]["hrv_rmssd"] == df["hrv_rmssd"].iloc[2]
+
+    def test_enrich_batch(self):
+        from biosystems.models import RunContext
+        from biosystems.wellness import cache as wc
+
+        df = self._df()
+        existing = RunContext(temperature_c=12.0)
+        with patch("biosystems.wellness.cache._load_df", return_value=df):
+            out = wc.enrich_run_context_batch({"2025-01-10": existing, "2025-01-21": existing, "2025-01-11": None})
+        assert out["2025-01-21"] is existing
+        assert out["2025-01-10"].temperature_c == 12.0
+        assert out["2025-01-10"].hrv_rmssd == float(df.loc["2025-01-10", "hrv_rmssd"])
+        assert out["2025-01-10"].rest_hr == round(df.loc["2025-01-10", "resting_hr_garmin"])
+        assert out["2025-01-11"].sleep_score == float(df.loc["2025-01-11", "sleep_score"])
+
+
+class TestIncrementalSync:
+    """sync_wellness requests each metric only from its watermark onward."""
+
+    @staticmethod
+    def _sync(tmp_path, monkeypatch, hd, **kwargs):
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        monkeypatch.setenv("HABITDASH_API_ROOT", hd.root_url)
+        hd.requests.clear()
+        return wc.sync_wellness(api_key="k", **kwargs)
+
+    def test_watermarks_shrink_later_syncs(self, tmp_path, monkeypatch):
+        from datetime import date, timedelta
+
+        from biosystems.testing import HabitDashStandIn
+        from biosystems.wellness import cache as wc
+        from biosystems.wellness.habitdash import COLUMN_MAP, FIELD_IDS
+
+        today = date.today()
+        stale = FIELD_IDS["whoop"]["skin_temp_c"]
+        with HabitDashStandIn(last_days={stale: today - timedelta(days=20)}) as hd:
+            assert self._sync(tmp_path, monkeypatch, hd, days=30) == 31
+            assert {r["date_start"] for r in hd.requests} == {(today - timedelta(days=30)).isoformat()}
+
+            marks = wc.load_watermarks()
+            assert marks["whoop/hrv_rmssd"] == {"last_value": today.isoformat(), "checked": today.isoformat()}
+            assert marks["whoop/skin_temp_c"]["last_value"] == (today - timedelta(days=20)).isoformat()
+
+            # Second sync: every metric (including the stale one) re-requests only the overlap
+            self._sync(tmp_path, monkeypatch, hd, days=30)
+            assert len(hd.requests) == len(COLUMN_MAP)
+            overlap = (today - timedelta(days=wc._OVERLAP_DAYS)).isoformat()
+            assert {r["date_start"] for r in hd.requests} == {overlap}
+
+            # --full ignores the watermarks
+            self._sync(tmp_path, monkeypatch, hd, days=30, full=True)
+            assert {r["date_start"] for r in hd.requests} == {(today - timedelta(days=30)).isoformat()}
+
+        df = wc.load_wellness_df()
+        assert len(df) == 31
+        assert df["skin_temp_c"].last_valid_index() == pd.Timestamp(today - timedelta(days=20))
+
+    def test_failed_metric_keeps_watermark(self, tmp_path, monkeypatch):
+        from biosystems.testing import HabitDashStandIn
+        from biosystems.wellness import cache as wc
+        from biosystems.wellness import habitdash
+
+        real = habitdash.HabitDashClient._fetch_range
+
+        def _flaky(self, field_id, date_start, date_end):
+            if field_id == habitdash.FIELD_IDS["garmin"]["vo2max"]:
+                return None
+            return real(self, field_id, date_start, date_end)
+
+        monkeypatch.setattr(habitdash.HabitDashClient, "_fetch_range", _flaky)
+        with HabitDashStandIn() as hd:
+            self._sync(tmp_path, monkeypatch, hd, days=5)
+        marks = wc.load_watermarks()
+        assert "garmin/vo2max" not in marks
+        assert marks["garmin/body_battery"]["checked"]
+
+
+class TestPartitionedStore:
+    """Monthly partitions: touched-only writes, pruned/projected reads."""
+
+    @staticmethod
+    def _frame(n_days=75):
+        dates = pd.date_range("2025-11-01", periods=n_days, freq="D")
+        rng = np.random.default_rng(3)
+        return pd.DataFrame({
+            "hrv_rmssd": rng.normal(60, 6, n_days),
+            "resting_hr_garmin": rng.normal(55, 2, n_days),
+            "sleep_duration_s_garmin": rng.normal(7.5 * 3600, 1800, n_days),
+            "body_battery": rng.normal(60, 8, n_days),
+        }, index=dates)
+
+    def test_legacy_file_is_imported(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        df = self._frame()
+        df.to_parquet(tmp_path / "wellness.parquet")
+
+        loaded = wc.load_wellness_df()
+        pd.testing.assert_frame_equal(loaded, df, check_names=False, check_freq=False, check_index_type=False)
+        assert sorted(p.name for p in (tmp_path / "wellness").glob("*.parquet")) == [
+            "2025-11.parquet", "2025-12.parquet", "2026-01.parquet",
+        ]
+        assert (tmp_path / "wellness.parquet.migrated").exists()
+        assert not (tmp_path / "wellness.parquet").exists()
+
+    def test_save_rewrites_only_touched_months(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        df = self._frame()
+        wc._save_df(df)
+        store = tmp_path / "wellness"
+        before = {p.name: p.stat().st_mtime_ns for p in store.glob("*.parquet")}
+
+        df.loc["2026-01-05", "body_battery"] = 99.0
+        wc._save_df(df, months={"2026-01"})
+        after = {p.name: p.stat().st_mtime_ns for p in store.glob("*.parquet")}
+        assert after["2025-11.parquet"] == before["2025-11.parquet"]
+        assert after["2025-12.parquet"] == before["2025-12.parquet"]
+        assert after["2026-01.parquet"] != before["2026-01.parquet"]
+
+        wc._frame_cache.clear()
+        assert wc.load_wellness_df().loc["2026-01-05", "body_battery"] == 99.0
+
+    def test_window_reads_only_needed_partitions_and_columns(self, tmp_path, monkeypatch):
+        import pyarrow.parquet as pq
+
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        df = self._frame()
+        wc._save_df(df)
+        wc._frame_cache.clear()
+
+        with patch.object(pq, "read_table", wraps=pq.read_table) as reads:
+            window = wc.get_wellness_window("2025-12-10", days=7, columns=["body_battery"])
+        assert [c.args[0].name for c in reads.call_args_list] == ["2025-12.parquet"]
+        assert reads.call_args_list[0].kwargs["columns"] == ["date", "body_battery"]
+        assert list(window.columns) == ["body_battery"]
+        assert window.index.min() == pd.Timestamp("2025-12-04")
+        assert window.index.max() == pd.Timestamp("2025-12-10")
+        pd.testing.assert_series_equal(
+            window["body_battery"], df.loc["2025-12-04":"2025-12-10", "body_battery"],
+            check_names=False, check_freq=False, check_index_type=False,
+        )
+
+    def test_fitness_columns_projection_matches_full_frame(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+        from biosystems.wellness.analytics import FITNESS_COLUMNS, compute_longitudinal_fitness
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        wc._save_df(self._frame())
+        wc._frame_cache.clear()
+
+        projected = wc.load_wellness_df(columns=FITNESS_COLUMNS)
+        assert list(projected.columns) == ["resting_hr_garmin"]
+        assert compute_longitudinal_fitness(projected) == compute_longitudinal_fitness(
+            wc.load_wellness_df()
+        )
+
+    def test_context_from_persisted_row_without_loading(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        wc._save_df(self._frame())
+        full = wc.compute_wellness_context("2026-01-10")  # builds + persists the feature table
+        wc._frame_cache.clear()
+
+        with patch.object(wc, "_read_partitions", wraps=wc._read_partitions) as reads:
+            fast = wc.compute_wellness_context("2026-01-10")
+        assert reads.call_count == 0
+        assert fast == full
+
+    def test_paths_keep_their_meaning(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        assert wc.wellness_path() == tmp_path / "wellness.parquet"
+        assert wc.wellness_dir() == tmp_path / "wellness"
+
+    def test_read_retries_when_a_writer_replaces_the_store(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        df = self._frame()
+        wc._save_df(df)
+        wc._frame_cache.clear()
+        newer = df.copy()
+        newer.loc["2026-01-05", "body_battery"] = 99.0
+        real = wc._read_partitions
+
+        def racing(manifest, *args):
+            if racing.first:  # a sync publishes a new version mid-read
+                racing.first = False
+                wc._save_df(newer)
+                wc._frame_cache.clear()
+                raise FileNotFoundError("2026-01.parquet")
+            return real(manifest, *args)
+
+        racing.first = True
+        with patch.object(wc, "_read_partitions", racing):
+            loaded = wc.load_wellness_df()
+        assert loaded.loc["2026-01-05", "body_battery"] == 99.0
+
+    def test_concurrent_saves_keep_every_partition(self, tmp_path, monkeypatch):
+        import threading
+
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        df = self._frame()
+        months = ["2025-11", "2025-12", "2026-01"]
+
+        def save(month):
+            for _ in range(5):
+                wc._save_df(df, months={month})
+
+        threads = [threading.Thread(target=save, args=(m,)) for m in months]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        _, manifest = wc._read_manifest()
+        assert sorted(manifest["partitions"]) == months
+        assert manifest["version"] == 15
+        assert not list((tmp_path / "wellness").glob(".*.tmp"))
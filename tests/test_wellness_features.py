@@ -0,0 +1,166 @@
+"""
+Tests for the Wellness Feature Table
+====================================
+
+Vectorized readiness features must match hand-computed values for a small
+frame and stay correct under incremental updates from ``sync_wellness``.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from biosystems.wellness.analytics import calibrate_thresholds, compute_sleep_debt
+from biosystems.wellness.features import (
+    compute_wellness_features,
+    features_path,
+    load_feature_table,
+)
+
+
+def _frame(n_days=60, start="2025-11-01", seed=0, gaps=True):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=n_days, freq="D")
+    if gaps:
+        dates = dates[rng.random(n_days) > 0.15]
+    n = len(dates)
+    return pd.DataFrame({
+        "hrv_rmssd": rng.normal(60, 12, n),
+        "resting_hr_garmin": rng.normal(54, 3, n),
+        "sleep_score": rng.normal(75, 12, n),
+        "sleep_duration_s_garmin": rng.normal(27000, 3000, n),
+        "body_battery": rng.normal(50, 15, n),
+        "avg_stress": rng.normal(35, 10, n),
+        "respiratory_rate_garmin": rng.normal(14, 0.8, n),
+    }, index=dates)
+
+
+def _features(df, targets=None):
+    thresholds = calibrate_thresholds(df)
+    debt = compute_sleep_debt(df, personal_mean_h=thresholds["norms"]["sleep_h_mean"])
+    return compute_wellness_features(df, thresholds, debt, targets=targets)
+
+
+class TestComputeWellnessFeatures:
+    """One vectorized pass gives the per-date readiness context."""
+
+    @staticmethod
+    def _small_frame():
+        # Nine days with 2025-11-05 missing; fallback thresholds apply (no Garmin era yet)
+        dates = pd.to_datetime([
+            "2025-11-01", "2025-11-02", "2025-11-03", "2025-11-04",
+            "2025-11-06", "2025-11-07", "2025-11-08", "2025-11-09", "2025-11-10",
+        ])
+        return pd.DataFrame({
+            "resting_hr_garmin": [50.0, 52, 51, 53, 50, 52, 51, 60, 57],
+            "hrv_rmssd": [60.0] * 7 + [45, 54],
+            "sleep_score": [85.0] * 8 + [70],
+            "body_battery": [50.0] * 8 + [40],
+        }, index=dates)
+
+    def test_matches_hand_computed_context(self):
+        from biosystems.wellness import cache as wc
+
+        df = self._small_frame()
+        table = _features(df)
+        with patch("biosystems.wellness.cache._load_df", return_value=df):
+            spike = wc.compute_wellness_context("2025-11-09")
+            mixed = wc.compute_wellness_context("2025-11-10")
+            gap = wc.compute_wellness_context("2025-11-05")
+
+        # 7 prior rows skip the gap: RHR mean 359/7, HRV mean 60 → -25%
+        assert spike["rhr_7d_mean"] == pytest.approx(51.3)
+        assert spike["rhr_1d_delta"] == pytest.approx(9.0)
+        assert spike["hrv_7d_pct"] == pytest.approx(-25.0)
+        assert spike["gar"] == "🔴 RED"
+        assert spike["gar_detail"] == "HRV -25% vs 7d mean; RHR +9 bpm vs 7d mean"
+        assert spike["gar_overnight_detail"] == "HRV -25% vs 7d mean; RHR +9 bpm vs 7d mean"
+
+        # RHR +4.3 and HRV -6.7% stay under the amber thresholds; sleep and BB do not
+        assert mixed["rhr_7d_mean"] == pytest.approx(52.7)
+        assert mixed["gar"] == "🟡 AMBER"
+        assert mixed["gar_detail"] == "Sleep 70%; Body Battery 40% (below norm)"
+        assert mixed["gar_overnight"] == "🟡 AMBER"
+        assert mixed["gar_overnight_detail"] == "Sleep score 70%"
+
+        assert not gap["stale"]  # one day behind is not reported as stale
+        assert gap["rhr_7d_mean"] == pytest.approx(51.5)
+        assert gap["gar"] == "🟢 GREEN"
+
+        for ctx, day in ((spike, "2025-11-09"), (mixed, "2025-11-10"), (gap, "2025-11-05")):
+            row = table.loc[day]
+            assert (row["gar"], row["gar_detail"]) == (ctx["gar"], ctx["gar_detail"])
+            assert row["rhr_7d_mean"] == pytest.approx(ctx["rhr_7d_mean"], abs=0.05)
+
+    def test_covers_gap_days_with_staleness(self):
+        df = _frame(n_days=10, gaps=False).drop(pd.Timestamp("2025-11-05"))
+        table = _features(df)
+        assert len(table) == 10  # calendar range, gap day included
+        gap = table.loc["2025-11-05"]
+        assert np.isnan(gap["hrv_rmssd"])
+        assert gap["staleness_days"] == 1
+        assert gap["hrv_7d_mean"] == pytest.approx(df["hrv_rmssd"].iloc[:4].mean())
+
+    def test_rhr_spike_is_red_overnight_ignores_body_battery(self):
+        dates = pd.date_range("2025-11-01", periods=8, freq="D")
+        df = pd.DataFrame({
+            "resting_hr_garmin": [50.0] * 7 + [60.0],
+            "body_battery": [60.0] * 7 + [10.0],
+        }, index=dates)
+        row = _features(df).loc["2025-11-08"]
+        assert row["gar"] == "🔴 RED"
+        assert row["gar_detail"] == "RHR +10 bpm vs 7d mean; Body Battery 10% (low)"
+        assert row["gar_overnight_detail"] == "RHR +10 bpm vs 7d mean"
+
+    def test_targets_outside_cache(self):
+        df = _frame(n_days=10, gaps=False)
+        table = _features(df, targets=["2025-11-12", "2025-12-31"])
+        assert table.loc["2025-11-12", "has_window"]
+        assert table.loc["2025-11-12", "staleness_days"] == 2
+        assert not table.loc["2025-12-31", "has_window"]
+
+
+class TestFeatureTablePersistence:
+    """sync_wellness keeps the persisted table in step with the cache."""
+
+    @staticmethod
+    def _records(df):
+        return [
+            {"date": str(ts.date()), "column": col, "value": float(v)}
+            for ts, row in df.iterrows() for col, v in row.items() if not pd.isna(v)
+        ]
+
+    def test_incremental_sync_matches_full_rebuild(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+        from biosystems.wellness import features
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        df = _frame(n_days=80, gaps=False)
+        first, second = df.iloc[:60], df.iloc[55:]
+
+        with patch("biosystems.wellness.habitdash.HabitDashClient") as client:
+            client.return_value.fetch_all_metrics.return_value = self._records(first)
+            wc.sync_wellness(date_start="2025-11-01", date_end="2025-12-30", api_key="x")
+            assert load_feature_table() is not None
+            client.return_value.fetch_all_metrics.return_value = self._records(second)
+            with patch.object(features, "_rolling_features", wraps=features._rolling_features) as rolled:
+                wc.sync_wellness(date_start="2025-12-25", date_end="2026-01-19", api_key="x")
+        # Only dates from the first changed day onward were recomputed
+        assert [len(c.args[1]) for c in rolled.call_args_list] == [len(second)]
+
+        table = load_feature_table()
+        expected = _features(wc.load_wellness_df())
+        assert table.attrs["source"] == wc._source_signature(wc._load_df())
+        pd.testing.assert_frame_equal(table, expected, check_freq=False, check_index_type=False)
+
+    def test_stale_table_is_rebuilt_on_read(self, tmp_path, monkeypatch):
+        from biosystems.wellness import cache as wc
+
+        monkeypatch.setenv("BIOSYSTEMS_HOME", str(tmp_path))
+        _frame(n_days=20, gaps=False).to_parquet(tmp_path / "wellness.parquet")
+        assert not features_path().exists()
+        ctx = wc.compute_wellness_context("2025-11-15")
+        assert ctx["gar"]
+        assert load_feature_table().attrs["source"] == wc._source_signature(wc._load_df())
@@ -0,0 +1,117 @@
+"""
+Generate Synthetic Sample Data
+==============================
+
+Writes deterministic synthetic inputs at a chosen scale, laid out as a
+``BIOSYSTEMS_HOME`` so the CLI and benchmarks can run against them:
+
+    <out>/activities/run_<H>h.gpx           GPX 1.1 with HR/cadence extensions
+    <out>/activities/run_<H>h.fit           FIT activity file
+    <out>/activities/run_<H>h.streams.json  decoded Strava streams + start_date
+    <out>/history.jsonl                     run history
+    <out>/wellness/                         partitioned daily wellness store
+
+Every file comes from ``biosystems.testing.synthetic``; the same arguments
+always produce the same data.
+
+Usage
+-----
+    python3.11 tools/generate_sample_data.py --out /tmp/bio-sample
+    python3.11 tools/generate_sample_data.py --out /tmp/bio-ultra --hours 1 12 48 --runs 50000 --wellness-years 10
+    BIOSYSTEMS_HOME=/tmp/bio-sample biosystems summary
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from biosystems.testing.synthetic import (  # noqa: E402
+    DEFAULT_START,
+    synthetic_fit,
+    synthetic_gpx,
+    synthetic_history,
+    synthetic_streams,
+    synthetic_wellness,
+)
+
+FORMATS = ("gpx", "fit", "streams")
+
+
+def write_activities(out: Path, hours: list[float], formats: list[str], seed: int) -> list[Path]:
+    """Write one run per duration in each requested format; return the paths written."""
+    activities = out / "activities"
+    activities.mkdir(parents=True, exist_ok=True)
+    written = []
+    for h in hours:
+        duration_s = int(h * 3600)
+        stem = f"run_{h:g}h"
+        if "gpx" in formats:
+            path = activities / f"{stem}.gpx"
+            path.write_text(synthetic_gpx(duration_s, seed))
+            written.append(path)
+        if "fit" in formats:
+            path = activities / f"{stem}.fit"
+            path.write_bytes(synthetic_fit(duration_s, seed))
+            written.append(path)
+        if "streams" in formats:
+            path = activities / f"{stem}.streams.json"
+            payload = {
+                "start_date": DEFAULT_START.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "streams": synthetic_streams(duration_s, seed),
+            }
+            path.write_text(json.dumps(payload, separators=(",", ":")))
+            written.append(path)
+    return written
+
+
+def write_history(out: Path, n_runs: int, seed: int) -> Path:
+    """Write ``n_runs`` entries as ``history.jsonl`` (one compact JSON object per line, by date)."""
+    path = out / "history.jsonl"
+    lines = [json.dumps(e, separators=(",", ":")) for e in synthetic_history(n_runs, seed)]
+    path.write_text("\n".join(lines) + "\n" if lines else "")
+    return path
+
+
+def write_wellness(out: Path, years: float, seed: int) -> Path:
+    """Write ``years`` of daily wellness into the partitioned store under ``out``."""
+    os.environ["BIOSYSTEMS_HOME"] = str(out)
+    from biosystems.wellness.cache import _save_df, wellness_dir
+
+    _save_df(synthetic_wellness(round(years * 365), seed))
+    return wellness_dir()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", type=Path, required=True, help="Output directory (usable as BIOSYSTEMS_HOME)")
+    parser.add_argument("--hours", type=float, nargs="*", default=[1.0], help="Activity durations in hours (1 Hz)")
+    parser.add_argument("--formats", nargs="*", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--runs", type=int, default=1000, help="History entries (0 to skip)")
+    parser.add_argument("--wellness-years", type=float, default=3.0, help="Years of daily wellness (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    out = args.out.expanduser().resolve()
+    out.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    for path in write_activities(out, args.hours, args.formats, args.seed):
+        print(f"  {path.relative_to(out)}  ({path.stat().st_size / 1e6:.1f} MB)")
+    if args.runs > 0:
+        path = write_history(out, args.runs, args.seed)
+        print(f"  {path.relative_to(out)}  ({args.runs:,} runs)")
+    if args.wellness_years > 0:
+        path = write_wellness(out, args.wellness_years, args.seed)
+        print(f"  {path.relative_to(out)}/  ({round(args.wellness_years * 365):,} days)")
+    print(f"Wrote sample data to {out} in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,8 @@ full bio-systems pipeline on each one:
   5. Run run_metrics() on walk-excluded data
   6. Write  <stem>_gpx_full.csv     — all rows with walk flag
   7. Write  <stem>_gpx_summary.csv  — run-only rows + scalar metrics broadcast
-  8. Regenerate data/real_weekly_data.json from every summary CSV
+  8. Regenerate data/real_weekly_data.json from the weekly rollup
+     (only new or changed summary CSVs are read)
 
 Usage
 -----
@@ -41,6 +42,7 @@ import yaml
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
+from biosystems.analytics.rollups import Accumulator  # noqa: E402, type: ignore
 from biosystems.ingestion.fit import add_derived_metrics, parse_fit  # noqa: E402, type: ignore
 from biosystems.ingestion.gpx import parse_gpx  # noqa: E402, type: ignore
 from biosystems.models import HeartRateZone, ZoneConfig  # noqa: E402, type: ignore
@@ -256,12 +258,51 @@ def process_fit(raw_path: Path, processed_dir: Path, zone_config: ZoneConfig, ve
 
 # ─── Weekly aggregation ───────────────────────────────────────────────────────
 
+WEEKLY_ROLLUP_NAME = "weekly_rollup.json"
+
+
+def _summary_contribution(csv_path: Path, verbose: bool) -> tuple[str, float, float | None] | None:
+    """
+    (ISO week key, EF, decoupling %) for one summary CSV, or None when it is
+    not a dated run summary. Metrics are broadcast to every row, so only the
+    first row is read.
+    """
+    parts = csv_path.stem.split("_")  # e.g. 20250425_191120_..._gpx_summary
+    if not (parts[0].isdigit() and len(parts[0]) == 8):
+        return None
+    try:
+        iso = datetime.strptime(parts[0], "%Y%m%d").isocalendar()
+    except ValueError:
+        return None
+
+    try:
+        df = pd.read_csv(csv_path, nrows=1)
+    except Exception as e:
+        if verbose:
+            print(f"  [WARN] Could not read {csv_path.name}: {e}")
+        return None
+
+    if "efficiency_factor" not in df.columns or df.empty:
+        return None  # HR-only or non-run file
+    ef = df["efficiency_factor"].iloc[0]
+    dec = df["decoupling_%"].iloc[0] if "decoupling_%" in df.columns else float("nan")
+    if pd.isna(ef):
+        return None
+    return f"{iso.year}-W{iso.week:02d}", float(ef), None if pd.isna(dec) else float(dec)
+
+
 def regenerate_weekly_json(processed_dir: Path, output_path: Path, verbose: bool) -> None:
     """
-    Read all *_summary.csv files and regenerate real_weekly_data.json.
+    Regenerate real_weekly_data.json from the *_summary.csv files.
 
     Only includes files whose stem starts with YYYYMMDD_ (a date prefix).
     Non-run sessions (walk-only FIT files without EF) are skipped.
+
+    Weekly EF / decoupling accumulators are kept in ``weekly_rollup.json``
+    beside the CSVs, together with each file's contribution keyed by its
+    mtime and size, so only new or changed CSVs are read: a changed or
+    removed file is subtracted from its week, and the JSON is written from
+    the accumulators.
     """
     summary_files = sorted(processed_dir.glob("*_summary.csv"))
 
@@ -271,48 +312,82 @@ def regenerate_weekly_json(processed_dir: Path, output_path: Path, verbose: bool
         if "non_run" not in str(f)
     ]
 
-    week_data: dict[int, list[dict]] = {}
-
-    for csv_path in summary_files:
-        stem = csv_path.stem  # e.g. 20250425_191120_..._gpx_summary
-        parts = stem.split("_")
-        if not (parts[0].isdigit() and len(parts[0]) == 8):
+    rollup_path = processed_dir / WEEKLY_ROLLUP_NAME
+    try:
+        rollup = json.loads(rollup_path.read_text())
+        files: dict[str, dict] = rollup["files"]
+        weeks = {
+            key: {m: Accumulator.from_json(acc) for m, acc in accs.items()}
+            for key, accs in rollup["weeks"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        files, weeks = {}, {}
+
+    def _apply(contrib: dict, sign: int) -> bool:
+        """Add (sign=1) or subtract (sign=-1) one file; False if its week needs recomputing."""
+        if contrib.get("week") is None:
+            return True
+        accs = weeks.setdefault(contrib["week"], {"ef": Accumulator(), "decoupling_pct": Accumulator()})
+        exact = True
+        for metric, value in (("ef", contrib["ef"]), ("decoupling_pct", contrib["dec"])):
+            if value is None:
+                continue
+            if sign > 0:
+                accs[metric].add(value)
+            elif not accs[metric].discard(value):
+                exact = False
+        return exact
+
+    present = {f.name: f for f in summary_files}
+    stale_weeks: set[str] = set()
+    read_count = 0
+    for name in [n for n in files if n not in present]:
+        removed = files.pop(name)
+        if not _apply(removed, -1):
+            stale_weeks.add(removed["week"])
+    for name, csv_path in present.items():
+        st = csv_path.stat()
+        stamp = [st.st_mtime_ns, st.st_size]
+        old = files.get(name)
+        if old is not None and old.get("stat") == stamp:
             continue
-
-        try:
-            dt = datetime.strptime(parts[0], "%Y%m%d")
-            iso_week = dt.isocalendar().week
-        except ValueError:
-            continue
-
-        try:
-            df = pd.read_csv(csv_path)
-        except Exception as e:
-            if verbose:
-                print(f"  [WARN] Could not read {csv_path.name}: {e}")
-            continue
-
-        if "efficiency_factor" not in df.columns:
-            continue  # HR-only or non-run file
-
-        ef = df["efficiency_factor"].iloc[0]
-        dec = df["decoupling_%"].iloc[0] if "decoupling_%" in df.columns else float("nan")
-
-        if pd.isna(ef):
-            continue
-
-        week_data.setdefault(iso_week, []).append({"ef": ef, "dec": dec})
+        if old is not None and not _apply(old, -1):
+            stale_weeks.add(old["week"])
+        contrib = _summary_contribution(csv_path, verbose)
+        read_count += 1
+        week, ef, dec = contrib if contrib is not None else (None, None, None)
+        files[name] = {"stat": stamp, "week": week, "ef": ef, "dec": dec}
+        _apply(files[name], 1)
+
+    # Subtracting a week's min/max leaves it inexact: recompute from the stored contributions
+    stale_weeks = {w for w in stale_weeks if w in weeks}
+    for week in stale_weeks:
+        weeks[week] = {"ef": Accumulator(), "decoupling_pct": Accumulator()}
+    for contrib in files.values():
+        if contrib.get("week") in stale_weeks:
+            _apply(contrib, 1)
+    weeks = {key: accs for key, accs in weeks.items() if accs["ef"].count}
+
+    rollup_path.write_text(json.dumps({
+        "files": files,
+        "weeks": {key: {m: acc.to_json() for m, acc in accs.items()} for key, accs in weeks.items()},
+    }))
+
+    # real_weekly_data.json is keyed by ISO week number alone: merge same-numbered weeks across years
+    by_number: dict[int, dict[str, Accumulator]] = {}
+    for key, accs in weeks.items():
+        merged = by_number.setdefault(int(key.split("-W")[1]), {"ef": Accumulator(), "decoupling_pct": Accumulator()})
+        for metric, acc in accs.items():
+            merged[metric].merge(acc)
 
     records = []
-    for week in sorted(week_data.keys()):
-        runs = week_data[week]
-        ef_vals = [r["ef"] for r in runs]
-        dec_vals = [r["dec"] for r in runs if not pd.isna(r["dec"])]
+    for week in sorted(by_number):
+        ef_acc, dec_acc = by_number[week]["ef"], by_number[week]["decoupling_pct"]
         records.append({
             "week": week,
-            "ef_mean": round(float(np.mean(ef_vals)), 5),
-            "decoupling_mean": round(float(np.mean(dec_vals)), 2) if dec_vals else None,
-            "num_runs": len(runs),
+            "ef_mean": round(ef_acc.mean, 5),
+            "decoupling_mean": round(dec_acc.mean, 2) if dec_acc.count else None,
+            "num_runs": ef_acc.count,
             "note": "",
         })
 
@@ -321,7 +396,8 @@ def regenerate_weekly_json(processed_dir: Path, output_path: Path, verbose: bool
 
     if verbose:
         total_runs = sum(r['num_runs'] for r in records)  # type: ignore[misc]
-        print(f"\nRegenerated {output_path.name}  ({len(records)} weeks, {total_runs} runs)")
+        print(f"\nRegenerated {output_path.name}  ({len(records)} weeks, {total_runs} runs, "
+              f"{read_count} summaries read)")
 
 
 # ─── Main ─────────────────────────────────────────────────────────────────────